@@ -0,0 +1,22 @@
+"""
+renQoder 명령줄 실행 진입점 (GUI 없이 일괄 인코딩, 결과는 JSON Lines)
+
+사용법:
+    python run_cli.py --help
+"""
+
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    # src 디렉토리를 Python 경로에 추가
+    src_path = Path(__file__).parent / 'src'
+    sys.path.insert(0, str(src_path))
+
+    try:
+        from renqoder.cli import main
+    except ImportError as e:
+        print(f"애플리케이션 실행 오류: {e}", file=sys.stderr)
+        print("필요한 모듈을 불러올 수 없습니다. 'pip install -r requirements.txt'를 실행해 주세요.", file=sys.stderr)
+        sys.exit(2)
+    main()
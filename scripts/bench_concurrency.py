@@ -0,0 +1,112 @@
+"""
+동시 실행 수 자동 조절 벤치마크 스크립트
+ffprobe 대역 시뮬레이터(fake_ffprobe.py)를 장치 프로필별로 고정 동시 실행 수 1..N으로 실행해
+처리량이 가장 높은 값을 찾고, AdaptiveConcurrency가 같은 값 근처로 수렴하는지 확인합니다.
+
+사용법:
+    python scripts/bench_concurrency.py --profile smb --requests 300
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'renqoder'))
+
+from concurrency import AdaptiveConcurrency, run_adaptive
+
+SIMULATOR = str(Path(__file__).parent / 'fake_ffprobe.py')
+PROFILES = ('nvme', 'hdd', 'smb')
+
+
+def make_probe(profile, state_dir):
+    """시뮬레이터를 ffprobe 명령과 같은 인자로 실행하는 함수"""
+    env = dict(os.environ, FAKE_FFPROBE_PROFILE=profile, FAKE_FFPROBE_STATE=state_dir)
+    creationflags = 0x08000000 if os.name == 'nt' else 0
+
+    def probe(index):
+        cmd = [sys.executable, SIMULATOR, '-v', 'quiet', '-print_format', 'json',
+               '-show_format', '-show_streams', f"video_{index}.mp4"]
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env, creationflags=creationflags)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+
+    return probe
+
+
+def run_fixed(probe, workers, requests):
+    """동시 실행 수를 고정하고 처리량(요청/초)을 반환합니다."""
+    pending = list(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                index = pending.pop()
+            probe(index)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return requests / (time.perf_counter() - start)
+
+
+def run_controlled(probe, requests, maximum, window):
+    """AdaptiveConcurrency로 실행하고 (처리량, 조절기, 시간 가중 평균 동시 실행 수(후반부)) 반환"""
+    controller = AdaptiveConcurrency("벤치마크", initial=1, maximum=maximum, window=window, min_samples=4,
+                                     log_callback=lambda _: None)
+    samples = []
+
+    def on_done(done, _):
+        samples.append(controller.limit)
+
+    start = time.perf_counter()
+    run_adaptive(list(range(requests)), probe, controller, on_done=on_done)
+    throughput = requests / (time.perf_counter() - start)
+
+    tail = samples[len(samples) // 2:]
+    settled = sum(tail) / len(tail) if tail else controller.limit
+    return throughput, controller, settled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="renQoder 동시 실행 수 자동 조절 벤치마크")
+    parser.add_argument('--profile', choices=PROFILES + ('all',), default='all', help="장치 프로필 (기본: 전체)")
+    parser.add_argument('--requests', type=int, default=200, help="고정 동시 실행 수마다 보낼 요청 수")
+    parser.add_argument('--maximum', type=int, default=10, help="시험할 최대 동시 실행 수")
+    parser.add_argument('--window', type=float, default=1.0, help="조절기 측정 구간(초)")
+    args = parser.parse_args()
+
+    profiles = PROFILES if args.profile == 'all' else (args.profile,)
+    for profile in profiles:
+        print(f"\n=== 프로필: {profile} ===")
+        with tempfile.TemporaryDirectory() as state_dir:
+            probe = make_probe(profile, state_dir)
+
+            results = {}
+            for workers in range(1, args.maximum + 1):
+                results[workers] = run_fixed(probe, workers, args.requests)
+                print(f"  고정 {workers:2d}개: {results[workers]:7.1f} 요청/초")
+            best = max(results, key=results.get)
+
+            throughput, controller, settled = run_controlled(probe, args.requests * 3, args.maximum, args.window)
+            for decision in controller.decisions:
+                print(f"    {decision['from']} → {decision['to']}: {decision['reason']}")
+
+        print(f"  최적 고정값: {best}개 ({results[best]:.1f} 요청/초)")
+        print(f"  자동 조절: 최종 {controller.limit}개, 후반부 평균 {settled:.1f}개, "
+              f"전체 처리량 {throughput:.1f} 요청/초 (최적 대비 {throughput / results[best] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
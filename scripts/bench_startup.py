@@ -0,0 +1,96 @@
+"""
+시작 시간 벤치마크 스크립트
+1. 주요 모듈의 import 비용을 `python -X importtime`으로 측정 (각각 새 프로세스에서)
+2. 프로그램을 벤치마크 모드(RENQODER_STARTUP_BENCH=1)로 여러 번 실행해
+   첫 화면 표시(first_frame)와 백그라운드 준비 완료(hardware_ready, cache_ready)까지의 시간을 측정
+
+사용법:
+    python scripts/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / 'src' / 'renqoder'
+sys.path.insert(0, str(SRC_DIR))
+
+from startup import BENCH_ENV
+
+# import 비용을 측정할 모듈 (외부 라이브러리 + 프로그램 모듈)
+MODULES = (
+    'customtkinter', 'PIL.Image', 'numpy', 'send2trash', 'comtypes',
+    'hardware_detector', 'encoder', 'searcher', 'planner', 'scheduler', 'main',
+)
+
+
+def measure_import(module):
+    """새 프로세스에서 module을 import하는 데 걸린 누적 시간(ms). 불러올 수 없으면 None"""
+    creationflags = 0x08000000 if os.name == 'nt' else 0
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, cwd=str(SRC_DIR), creationflags=creationflags
+    )
+    if result.returncode != 0:
+        return None
+
+    # 형식: "import time: self [us] | cumulative | imported package" - 마지막으로 끝난 최상위 모듈이 대상
+    for line in reversed(result.stderr.splitlines()):
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1].strip()) / 1000
+    return None
+
+
+def measure_startup(timeout):
+    """벤치마크 모드로 프로그램을 실행하고 단계별 시작 시간(초)을 반환합니다."""
+    creationflags = 0x08000000 if os.name == 'nt' else 0
+    env = dict(os.environ, **{BENCH_ENV: '1'})
+    result = subprocess.run(
+        [sys.executable, 'main.py'], capture_output=True, text=True, encoding='utf-8', errors='replace',
+        cwd=str(SRC_DIR), env=env, timeout=timeout, creationflags=creationflags
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith('{"startup"'):
+            return json.loads(line)['startup']
+    raise RuntimeError(f"시작 시간 결과를 찾을 수 없습니다: {result.stderr.strip()[-500:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="renQoder 시작 시간 벤치마크")
+    parser.add_argument('--runs', type=int, default=5, help="프로그램 실행 횟수 (기본: 5)")
+    parser.add_argument('--timeout', type=float, default=60, help="실행 1회 제한 시간(초)")
+    parser.add_argument('--imports-only', action='store_true', help="import 비용만 측정")
+    args = parser.parse_args()
+
+    print("=== 모듈 import 비용 (누적, 새 프로세스) ===")
+    for module in MODULES:
+        cost = measure_import(module)
+        print(f"  {module:<20} {'불러올 수 없음' if cost is None else f'{cost:8.1f} ms'}")
+
+    if args.imports_only:
+        return
+
+    print(f"\n=== 시작 시간 ({args.runs}회 중앙값) ===")
+    runs = []
+    for i in range(args.runs):
+        try:
+            runs.append(measure_startup(args.timeout))
+        except Exception as e:
+            print(f"  실행 {i + 1} 실패: {e}")
+    if not runs:
+        return
+
+    stages = sorted({name for run in runs for name in run}, key=lambda name: statistics.median(
+        run[name] for run in runs if name in run))
+    for name in stages:
+        values = [run[name] for run in runs if name in run]
+        print(f"  {name:<16} {statistics.median(values) * 1000:8.0f} ms  (최소 {min(values) * 1000:.0f} / 최대 {max(values) * 1000:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+스레드 배분 벤치마크 스크립트
+동시 인코딩 작업을 FFmpeg 기본 스레드 설정과 CPU 토폴로지 기반 배분(ThreadPlanner)으로 각각 실행하여
+전체 처리량(fps)을 비교합니다.
+
+사용법:
+    python scripts/bench_threads.py --encoder libx265 --jobs 4 --duration 10
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'renqoder'))
+
+from encoder import VideoEncoder
+from cpu_topology import ThreadPlanner, read_cpu_topology
+
+
+def make_source(path, duration, size, fps):
+    """lavfi testsrc2 + sine으로 테스트용 원본 영상을 생성합니다."""
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f'testsrc2=size={size}:rate={fps}:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18', '-c:a', 'aac',
+        str(path)
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def run_round(source, workdir, encoder_type, jobs, allocations):
+    """jobs개의 인코딩을 동시에 실행하고 총 소요 시간(초)을 반환합니다."""
+    results = [None] * jobs
+
+    def worker(index):
+        encoder = VideoEncoder(encoder_type)
+        encoder.thread_allocation = allocations[index] if allocations else None
+        output = str(Path(workdir) / f"out_{index}.mp4")
+        results[index] = encoder.encode(source, output_file=output, overwrite=True, log_callback=lambda _: None)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if not r)
+    return elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="renQoder 스레드 배분 벤치마크")
+    parser.add_argument('--encoder', default='libx265', help="테스트할 인코더 (기본: libx265)")
+    parser.add_argument('--jobs', type=int, default=4, help="동시 작업 수 (기본: 4)")
+    parser.add_argument('--duration', type=int, default=10, help="테스트 영상 길이(초)")
+    parser.add_argument('--size', default='1920x1080', help="테스트 영상 해상도")
+    parser.add_argument('--fps', type=int, default=30, help="테스트 영상 FPS")
+    args = parser.parse_args()
+
+    topology = read_cpu_topology()
+    print(f"논리 CPU {topology['logical']}개, 물리 코어 {len(topology['cores'])}개, NUMA 노드 {len(topology['nodes'])}개")
+
+    total_frames = args.duration * args.fps * args.jobs
+    allocations = ThreadPlanner(topology).allocate(args.jobs)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = str(Path(workdir) / "source.mp4")
+        print("테스트 영상 생성 중...")
+        make_source(source, args.duration, args.size, args.fps)
+
+        for label, plan in (("FFmpeg 기본", None), ("토폴로지 배분", allocations)):
+            elapsed, failed = run_round(source, workdir, args.encoder, args.jobs, plan)
+            status = f" (실패 {failed}개)" if failed else ""
+            print(f"{label:>10}: {elapsed:7.2f}초, 전체 {total_frames / elapsed:7.1f} fps{status}")
+
+
+if __name__ == "__main__":
+    main()
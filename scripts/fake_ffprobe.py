@@ -0,0 +1,72 @@
+"""
+ffprobe 대역 시뮬레이터
+실제 디스크/네트워크 없이 동시 실행 수에 따른 ffprobe 응답 시간을 흉내 냅니다.
+같은 상태 폴더를 쓰는 시뮬레이터끼리 동시에 실행 중인 개수를 세어, 장치 프로필에 따라
+각 요청이 느려지게 하고 ffprobe와 같은 형식의 JSON을 출력합니다.
+
+사용법:
+    FAKE_FFPROBE_PROFILE=smb FAKE_FFPROBE_STATE=/tmp/state python scripts/fake_ffprobe.py -v quiet ... file.mp4
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+
+# 장치 프로필: 요청 하나의 기본 처리 시간(초), 처리량이 가장 높은 동시 실행 수, 그 이상일 때의 경합 비용
+PROFILES = {
+    'nvme': {'base': 0.03, 'best': 8, 'penalty': 0.05},
+    'hdd': {'base': 0.04, 'best': 1, 'penalty': 0.35},
+    'smb': {'base': 0.15, 'best': 4, 'penalty': 0.2},
+}
+
+SLICE = 0.01
+
+
+def service_time(profile, concurrent):
+    """동시 실행 수가 concurrent일 때 요청 하나에 걸리는 시간(초)"""
+    best = profile['best']
+    return profile['base'] * max(1.0, concurrent / best) * (1 + profile['penalty'] * max(0, concurrent - best))
+
+
+def count_active(state_dir):
+    try:
+        return max(1, sum(1 for _ in os.scandir(state_dir)))
+    except OSError:
+        return 1
+
+
+def main():
+    profile = PROFILES[os.environ.get('FAKE_FFPROBE_PROFILE', 'nvme')]
+    state_dir = Path(os.environ.get('FAKE_FFPROBE_STATE', Path.home() / '.fake_ffprobe'))
+    state_dir.mkdir(parents=True, exist_ok=True)
+    marker = state_dir / f"{os.getpid()}"
+    marker.touch()
+
+    try:
+        # 동시 실행 수가 바뀌면 남은 부분의 속도도 바뀜
+        progress = 0.0
+        while progress < 1.0:
+            time.sleep(SLICE)
+            progress += SLICE / service_time(profile, count_active(state_dir))
+    finally:
+        try:
+            marker.unlink()
+        except OSError:
+            pass
+
+    path = sys.argv[-1] if len(sys.argv) > 1 else 'input.mp4'
+    print(json.dumps({
+        'format': {'filename': path, 'duration': '60.0', 'size': '75000000', 'bit_rate': '10000000'},
+        'streams': [
+            {'codec_type': 'video', 'codec_name': 'h264', 'width': 1920, 'height': 1080,
+             'r_frame_rate': '30/1', 'avg_frame_rate': '30/1', 'nb_frames': '1800', 'bit_rate': '9800000'},
+            {'codec_type': 'audio', 'codec_name': 'aac', 'bit_rate': '192000', 'duration': '60.0'}
+        ]
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+로그 모듈
+수준(level)과 분류(category)가 있는 로그를 남깁니다.
+- 전체 로그(FFmpeg 진행률 줄 포함)는 크기 기준으로 교체되는 파일에 기록
+- UI 로그 창에는 고정 크기 링 버퍼에 담긴 최근 로그만 표시 (진행률 줄은 제외 - 진행 표시줄이 대신 보여줌)
+"""
+
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+LOG_DIR = Path.home() / '.renqoder_logs'
+LOG_FILE_NAME = 'renqoder.log'
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+# UI 로그 창에 남길 최근 로그 줄 수
+UI_LOG_LINES = 2000
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', ERROR: 'error'}
+
+# 로그 분류
+CATEGORY_APP = 'app'
+CATEGORY_SEARCH = 'search'
+CATEGORY_METADATA = 'metadata'
+CATEGORY_ENCODE = 'encode'
+CATEGORY_QUEUE = 'queue'
+CATEGORY_PROBE = 'probe'
+CATEGORY_FFMPEG = 'ffmpeg'
+
+# FFmpeg 진행률 줄 (frame= ... time= ... 또는 size= ... time= ...)
+PROGRESS_LINE_PATTERN = re.compile(r"^(?:frame=|size=).*\btime=")
+
+# 메시지 앞의 표시로 수준 추정 (기존 로그 문구와의 호환)
+LEVEL_MARKERS = [('✗', ERROR), ('❌', ERROR), ('⚠️', WARNING)]
+
+
+def is_progress_line(message: str) -> bool:
+    return bool(PROGRESS_LINE_PATTERN.match(message.strip()))
+
+
+def guess_level(message: str) -> int:
+    text = message.lstrip()
+    for marker, level in LEVEL_MARKERS:
+        if text.startswith(marker):
+            return level
+    return INFO
+
+
+class AppLogger:
+    """
+    프로그램 로그
+
+    어느 스레드에서나 log()를 호출할 수 있으며, UI는 since()로 마지막으로 그린 이후의 로그만 가져가
+    로그 창에 덧붙입니다 (링 버퍼에서 밀려난 줄은 창에서도 지움).
+    """
+
+    def __init__(self, log_dir: Optional[Path] = None, capacity: int = UI_LOG_LINES):
+        self.lock = threading.Lock()
+        self.buffer = deque(maxlen=capacity)    # (순번, 기록)
+        self.sequence = itertools.count(1)
+        self.last_sequence = 0
+        self.listeners = []
+
+        self.logger = logging.getLogger('renqoder')
+        self.logger.setLevel(DEBUG)
+        self.logger.propagate = False
+        self.log_file = None
+        if not self.logger.handlers:
+            try:
+                directory = Path(log_dir) if log_dir else LOG_DIR
+                directory.mkdir(parents=True, exist_ok=True)
+                self.log_file = directory / LOG_FILE_NAME
+                handler = RotatingFileHandler(
+                    self.log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s [%(category)s] %(message)s'))
+                self.logger.addHandler(handler)
+            except Exception as e:
+                print(f"로그 파일을 열 수 없습니다: {e}")
+
+    def add_listener(self, callback):
+        """UI 로그 버퍼에 새 로그가 들어올 때 호출할 함수 (인자 없음, 작업 스레드에서 호출될 수 있음)"""
+        self.listeners.append(callback)
+
+    def log(self, message: str, level: Optional[int] = None, category: str = CATEGORY_APP):
+        """
+        로그를 남깁니다.
+
+        Args:
+            level: 로그 수준 (None이면 메시지 앞의 ✗/⚠️ 표시로 추정, FFmpeg 진행률 줄은 DEBUG)
+            category: 로그 분류 (CATEGORY_*)
+        """
+        if level is None:
+            if is_progress_line(message):
+                level, category = DEBUG, CATEGORY_FFMPEG
+            else:
+                level = guess_level(message)
+
+        self.logger.log(level, message, extra={'category': category})
+        if level < INFO:
+            return
+
+        record = {'time': time.time(), 'level': level, 'category': category, 'message': message}
+        with self.lock:
+            self.last_sequence = next(self.sequence)
+            self.buffer.append((self.last_sequence, record))
+        for callback in self.listeners:
+            callback()
+
+    def since(self, sequence: int) -> Tuple[List[Dict], int, bool]:
+        """
+        sequence 이후의 UI 로그를 반환합니다.
+
+        Returns:
+            (새 기록 리스트, 마지막 순번, 링 버퍼가 넘쳐 일부가 빠졌는지 여부)
+        """
+        with self.lock:
+            entries = [record for seq, record in self.buffer if seq > sequence]
+            dropped = bool(self.buffer) and self.buffer[0][0] > sequence + 1
+            return entries, self.last_sequence, dropped
+
+    def capacity(self) -> int:
+        return self.buffer.maxlen
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== App Logger Test ===")
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        app_log = AppLogger(Path(directory), capacity=5)
+        app_log.log("검색 완료: 10개 파일 발견", category=CATEGORY_SEARCH)
+        app_log.log("frame=  120 fps= 60 q=28.0 size=    1024kB time=00:00:04.00 bitrate=2097.2kbits/s speed=2.00x")
+        app_log.log("⚠️ FFmpeg 진행이 120초 동안 멈춰 프로세스를 종료합니다.", category=CATEGORY_ENCODE)
+        for i in range(10):
+            app_log.log(f"line {i}")
+
+        entries, last, dropped = app_log.since(0)
+        print(f"UI 버퍼: {[e['message'] for e in entries]} (마지막 순번 {last}, 밀려남 {dropped})")
+        logging.getLogger('renqoder').handlers[0].flush()
+        print(app_log.log_file.read_text(encoding='utf-8'))
@@ -0,0 +1,430 @@
+"""
+asyncio API 모듈
+다른 asyncio 기반 도구에서 renQoder를 쓰기 위한 코루틴 API입니다. ffprobe/FFmpeg를 asyncio 서브프로세스로
+실행하므로 작업마다 스레드를 만들지 않고, 이벤트 루프 하나에서 수백 개의 분석과 수십 개의 인코딩을 다룰 수 있습니다.
+취소는 일반적인 태스크 취소(task.cancel())로 하며, 실행 중인 FFmpeg를 종료하고 불완전한 출력을 지웁니다.
+
+Usage:
+    info = await probe("input.mp4")
+    infos = await asyncio.gather(*(probe(path) for path in paths))   # 동시 실행 수는 PROBE_CONCURRENCY로 제한
+
+    stream = ProgressStream()
+    task = asyncio.create_task(encode("input.mp4", encoder_type="hevc_nvenc", progress=stream))
+    async for data in stream:                    # {'progress', 'speed', 'remaining'}
+        print(data['progress'])
+    output = await task                          # 실패 시 EncodeFailed
+
+    jobs = await batch(paths, workers=4, progress=stream)   # EncodeJob 리스트 (status/result/failure)
+
+Windows에서는 서브프로세스를 지원하는 기본 이벤트 루프(ProactorEventLoop)가 필요합니다.
+
+알려진 제한: Python 3.10/3.11의 POSIX 기본 자식 프로세스 감시자(ThreadedChildWatcher)는 서브프로세스마다
+waitpid 스레드를 하나씩 만듭니다. 이 모듈은 프로세스 전역 설정인 감시자를 바꾸지 않으므로 (호스트 프로그램의
+다른 이벤트 루프에 영향을 주지 않도록) 동시에 실행 중인 ffprobe/FFmpeg 수만큼 스레드가 생깁니다.
+Python 3.12부터는 pidfd로 이벤트 루프 안에서 감시하므로 스레드를 만들지 않습니다.
+"""
+
+import asyncio
+import codecs
+import json
+import os
+import re
+import sys
+import weakref
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+# 모듈 경로 문제 해결 (패키지로 불러와도 같은 폴더의 모듈을 찾도록)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from encoder import VideoEncoder, LOG_TAIL_LINES, write_concat_list
+from jobs import EncodeJob, combine_video_info, parse_multipart_name
+from metadata_utils import empty_video_info, probe_command, apply_probe_data, finish_video_info
+from watchdog import FAILURE_LABELS, classify_failure
+
+
+# 이벤트 루프마다 동시에 실행할 ffprobe 최대 수 (초과한 요청은 대기)
+PROBE_CONCURRENCY = 32
+PROBE_TIMEOUT = 10.0
+
+# FFmpeg 출력 읽기 단위 (진행률 줄은 '\r'로 끝나므로 줄 단위가 아니라 조각으로 읽어 나눔)
+READ_CHUNK = 4096
+LINE_SPLIT = re.compile(r'[\r\n]')
+
+# Windows에서 CMD 창 생성 방지
+CREATIONFLAGS = 0x08000000 if os.name == 'nt' else 0
+
+_probe_limits = weakref.WeakKeyDictionary()     # 이벤트 루프 -> ffprobe 동시 실행 제한
+
+
+class EncodeFailed(Exception):
+    """인코딩 실패 (failure: VideoEncoder.last_failure와 같은 형식의 실패 정보)"""
+
+    def __init__(self, failure: Dict):
+        super().__init__(failure['label'])
+        self.failure = failure
+
+
+class ProgressStream:
+    """
+    encode()/batch()의 진행률을 async for로 받는 스트림
+
+    인코딩이 끝나면 반복도 끝납니다. 소비가 늦어 maxsize개가 쌓이면 오래된 항목부터 버립니다
+    (진행률은 최신 값만 의미가 있으므로 인코딩을 늦추지 않음).
+    """
+
+    _END = object()
+
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self.queue = asyncio.Queue()
+        self.closed = False
+
+    def put(self, item: Dict):
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.maxsize:
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.queue.put_nowait(self._END)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        item = await self.queue.get()
+        if item is self._END:
+            # 같은 스트림을 여러 곳에서 읽어도 모두 끝나도록 종료 표시를 되돌려 둠
+            self.queue.put_nowait(self._END)
+            raise StopAsyncIteration
+        return item
+
+
+async def _spawn(cmd: List[str], **kwargs):
+    return await asyncio.create_subprocess_exec(
+        *cmd, stdin=asyncio.subprocess.DEVNULL, creationflags=CREATIONFLAGS, **kwargs
+    )
+
+
+def _probe_limit() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limit = _probe_limits.get(loop)
+    if limit is None:
+        limit = _probe_limits[loop] = asyncio.Semaphore(PROBE_CONCURRENCY)
+    return limit
+
+
+async def _finish_process(process):
+    """아직 실행 중인 프로세스를 종료하고 기다립니다 (취소/시간 초과 시)."""
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), 5)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+async def probe(path: str, limit: Optional[asyncio.Semaphore] = None) -> Dict:
+    """
+    파일 정보를 분석합니다 (metadata_utils.get_video_info의 fast_only와 같은 결과, 정밀 스캔 없음).
+
+    Args:
+        limit: ffprobe 동시 실행 제한 (None이면 이벤트 루프별 기본 제한 PROBE_CONCURRENCY)
+    """
+    info = empty_video_info()
+    async with (limit or _probe_limit()):
+        process = await _spawn(probe_command(path), stdout=asyncio.subprocess.PIPE,
+                               stderr=asyncio.subprocess.DEVNULL)
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            stdout = None
+        finally:
+            await _finish_process(process)
+
+    if not stdout or process.returncode != 0:
+        info['invalid'] = True
+        info['metadata_loaded'] = True
+        return info
+
+    try:
+        data = json.loads(stdout.decode('utf-8', 'replace'))
+        try:
+            file_size = os.path.getsize(path)
+        except OSError:
+            file_size = 0
+        vstream, duration, bitrate = apply_probe_data(info, data, file_size)
+        finish_video_info(info, vstream, duration, bitrate)
+    except (ValueError, TypeError) as e:
+        print(f"메타데이터 추출 오류 ({path}): {e}")
+        info['invalid'] = True
+        info['metadata_loaded'] = True
+    return info
+
+
+async def _read_lines(stream, timeout: Optional[float]):
+    """FFmpeg 출력을 '\r' 또는 '\n' 단위로 나눠 반환합니다 (timeout초 동안 출력이 없으면 asyncio.TimeoutError)."""
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    buffer = ''
+    while True:
+        chunk = await asyncio.wait_for(stream.read(READ_CHUNK), timeout)
+        if not chunk:
+            buffer += decoder.decode(b'', final=True)
+            if buffer.strip():
+                yield buffer.strip()
+            return
+        buffer += decoder.decode(chunk)
+        *lines, buffer = LINE_SPLIT.split(buffer)
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+
+
+def _file_state(path: str):
+    """파일이 바뀌었는지 비교하기 위한 (inode, 크기, 수정 시각), 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _failure(kind: str, output_file: str, returncode=None, tail=None) -> Dict:
+    return {
+        'kind': kind, 'label': FAILURE_LABELS[kind], 'returncode': returncode,
+        'tail': list(tail or [])[-5:], 'output_file': output_file,
+        # 불완전한 출력은 여기서 지우므로 남아 있지 않음
+        'partial': False
+    }
+
+
+async def _prepare(inputs: List[str], output_file: Optional[str], quality, audio_mode, encoder_type, preset):
+    """입력을 분석하고 (VideoEncoder, 입력 정보, 출력 경로)를 반환합니다."""
+    encoder = VideoEncoder(encoder_type)
+    encoder.preset = preset
+    infos = await asyncio.gather(*(probe(path) for path in inputs))
+    if any(part['invalid'] for part in infos):
+        raise EncodeFailed(_failure('input', output_file or inputs[0]))
+    info = combine_video_info(infos) if len(inputs) > 1 else infos[0]
+    if output_file is None:
+        parsed = parse_multipart_name(inputs[0]) if len(inputs) > 1 else None
+        # 파일명의 오디오 표시는 방금 분석한 결과로 정함 (비우면 VideoEncoder가 ffprobe를 동기로 다시 실행해
+        # 이벤트 루프를 막으므로, 오디오 트랙이 없으면 'None'을 명시)
+        output_file = encoder.generate_output_filename(
+            inputs[0], quality, audio_mode, stem=parsed['base'] if parsed else None,
+            audio_info=infos[0].get('audio_info') or 'None'
+        )
+    return encoder, info, output_file
+
+
+async def _run_encode(encoder: VideoEncoder, inputs: List[str], info: Dict, output_file: str, quality, audio_mode,
+                      overwrite: bool, progress_callback: Optional[Callable], log_callback: Optional[Callable]) -> str:
+    """FFmpeg를 asyncio 서브프로세스로 실행하고 출력 경로를 반환합니다 (실패 시 EncodeFailed)."""
+    encoder.total_seconds = info['duration']
+    encoder.total_frames = info.get('frames', 0)
+
+    list_file = write_concat_list(inputs) if len(inputs) > 1 else None
+    if list_file:
+        cmd = encoder.build_command(list_file, output_file, quality, audio_mode, overwrite,
+                                    input_args=['-f', 'concat', '-safe', '0'])
+    else:
+        cmd = encoder.build_command(inputs[0], output_file, quality, audio_mode, overwrite)
+    if log_callback:
+        log_callback(f"실행 명령어: {' '.join(cmd)}")
+
+    # 덮어쓰기(overwrite)로 FFmpeg가 기존 출력을 잘랐는지 구분하기 위해 시작 전 상태를 기록
+    output_before = _file_state(output_file)
+    log_tail = deque(maxlen=LOG_TAIL_LINES)
+    loop = asyncio.get_running_loop()
+    stall_timeout = encoder.stall_timeout
+    stalled = False
+    finished = False
+    process = None
+    try:
+        process = await _spawn(cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+        last_seconds = -1.0
+        last_advance = loop.time()
+        try:
+            async for line in _read_lines(process.stderr, stall_timeout):
+                log_tail.append(line)
+                if log_callback:
+                    log_callback(line)
+                if 'frame=' in line and 'time=' in line:
+                    encoder._handle_progress_line(line, progress_callback)
+                    if encoder.current_seconds > last_seconds:
+                        last_seconds = encoder.current_seconds
+                        last_advance = loop.time()
+                    elif stall_timeout and loop.time() - last_advance > stall_timeout:
+                        stalled = True
+                        break
+        except asyncio.TimeoutError:
+            # 출력이 stall_timeout초 동안 전혀 없음
+            stalled = True
+        if stalled:
+            message = f"⚠️ FFmpeg 진행이 {stall_timeout:.0f}초 동안 멈춰 프로세스를 종료합니다."
+            log_tail.append(message)
+            if log_callback:
+                log_callback(message)
+        await _finish_process(process)
+        finished = process.returncode == 0 and not stalled
+    except OSError as e:
+        # FFmpeg를 실행할 수 없음 (설치되지 않음 등)
+        log_tail.append(str(e))
+    finally:
+        if process is not None:
+            await _finish_process(process)
+        if list_file:
+            try:
+                os.remove(list_file)
+            except OSError:
+                pass
+        output_after = _file_state(output_file)
+        if not finished and output_after is not None and output_after != output_before:
+            # 취소/실패로 남은 불완전한 출력 삭제 (FFmpeg가 건드리지 않은 기존 출력은 그대로 둠)
+            try:
+                os.remove(output_file)
+            except OSError:
+                pass
+
+    if finished:
+        return output_file
+    kind = classify_failure(list(log_tail), stalled=stalled)
+    raise EncodeFailed(_failure(kind, output_file, process.returncode if process else None, log_tail))
+
+
+def _as_inputs(input_file: Union[str, Sequence[str]]) -> List[str]:
+    if isinstance(input_file, (str, os.PathLike)):
+        return [os.fspath(input_file)]
+    return [os.fspath(path) for path in input_file]
+
+
+async def encode(input_file: Union[str, Sequence[str]], output_file: Optional[str] = None, quality: int = 23,
+                 audio_mode: str = "copy", encoder_type: str = "libx265", preset=None, overwrite: bool = False,
+                 progress: Optional[ProgressStream] = None, log_callback: Optional[Callable[[str], None]] = None) -> str:
+    """
+    파일 하나를 인코딩하고 출력 경로를 반환합니다.
+
+    Args:
+        input_file: 입력 파일 경로 (리스트면 분할 녹화로 보고 이어 붙여 인코딩)
+        output_file: 출력 파일 경로 (None이면 VideoEncoder 규칙으로 자동 생성)
+        progress: 진행률을 받을 ProgressStream (인코딩이 끝나면 닫힘)
+        log_callback: FFmpeg 출력 줄을 받을 함수 (이벤트 루프에서 호출되므로 오래 걸리면 안 됨)
+
+    Raises:
+        EncodeFailed: 인코딩 실패 (e.failure['kind']로 원인 확인)
+        asyncio.CancelledError: 태스크가 취소됨 (FFmpeg 종료, 불완전한 출력 삭제 후 전달)
+    """
+    inputs = _as_inputs(input_file)
+    try:
+        encoder, info, output_file = await _prepare(inputs, output_file, quality, audio_mode, encoder_type, preset)
+        return await _run_encode(encoder, inputs, info, output_file, quality, audio_mode, overwrite,
+                                 progress.put if progress else None, log_callback)
+    finally:
+        if progress:
+            progress.close()
+
+
+async def batch(jobs: Sequence[Union[EncodeJob, str]], workers: int = 2, encoder_type: str = "libx265",
+                overwrite: bool = False, progress: Optional[ProgressStream] = None,
+                log_callback: Optional[Callable[[str], None]] = None) -> List[EncodeJob]:
+    """
+    여러 작업을 최대 workers개씩 동시에 인코딩하고 EncodeJob 리스트를 반환합니다.
+    (실패한 작업은 status='failed'와 failure로 표시되고 나머지는 계속 진행, 출력이 이미 있으면 건너뜀)
+
+    Args:
+        jobs: EncodeJob 또는 입력 경로 (작업에 encoder_type이 없으면 인자의 encoder_type 사용)
+        progress: 진행률을 받을 ProgressStream. 항목에 'job'(순번), 'name', 'status'가 추가되며
+                  작업 시작/종료 시에도 항목을 보냅니다 (모든 작업이 끝나면 닫힘).
+
+    Raises:
+        asyncio.CancelledError: batch 태스크가 취소됨 (실행 중인 모든 FFmpeg 종료)
+        OSError 등: 작업 실패로 처리할 수 없는 오류 (나머지 작업을 취소하고 끝날 때까지 기다린 뒤 전달)
+    """
+    jobs = [job if isinstance(job, EncodeJob) else EncodeJob(os.fspath(job)) for job in jobs]
+    limit = asyncio.Semaphore(max(1, workers))
+    loop = asyncio.get_running_loop()
+
+    def report(index: int, job: EncodeJob, data: Optional[Dict] = None):
+        if progress:
+            item = {'progress': 100 if job.status == 'done' else 0, 'speed': None, 'remaining': None}
+            item.update(data or {})
+            item.update(job=index, name=job.name, status=job.status)
+            progress.put(item)
+
+    async def run(index: int, job: EncodeJob):
+        async with limit:
+            job.status = 'running'
+            started = loop.time()
+            try:
+                encoder, info, job.output_file = await _prepare(
+                    job.inputs, job.output_file, job.quality, job.audio_mode, job.encoder_type or encoder_type, job.preset
+                )
+                if os.path.exists(job.output_file) and not overwrite:
+                    job.status = 'skipped'
+                    return
+                report(index, job)
+                job.attempts += 1
+                job.result = await _run_encode(
+                    encoder, job.inputs, info, job.output_file, job.quality, job.audio_mode, overwrite,
+                    lambda data: report(index, job, data), log_callback
+                )
+                job.status = 'done'
+            except EncodeFailed as e:
+                job.failure = e.failure
+                job.status = 'failed'
+            except asyncio.CancelledError:
+                job.failure = _failure('cancelled', job.output_file)
+                job.status = 'failed'
+                raise
+            finally:
+                job.elapsed = loop.time() - started
+                report(index, job)
+
+    tasks = [asyncio.ensure_future(run(index, job)) for index, job in enumerate(jobs)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # 한 작업의 예기치 않은 오류나 batch 취소: 나머지 작업의 FFmpeg도 종료되고 출력이 정리될 때까지 기다림
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if progress:
+            progress.close()
+    return jobs
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    import time
+
+    print("=== Async API Test ===")
+    paths = sys.argv[1:]
+    if not paths:
+        print("사용법: python async_api.py <동영상 파일>...")
+        sys.exit(0)
+
+    async def demo():
+        started = time.perf_counter()
+        infos = await asyncio.gather(*(probe(path) for path in paths * 50))
+        print(f"분석 {len(infos)}회: {time.perf_counter() - started:.2f}초 (동시 {PROBE_CONCURRENCY}개)")
+
+        stream = ProgressStream()
+        task = asyncio.create_task(batch(paths, workers=2, progress=stream))
+        async for data in stream:
+            print(f"  [{data['job']}] {data['name']} {data['status']} {data['progress']}%")
+        for job in await task:
+            print(f"{job.name}: {job.status} -> {job.result}")
+
+    asyncio.run(demo())
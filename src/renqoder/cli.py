@@ -0,0 +1,492 @@
+"""
+명령줄 일괄 인코딩 모듈
+GUI 모듈(CustomTkinter) 없이 파일 목록/글롭 패턴/검색 폴더로 인코딩 대기열을 만들어 실행하고,
+진행 상황과 결과를 JSON Lines(한 줄에 JSON 객체 하나)로 출력합니다. 헤드리스 서버나 cron에서 사용합니다.
+
+사용법:
+    python run_cli.py "D:/Videos/*.mp4" --workers 2
+    python run_cli.py --root /mnt/nas/recordings --ext ts,mkv --min-size 1GB --skip-codec hevc,av1
+    python run_cli.py --from-file list.txt --dry-run
+    python run_cli.py "D:/Videos/*.ts" --service        # 백그라운드 서비스에 보내고 진행 상황 출력
+    python run_cli.py --attach                           # 서비스에서 진행 중인 작업에 다시 연결
+
+출력 이벤트 (event 필드):
+    start, queued, job_start, progress, log, job_end, summary, error
+    (--service/--attach: submitted, attached, detached 추가)
+"""
+
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 모듈 경로 문제 해결 (run_cli.py에서 패키지로 불러와도 같은 폴더의 모듈을 찾도록)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from __init__ import __version__
+from hardware_detector import HardwareDetector, check_ffmpeg
+from encoder import VideoEncoder
+from encoder_probe import EncoderProbe, recommend_encoder
+from searcher import VideoSearcher
+from jobs import EncodeJob, find_multipart_groups, parse_multipart_name
+from scheduler import BatchQueue, RANKING_MODES, AUTO_WORKERS, parse_deadline
+from concurrency import AdaptiveConcurrency, run_adaptive
+from io_arbiter import IO_INTERACTIVE
+from encode_service import ServiceClient, ServiceError, job_spec
+
+
+# 메타데이터(ffprobe) 동시 실행 최대 수 (GUI의 1단계 빠른 스캔과 같은 자동 조절)
+METADATA_MAX_WORKERS = 8
+
+# 같은 작업의 진행률 이벤트 최소 간격(초)
+PROGRESS_INTERVAL = 1.0
+
+SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1       # 실패한 작업이 있음
+EXIT_USAGE = 2        # 입력/옵션 오류
+EXIT_SERVICE = 3      # 백그라운드 서비스에 연결할 수 없음
+EXIT_INTERRUPTED = 130
+
+
+def parse_size(text: str) -> int:
+    """'500MB', '1.5GB', '1048576' 같은 크기 문자열을 바이트로 변환합니다."""
+    value = str(text).strip().upper().replace(' ', '')
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if unit and value.endswith(unit):
+            return int(float(value[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(float(value))
+
+
+class JsonLinesWriter:
+    """이벤트를 한 줄짜리 JSON으로 출력합니다 (여러 작업자 스레드에서 호출 가능)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        record = {'event': event, 'time': round(time.time(), 3)}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+def job_fields(job: EncodeJob) -> Dict:
+    """이벤트에 공통으로 넣는 작업 식별 정보"""
+    return {'job': job.seq, 'name': job.name}
+
+
+def collect_paths(args, searcher: VideoSearcher, writer: JsonLinesWriter) -> List[str]:
+    """
+    위치 인자(파일/글롭/폴더), --from-file 목록, --root 검색 폴더에서 입력 경로를 모읍니다.
+    폴더는 검색 폴더로 취급하며, 같은 파일은 한 번만 넣습니다.
+    """
+    candidates = []
+    roots = list(args.root or [])
+
+    for pattern in args.inputs:
+        if os.path.isdir(pattern):
+            roots.append(pattern)
+        elif os.path.isfile(pattern):
+            candidates.append(pattern)
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                writer.emit('error', message=f"일치하는 파일이 없습니다: {pattern}")
+            candidates.extend(path for path in matches if os.path.isfile(path))
+
+    for list_file in args.from_file or []:
+        if list_file == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(list_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        candidates.extend(line.strip() for line in lines if line.strip() and not line.strip().startswith('#'))
+
+    filters = build_filters(args)
+    for root in roots:
+        results = searcher.search(root, filters)
+        writer.emit('log', message=f"검색 완료: {root} ({len(results)}개)")
+        candidates.extend(item['path'] for item in sorted(results, key=lambda item: item['path']))
+
+    seen = set()
+    paths = []
+    for path in candidates:
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            paths.append(os.path.abspath(path))
+    return paths
+
+
+def build_filters(args) -> Dict:
+    """검색 조건 (VideoSearcher.normalize_filters 형식)"""
+    return {
+        'extensions': [e.strip() for e in args.ext.split(',')] if args.ext else None,
+        'min_size': parse_size(args.min_size) if args.min_size else 0,
+        'modified_after': time.time() - args.modified_within * 86400 if args.modified_within else None
+    }
+
+
+def analyze(paths: List[str], searcher: VideoSearcher, args, writer: JsonLinesWriter) -> List[Dict]:
+    """
+    입력 파일의 메타데이터를 분석하고(GUI와 같은 캐시 공유) 인코딩 대상만 남깁니다.
+    제외한 파일은 이유와 함께 log 이벤트로 남깁니다.
+    """
+    filters = searcher.normalize_filters(build_filters(args))
+    items = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            writer.emit('error', path=path, message=f"파일에 접근할 수 없습니다: {e}")
+            continue
+        ext = os.path.splitext(path)[1].lower()
+        reason = None
+        if ext not in filters['extensions']:
+            reason = f"확장자 ({ext or '없음'})"
+        elif stat.st_size < filters['min_size']:
+            reason = f"최소 크기 미만 ({stat.st_size} bytes)"
+        elif filters['modified_after'] and stat.st_mtime < filters['modified_after']:
+            reason = "수정 날짜 조건 미충족"
+        if reason:
+            writer.emit('log', path=path, message=f"제외: {reason}")
+            continue
+        items.append({'name': os.path.basename(path), 'path': path, 'size': stat.st_size,
+                      'extension': ext, 'modified': stat.st_mtime, 'metadata_loaded': False})
+
+    def scan(item):
+        item.update(searcher.extract_metadata(item['path'], fast_only=True, io_priority=IO_INTERACTIVE))
+
+    controller = AdaptiveConcurrency("메타데이터", initial=1, maximum=METADATA_MAX_WORKERS,
+                                     log_callback=lambda message: writer.emit('log', message=message))
+    run_adaptive(items, scan, controller)
+
+    if not args.include_recording:
+        searcher.mark_recordings(items)
+
+    skip_codecs = [c.strip().lower() for c in args.skip_codec.split(',')] if args.skip_codec else []
+    selected = []
+    for item in items:
+        reason = None
+        if item.get('invalid') or not item.get('duration'):
+            reason = "분석할 수 없는 파일"
+        elif item.get('recording'):
+            reason = f"녹화 중 ({item.get('recording_reason')})"
+        elif any(codec in str(item.get('codec', '')).lower() for codec in skip_codecs):
+            reason = f"제외 코덱 ({item.get('codec')})"
+        if reason:
+            writer.emit('log', path=item['path'], message=f"제외: {reason}")
+        else:
+            selected.append(item)
+    return selected
+
+
+def choose_encoder(args, writer: JsonLinesWriter):
+    """사용할 인코더와 실패 시 대체 인코더 판단용 코덱 목록을 정합니다 (auto면 GPU 감지 + 실측 캐시)."""
+    detector = HardwareDetector()
+    detector.detect_gpu()
+    probe_results = EncoderProbe().load_cached()
+    if probe_results:
+        best = recommend_encoder(probe_results)
+        if best:
+            detector.set_recommended_encoder(best)
+    codecs = detector.get_available_codecs(probe_results)
+
+    encoder_type = detector.recommended_encoder if args.encoder == 'auto' else args.encoder
+    info = next((c for c in codecs if c['id'] == encoder_type), None)
+    if info is not None and not info['available']:
+        writer.emit('log', message=f"⚠️ {encoder_type} 인코더를 이 시스템에서 사용할 수 없을 수 있습니다.")
+    return encoder_type, codecs
+
+
+def build_jobs(items: List[Dict], queue: BatchQueue, encoder: VideoEncoder, args) -> List[EncodeJob]:
+    """분석된 항목으로 작업을 만들어 대기열에 넣습니다 (--concat이면 분할 녹화를 하나로)."""
+    quality = args.quality if args.quality is not None else encoder.get_quality_metadata()['default']
+    groups = find_multipart_groups(items) if args.concat else []
+    grouped = {item['path'] for group in groups for item in group}
+    units = [[item] for item in items if item['path'] not in grouped] + groups
+    units.sort(key=lambda unit: unit[0]['path'])
+
+    jobs = []
+    for unit in units:
+        job = EncodeJob([item['path'] for item in unit], quality=quality, audio_mode=args.audio)
+        if args.output_dir:
+            # 자동 생성된 파일명만 가져와 출력 폴더에 저장
+            parsed = parse_multipart_name(unit[0]['path']) if job.is_concat else None
+            parsed_base = parsed['base'] if parsed else None
+            name = Path(encoder.generate_output_filename(
+                unit[0]['path'], quality, args.audio, stem=parsed_base, audio_info=unit[0].get('audio_info')
+            )).name
+            job.output_file = str(Path(args.output_dir) / name)
+        queue.add(job, video_info=unit if job.is_concat else unit[0])
+        jobs.append(job)
+    return jobs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='renqoder-cli',
+        description="renQoder 명령줄 일괄 인코딩 (결과는 JSON Lines로 표준 출력에 기록)"
+    )
+    parser.add_argument('inputs', nargs='*', help="입력 파일, 글롭 패턴(**/*.ts 등) 또는 검색할 폴더")
+    parser.add_argument('--root', action='append', help="검색할 폴더 (여러 번 지정 가능)")
+    parser.add_argument('--from-file', action='append', help="입력 경로 목록 파일 (한 줄에 하나, '-'는 표준 입력)")
+    parser.add_argument('--ext', help="확장자 필터 (예: mp4,mkv,ts)")
+    parser.add_argument('--min-size', help="최소 크기 (예: 500MB, 1GB)")
+    parser.add_argument('--modified-within', type=float, help="최근 N일 안에 수정된 파일만")
+    parser.add_argument('--skip-codec', help="이 코덱인 파일은 제외 (예: hevc,av1)")
+    parser.add_argument('--include-recording', action='store_true', help="녹화 중인 파일도 포함")
+    parser.add_argument('--concat', action='store_true', help="분할 녹화(part1, part2...)를 하나로 이어 붙여 인코딩")
+    parser.add_argument('--encoder', default='auto', help="FFmpeg 인코더 (기본: auto - GPU 감지/실측 결과로 선택)")
+    parser.add_argument('--quality', type=int, help="화질 값 (기본: 인코더별 권장값)")
+    parser.add_argument('--audio', choices=('copy', 'aac'), default='copy', help="오디오 모드 (기본: copy)")
+    parser.add_argument('--output-dir', help="출력 폴더 (기본: 입력 파일과 같은 폴더)")
+    parser.add_argument('--workers', type=int, default=1, help="동시 작업 수 (0: 처리량을 보며 자동 조절)")
+    parser.add_argument('--order', choices=sorted(RANKING_MODES), default='fifo', help="작업 실행 순서")
+    parser.add_argument('--deadline', help="마감 시각 (예: 07:00) - 남은 시간에 맞춰 프리셋 조정")
+    parser.add_argument('--dry-run', action='store_true', help="대기열만 만들고 인코딩하지 않음")
+    parser.add_argument('--verbose', action='store_true', help="FFmpeg 로그도 log 이벤트로 출력")
+    parser.add_argument('--service', action='store_true',
+                        help="백그라운드 서비스에 작업을 보내고 진행 상황 출력 (이 명령을 중단해도 인코딩은 계속)")
+    parser.add_argument('--detach', action='store_true', help="--service로 작업만 보내고 바로 종료")
+    parser.add_argument('--attach', action='store_true', help="서비스에서 진행 중인 작업에 다시 연결 (입력 불필요)")
+    parser.add_argument('--since', type=int, help="--attach: 이 이벤트 순번 이후부터 다시 출력")
+    parser.add_argument('--version', action='version', version=f"renQoder {__version__}")
+    return parser
+
+
+def run(argv: Optional[List[str]] = None, stream=None) -> int:
+    """
+    명령줄 인자대로 일괄 인코딩을 실행하고 종료 코드를 반환합니다.
+
+    stream: 이벤트를 쓸 스트림 (기본: 표준 출력). 라이브러리 모듈의 print() 출력은 표준 오류로 보내
+            표준 출력에는 JSON 줄만 남깁니다.
+    """
+    args = build_parser().parse_args(argv)
+    writer = JsonLinesWriter(stream or sys.stdout)
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    # SIGTERM(kill, systemd 중지)도 Ctrl+C처럼 처리해 FFmpeg와 불완전한 출력을 남기지 않음
+    previous_sigterm = None
+    if threading.current_thread() is threading.main_thread():
+        previous_sigterm = signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        return _run(args, writer)
+    finally:
+        sys.stdout = stdout
+        if previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, previous_sigterm)
+
+
+def _raise_interrupt(signum, frame):
+    """종료 시그널을 KeyboardInterrupt로 바꿔 Ctrl+C와 같은 정리 경로를 타게 합니다."""
+    raise KeyboardInterrupt
+
+
+def _run(args, writer: JsonLinesWriter) -> int:
+    if args.attach:
+        return attach_service(args, writer)
+    if not (args.inputs or args.root or args.from_file):
+        writer.emit('error', message="입력 파일, 글롭 패턴, --root 또는 --from-file 중 하나가 필요합니다.")
+        return EXIT_USAGE
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if not args.dry_run and not check_ffmpeg():
+        writer.emit('error', message="FFmpeg를 찾을 수 없습니다.")
+        return EXIT_USAGE
+
+    searcher = VideoSearcher()
+    paths = collect_paths(args, searcher, writer)
+    items = analyze(paths, searcher, args, writer)
+
+    encoder_type, codecs = choose_encoder(args, writer)
+    encoder = VideoEncoder(encoder_type)
+    # --include-recording이면 녹화 중인 입력도 기다리지 않고 바로 실행
+    recording_detector = None if args.include_recording else searcher.recording_detector
+    queue = BatchQueue(encoder, mode=args.order, recording_detector=recording_detector)
+    queue.recovery.set_codecs(codecs)
+    if args.deadline:
+        try:
+            queue.set_deadline(parse_deadline(args.deadline))
+        except ValueError as e:
+            writer.emit('error', message=f"마감 시각 형식 오류: {e}")
+            return EXIT_USAGE
+
+    jobs = build_jobs(items, queue, encoder, args)
+    writer.emit('start', version=__version__, encoder=encoder_type, workers=args.workers,
+                order=args.order, jobs=len(jobs), dry_run=args.dry_run)
+    for job in queue.pending():
+        writer.emit('queued', inputs=job.inputs, output=job.output_file, quality=job.quality,
+                    preset=job.preset, estimate=job.estimate, **job_fields(job))
+    if args.dry_run or not jobs:
+        writer.emit('summary', done=0, failed=0, skipped=0, saved_bytes=0, elapsed=0.0)
+        return EXIT_OK
+    if args.service or args.detach:
+        return submit_to_service(queue.pending(), encoder_type, args, writer)
+
+    last_progress = {}
+
+    def on_progress(job, data):
+        now = time.time()
+        if isinstance(data, dict):
+            if now - last_progress.get(job.seq, 0) < PROGRESS_INTERVAL and data.get('progress', 0) < 100:
+                return
+            last_progress[job.seq] = now
+            writer.emit('progress', progress=data.get('progress', 0), speed=data.get('speed'),
+                        remaining=data.get('remaining'), **job_fields(job))
+
+    def on_job(job):
+        if job.status == 'running':
+            writer.emit('job_start', encoder=job.encoder_type or encoder_type, preset=job.preset, **job_fields(job))
+            return
+        failure = job.failure or {}
+        output_size = os.path.getsize(job.result) if job.result and os.path.exists(job.result) else None
+        writer.emit('job_end', status=job.status, output=job.result or job.output_file,
+                    elapsed=round(job.elapsed, 1), attempts=job.attempts,
+                    original_size=(job.estimate or {}).get('original'), output_size=output_size,
+                    failure={'kind': failure.get('kind'), 'label': failure.get('label')} if failure else None,
+                    **job_fields(job))
+
+    def on_log(message):
+        if args.verbose:
+            writer.emit('log', message=message)
+
+    queue.job_progress_callback = on_progress
+    workers = AUTO_WORKERS if args.workers <= 0 else args.workers
+    started = time.time()
+    processed = []
+    finished = threading.Event()
+
+    def run_queue():
+        try:
+            processed.extend(queue.run(None, on_log, on_job, workers=workers))
+        finally:
+            finished.set()
+
+    # Thread.join()이 인터럽트되면 스레드가 끝난 것으로 잘못 표시될 수 있어 완료 이벤트로 기다림
+    runner = threading.Thread(target=run_queue, daemon=True)
+    runner.start()
+
+    interrupted = False
+    try:
+        while not finished.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        # 새 작업을 시작하지 않고 작업자별 인코더의 FFmpeg까지 모두 중단 (SIGTERM은 FFmpeg에 전달되지 않음)
+        interrupted = True
+        queue.stop()
+        writer.emit('error', message="중단 요청: 실행 중인 작업을 취소하고 종료합니다.")
+        # 중단 직전에 시작된 작업은 실행 시 취소 플래그를 초기화하므로 끝날 때까지 반복해서 취소
+        while not finished.is_set():
+            queue.cancel_running()
+            finished.wait(0.5)
+
+    counts = {status: sum(1 for job in processed if job.status == status) for status in ('done', 'failed', 'skipped')}
+    saved = 0
+    for job in processed:
+        if job.status == 'done' and job.result and os.path.exists(job.result):
+            saved += max((job.estimate or {}).get('original', 0) - os.path.getsize(job.result), 0)
+    writer.emit('summary', done=counts['done'], failed=counts['failed'], skipped=counts['skipped'],
+                saved_bytes=saved, elapsed=round(time.time() - started, 1), interrupted=interrupted)
+
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if counts['failed'] else EXIT_OK
+
+
+def submit_to_service(jobs: List[EncodeJob], encoder_type: str, args, writer: JsonLinesWriter) -> int:
+    """작업을 백그라운드 서비스에 보냅니다 (서비스가 없으면 실행). --detach가 아니면 끝날 때까지 진행 상황 출력"""
+    specs = [dict(job_spec(job), encoder_type=job.encoder_type or encoder_type) for job in jobs]
+    try:
+        client = ServiceClient.connect(auto_start=True)
+        state = client.list_jobs()
+        ids = client.submit(specs)
+    except ServiceError as e:
+        writer.emit('error', message=str(e))
+        return EXIT_SERVICE
+
+    writer.emit('submitted', ids=ids, pid=client.info['pid'], since=state['last_seq'], instance=state['instance'])
+    if args.detach:
+        return EXIT_OK
+    return stream_service(client, state['last_seq'], state['instance'], set(ids), args, writer)
+
+
+def attach_service(args, writer: JsonLinesWriter) -> int:
+    """서비스에서 진행 중인 작업에 다시 연결해 대기열이 빌 때까지 진행 상황을 출력합니다."""
+    try:
+        client = ServiceClient.connect()
+        if client is None:
+            writer.emit('error', message="실행 중인 백그라운드 서비스가 없습니다.")
+            return EXIT_SERVICE
+        state = client.list_jobs()
+    except ServiceError as e:
+        writer.emit('error', message=str(e))
+        return EXIT_SERVICE
+
+    active = [job for job in state['jobs'] if job['status'] in ('pending', 'running')]
+    since = state['last_seq'] if args.since is None else args.since
+    writer.emit('attached', pid=client.info['pid'], since=since, instance=state['instance'],
+                paused=state['paused'], jobs=active)
+    if not active and args.since is None:
+        writer.emit('summary', done=0, failed=0, skipped=0, cancelled=0, elapsed=0.0)
+        return EXIT_OK
+    return stream_service(client, since, state['instance'], None, args, writer, idle_after=state['last_seq'])
+
+
+def stream_service(client: ServiceClient, since: int, instance: str, ids, args, writer: JsonLinesWriter,
+                   idle_after: int = 0) -> int:
+    """
+    서비스 이벤트를 그대로 출력합니다. ids가 있으면 그 작업이 모두 끝날 때까지, 없으면 대기열이 빌 때까지.
+    Ctrl+C는 연결만 끊고 인코딩은 서비스에서 계속됩니다 (--attach --since로 다시 연결).
+    """
+    counts = {'done': 0, 'failed': 0, 'skipped': 0, 'cancelled': 0, 'interrupted': 0}
+    started = time.time()
+    last_seq = since
+    try:
+        for record in client.watch(since, instance):
+            event = record.pop('event')
+            last_seq = record['seq']
+            if ids is not None and record.get('job') not in ids:
+                continue
+            if event == 'log' and not args.verbose:
+                continue
+            writer.emit(event, **record)
+            if event == 'job_end':
+                counts[record['status']] = counts.get(record['status'], 0) + 1
+                if ids is not None:
+                    ids.discard(record['job'])
+                    if not ids:
+                        break
+            elif event == 'idle' and ids is None and record['seq'] > idle_after:
+                break
+    except ServiceError as e:
+        writer.emit('error', message=str(e), since=last_seq)
+        return EXIT_SERVICE
+    except KeyboardInterrupt:
+        writer.emit('detached', since=last_seq, message="연결만 끊었습니다. 인코딩은 백그라운드 서비스에서 계속됩니다.")
+        return EXIT_INTERRUPTED
+
+    writer.emit('summary', elapsed=round(time.time() - started, 1), **counts)
+    return EXIT_FAILED if counts['failed'] or counts['interrupted'] else EXIT_OK
+
+
+def main():
+    sys.exit(run())
+
+
+if __name__ == "__main__":
+    main()
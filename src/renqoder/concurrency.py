@@ -0,0 +1,311 @@
+"""
+동시 실행 수 자동 조절 모듈
+ffprobe 메타데이터 추출과 대기열 인코딩의 동시 작업 수를 고정값 대신 실측 처리량/지연 시간으로 조절합니다.
+로컬 NVMe는 여러 개를 동시에 돌릴수록 빨라지지만, HDD나 SMB 공유 폴더는 동시 접근이 늘면
+오히려 느려지므로 처리량이 더 이상 늘지 않는 지점을 찾아 그 근처에 머뭅니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from task_executor import current_token, bind_token, TaskCancelled
+
+
+# 처리량이 이 비율 이상 늘어야 동시 작업을 늘린 효과가 있다고 판단
+IMPROVE_THRESHOLD = 0.05
+
+# 같은 동시 작업 수에서 측정했던 지연 시간의 이 배수를 넘으면 급증으로 판단
+# (동시 작업이 늘면 대기 때문에 지연이 느는 것은 당연하므로 같은 값끼리만 비교)
+LATENCY_TOLERANCE = 2.0
+
+# 지연 급증/오류 시 동시 작업 수에 곱할 배수 (AIMD의 Multiplicative Decrease)
+DECREASE_FACTOR = 0.75
+
+# 상한에 머문 채로 이 횟수만큼 측정 구간이 지나면 다시 한 단계 늘려 봄 (디스크/네트워크 상황 변화 대응)
+REPROBE_WINDOWS = 10
+
+
+class AdaptiveConcurrency:
+    """
+    동시 작업 수 조절기 (처리량 기울기 + AIMD)
+
+    측정 구간마다 처리량(초당 처리량)과 평균 지연 시간을 계산해 동시 작업 수를 정합니다.
+    - 늘린 직후 처리량이 IMPROVE_THRESHOLD 이상 늘지 않았으면 되돌리고 그 값을 상한으로 기억
+    - 한 단계 아래보다 처리량이 오히려 줄었으면 한 단계 감소
+    - 같은 동시 작업 수에서 지연 시간이 급증하거나(장치가 다른 부하로 느려짐) 오류가 나면
+      DECREASE_FACTOR 배로 감소
+    - 그 외에는 한 단계씩 증가 (Additive Increase)
+    """
+
+    def __init__(self, name: str, initial=1, minimum=1, maximum=8, window=2.0, min_samples=4,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            name: 로그에 표시할 이름 (예: "메타데이터", "인코딩")
+            window: 측정 구간 최소 길이(초)
+            min_samples: 측정 구간마다 필요한 최소 완료/진행 보고 수
+            log_callback: 조절 결정을 알릴 함수
+        """
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.window = window
+        self.min_samples = min_samples
+        self.log_callback = log_callback
+
+        self.condition = threading.Condition()
+        self.active = 0
+        self.history = {}           # 동시 작업 수 -> 처리량 (지수 이동 평균)
+        self.latency_history = {}   # 동시 작업 수 -> 지연 시간 (지수 이동 평균)
+        self.ceiling = None
+        self.last_action = None
+        self.steady_windows = 0
+        self.decisions = []
+        self._reset_window(time.perf_counter())
+
+    def _reset_window(self, now):
+        self.window_start = now
+        self.window_work = 0.0
+        self.window_samples = 0
+        self.window_latencies = []
+        self.window_failures = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """동시 작업 자리를 얻습니다 (timeout 안에 못 얻거나 현재 작업이 취소되면 False)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        token = current_token()
+        with self.condition:
+            while self.active >= self.limit:
+                if token is not None and token.cancelled:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.active += 1
+            return True
+
+    def release(self, latency: Optional[float] = None, work=1.0, ok=True):
+        """
+        작업 하나가 끝났음을 알립니다.
+
+        Args:
+            latency: 작업에 걸린 시간(초) (없으면 지연 시간 판단에서 제외)
+            work: 처리량에 더할 작업량 (메타데이터: 파일 1개, 인코딩: 0 - 진행 중 add_work()로 보고)
+            ok: 실패한 작업이면 False
+        """
+        with self.condition:
+            self.active -= 1
+            self.window_samples += 1
+            self.window_work += work
+            if latency is not None:
+                self.window_latencies.append(latency)
+            if not ok:
+                self.window_failures += 1
+            self._maybe_evaluate()
+            self.condition.notify_all()
+
+    def add_work(self, work: float):
+        """진행 중인 작업의 처리량을 보고합니다 (예: 인코딩된 영상 길이(초))."""
+        with self.condition:
+            self.window_work += work
+            self.window_samples += 1
+            self._maybe_evaluate()
+            self.condition.notify_all()
+
+    def wake(self):
+        """자리를 기다리는 스레드를 깨웁니다 (작업 취소 시)."""
+        with self.condition:
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        Usage:
+            with controller.slot():
+                extract(path)
+        """
+        if not self.acquire():
+            raise TaskCancelled()
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(time.perf_counter() - start, ok=ok)
+
+    def _maybe_evaluate(self):
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed < self.window or self.window_samples < self.min_samples:
+            return
+
+        throughput = self.window_work / elapsed
+        latency = sum(self.window_latencies) / len(self.window_latencies) if self.window_latencies else None
+        failures = self.window_failures
+        self._reset_window(now)
+
+        old = self.limit
+        baseline = self.latency_history.get(old)
+        latency_spike = latency is not None and baseline and latency > baseline * LATENCY_TOLERANCE
+        if latency is not None:
+            self.latency_history[old] = latency if baseline is None else (baseline + latency) / 2
+
+        previous = self.history.get(old)
+        self.history[old] = throughput if previous is None else (previous + throughput) / 2
+        current = self.history[old]
+        lower = self.history.get(old - 1)
+        gain = (current - lower) / lower if lower else None
+
+        new, reason = old, None
+        if (failures or latency_spike) and old > self.minimum:
+            new = max(self.minimum, int(old * DECREASE_FACTOR))
+            if new == old:
+                new = old - 1
+            reason = f"오류 {failures}건" if failures else f"지연 급증 ({latency:.2f}초, 평소 {baseline:.2f}초)"
+            self.ceiling = old
+        elif self.last_action == 'increase' and gain is not None and gain < IMPROVE_THRESHOLD:
+            new = old - 1
+            reason = f"처리량 개선 없음 ({gain * 100:+.0f}%)"
+            self.ceiling = old
+        elif gain is not None and gain < -IMPROVE_THRESHOLD and old > self.minimum:
+            new = old - 1
+            reason = f"처리량 감소 ({gain * 100:+.0f}%)"
+            self.ceiling = old
+        elif old < self.maximum and (self.ceiling is None or old + 1 < self.ceiling):
+            new = old + 1
+            reason = "처리량 개선" if gain is not None else "측정을 위해 증가"
+        else:
+            self.steady_windows += 1
+            if self.steady_windows >= REPROBE_WINDOWS:
+                # 상황이 바뀌었을 수 있으므로 상한을 잊고 다시 탐색
+                self.ceiling = None
+                self.steady_windows = 0
+
+        if new == old:
+            self.last_action = None
+            return
+
+        self.steady_windows = 0
+        self.last_action = 'increase' if new > old else 'decrease'
+        self.limit = new
+        decision = {
+            'time': time.time(), 'from': old, 'to': new, 'reason': reason,
+            'throughput': throughput, 'latency': latency
+        }
+        self.decisions.append(decision)
+        self._log(decision)
+
+    def _log(self, decision: Dict):
+        latency_text = f", 지연 {decision['latency']:.2f}초" if decision['latency'] is not None else ""
+        message = (
+            f"[{self.name}] 동시 작업 {decision['from']} → {decision['to']}: {decision['reason']} "
+            f"(처리량 {decision['throughput']:.2f}/초{latency_text})"
+        )
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+
+def run_adaptive(items, func: Callable, controller: AdaptiveConcurrency,
+                 should_stop: Optional[Callable[[], bool]] = None, on_done: Optional[Callable] = None):
+    """
+    items를 순서대로 func에 넘겨 처리하되, 동시에 실행하는 수는 controller가 정합니다.
+
+    Args:
+        items: 리스트, 또는 pop_next()로 다음 항목(없으면 None)을 내주는 대기열 (예: MetadataQueue)
+        func: 항목 하나를 처리하는 함수 (예외는 실패로 기록)
+        should_stop: True를 반환하면 새 항목을 꺼내지 않음
+        on_done: 항목 하나가 끝날 때마다 (완료 수, 항목) 전달
+
+    현재 작업(TaskExecutor)이 취소되면 새 항목을 꺼내지 않고, 실행 중인 항목의 프로세스도 종료된 뒤 반환합니다.
+    """
+    lock = threading.Lock()
+    state = {'done': 0, 'exhausted': False}
+    token = current_token()
+
+    def stopped():
+        return (token is not None and token.cancelled) or (should_stop is not None and should_stop())
+
+    if hasattr(items, 'pop_next'):
+        take = items.pop_next
+    else:
+        iterator = iter(items)
+        take = lambda: next(iterator, None)
+
+    def worker():
+        with bind_token(token):
+            work()
+
+    def work():
+        while True:
+            # 자리를 먼저 얻은 뒤 항목을 꺼내야 순서(우선순위)가 유지됨
+            if not controller.acquire(timeout=0.5):
+                with lock:
+                    if state['exhausted'] or stopped():
+                        return
+                continue
+
+            with lock:
+                item = None
+                if not state['exhausted'] and not stopped():
+                    item = take()
+                    state['exhausted'] = item is None
+            if item is None:
+                controller.release(work=0)
+                return
+
+            start = time.perf_counter()
+            ok = True
+            try:
+                func(item)
+            except TaskCancelled:
+                # 취소로 끊긴 작업은 처리량/오류 측정에서 제외
+                controller.release(work=0)
+                return
+            except Exception as e:
+                ok = False
+                print(f"작업 처리 오류: {e}")
+            controller.release(time.perf_counter() - start, ok=ok)
+
+            with lock:
+                state['done'] += 1
+                done = state['done']
+            if on_done:
+                on_done(done, item)
+
+    if token is not None:
+        token.add_callback(controller.wake)
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(controller.maximum)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if token is not None:
+        token.remove_callback(controller.wake)
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Adaptive Concurrency Test ===")
+
+    # 동시 3개까지는 빨라지고 그 이상은 경합으로 느려지는 가상 장치
+    active = [0]
+    active_lock = threading.Lock()
+
+    def fake_probe(_):
+        with active_lock:
+            active[0] += 1
+            n = active[0]
+        time.sleep(0.02 * max(1, n / 3) ** 2 * (n if n > 3 else 1))
+        with active_lock:
+            active[0] -= 1
+
+    controller = AdaptiveConcurrency("테스트", initial=1, maximum=8, window=0.3, min_samples=4)
+    run_adaptive(list(range(400)), fake_probe, controller)
+    print(f"최종 동시 작업 수: {controller.limit}")
@@ -0,0 +1,230 @@
+"""
+CPU 토폴로지 및 스레드 배분 모듈
+물리 코어/SMT 형제/NUMA 노드 구성을 읽어 동시에 실행되는 인코딩 작업에 코어를 나눠 줍니다.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+SYSFS_CPU = Path("/sys/devices/system/cpu")
+SYSFS_NODE = Path("/sys/devices/system/node")
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """sysfs의 CPU 목록 문자열("0-3,8-11")을 정수 리스트로 변환합니다."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def read_cpu_topology() -> Dict:
+    """
+    CPU 토폴로지를 읽습니다.
+
+    Returns:
+        {
+            'logical': 사용 가능한 논리 CPU 수,
+            'cores': [[논리 CPU, SMT 형제, ...], ...] (물리 코어 단위),
+            'nodes': {NUMA 노드: [물리 코어 인덱스, ...]}
+        }
+        sysfs가 없는 환경(Windows 등)에서는 논리 CPU 하나를 코어 하나로 간주합니다.
+    """
+    # 현재 프로세스가 사용할 수 있는 CPU (컨테이너/affinity 제한 반영)
+    if hasattr(os, 'sched_getaffinity'):
+        usable = sorted(os.sched_getaffinity(0))
+    else:
+        usable = list(range(os.cpu_count() or 1))
+
+    cores = {}
+    if (SYSFS_CPU / "cpu0" / "topology").exists():
+        for cpu in usable:
+            topology = SYSFS_CPU / f"cpu{cpu}" / "topology"
+            try:
+                package = int((topology / "physical_package_id").read_text())
+                core_id = int((topology / "core_id").read_text())
+            except (OSError, ValueError):
+                package, core_id = 0, cpu
+            cores.setdefault((package, core_id), []).append(cpu)
+
+    if not cores:
+        cores = {(0, cpu): [cpu] for cpu in usable}
+
+    core_list = [sorted(siblings) for _, siblings in sorted(cores.items(), key=lambda kv: min(kv[1]))]
+
+    # NUMA 노드별 물리 코어 인덱스
+    cpu_to_node = {}
+    if SYSFS_NODE.exists():
+        for node_dir in SYSFS_NODE.glob("node[0-9]*"):
+            try:
+                node = int(node_dir.name[4:])
+                for cpu in parse_cpu_list((node_dir / "cpulist").read_text()):
+                    cpu_to_node[cpu] = node
+            except (OSError, ValueError):
+                continue
+
+    nodes = {}
+    for index, siblings in enumerate(core_list):
+        nodes.setdefault(cpu_to_node.get(siblings[0], 0), []).append(index)
+
+    return {'logical': len(usable), 'cores': core_list, 'nodes': nodes}
+
+
+class ThreadPlanner:
+    """
+    동시에 실행되는 작업들에 물리 코어를 나눠 주는 스레드 배분기
+
+    각 작업은 가능한 한 하나의 NUMA 노드 안에서 연속된 물리 코어(및 SMT 형제)를 받으며,
+    받은 논리 CPU 수에 맞춰 FFmpeg/인코더 스레드 옵션과 CPU affinity가 정해집니다.
+    """
+
+    def __init__(self, topology: Optional[Dict] = None):
+        self.topology = topology or read_cpu_topology()
+
+    def allocate(self, job_count: int) -> List[Dict]:
+        """
+        물리 코어를 job_count개의 작업에 나눕니다.
+
+        Returns:
+            [{'cpus': [논리 CPU, ...], 'threads': 논리 CPU 수, 'node': NUMA 노드, 'node_count': 전체 노드 수}, ...]
+            (작업이 하나면 모든 CPU를 사용하며 node는 None)
+        """
+        job_count = max(1, job_count)
+        cores = self.topology['cores']
+        nodes = self.topology['nodes']
+        node_ids = sorted(nodes)
+
+        if job_count == 1:
+            cpus = sorted(cpu for siblings in cores for cpu in siblings)
+            return [{'cpus': cpus, 'threads': len(cpus), 'node': None, 'node_count': len(node_ids)}]
+
+        # 노드별 코어 수에 비례해 작업 수를 배정 (각 노드 최소 1개, 코어 수보다 많이 배정하지 않음)
+        if job_count >= len(node_ids):
+            share = {node: max(1, round(job_count * len(nodes[node]) / len(cores))) for node in node_ids}
+            while sum(share.values()) > job_count:
+                largest = max(share, key=lambda n: share[n])
+                share[largest] -= 1
+            while sum(share.values()) < job_count:
+                roomiest = max(share, key=lambda n: len(nodes[n]) / share[n])
+                share[roomiest] += 1
+        else:
+            # 작업이 노드보다 적으면 큰 노드부터 하나씩
+            ordered = sorted(node_ids, key=lambda n: -len(nodes[n]))
+            share = {node: (1 if node in ordered[:job_count] else 0) for node in node_ids}
+
+        allocations = []
+        for node in node_ids:
+            jobs_here = share[node]
+            if jobs_here <= 0:
+                continue
+            node_cores = nodes[node]
+            for j in range(jobs_here):
+                # 코어가 작업보다 적으면 코어를 공유 (라운드 로빈)
+                if len(node_cores) >= jobs_here:
+                    start = j * len(node_cores) // jobs_here
+                    end = (j + 1) * len(node_cores) // jobs_here
+                    assigned = node_cores[start:end]
+                else:
+                    assigned = [node_cores[j % len(node_cores)]]
+                cpus = sorted(cpu for core in assigned for cpu in cores[core])
+                allocations.append({
+                    'cpus': cpus,
+                    'threads': len(cpus),
+                    'node': node,
+                    'node_count': len(node_ids)
+                })
+        return allocations
+
+
+def get_thread_args(encoder_type: str, allocation: Optional[Dict]) -> Dict[str, List[str]]:
+    """
+    배분된 CPU 수에 맞는 FFmpeg 스레드 옵션을 생성합니다.
+
+    Returns:
+        {'input': '-i' 앞 옵션 (디코더/필터 스레드), 'output': 인코더 옵션}
+    """
+    if not allocation:
+        return {'input': [], 'output': []}
+
+    threads = max(1, allocation['threads'])
+    etype = encoder_type.lower()
+    input_args = ['-threads', str(threads), '-filter_threads', str(max(1, threads // 2))]
+    output_args = []
+
+    if 'libx265' in etype:
+        # x265 스레드 풀은 NUMA 노드별 개수로 지정 ('-'는 해당 노드 사용 안 함, '*'는 모든 노드)
+        node = allocation.get('node')
+        if node is None:
+            pools = '*'
+        else:
+            nodes = ['-'] * max(allocation.get('node_count', 1), node + 1)
+            nodes[node] = str(threads)
+            pools = ','.join(nodes)
+        frame_threads = min(max(1, threads // 4), 6)
+        output_args = ['-x265-params', f"pools={pools}:frame-threads={frame_threads}"]
+    elif 'libsvtav1' in etype:
+        output_args = ['-svtav1-params', f"lp={threads}"]
+    elif etype.startswith('lib') or 'mpeg4' in etype:
+        output_args = ['-threads', str(threads)]
+    # 하드웨어 인코더는 인코딩 자체에 CPU 스레드를 쓰지 않으므로 디코더 스레드만 제한
+
+    return {'input': input_args, 'output': output_args}
+
+
+def get_affinity_command_prefix(cpus: Optional[List[int]]) -> List[str]:
+    """
+    자식 프로세스가 시작될 때부터 지정한 CPU에서만 실행되도록 명령어 앞에 붙일 인자 (Linux: taskset)
+    taskset이 없거나 다른 플랫폼이면 빈 리스트를 반환하며, 시작 후 apply_affinity로 적용합니다.
+    (Popen의 preexec_fn은 작업자 스레드가 있는 프로세스에서 자식이 교착될 수 있어 사용하지 않음)
+    """
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return []
+    taskset = shutil.which('taskset')
+    if not taskset:
+        return []
+    return [taskset, '-c', ','.join(str(cpu) for cpu in sorted(set(cpus)))]
+
+
+def apply_affinity(process, cpus: Optional[List[int]]) -> bool:
+    """실행 중인 프로세스에 CPU affinity를 적용합니다 (Windows: SetProcessAffinityMask)."""
+    if not cpus or process is None:
+        return False
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            mask = 0
+            for cpu in cpus:
+                if cpu < 64:
+                    mask |= 1 << cpu
+            return bool(ctypes.windll.kernel32.SetProcessAffinityMask(int(process._handle), ctypes.c_size_t(mask)))
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(process.pid, set(cpus))
+            return True
+    except Exception as e:
+        print(f"CPU affinity 설정 실패: {e}")
+    return False
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== CPU Topology Test ===")
+
+    topology = read_cpu_topology()
+    print(f"논리 CPU: {topology['logical']}, 물리 코어: {len(topology['cores'])}, NUMA 노드: {sorted(topology['nodes'])}")
+
+    planner = ThreadPlanner(topology)
+    for jobs in (1, 2, 4):
+        print(f"\n동시 작업 {jobs}개:")
+        for allocation in planner.allocate(jobs):
+            args = get_thread_args('libx265', allocation)
+            print(f"  CPU {allocation['cpus']} -> {args['input'] + args['output']}")
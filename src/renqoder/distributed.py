@@ -0,0 +1,656 @@
+"""
+분산 인코딩 모듈 (코디네이터/작업자)
+같은 공유 저장소(NAS)를 보는 여러 PC가 인코딩 작업을 나눠 처리합니다. 코디네이터는 작은 HTTP API로
+작업 목록을 관리하고, 각 PC의 작업자는 작업을 임대(lease)받아 VideoEncoder로 인코딩하면서 진행률과
+생존 신호(heartbeat)를 보냅니다. 생존 신호가 끊겨 임대가 만료되면 작업은 다른 작업자에게 다시 배정됩니다.
+
+HTTP API (JSON, 코디네이터에 토큰이 있으면 'Authorization: Bearer <토큰>' 헤더 필요)
+    GET  /jobs                   작업 목록
+    POST /jobs                   {'jobs': [{'inputs', 'quality', 'audio_mode', 'encoder_type', 'output_file'}]}
+                                 (output_file을 생략하면 작업자가 입력을 분석해 정함)
+    POST /jobs/<id>/cancel       작업 취소
+    POST /lease                  {'worker', 'encoders'} -> 작업 하나 (없으면 204)
+    POST /jobs/<id>/heartbeat    {'lease', 'progress', 'speed', 'remaining'} -> {'cancel'} (임대를 잃었으면 409)
+    POST /jobs/<id>/complete     {'lease', 'status', 'error', 'elapsed'}
+    GET  /workers                작업자별 마지막 신호
+
+코디네이터는 기본으로 이 PC(127.0.0.1)에서만 접속을 받습니다. 다른 PC의 작업자를 받으려면
+--host 0.0.0.0과 함께 --token을 지정해야 합니다 (토큰 없이 외부에 열 수 없음).
+
+사용법 (한 PC에서 시험할 때는 같은 코디네이터에 작업자를 여러 개 실행):
+    python src/renqoder/distributed.py coordinator --host 0.0.0.0 --port 8765 --token secret
+    python src/renqoder/distributed.py worker http://nas-pc:8765 --token secret --path-map /mnt/nas=Z:/
+    python src/renqoder/distributed.py submit http://nas-pc:8765 --token secret "/mnt/nas/rec/*.ts" --quality 24
+    python src/renqoder/distributed.py status http://nas-pc:8765 --token secret
+"""
+
+import argparse
+import glob
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# 모듈 경로 문제 해결 (패키지로 불러와도 같은 폴더의 모듈을 찾도록)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from __init__ import __version__
+from encoder import VideoEncoder
+from encoder_probe import EncoderProbe, recommend_encoder
+from hardware_detector import HardwareDetector
+from jobs import EncodeJob, parse_multipart_name
+from watchdog import RecoveryPolicy
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+LEASE_SECONDS = 30.0        # 생존 신호 없이 임대가 유지되는 시간(초)
+HEARTBEAT_SECONDS = 5.0     # 작업자의 생존 신호 간격(초)
+POLL_SECONDS = 3.0          # 받을 작업이 없을 때 작업자가 다시 묻는 간격(초)
+MAX_LEASES = 3              # 임대가 이 횟수만큼 만료되면 (작업자가 계속 죽으면) 실패 처리
+REQUEST_TIMEOUT = 10.0
+
+# 끝난 작업 상태
+FINISHED_STATUSES = ('done', 'failed', 'skipped', 'cancelled')
+
+
+class CoordinatorError(Exception):
+    """코디네이터에 연결할 수 없거나 요청이 거부됨"""
+
+
+def partial_path(output_file: str, lease: str) -> str:
+    """인코딩 중에 쓰는 임시 출력 경로 (임대마다 달라서, 만료된 작업자가 새 작업자의 출력을 덮어쓰지 않음)"""
+    path = Path(output_file)
+    return str(path.with_name(f"{path.stem}.partial-{lease[:8]}{path.suffix}"))
+
+
+def is_loopback(host: str) -> bool:
+    """이 PC에서만 접속할 수 있는 주소인지 (localhost, 127.0.0.0/8, ::1)"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_path_map(entries: Optional[List[str]]) -> List[Tuple[str, str]]:
+    """'코디네이터 경로=이 PC 경로' 목록 (예: /mnt/nas=Z:/) - 긴 접두사부터 적용"""
+    pairs = []
+    for entry in entries or []:
+        source, sep, target = entry.partition('=')
+        if not sep:
+            raise ValueError(f"경로 매핑 형식 오류: {entry} (예: /mnt/nas=Z:/)")
+        pairs.append((source, target))
+    return sorted(pairs, key=lambda pair: len(pair[0]), reverse=True)
+
+
+class Coordinator:
+    """
+    작업 목록과 임대 관리 (HTTP 요청 스레드와 만료 확인 스레드에서 호출)
+
+    작업은 dict로 보관합니다: status는 pending -> leased -> done/failed/cancelled,
+    임대가 만료되면 다시 pending (MAX_LEASES회 만료되면 failed).
+    """
+
+    def __init__(self, token: Optional[str] = None, lease_seconds: float = LEASE_SECONDS, max_leases: int = MAX_LEASES):
+        self.token = token
+        self.lease_seconds = lease_seconds
+        self.max_leases = max_leases
+        self.lock = threading.Lock()
+        self.jobs = {}          # 작업 번호 -> 작업 정보
+        self.workers = {}       # 작업자 이름 -> {'seen', 'job', 'encoders'}
+        self.next_id = 1
+        self.stopped = threading.Event()
+
+    def submit(self, specs: List[Dict]) -> List[int]:
+        ids = []
+        for spec in specs:
+            inputs = [spec['inputs']] if isinstance(spec['inputs'], str) else list(spec['inputs'])
+            quality = spec.get('quality', 23)
+            audio_mode = spec.get('audio_mode', 'copy')
+            encoder_type = spec.get('encoder_type')
+            # 지정하지 않으면 작업자가 정함 (이름에 넣을 오디오 정보는 파일에 접근할 수 있는 작업자가 분석)
+            output_file = spec.get('output_file')
+
+            job = {
+                'id': 0, 'name': EncodeJob(inputs).name, 'inputs': inputs, 'quality': quality,
+                'audio_mode': audio_mode, 'encoder_type': encoder_type, 'preset': spec.get('preset'),
+                'output_file': output_file, 'status': 'pending', 'worker': None, 'lease': None,
+                'expires': None, 'leases': 0, 'cancel': False, 'progress': 0, 'speed': None,
+                'remaining': None, 'error': None, 'elapsed': 0.0, 'submitted': time.time()
+            }
+            if output_file and os.path.exists(output_file):
+                job['status'] = 'skipped'
+            with self.lock:
+                job['id'] = self.next_id
+                self.next_id += 1
+                self.jobs[job['id']] = job
+            ids.append(job['id'])
+            print(f"작업 추가 [{job['id']}] {job['name']}{' (출력 있음, 건너뜀)' if job['status'] == 'skipped' else ''}")
+        return ids
+
+    def _touch(self, worker: str, job_id: Optional[int] = None, encoders: Optional[List[str]] = None):
+        entry = self.workers.setdefault(worker, {'seen': 0.0, 'job': None, 'encoders': []})
+        entry['seen'] = time.time()
+        entry['job'] = job_id
+        if encoders is not None:
+            entry['encoders'] = list(encoders)
+
+    def lease(self, worker: str, encoders: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        대기 중인 작업 하나를 worker에게 임대합니다 (없으면 None).
+        작업에 인코더가 지정되어 있으면 그 인코더를 쓸 수 있는 작업자에게만 배정합니다.
+        """
+        now = time.time()
+        with self.lock:
+            self._touch(worker, None, encoders)
+            for job_id in sorted(self.jobs):
+                job = self.jobs[job_id]
+                if job['status'] != 'pending':
+                    continue
+                if job['encoder_type'] and encoders and job['encoder_type'] not in encoders:
+                    continue
+                job.update(status='leased', worker=worker, lease=secrets.token_hex(8), expires=now + self.lease_seconds,
+                           progress=0, speed=None, remaining=None, started=now)
+                job['leases'] += 1
+                self._touch(worker, job_id)
+                print(f"임대 [{job_id}] {job['name']} -> {worker} ({job['leases']}회째)")
+                return dict(job, lease_seconds=self.lease_seconds)
+        return None
+
+    def _leased(self, job_id: int, lease: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job is None or job['status'] != 'leased' or not secrets.compare_digest(str(job['lease']), str(lease)):
+            return None
+        return job
+
+    def heartbeat(self, job_id: int, lease: str, progress=None, speed=None, remaining=None) -> Optional[Dict]:
+        """임대를 연장하고 진행률을 기록합니다. 임대를 잃었으면(만료 후 재배정 등) None"""
+        with self.lock:
+            job = self._leased(job_id, lease)
+            if job is None:
+                return None
+            job['expires'] = time.time() + self.lease_seconds
+            if progress is not None:
+                job.update(progress=progress, speed=speed, remaining=remaining)
+            self._touch(job['worker'], job_id)
+            return {'cancel': job['cancel']}
+
+    def complete(self, job_id: int, lease: str, status: str, error: Optional[str] = None, elapsed: float = 0.0) -> bool:
+        if status not in FINISHED_STATUSES:
+            raise ValueError(f"알 수 없는 상태: {status}")
+        with self.lock:
+            job = self._leased(job_id, lease)
+            if job is None:
+                return False
+            job.update(status=status, error=error, elapsed=round(elapsed, 1), lease=None, expires=None,
+                       finished=time.time())
+            if status == 'done':
+                job['progress'] = 100
+            self._touch(job['worker'])
+        print(f"작업 {status} [{job_id}] {job['name']} ({job['worker']}, {elapsed:.0f}초){f' - {error}' if error else ''}")
+        return True
+
+    def cancel(self, job_id: int) -> bool:
+        """대기 중이면 바로 취소하고, 임대 중이면 다음 생존 신호 응답으로 작업자에게 중단을 요청합니다."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return False
+            if job['status'] == 'pending':
+                job['status'] = 'cancelled'
+            else:
+                job['cancel'] = True
+            return True
+
+    def reap(self) -> List[int]:
+        """임대가 만료된 작업을 다시 대기 상태로 (작업자가 죽었거나 연결이 끊김)"""
+        now = time.time()
+        expired = []
+        with self.lock:
+            for job in self.jobs.values():
+                if job['status'] != 'leased' or job['expires'] > now:
+                    continue
+                expired.append(job['id'])
+                job.update(lease=None, expires=None)
+                if job['cancel']:
+                    job['status'] = 'cancelled'
+                elif job['leases'] >= self.max_leases:
+                    job.update(status='failed', error=f"작업자 응답 없음 (임대 {job['leases']}회 만료)")
+                else:
+                    job['status'] = 'pending'
+                print(f"임대 만료 [{job['id']}] {job['name']} ({job['worker']}) -> {job['status']}")
+        return expired
+
+    def snapshot(self) -> List[Dict]:
+        with self.lock:
+            # 임대 토큰은 작업자만 알아야 하므로 목록에서는 제외
+            return [{key: value for key, value in job.items() if key != 'lease'} for _, job in sorted(self.jobs.items())]
+
+    def worker_report(self) -> Dict[str, Dict]:
+        now = time.time()
+        with self.lock:
+            return {name: dict(entry, idle=round(now - entry['seen'], 1)) for name, entry in self.workers.items()}
+
+    def _reap_loop(self):
+        interval = max(0.5, min(5.0, self.lease_seconds / 3))
+        while not self.stopped.wait(interval):
+            self.reap()
+
+    def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+        """
+        HTTP 서버를 만들고 임대 만료 확인을 시작합니다 (요청 처리는 serve_forever()를 호출해야 시작).
+        토큰 없이 이 PC 밖에서 접속할 수 있는 주소로 열려고 하면 ValueError
+        """
+        if not self.token and not is_loopback(host):
+            raise ValueError(f"토큰 없이 {host}에서 접속을 받을 수 없습니다. --token을 지정하세요.")
+        server = ThreadingHTTPServer((host, port), CoordinatorHandler)
+        server.daemon_threads = True
+        server.coordinator = self
+        threading.Thread(target=self._reap_loop, daemon=True).start()
+        print(f"코디네이터 실행: http://{host}:{server.server_address[1]} (임대 {self.lease_seconds:.0f}초)")
+        return server
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """HTTP API를 실행합니다 (Ctrl+C까지 반환하지 않음)."""
+        server = self.start(host, port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            server.server_close()
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """코디네이터 HTTP API"""
+
+    server_version = f"renQoder/{__version__}"
+
+    def log_message(self, format, *args):
+        # 생존 신호가 자주 오므로 요청마다 출력하지 않음
+        pass
+
+    def _send(self, status: int, body=None):
+        data = b'' if body is None else json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        token = self.server.coordinator.token
+        if not token:
+            return True
+        return secrets.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}")
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+
+    def _route(self) -> List[str]:
+        return [part for part in urlparse(self.path).path.split('/') if part]
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, {'error': "인증 실패"})
+        coordinator = self.server.coordinator
+        route = self._route()
+        if route == ['jobs']:
+            return self._send(200, {'jobs': coordinator.snapshot()})
+        if route == ['workers']:
+            return self._send(200, {'workers': coordinator.worker_report()})
+        self._send(404, {'error': "없는 경로"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return self._send(401, {'error': "인증 실패"})
+        coordinator = self.server.coordinator
+        route = self._route()
+        try:
+            body = self._read_json()
+            if route == ['jobs']:
+                return self._send(200, {'ids': coordinator.submit(body.get('jobs', []))})
+            if route == ['lease']:
+                job = coordinator.lease(body['worker'], body.get('encoders'))
+                return self._send(200, job) if job else self._send(204)
+            if len(route) == 3 and route[0] == 'jobs':
+                job_id = int(route[1])
+                if route[2] == 'heartbeat':
+                    reply = coordinator.heartbeat(job_id, body.get('lease'), body.get('progress'),
+                                                  body.get('speed'), body.get('remaining'))
+                    return self._send(200, reply) if reply else self._send(409, {'error': "임대를 잃었습니다."})
+                if route[2] == 'complete':
+                    accepted = coordinator.complete(job_id, body.get('lease'), body.get('status'),
+                                                    body.get('error'), body.get('elapsed', 0.0))
+                    return self._send(200, {'ok': True}) if accepted else self._send(409, {'error': "임대를 잃었습니다."})
+                if route[2] == 'cancel':
+                    if coordinator.cancel(job_id):
+                        return self._send(200, {'ok': True})
+                    return self._send(409, {'error': "취소할 수 없는 작업입니다."})
+        except (KeyError, ValueError) as e:
+            return self._send(400, {'error': str(e)})
+        self._send(404, {'error': "없는 경로"})
+
+
+class CoordinatorClient:
+    """코디네이터 HTTP API 클라이언트 (작업자, submit/status 명령에서 사용)"""
+
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = REQUEST_TIMEOUT):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, Optional[Dict]]:
+        data = None if body is None else json.dumps(body, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = response.read()
+                return response.status, json.loads(payload) if payload else None
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return e.code, None
+            raise CoordinatorError(f"HTTP {e.code}: {e.read().decode('utf-8', 'replace')}")
+        except (OSError, ValueError) as e:
+            raise CoordinatorError(f"코디네이터에 연결할 수 없습니다: {e}")
+
+    def submit(self, specs: List[Dict]) -> List[int]:
+        return self._request('POST', '/jobs', {'jobs': specs})[1]['ids']
+
+    def jobs(self) -> List[Dict]:
+        return self._request('GET', '/jobs')[1]['jobs']
+
+    def workers(self) -> Dict[str, Dict]:
+        return self._request('GET', '/workers')[1]['workers']
+
+    def cancel(self, job_id: int) -> bool:
+        return self._request('POST', f"/jobs/{job_id}/cancel", {})[0] == 200
+
+    def lease(self, worker: str, encoders: List[str]) -> Optional[Dict]:
+        return self._request('POST', '/lease', {'worker': worker, 'encoders': encoders})[1]
+
+    def heartbeat(self, job_id: int, lease: str, **progress) -> Optional[Dict]:
+        """임대를 잃었으면 None"""
+        return self._request('POST', f"/jobs/{job_id}/heartbeat", dict(progress, lease=lease))[1]
+
+    def complete(self, job_id: int, lease: str, status: str, error: Optional[str] = None, elapsed: float = 0.0) -> bool:
+        body = {'lease': lease, 'status': status, 'error': error, 'elapsed': elapsed}
+        return self._request('POST', f"/jobs/{job_id}/complete", body)[0] == 200
+
+
+class RemoteWorker:
+    """
+    코디네이터에서 작업을 받아 인코딩하는 작업자 (한 번에 한 작업)
+
+    인코딩은 임시 파일(partial_path)에 하고, 성공하면 임대를 다시 확인한 뒤 최종 출력 이름으로 바꾸고 완료를 보고합니다.
+    생존 신호가 거부되면(임대 만료 후 다른 작업자에게 재배정) 인코딩을 중단하고 결과를 버립니다.
+    """
+
+    def __init__(self, client: CoordinatorClient, name: Optional[str] = None, encoder_type: Optional[str] = None,
+                 path_map: Optional[List[Tuple[str, str]]] = None, heartbeat_interval: float = HEARTBEAT_SECONDS,
+                 poll_interval: float = POLL_SECONDS):
+        self.client = client
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.path_map = path_map or []
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+
+        # 이 PC에서 쓸 수 있는 인코더 (GPU 감지 + 실측 캐시), 실패 시 대체 인코더 정책
+        detector = HardwareDetector()
+        detector.detect_gpu()
+        probe_results = EncoderProbe().load_cached()
+        if probe_results:
+            best = recommend_encoder(probe_results)
+            if best:
+                detector.set_recommended_encoder(best)
+        codecs = detector.get_available_codecs(probe_results)
+        self.encoders = [codec['id'] for codec in codecs if codec.get('available')]
+        self.encoder = VideoEncoder(encoder_type or detector.recommended_encoder)
+        if self.encoder.encoder_type not in self.encoders:
+            self.encoders.append(self.encoder.encoder_type)
+        self.recovery = RecoveryPolicy(codecs)
+
+    def local_path(self, path: str) -> str:
+        """코디네이터 기준 경로를 이 PC의 공유 저장소 경로로 바꿉니다."""
+        for source, target in self.path_map:
+            if path.startswith(source):
+                return target + path[len(source):]
+        return path
+
+    def output_name(self, job: Dict, inputs: List[str]) -> str:
+        """출력 경로를 지정하지 않은 작업의 출력 이름 (이 작업자가 쓸 인코더 기준)"""
+        parsed = parse_multipart_name(inputs[0]) if len(inputs) > 1 else None
+        return VideoEncoder(job['encoder_type'] or self.encoder.encoder_type).generate_output_filename(
+            inputs[0], job['quality'], job['audio_mode'], stem=parsed['base'] if parsed else None
+        )
+
+    def stop(self):
+        """현재 작업이 끝나면 멈춥니다."""
+        self.stopped.set()
+
+    def run(self, max_jobs: Optional[int] = None) -> int:
+        """stop() 또는 max_jobs개를 처리할 때까지 작업을 받아 실행하고 처리한 작업 수를 반환합니다."""
+        print(f"작업자 {self.name} 시작 (기본 인코더 {self.encoder.encoder_type}, 사용 가능: {', '.join(self.encoders)})")
+        processed = 0
+        while not self.stopped.is_set() and (max_jobs is None or processed < max_jobs):
+            try:
+                job = self.client.lease(self.name, self.encoders)
+            except CoordinatorError as e:
+                print(f"작업 요청 실패: {e}")
+                job = None
+            if job is None:
+                self.stopped.wait(self.poll_interval)
+                continue
+            self.process(job)
+            processed += 1
+        return processed
+
+    def process(self, job: Dict):
+        inputs = [self.local_path(path) for path in job['inputs']]
+        try:
+            output_file = self.local_path(job['output_file']) if job['output_file'] else self.output_name(job, inputs)
+        except Exception as e:
+            print(f"[{job['id']}] 출력 이름을 정할 수 없습니다: {e}")
+            self._report(job, 'failed', f"출력 이름 오류: {e}")
+            return
+        if os.path.exists(output_file):
+            print(f"[{job['id']}] 출력 파일이 이미 있어 건너뜁니다: {output_file}")
+            self._report(job, 'skipped')
+            return
+
+        temp_file = partial_path(output_file, job['lease'])
+        encode_job = EncodeJob(
+            inputs, job['quality'], job['audio_mode'],
+            output_file=temp_file, encoder_type=job['encoder_type'], preset=job['preset']
+        )
+        state = {'progress': 0, 'speed': None, 'remaining': None}
+        finished = threading.Event()
+        lost = threading.Event()
+        cancelled = threading.Event()
+
+        def on_progress(data):
+            if isinstance(data, dict):
+                state.update(progress=data.get('progress', 0), speed=data.get('speed'), remaining=data.get('remaining'))
+
+        def on_log(message):
+            if 'frame=' not in message:
+                print(f"[{job['id']}] {message}")
+
+        def heartbeat():
+            interval = min(self.heartbeat_interval, job.get('lease_seconds', LEASE_SECONDS) / 3)
+            while not finished.wait(interval):
+                try:
+                    reply = self.client.heartbeat(job['id'], job['lease'], **state)
+                except CoordinatorError as e:
+                    # 일시적인 연결 오류: 임대가 만료되기 전에 다시 시도
+                    print(f"[{job['id']}] 생존 신호 실패: {e}")
+                    continue
+                if reply is None or reply.get('cancel'):
+                    (lost if reply is None else cancelled).set()
+                    encode_job.cancel()
+                    return
+
+        print(f"[{job['id']}] 인코딩 시작: {job['name']} ({job['encoder_type'] or self.encoder.encoder_type})")
+        threading.Thread(target=heartbeat, daemon=True).start()
+        started = time.time()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+            result = encode_job.run(self.encoder, on_progress, on_log, recovery=self.recovery)
+            finished.set()
+            if result and not lost.is_set() and not cancelled.is_set():
+                # 생존 신호 사이에 임대가 만료되어 재배정되었을 수 있으므로 이름을 바꾸기 직전에 다시 확인
+                # (확인하면 임대가 연장되어, 바꾸는 동안 다른 작업자에게 넘어가지 않음)
+                reply = self._confirm_lease(job, state)
+                if reply is None:
+                    lost.set()
+                elif reply.get('cancel'):
+                    cancelled.set()
+                else:
+                    os.replace(temp_file, output_file)
+        except Exception as e:
+            on_log(f"❌ 오류: {e}")
+            result = None
+        finally:
+            finished.set()
+        elapsed = time.time() - started
+
+        if not result or lost.is_set() or cancelled.is_set():
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+        if lost.is_set():
+            print(f"[{job['id']}] 임대를 잃어 결과를 버렸습니다 (다른 작업자에게 재배정됨).")
+            return
+
+        if cancelled.is_set():
+            status, error = 'cancelled', None
+        elif result:
+            status, error = 'done', None
+        else:
+            status, error = 'failed', (encode_job.failure or {}).get('label', "인코딩 실패")
+        self._report(job, status, error, elapsed)
+
+    def _confirm_lease(self, job: Dict, state: Dict) -> Optional[Dict]:
+        """임대가 아직 이 작업자에게 있는지 확인하고 연장합니다 (잃었거나 확인할 수 없으면 None)."""
+        try:
+            return self.client.heartbeat(job['id'], job['lease'], **state)
+        except CoordinatorError as e:
+            # 확인할 수 없으면 임대가 만료되어 재배정될 수 있으므로 출력을 쓰지 않음
+            print(f"[{job['id']}] 임대 확인 실패: {e}")
+            return None
+
+    def _report(self, job: Dict, status: str, error: Optional[str] = None, elapsed: float = 0.0):
+        try:
+            if not self.client.complete(job['id'], job['lease'], status, error, elapsed):
+                print(f"[{job['id']}] 완료 보고가 거부되었습니다 (임대 만료).")
+        except CoordinatorError as e:
+            # 보고하지 못하면 임대가 만료되어 다른 작업자가 다시 인코딩 (출력이 이미 있으면 건너뜀)
+            print(f"[{job['id']}] 완료 보고 실패: {e}")
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        paths.extend(matches or [pattern])
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="renQoder 분산 인코딩 (코디네이터/작업자)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinator_parser = commands.add_parser('coordinator', help="작업 목록을 관리하는 HTTP API 실행")
+    coordinator_parser.add_argument('--host', default=DEFAULT_HOST,
+                                    help="접속을 받을 주소 (기본: 127.0.0.1, 다른 PC에서 접속하려면 0.0.0.0과 --token)")
+    coordinator_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    coordinator_parser.add_argument('--lease', type=float, default=LEASE_SECONDS, help="임대 유지 시간(초)")
+
+    worker_parser = commands.add_parser('worker', help="코디네이터에서 작업을 받아 인코딩")
+    worker_parser.add_argument('url', help="코디네이터 주소 (예: http://nas-pc:8765)")
+    worker_parser.add_argument('--name', help="작업자 이름 (기본: 호스트명-PID)")
+    worker_parser.add_argument('--encoder', help="기본 인코더 (기본: GPU 감지/실측 결과)")
+    worker_parser.add_argument('--path-map', action='append', help="코디네이터 경로=이 PC 경로 (예: /mnt/nas=Z:/)")
+    worker_parser.add_argument('--max-jobs', type=int, help="이 수만큼 처리하고 종료")
+
+    submit_parser = commands.add_parser('submit', help="작업 추가 (경로는 코디네이터 기준 공유 저장소 경로)")
+    submit_parser.add_argument('url')
+    submit_parser.add_argument('inputs', nargs='+', help="입력 파일 또는 글롭 패턴")
+    submit_parser.add_argument('--encoder', help="인코더 (기본: 각 작업자의 기본 인코더)")
+    submit_parser.add_argument('--quality', type=int, default=23)
+    submit_parser.add_argument('--audio', choices=('copy', 'aac'), default='copy')
+    submit_parser.add_argument('--output-dir', help="출력 폴더 (기본: 입력 파일과 같은 폴더)")
+
+    status_parser = commands.add_parser('status', help="작업/작업자 목록")
+    status_parser.add_argument('url')
+
+    cancel_parser = commands.add_parser('cancel', help="작업 취소")
+    cancel_parser.add_argument('url')
+    cancel_parser.add_argument('id', type=int)
+
+    for sub in (coordinator_parser, worker_parser, submit_parser, status_parser, cancel_parser):
+        sub.add_argument('--token', default=os.environ.get('RENQODER_CLUSTER_TOKEN'),
+                         help="공유 토큰 (기본: 환경 변수 RENQODER_CLUSTER_TOKEN)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'coordinator':
+        if not args.token and not is_loopback(args.host):
+            coordinator_parser.error(f"토큰 없이 {args.host}에서 접속을 받을 수 없습니다. --token을 지정하세요.")
+        Coordinator(args.token, lease_seconds=args.lease).serve(args.host, args.port)
+        return
+
+    client = CoordinatorClient(args.url, args.token)
+    try:
+        if args.command == 'worker':
+            worker = RemoteWorker(client, args.name, args.encoder, parse_path_map(args.path_map))
+            try:
+                worker.run(args.max_jobs)
+            except KeyboardInterrupt:
+                # 실행 중인 FFmpeg는 같은 프로세스 그룹으로 전달된 인터럽트로 종료되고, 임대는 만료 후 재배정됨
+                print("작업자 종료")
+        elif args.command == 'submit':
+            specs = []
+            for path in expand_inputs(args.inputs):
+                spec = {'inputs': [path], 'quality': args.quality, 'audio_mode': args.audio, 'encoder_type': args.encoder}
+                if args.output_dir:
+                    name = Path(VideoEncoder(args.encoder or 'libx265').generate_output_filename(
+                        path, args.quality, args.audio)).name
+                    spec['output_file'] = str(Path(args.output_dir) / name)
+                specs.append(spec)
+            print(f"작업 {len(client.submit(specs))}개 추가")
+        elif args.command == 'status':
+            for job in client.jobs():
+                progress = f"{job['progress']:>3.0f}%" if job['status'] == 'leased' else "    "
+                print(f"  [{job['id']}] {job['status']:<10} {progress} {job['name']}  {job['worker'] or ''}")
+            for name, entry in client.workers().items():
+                print(f"  작업자 {name}: 마지막 신호 {entry['idle']}초 전, 작업 {entry['job'] or '-'}")
+        elif args.command == 'cancel':
+            print("취소 요청" if client.cancel(args.id) else "취소할 수 없는 작업입니다.")
+    except CoordinatorError as e:
+        print(f"오류: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
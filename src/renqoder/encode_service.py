@@ -0,0 +1,653 @@
+"""
+백그라운드 인코딩 서비스 모듈
+인코딩 대기열과 FFmpeg 프로세스를 GUI와 분리된 백그라운드 프로세스가 맡아, 창을 닫거나 GUI가 비정상
+종료되어도 긴 배치 작업이 계속됩니다. GUI와 명령줄(run_cli.py --service)은 로컬 소켓(127.0.0.1)으로
+작업을 보내고 진행 상황을 받아 보는 클라이언트이며, 다시 실행하면 진행 중인 작업에 다시 연결합니다.
+서비스가 종료되거나 비정상 종료되면 끝나지 않은 작업은 다음 실행 시 처음부터 다시 인코딩합니다.
+
+프로토콜: 한 줄에 JSON 하나 (요청마다 서비스 정보 파일의 'token' 필요)
+    hello                       -> 버전/PID/인스턴스 ID
+    submit  {'jobs': [...]}     -> 작업 번호 목록
+    list                        -> 작업 목록, 마지막 이벤트 순번
+    cancel  {'id': n}           -> 대기 작업 제거 또는 실행 중인 작업 중단
+    pause / resume              -> 모든 인코딩 일시정지/재개
+    watch   {'since': n}        -> n 이후의 이벤트를 연결이 끊길 때까지 계속 전송
+    shutdown                    -> 실행 중인 작업을 멈추고 종료 (다음 실행 시 이어서 처리)
+
+사용법:
+    python src/renqoder/encode_service.py serve     # 보통은 클라이언트가 필요할 때 자동으로 실행
+    python src/renqoder/encode_service.py status
+    python src/renqoder/encode_service.py cancel 3
+"""
+
+import argparse
+import json
+import os
+import secrets
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+# 모듈 경로 문제 해결 (패키지로 불러와도 같은 폴더의 모듈을 찾도록)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from __init__ import __version__
+from app_logger import AppLogger, CATEGORY_QUEUE, is_progress_line
+from encoder import VideoEncoder
+from encoder_probe import EncoderProbe, recommend_encoder
+from hardware_detector import HardwareDetector
+from jobs import EncodeJob
+from recording_detector import RecordingDetector
+from scheduler import BatchQueue
+
+
+# 실행 중인 서비스의 접속 정보 (포트, 인증 토큰, PID)
+SERVICE_FILE = Path.home() / '.renqoder_service.json'
+# 작업 목록 (서비스를 다시 실행하면 끝나지 않은 작업부터 이어서 처리)
+STATE_FILE = Path.home() / '.renqoder_service_jobs.json'
+# 서비스 로그 (GUI 로그 파일과 분리)
+SERVICE_LOG_DIR = Path.home() / '.renqoder_logs' / 'service'
+
+SERVICE_HOST = '127.0.0.1'
+EVENT_BUFFER_SIZE = 5000        # 다시 연결한 클라이언트에게 보내 줄 수 있는 최근 이벤트 수
+FINISHED_JOBS_KEPT = 200        # 목록에 남겨 둘 끝난 작업 수
+CONNECT_TIMEOUT = 5.0
+START_TIMEOUT = 15.0            # 서비스 자동 실행 후 접속될 때까지 기다리는 시간(초)
+WATCH_HEARTBEAT = 5.0           # 이벤트가 없을 때 연결 확인용 빈 이벤트 간격(초)
+PROGRESS_INTERVAL = 1.0         # 같은 작업의 진행률 이벤트 최소 간격(초)
+DEFER_SECONDS = 5.0             # 녹화 중인 입력만 남았을 때 다시 확인하는 간격(초)
+
+# 끝난 작업 상태 (cancelled/interrupted는 서비스만 쓰는 상태)
+FINISHED_STATUSES = ('done', 'failed', 'skipped', 'cancelled')
+
+# Windows: 콘솔 없이 GUI/명령 창과 분리된 프로세스로 실행 (DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP)
+DETACHED_CREATIONFLAGS = 0x00000008 | 0x00000200
+
+
+class ServiceError(Exception):
+    """서비스가 요청을 거부했거나 서비스에 연결할 수 없음"""
+
+
+def describe_job(job_id: int, job: EncodeJob, status: Optional[str] = None) -> Dict:
+    """작업 정보 (응답/이벤트/상태 파일 공통 형식)"""
+    failure = job.failure or {}
+    return {
+        'job': job_id,
+        'name': job.name,
+        'inputs': job.inputs,
+        'quality': job.quality,
+        'audio_mode': job.audio_mode,
+        'output_file': job.output_file,
+        'encoder_type': job.encoder_type,
+        'preset': job.preset,
+        'status': status or job.status,
+        'result': job.result,
+        'elapsed': round(job.elapsed, 1),
+        'attempts': job.attempts,
+        'estimate': job.estimate,
+        'failure': {'kind': failure.get('kind'), 'label': failure.get('label')} if failure else None
+    }
+
+
+def job_spec(job: EncodeJob) -> Dict:
+    """submit 요청에 넣을 작업 내용"""
+    return {
+        'inputs': job.inputs, 'quality': job.quality, 'audio_mode': job.audio_mode,
+        'output_file': job.output_file, 'encoder_type': job.encoder_type, 'preset': job.preset
+    }
+
+
+class EncodeService:
+    """
+    백그라운드 인코딩 서비스 (대기열 + 이벤트 기록 + 작업 목록 저장)
+
+    작업 실행은 GUI와 같은 BatchQueue가 맡고, 서비스는 작업 번호를 붙이고 이벤트를 순번과 함께
+    기록해 두었다가 watch 요청에 보내 줍니다.
+    """
+
+    def __init__(self, workers: int = 1, state_file: Path = STATE_FILE):
+        self.state_file = Path(state_file)
+        self.instance = secrets.token_hex(8)
+        self.token = secrets.token_hex(16)
+        self.app_log = AppLogger(SERVICE_LOG_DIR)
+        self.workers = workers
+
+        self.encoder = VideoEncoder('libx265')
+        self.queue = BatchQueue(self.encoder, recording_detector=RecordingDetector())
+        self.queue.job_progress_callback = self._on_progress
+
+        self.lock = threading.Lock()
+        self.jobs = {}              # 작업 번호 -> EncodeJob
+        self.job_ids = {}           # EncodeJob -> 작업 번호
+        self.next_id = 1
+        self.cancelled = set()      # 사용자가 취소한 작업 번호
+        self.interrupted = set()    # 서비스 종료로 중단된 작업 번호 (다음 실행 시 다시 처리)
+        self.runner = None
+        self.stopping = False
+        self.last_progress = {}
+
+        self.event_cond = threading.Condition()
+        self.events = deque(maxlen=EVENT_BUFFER_SIZE)
+        self.event_seq = 0
+
+    # --- 이벤트 ---
+
+    def publish(self, event: str, **fields):
+        with self.event_cond:
+            self.event_seq += 1
+            record = {'seq': self.event_seq, 'event': event, 'time': round(time.time(), 3)}
+            record.update(fields)
+            self.events.append(record)
+            self.event_cond.notify_all()
+
+    def events_since(self, seq: int, timeout: float) -> List[Dict]:
+        """seq 이후의 이벤트 (없으면 timeout초 동안 새 이벤트를 기다림)"""
+        with self.event_cond:
+            if self.event_seq <= seq:
+                self.event_cond.wait(timeout)
+            return [record for record in self.events if record['seq'] > seq]
+
+    def log(self, message: str):
+        self.app_log.log(message, category=CATEGORY_QUEUE)
+
+    # --- 작업 ---
+
+    def start(self):
+        """저장된 작업을 불러오고, 사용할 인코더를 감지한 뒤 남은 작업을 실행합니다."""
+        self.load_state()
+        threading.Thread(target=self._detect_hardware, daemon=True).start()
+
+    def _detect_hardware(self):
+        detector = HardwareDetector()
+        detector.detect_gpu()
+        probe_results = EncoderProbe().load_cached()
+        if probe_results:
+            best = recommend_encoder(probe_results)
+            if best:
+                detector.set_recommended_encoder(best)
+        # 작업에 인코더가 지정되지 않았을 때의 기본 인코더 + 실패 시 대체 인코더 판단용 코덱 목록
+        self.encoder.encoder_type = detector.recommended_encoder
+        self.queue.recovery.set_codecs(detector.get_available_codecs(probe_results))
+        self.log(f"서비스 시작 (PID {os.getpid()}, 기본 인코더 {detector.recommended_encoder})")
+        self.kick()
+
+    def submit(self, specs: List[Dict]) -> List[int]:
+        ids = []
+        for spec in specs:
+            job = EncodeJob(
+                spec['inputs'], spec.get('quality', 23), spec.get('audio_mode', 'copy'),
+                output_file=spec.get('output_file'), encoder_type=spec.get('encoder_type'), preset=spec.get('preset')
+            )
+            self.queue.add(job, spec.get('video_info'))
+            ids.append(self._register(job))
+            self.publish('queued', **describe_job(self.job_ids[job], job))
+            self.log(f"작업 추가: {job.name}")
+        self.save_state()
+        self.kick()
+        return ids
+
+    def _register(self, job: EncodeJob, job_id: Optional[int] = None) -> int:
+        with self.lock:
+            if job_id is None:
+                job_id = self.next_id
+            self.next_id = max(self.next_id, job_id + 1)
+            self.jobs[job_id] = job
+            self.job_ids[job] = job_id
+            return job_id
+
+    def kick(self):
+        """대기 작업이 있고 실행 중이 아니면 대기열 실행을 시작합니다."""
+        with self.lock:
+            if self.runner is not None or self.stopping:
+                return
+            self.runner = threading.Thread(target=self._run_queue, daemon=True)
+            self.runner.start()
+
+    def _run_queue(self):
+        while True:
+            processed = self.queue.run(None, self._on_log, self._on_job, workers=self.workers)
+            with self.lock:
+                # 실행이 끝나는 사이에 추가된 작업이 있으면 이어서 실행 (kick()과 같은 잠금 안에서 확인)
+                if self.stopping or not self.queue.pending():
+                    self.runner = None
+                    break
+            if not processed:
+                # 녹화 중인 입력만 남음: 녹화가 끝날 때까지 주기적으로 다시 확인
+                time.sleep(DEFER_SECONDS)
+        self.save_state()
+        if not self.stopping:
+            self.publish('idle', **self.counts())
+
+    def _on_job(self, job: EncodeJob):
+        job_id = self.job_ids.get(job)
+        if job.status == 'running':
+            self.publish('job_start', encoder=job.encoder_type or self.encoder.encoder_type,
+                         **describe_job(job_id, job))
+        else:
+            status = self._status(job_id, job)
+            self.publish('job_end', **describe_job(job_id, job, status))
+            self.log(f"작업 {status}: {job.name}")
+            self.last_progress.pop(job_id, None)
+        self.save_state()
+
+    def _on_progress(self, job: EncodeJob, data):
+        if not isinstance(data, dict):
+            return
+        job_id = self.job_ids.get(job)
+        now = time.time()
+        if now - self.last_progress.get(job_id, 0) < PROGRESS_INTERVAL and data.get('progress', 0) < 100:
+            return
+        self.last_progress[job_id] = now
+        self.publish('progress', job=job_id, name=job.name, progress=data.get('progress', 0),
+                     speed=data.get('speed'), remaining=data.get('remaining'))
+
+    def _on_log(self, message: str):
+        self.log(message)
+        if not is_progress_line(message):
+            self.publish('log', message=message)
+
+    def _status(self, job_id: int, job: EncodeJob) -> str:
+        if job_id in self.interrupted:
+            return 'interrupted'
+        if job_id in self.cancelled and job.status in ('pending', 'failed'):
+            return 'cancelled'
+        return job.status
+
+    def cancel(self, job_id: int) -> bool:
+        """대기 중이면 대기열에서 빼고, 실행 중이면 FFmpeg를 중단합니다."""
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return False
+        self.cancelled.add(job_id)
+        self.queue.remove(job)
+        if job.status == 'running':
+            job.cancel()
+        else:
+            job.status = 'cancelled'
+            self.publish('job_end', **describe_job(job_id, job))
+        self.log(f"작업 취소: {job.name}")
+        self.save_state()
+        return True
+
+    def stop(self):
+        """새 작업을 시작하지 않고 실행 중인 작업을 중단합니다 (중단된 작업은 다음 실행 시 다시 처리)."""
+        with self.lock:
+            self.stopping = True
+            running = [(job_id, job) for job_id, job in self.jobs.items() if job.status == 'running']
+        self.queue.stop()
+        for job_id, job in running:
+            self.interrupted.add(job_id)
+            job.cancel()
+        self.save_state()
+        self.log("서비스 종료")
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            jobs = list(self.jobs.items())
+        counts = {}
+        for job_id, job in jobs:
+            status = self._status(job_id, job)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def snapshot(self) -> List[Dict]:
+        with self.lock:
+            jobs = sorted(self.jobs.items())
+        return [describe_job(job_id, job, self._status(job_id, job)) for job_id, job in jobs]
+
+    # --- 작업 목록 저장/복원 ---
+
+    def save_state(self):
+        records = self.snapshot()
+        finished = [record for record in records if record['status'] in FINISHED_STATUSES]
+        active = [record for record in records if record['status'] not in FINISHED_STATUSES]
+        data = {'next_id': self.next_id, 'jobs': finished[-FINISHED_JOBS_KEPT:] + active}
+        try:
+            temp_file = self.state_file.with_suffix('.tmp')
+            temp_file.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            self.log(f"작업 목록 저장 실패: {e}")
+
+    def load_state(self):
+        """저장된 작업 목록을 불러옵니다. 실행 중에 끊긴 작업은 불완전한 출력을 지우고 다시 대기열에 넣습니다."""
+        try:
+            if not self.state_file.exists():
+                return
+            data = json.loads(self.state_file.read_text(encoding='utf-8'))
+        except Exception as e:
+            self.log(f"작업 목록을 불러올 수 없습니다: {e}")
+            return
+
+        resumed = 0
+        for record in sorted(data.get('jobs', []), key=lambda record: record['job']):
+            job = EncodeJob(record['inputs'], record['quality'], record['audio_mode'],
+                            output_file=record['output_file'], encoder_type=record['encoder_type'],
+                            preset=record['preset'])
+            if record['status'] in FINISHED_STATUSES:
+                job.status = record['status']
+                job.result = record.get('result')
+                job.elapsed = record.get('elapsed', 0.0)
+                job.attempts = record.get('attempts', 0)
+                job.estimate = record.get('estimate')
+                self._register(job, record['job'])
+                continue
+
+            if record['status'] in ('running', 'interrupted') and record['output_file']:
+                # 대기열은 출력이 이미 있으면 건너뛰므로, 끊긴 인코딩이 남긴 불완전한 출력은 지움
+                try:
+                    os.remove(record['output_file'])
+                except OSError:
+                    pass
+            self.queue.add(job)
+            self._register(job, record['job'])
+            resumed += 1
+
+        self.next_id = max(self.next_id, data.get('next_id', 1))
+        if resumed:
+            self.log(f"이전 작업 {resumed}개를 이어서 처리합니다.")
+
+    # --- 요청 처리 ---
+
+    def handle(self, op: str, request: Dict) -> Dict:
+        if op == 'hello':
+            return {'ok': True, 'version': __version__, 'pid': os.getpid(), 'instance': self.instance}
+        if op == 'submit':
+            return {'ok': True, 'ids': self.submit(request.get('jobs', []))}
+        if op == 'list':
+            with self.event_cond:
+                last_seq = self.event_seq
+            return {'ok': True, 'jobs': self.snapshot(), 'last_seq': last_seq, 'instance': self.instance,
+                    'paused': self.encoder.governor.paused}
+        if op == 'cancel':
+            if not self.cancel(int(request.get('id', 0))):
+                return {'ok': False, 'error': "취소할 수 없는 작업입니다 (없거나 이미 끝남)."}
+            return {'ok': True}
+        if op == 'pause':
+            self.encoder.governor.pause()
+            self.publish('paused')
+            return {'ok': True}
+        if op == 'resume':
+            self.encoder.governor.resume()
+            self.publish('resumed')
+            return {'ok': True}
+        if op == 'shutdown':
+            self.stop()
+            return {'ok': True}
+        return {'ok': False, 'error': f"알 수 없는 요청: {op}"}
+
+    def serve(self, port: int = 0):
+        """로컬 소켓으로 요청을 받습니다 (shutdown 요청이 올 때까지 반환하지 않음)."""
+        server = ServiceServer((SERVICE_HOST, port), ServiceRequestHandler)
+        server.service = self
+        self.start()
+        write_service_info({
+            'port': server.server_address[1], 'token': self.token, 'pid': os.getpid(),
+            'instance': self.instance, 'version': __version__
+        })
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            info = read_service_info()
+            if info and info.get('instance') == self.instance:
+                try:
+                    SERVICE_FILE.unlink()
+                except OSError:
+                    pass
+
+
+class ServiceServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+class ServiceRequestHandler(socketserver.StreamRequestHandler):
+    """연결 하나에서 한 줄씩 요청을 읽어 처리합니다 (watch는 연결이 끊길 때까지 이벤트 전송)."""
+
+    def send(self, message: Dict):
+        self.wfile.write((json.dumps(message, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        service = self.server.service
+        for raw in self.rfile:
+            try:
+                request = json.loads(raw.decode('utf-8'))
+            except ValueError:
+                self.send({'ok': False, 'error': "잘못된 요청 형식"})
+                continue
+            if not secrets.compare_digest(str(request.get('token', '')), service.token):
+                self.send({'ok': False, 'error': "인증 실패"})
+                return
+
+            op = request.get('op')
+            if op == 'watch':
+                self.watch(service, request)
+                return
+            try:
+                response = service.handle(op, request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.send(response)
+            if op == 'shutdown':
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+    def watch(self, service: EncodeService, request: Dict):
+        since = int(request.get('since') or 0)
+        if request.get('instance') not in (None, service.instance):
+            # 서비스가 다시 시작되어 이벤트 순번이 새로 시작됨
+            since = 0
+        self.send({'ok': True, 'instance': service.instance})
+        try:
+            while not service.stopping:
+                records = service.events_since(since, WATCH_HEARTBEAT)
+                for record in records:
+                    self.send(record)
+                    since = record['seq']
+                if not records:
+                    self.send({'event': 'heartbeat', 'seq': since})
+        except OSError:
+            pass
+
+
+# --- 클라이언트 ---
+
+def read_service_info() -> Optional[Dict]:
+    try:
+        return json.loads(SERVICE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def write_service_info(info: Dict):
+    SERVICE_FILE.write_text(json.dumps(info), encoding='utf-8')
+    if os.name != 'nt':
+        # 인증 토큰이 들어 있으므로 본인만 읽을 수 있게
+        os.chmod(SERVICE_FILE, 0o600)
+
+
+def start_service_process():
+    """서비스를 GUI/터미널과 분리된 백그라운드 프로세스로 실행합니다."""
+    if getattr(sys, 'frozen', False):
+        cmd = [sys.executable, '--service']
+    else:
+        cmd = [sys.executable, str(Path(__file__).resolve()), 'serve']
+    kwargs = {'stdin': subprocess.DEVNULL, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL,
+              'close_fds': True}
+    if os.name == 'nt':
+        kwargs['creationflags'] = DETACHED_CREATIONFLAGS
+    else:
+        # 새 세션: 터미널을 닫거나 GUI가 종료되어도 SIGHUP을 받지 않음
+        kwargs['start_new_session'] = True
+    subprocess.Popen(cmd, **kwargs)
+
+
+class ServiceClient:
+    """
+    서비스 클라이언트 (요청마다 새 연결)
+
+    Usage:
+        client = ServiceClient.connect(auto_start=True)
+        state = client.list_jobs()
+        ids = client.submit([job_spec(job)])
+        for event in client.watch(since=state['last_seq'], instance=state['instance']):
+            ...
+    """
+
+    def __init__(self, info: Dict):
+        self.info = info
+
+    @classmethod
+    def connect(cls, auto_start: bool = False) -> Optional['ServiceClient']:
+        """실행 중인 서비스에 연결합니다. 없으면 auto_start일 때 실행하고, 아니면 None을 반환합니다."""
+        info = read_service_info()
+        if info:
+            client = cls(info)
+            if client.ping():
+                return client
+        if not auto_start:
+            return None
+
+        start_service_process()
+        deadline = time.time() + START_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(0.2)
+            new_info = read_service_info()
+            if new_info and new_info != info:
+                client = cls(new_info)
+                if client.ping():
+                    return client
+        raise ServiceError("백그라운드 인코딩 서비스를 시작할 수 없습니다.")
+
+    def _open(self, timeout: Optional[float] = CONNECT_TIMEOUT) -> socket.socket:
+        return socket.create_connection((SERVICE_HOST, self.info['port']), timeout=timeout)
+
+    def _send(self, sock: socket.socket, op: str, fields: Dict):
+        request = dict(fields, op=op, token=self.info['token'])
+        sock.sendall((json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    def request(self, op: str, **fields) -> Dict:
+        try:
+            with self._open() as sock:
+                self._send(sock, op, fields)
+                with sock.makefile('rb') as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise ServiceError(f"서비스에 연결할 수 없습니다: {e}")
+        if not line:
+            raise ServiceError("서비스가 응답하지 않았습니다.")
+        response = json.loads(line.decode('utf-8'))
+        if not response.get('ok'):
+            raise ServiceError(response.get('error', "요청 실패"))
+        return response
+
+    def ping(self) -> bool:
+        try:
+            self.request('hello')
+            return True
+        except (ServiceError, ValueError):
+            return False
+
+    def submit(self, specs: List[Dict]) -> List[int]:
+        return self.request('submit', jobs=specs)['ids']
+
+    def list_jobs(self) -> Dict:
+        return self.request('list')
+
+    def cancel(self, job_id: int):
+        self.request('cancel', id=job_id)
+
+    def pause(self):
+        self.request('pause')
+
+    def resume(self):
+        self.request('resume')
+
+    def shutdown(self):
+        self.request('shutdown')
+
+    def watch(self, since: int = 0, instance: Optional[str] = None,
+              stop: Optional[Callable[[], bool]] = None) -> Iterator[Dict]:
+        """
+        since 이후의 이벤트를 차례로 반환합니다 (연결 확인용 heartbeat는 제외).
+        서비스가 종료되면 ServiceError, stop()이 True를 반환하면 조용히 끝납니다.
+        """
+        try:
+            sock = self._open(timeout=WATCH_HEARTBEAT * 3)
+        except OSError as e:
+            raise ServiceError(f"서비스에 연결할 수 없습니다: {e}")
+        with sock, sock.makefile('rb') as stream:
+            self._send(sock, 'watch', {'since': since, 'instance': instance})
+            while True:
+                if stop is not None and stop():
+                    return
+                try:
+                    line = stream.readline()
+                except OSError as e:
+                    raise ServiceError(f"서비스 연결이 끊어졌습니다: {e}")
+                if not line:
+                    raise ServiceError("서비스 연결이 끊어졌습니다.")
+                record = json.loads(line.decode('utf-8'))
+                if 'event' not in record:
+                    if not record.get('ok'):
+                        raise ServiceError(record.get('error', "요청 실패"))
+                    continue
+                if record['event'] != 'heartbeat':
+                    yield record
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="renQoder 백그라운드 인코딩 서비스")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="서비스 실행")
+    serve_parser.add_argument('--port', type=int, default=0, help="포트 (기본: 비어 있는 포트)")
+    serve_parser.add_argument('--workers', type=int, default=1, help="동시 작업 수")
+    commands.add_parser('status', help="작업 목록 출력")
+    cancel_parser = commands.add_parser('cancel', help="작업 취소")
+    cancel_parser.add_argument('id', type=int)
+    commands.add_parser('pause', help="모든 인코딩 일시정지")
+    commands.add_parser('resume', help="일시정지 해제")
+    commands.add_parser('stop', help="서비스 종료 (끝나지 않은 작업은 다음 실행 시 이어서 처리)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        if ServiceClient.connect() is not None:
+            print("서비스가 이미 실행 중입니다.")
+            return
+        EncodeService(workers=args.workers).serve(args.port)
+        return
+
+    client = ServiceClient.connect()
+    if client is None:
+        print("실행 중인 서비스가 없습니다.")
+        sys.exit(1)
+    try:
+        if args.command == 'status':
+            state = client.list_jobs()
+            print(f"서비스 PID {client.info['pid']}{' (일시정지)' if state['paused'] else ''}")
+            for job in state['jobs']:
+                print(f"  [{job['job']}] {job['status']:<12} {job['name']}")
+        elif args.command == 'cancel':
+            client.cancel(args.id)
+        elif args.command == 'pause':
+            client.pause()
+        elif args.command == 'resume':
+            client.resume()
+        elif args.command == 'stop':
+            client.shutdown()
+    except ServiceError as e:
+        print(f"오류: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,102 @@ FFmpeg를 사용하여 비디오를 변환합니다.
 
 import subprocess
 import os
+import logging
 import re
 import json
+import time
+import threading
+import tempfile
+from collections import deque
 from pathlib import Path
-from metadata_utils import get_video_info, get_audio_info, format_duration
+from metadata_utils import get_video_info, get_audio_info, format_duration, sniff_container
+from io_arbiter import get_io_arbiter, IO_INTERACTIVE, IO_ENCODE
+from jobs import parse_multipart_name, combine_video_info
+from cpu_topology import get_thread_args, get_affinity_command_prefix, apply_affinity
+from governor import ResourceGovernor
+from watchdog import StallWatchdog, STALL_TIMEOUT, FAILURE_LABELS, classify_failure
+from app_logger import CATEGORY_FFMPEG
+
+
+# 예상 용량 모델 파라미터 (estimate_output_size와 planner.SavingsPlanner가 공유)
+ESTIMATE_BASE_BPP = 0.12         # CQ 23 기준의 기준 bpp (현실적인 실사 영상 기준)
+ESTIMATE_BASE_QUALITY = 23
+ESTIMATE_HALVING_STEP = 7.0      # 품질 값이 이만큼 증가할 때마다 비트레이트 절반
+AAC_BITRATE = 192000             # AAC 변환 시 오디오 비트레이트
+FALLBACK_AUDIO_BITRATE = 128000  # 원본 오디오 크기를 알 수 없을 때 가정하는 비트레이트
+# 해상도/프레임레이트를 알 수 없을 때 가정하는 값 (값이 없거나 0인 경우)
+ESTIMATE_DEFAULT_VIDEO = {'width': 1920, 'height': 1080, 'fps': 30}
+
+# 실패 원인 분석용으로 보관할 FFmpeg 로그 줄 수
+LOG_TAIL_LINES = 40
+
+# Follow 모드에서 지원하는 (스트리밍 가능한) 입력 컨테이너 -> FFmpeg 입력 포맷
+FOLLOW_INPUT_FORMATS = {
+    'mpegts': 'mpegts',
+    'm2ts': 'mpegts',
+    'mkv': 'matroska',
+    'webm': 'matroska'
+}
+
+# 인코더 계열별 프리셋 단계: 느린(압축 효율 높은) 프리셋 -> 빠른 프리셋 순서
+# 각 항목은 (프리셋 값, 기본 프리셋 대비 상대 처리 속도)이며 기본 프리셋의 속도는 1.0
+PRESET_LADDERS = {
+    'nvenc': [('p7', 1.0), ('p6', 1.3), ('p5', 1.7), ('p4', 2.2), ('p3', 2.8), ('p2', 3.4), ('p1', 4.0)],
+    'qsv': [('veryslow', 1.0), ('slower', 1.3), ('slow', 1.6), ('medium', 2.0), ('fast', 2.5),
+            ('faster', 3.0), ('veryfast', 3.6)],
+    'amf': [('quality', 1.0), ('balanced', 1.5), ('speed', 2.2)],
+    'libx265': [('veryslow', 0.25), ('slower', 0.45), ('slow', 1.0), ('medium', 2.0), ('fast', 2.5),
+                ('faster', 3.0), ('veryfast', 4.0), ('superfast', 6.0), ('ultrafast', 9.0)],
+    'libx264': [('veryslow', 0.3), ('slower', 0.5), ('slow', 0.7), ('medium', 1.0), ('fast', 1.3),
+                ('faster', 1.8), ('veryfast', 2.8), ('superfast', 4.0), ('ultrafast', 6.0)],
+    'libsvtav1': [('4', 0.35), ('5', 0.6), ('6', 1.0), ('7', 1.5), ('8', 2.2), ('9', 3.0),
+                  ('10', 4.0), ('11', 5.0), ('12', 6.5)],
+    'libaom': [('2', 0.4), ('3', 0.65), ('4', 1.0), ('5', 1.6), ('6', 2.5), ('7', 3.5), ('8', 5.0)]
+}
+
+# 계열별 기본 프리셋 (build_command의 기존 고정값)
+DEFAULT_PRESETS = {
+    'nvenc': 'p7',
+    'qsv': 'veryslow',
+    'amf': 'quality',
+    'libx265': 'slow',
+    'libx264': 'medium',
+    'libsvtav1': '6',
+    'libaom': '4'
+}
+
+
+def get_preset_family(encoder_type: str):
+    """인코더 이름에서 프리셋 계열(PRESET_LADDERS 키)을 찾습니다. 프리셋이 없는 인코더는 None."""
+    etype = encoder_type.lower()
+    for family in ('nvenc', 'qsv', 'amf', 'libx265', 'libx264', 'libsvtav1', 'libaom'):
+        if family in etype:
+            return family
+    return None
+
+
+def get_preset_ladder(encoder_type: str):
+    """느린 프리셋부터 빠른 프리셋 순서의 [(프리셋, 상대 속도), ...]를 반환합니다."""
+    return PRESET_LADDERS.get(get_preset_family(encoder_type), [])
+
+
+def get_preset_speed_factor(encoder_type: str, preset=None) -> float:
+    """기본 프리셋 대비 상대 처리 속도 (프리셋이 None이거나 알 수 없으면 1.0)"""
+    if preset is None:
+        return 1.0
+    return dict(get_preset_ladder(encoder_type)).get(str(preset), 1.0)
+
+
+def write_concat_list(input_files):
+    """concat demuxer 목록 파일을 임시 파일로 작성하고 경로를 반환합니다 (사용 후 호출한 쪽에서 삭제)."""
+    fd, list_file = tempfile.mkstemp(prefix='renqoder_concat_', suffix='.ffconcat')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write('ffconcat version 1.0\n')
+        for path in input_files:
+            # 작은따옴표 안은 경로 그대로 해석됨
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return list_file
 
 
 class VideoEncoder:
@@ -21,16 +113,40 @@ class VideoEncoder:
         self.current_frame = 0
         self.total_seconds = 0
         self.current_seconds = 0
+        self.following = False
+        self.follow_progress = 0.0
+        self.preset = None  # None이면 인코더별 기본 프리셋 사용
+        self.thread_allocation = None  # ThreadPlanner.allocate() 결과 (None이면 FFmpeg 기본 스레드)
+        self.governor = ResourceGovernor()  # 우선순위/일시정지/CPU 상한 (여러 인코더가 공유 가능)
+        self.stall_timeout = STALL_TIMEOUT  # 진행이 이 시간(초) 동안 멈추면 프로세스 강제 종료 (None이면 감시 안 함)
+        self.cancel_requested = False
+        self.last_failure = None  # 마지막 실패 정보 {'kind', 'label', 'returncode', 'tail', 'output_file', 'partial'}
+        self.probe_service = None  # ProbeService (설정되면 파일 분석 결과를 (경로, 크기, 수정 시각)별로 재사용)
+        
+    def get_preset(self):
+        """현재 인코더에 적용할 프리셋 값 (지정된 프리셋이 해당 인코더에 없으면 기본값)"""
+        family = get_preset_family(self.encoder_type)
+        if family is None:
+            return None
+        if self.preset is not None and str(self.preset) in dict(PRESET_LADDERS[family]):
+            return str(self.preset)
+        return DEFAULT_PRESETS[family]
         
     def get_audio_info(self, input_file):
         """ffprobe JSON 포맷을 사용하여 오디오 상세 정보(코덱 + 비트레이트)를 가져옵니다."""
-        return get_audio_info(input_file)
+        if self.probe_service is not None:
+            return self.probe_service.probe(input_file).get('audio_info', 'Unknown')
+        return get_audio_info(input_file, io_priority=IO_INTERACTIVE)
     
     def get_video_info(self, input_file):
         """
         ffprobe JSON 포맷을 사용하여 비디오 파일의 상세 정보를 가져옵니다.
+        사용자가 기다리는 분석이므로 백그라운드 스캔보다 먼저 디스크를 사용합니다.
         """
-        info = get_video_info(input_file)
+        if self.probe_service is not None:
+            info = self.probe_service.probe(input_file)
+        else:
+            info = get_video_info(input_file, io_priority=IO_INTERACTIVE)
         
         # 최종 클래스 변수 업데이트 (기존 코드 호환성)
         self.total_seconds = info['duration']
@@ -122,35 +238,68 @@ class VideoEncoder:
                 )
             }
     
-    def build_command(self, input_file, output_file, quality=23, audio_mode="copy", overwrite=False):
-        """FFmpeg 명령어를 생성합니다."""
+    def build_command(self, input_file, output_file, quality=23, audio_mode="copy", overwrite=False, input_args=None):
+        """
+        FFmpeg 명령어를 생성합니다.
+        
+        Args:
+            input_args: '-i' 앞에 추가할 입력 옵션 (예: ['-f', 'mpegts'])
+        """
         
         # 기본 명령어
         cmd = ['ffmpeg', '-hide_banner']
         if overwrite:
             cmd.append('-y')
         
+        if input_args:
+            cmd.extend(input_args)
+        
+        # 동시 작업 간 코어 분할 시 디코더/필터 스레드 수 제한
+        thread_args = get_thread_args(self.encoder_type, self.thread_allocation)
+        cmd.extend(thread_args['input'])
+        
         cmd.extend(['-i', input_file, '-map', '0:v', '-map', '0:a'])
         
         # 비디오 인코더 설정
-        cmd.extend(['-c:v', self.encoder_type])
+        cmd.extend(self.build_video_args(quality))
+        
+        # 오디오 설정
+        if audio_mode == "copy":
+            cmd.extend(['-c:a', 'copy'])
+        else:  # AAC
+            cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
+        
+        # HEVC 태그 (Apple 호환성)
+        cmd.extend(['-tag:v', 'hvc1'])
+        
+        
+        # 출력 파일
+        cmd.append(output_file)
+        
+        return cmd
+
+    def build_video_args(self, quality=23):
+        """비디오 인코더/스레드/품질 옵션 ('-c:v'부터, 성능 측정도 같은 옵션 사용)"""
+        cmd = ['-c:v', self.encoder_type]
+        cmd.extend(get_thread_args(self.encoder_type, self.thread_allocation)['output'])
         
         # 품질 설정 (CQP)
         # 품질 설정
+        preset = self.get_preset()
         if 'nvenc' in self.encoder_type:
             # NVIDIA: -cq (Constant Quality)
-            cmd.extend(['-preset', 'p7', '-cq', str(quality)])
+            cmd.extend(['-preset', preset, '-cq', str(quality)])
         
         elif 'qsv' in self.encoder_type:
             # Intel QuickSync: -global_quality (ICQ)
             # QSV의 global_quality는 숫자가 높을수록 고화질인 경우도 있고 낮을수록 고화질인 경우도 있음 (코덱별 상이)
             # 하지만 ffmpeg wrapper에서는 보통 ICQ 모드에서 낮을수록 고화질 (CRF와 유사)
-            cmd.extend(['-preset', 'veryslow', '-global_quality', str(quality)])
+            cmd.extend(['-preset', preset, '-global_quality', str(quality)])
         
         elif 'amf' in self.encoder_type:
             # AMD AMF: -qp_i / -qp_p
             # AMF는 품질 모드 명시 필요
-            cmd.extend(['-usage', 'transcoding', '-quality', 'quality', '-rc', 'cqp', '-qp_i', str(quality), '-qp_p', str(quality)])
+            cmd.extend(['-usage', 'transcoding', '-quality', preset, '-rc', 'cqp', '-qp_i', str(quality), '-qp_p', str(quality)])
             
         elif 'libvpx' in self.encoder_type:
             # VP8/VP9
@@ -162,11 +311,11 @@ class VideoEncoder:
         elif 'av1' in self.encoder_type or 'libaom' in self.encoder_type or 'libsvtav1' in self.encoder_type:
             # AV1 Software
             # SVT-AV1, libaom-av1 모두 crf 지원 (-qp 대신 -crf 사용 권장 추세)
-            # SVT-AV1: -crf, -preset (0-13, 높을수록 빠름), 여기선 6 정도가 적당
+            # SVT-AV1: -crf, -preset (0-13, 높을수록 빠름), 기본 6 정도가 적당
             if 'libsvtav1' in self.encoder_type:
-                cmd.extend(['-crf', str(quality), '-preset', '6'])
+                cmd.extend(['-crf', str(quality), '-preset', preset])
             elif 'libaom' in self.encoder_type:
-                cmd.extend(['-crf', str(quality), '-cpu-used', '4']) # cpu-used 0-8
+                cmd.extend(['-crf', str(quality), '-cpu-used', preset]) # cpu-used 0-8 (기본 4)
             else:
                  cmd.extend(['-crf', str(quality)]) # hardware av1 implies implementation dependent, usually cq/qp handles above
                  
@@ -177,25 +326,12 @@ class VideoEncoder:
             if 'mpeg4' in self.encoder_type:
                  cmd.extend(['-qscale:v', str(quality)]) # mpeg4 qscale 1-31 직접 사용
             else:
-                preset = 'slow' if 'libx265' in self.encoder_type else 'medium'
-                cmd.extend(['-preset', preset, '-crf', str(quality)])
-        
-        # 오디오 설정
-        if audio_mode == "copy":
-            cmd.extend(['-c:a', 'copy'])
-        else:  # AAC
-            cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
-        
-        # HEVC 태그 (Apple 호환성)
-        cmd.extend(['-tag:v', 'hvc1'])
-        
-        
-        # 출력 파일
-        cmd.append(output_file)
+                # 기본: x265 slow, x264 medium
+                cmd.extend(['-preset', preset or 'medium', '-crf', str(quality)])
         
         return cmd
     
-    def generate_output_filename(self, input_file, quality, audio_mode):
+    def generate_output_filename(self, input_file, quality, audio_mode, stem=None, audio_info=None):
         """
         출력 파일명을 생성합니다.
         
@@ -203,11 +339,14 @@ class VideoEncoder:
             input_file: 입력 파일 경로
             quality: 화질 설정값
             audio_mode: 오디오 모드
+            stem: 원본명 대신 사용할 이름 (분할 녹화를 합칠 때 공통 이름 등)
+            audio_info: 이미 분석한 원본 오디오 정보 (예: AAC192k, None이면 ffprobe로 확인)
             
         Returns:
             생성된 출력 파일 경로
         """
         input_path = Path(input_file)
+        stem = stem or input_path.stem
         
         # 코덱 이름 간소화
         codec_map = {
@@ -243,11 +382,10 @@ class VideoEncoder:
             audio_suffix = 'AAC192k'  # AAC 변환 시 비트레이트 명시
         else:
             # Copy 모드일 때 원본 오디오 정보 감지 (코덱 + 비트레이트)
-            original_audio_info = self.get_audio_info(input_file)
-            audio_suffix = original_audio_info
+            audio_suffix = audio_info or self.get_audio_info(input_file)
         
         # 파일명 생성: 원본명_코덱_CQ품질_오디오.mp4
-        output_filename = f"{input_path.stem}_{codec_short}_CQ{quality}_{audio_suffix}.mp4"
+        output_filename = f"{stem}_{codec_short}_CQ{quality}_{audio_suffix}.mp4"
         output_file = str(input_path.parent / output_filename)
         
         return output_file
@@ -268,26 +406,26 @@ class VideoEncoder:
         if duration <= 0:
             return {'total': 0, 'video': 0, 'audio': 0}
             
-        width = video_info.get('width', 1920)
-        height = video_info.get('height', 1080)
-        fps = video_info.get('fps', 30)
+        width = video_info.get('width') or ESTIMATE_DEFAULT_VIDEO['width']
+        height = video_info.get('height') or ESTIMATE_DEFAULT_VIDEO['height']
+        fps = video_info.get('fps') or ESTIMATE_DEFAULT_VIDEO['fps']
         
         # 1. 비디오 비트레이트 추정 (HEVC/H.265 기준)
         # 기본 픽셀 당 비트 모델: bpp (bits per pixel)
         # CQ 23, 1080p, 30fps 기준 대략 2Mbps-4Mbps 타겟
         # CQ에 따른 지수적 변화 반영: CQ가 6 증가할 때마다 비트레이트 대략 절반
         
-        base_bpp = 0.12  # CQ 23 기준의 기준 bpp (현실적인 실사 영상 기준)
-        cq_offset = quality - 23
+        base_bpp = ESTIMATE_BASE_BPP  # CQ 23 기준의 기준 bpp (현실적인 실사 영상 기준)
+        cq_offset = quality - ESTIMATE_BASE_QUALITY
         # 지수적 감쇄: 2^(-cq_offset/7) (보정된 감쇄율)
-        estimated_bpp = base_bpp * (0.5 ** (cq_offset / 7.0))
+        estimated_bpp = base_bpp * (0.5 ** (cq_offset / ESTIMATE_HALVING_STEP))
         
         # 해상도 및 FPS 반영
         pixel_count = width * height * fps
         v_bitrate = pixel_count * estimated_bpp
         
         if audio_mode == 'aac':
-            a_bitrate = 192000  # 192kbps
+            a_bitrate = AAC_BITRATE  # 192kbps
             a_size = (a_bitrate * duration) / 8
         else:
             # 원본 오디오 사이즈를 그대로 사용 (Copy 모드)
@@ -300,7 +438,7 @@ class VideoEncoder:
                     a_bitrate = total_orig_bitrate * 0.1 # 대략 10% 가정
                     a_size = (a_bitrate * duration) / 8
                 else:
-                    a_size = (128000 * duration) / 8
+                    a_size = (FALLBACK_AUDIO_BITRATE * duration) / 8
         
         # 3. 전체 크기 계산
         v_size = (v_bitrate * duration) / 8
@@ -368,7 +506,7 @@ class VideoEncoder:
             
         return "".join(result)
     
-    def encode(self, input_file, quality=23, audio_mode="copy", output_file=None, progress_callback=None, log_callback=None, overwrite=False):
+    def encode(self, input_file, quality=23, audio_mode="copy", output_file=None, progress_callback=None, log_callback=None, overwrite=False, follow=False, idle_timeout=30):
         """
         비디오를 인코딩합니다.
         
@@ -380,6 +518,8 @@ class VideoEncoder:
             progress_callback: 진행률 콜백 함수 (0-100 값 전달)
             log_callback: 로그 콜백 함수 (문자열 전달)
             overwrite: 덮어쓰기 여부
+            follow: 녹화 중인 입력(MPEG-TS/MKV)을 따라가며 실시간으로 인코딩 (Follow 모드)
+            idle_timeout: Follow 모드에서 입력이 이 시간(초) 동안 커지지 않으면 녹화 종료로 간주
         
         Returns:
             성공 시 출력 파일 경로, 실패 시 None
@@ -389,11 +529,13 @@ class VideoEncoder:
         if output_file is None:
             output_file = self.generate_output_filename(input_file, quality, audio_mode)
 
+        if follow:
+            return self.encode_follow(input_file, quality, audio_mode, output_file, progress_callback, log_callback, overwrite, idle_timeout)
         
         # 비디오 정보 가져오기 (인코딩 시작 직전 최종 동기화)
         info = self.get_video_info(input_file)
         self.total_seconds = info['duration']
-        self.total_frames = info['frames']
+        self.total_frames = info.get('frames', 0)
         
         if log_callback:
             log_callback(f"진행률 계산 기준: {self.total_seconds:.2f}초 / {self.total_frames}프레임")
@@ -401,6 +543,179 @@ class VideoEncoder:
         # FFmpeg 명령어 생성
         cmd = self.build_command(input_file, output_file, quality, audio_mode, overwrite)
         
+        return self._run_ffmpeg(cmd, output_file, progress_callback, log_callback, input_path=input_file)
+
+    def encode_concat(self, input_files, quality=23, audio_mode="copy", output_file=None, progress_callback=None, log_callback=None, overwrite=False):
+        """
+        분할 녹화된 여러 파일을 concat demuxer로 이어 붙여 하나의 출력으로 인코딩합니다.
+        
+        Args:
+            input_files: 순서대로 정렬된 입력 파일 경로 리스트 (스트림 파라미터가 동일해야 함)
+            
+        Returns:
+            성공 시 출력 파일 경로, 실패 시 None
+        """
+        # 진행률은 전체 파트의 합산 재생 시간 기준 (UI가 이미 분석한 파트는 probe_service 결과 재사용)
+        infos = [self.get_video_info(path) for path in input_files]
+        if output_file is None:
+            parsed = parse_multipart_name(input_files[0])
+            output_file = self.generate_output_filename(
+                input_files[0], quality, audio_mode, stem=parsed['base'] if parsed else None,
+                audio_info=infos[0].get('audio_info')
+            )
+        
+        combined = combine_video_info(infos)
+        self.total_seconds = combined['duration']
+        self.total_frames = combined.get('frames', 0)
+        
+        if log_callback:
+            log_callback(f"분할 파일 {len(input_files)}개를 하나로 인코딩합니다. 진행률 계산 기준: {self.total_seconds:.2f}초 / {self.total_frames}프레임")
+        
+        list_file = write_concat_list(input_files)
+        try:
+            cmd = self.build_command(list_file, output_file, quality, audio_mode, overwrite, input_args=['-f', 'concat', '-safe', '0'])
+            return self._run_ffmpeg(cmd, output_file, progress_callback, log_callback, input_path=input_files[0])
+        finally:
+            try:
+                os.remove(list_file)
+            except OSError:
+                pass
+
+    def encode_follow(self, input_file, quality=23, audio_mode="copy", output_file=None, progress_callback=None, log_callback=None, overwrite=False, idle_timeout=30):
+        """
+        녹화 중인 파일을 따라가며(tail) 인코딩합니다 (Follow 모드).
+        
+        새로 추가되는 데이터를 계속 읽어 FFmpeg 표준 입력으로 전달하고, 입력 파일이
+        idle_timeout 초 동안 커지지 않으면 녹화가 끝난 것으로 보고 출력을 마무리합니다.
+        스트리밍 가능한 컨테이너(MPEG-TS, Matroska/WebM)만 지원합니다.
+        """
+        if output_file is None:
+            output_file = self.generate_output_filename(input_file, quality, audio_mode)
+        
+        # 스트리밍 입력은 파일 끝(인덱스)을 참조할 수 없으므로 컨테이너를 명시
+        try:
+            container = sniff_container(input_file)
+        except OSError:
+            container = None
+        input_format = FOLLOW_INPUT_FORMATS.get(container)
+        if not input_format:
+            if log_callback:
+                log_callback(f"Follow 모드는 MPEG-TS/MKV 입력만 지원합니다 (감지된 컨테이너: {container})")
+            return None
+        
+        # 녹화가 끝나기 전에는 전체 길이를 알 수 없으므로 입력 바이트 기준으로 진행률 표시
+        self.total_seconds = 0
+        self.total_frames = 0
+        self.follow_progress = 0.0
+        self.following = True
+        
+        if log_callback:
+            log_callback(f"Follow 모드: 입력이 {idle_timeout}초 동안 멈추면 녹화 종료로 간주합니다.")
+        
+        cmd = self.build_command('pipe:0', output_file, quality, audio_mode, overwrite, input_args=['-f', input_format])
+        feeder = lambda: self._follow_feeder(input_file, idle_timeout, log_callback)
+        
+        try:
+            result = self._run_ffmpeg(cmd, output_file, progress_callback, log_callback, feeder=feeder, stall_grace=idle_timeout)
+        finally:
+            self.following = False
+        
+        if result and not self.verify_output_duration(input_file, result, log_callback):
+            # 잘린 출력을 남기면 다음 실행에서 완성된 출력으로 보고 건너뛰므로 실패로 기록하고 지움
+            self.last_failure = {
+                'kind': 'output',
+                'label': FAILURE_LABELS['output'],
+                'returncode': 0,
+                'tail': ["출력 재생 시간이 완성된 원본과 다릅니다."],
+                'output_file': result,
+                'partial': True
+            }
+            try:
+                os.remove(result)
+            except OSError:
+                pass
+            return None
+        return result
+
+    def _follow_feeder(self, input_file, idle_timeout, log_callback=None):
+        """입력 파일에 추가되는 데이터를 FFmpeg stdin으로 전달합니다 (Follow 모드 전용 스레드)."""
+        chunk_size = 1024 * 1024
+        fed_bytes = 0
+        last_growth = time.time()
+        process = self.process
+        
+        try:
+            with open(input_file, 'rb') as src:
+                while process.poll() is None:
+                    data = src.read(chunk_size)
+                    if data:
+                        process.stdin.buffer.write(data)
+                        process.stdin.buffer.flush()
+                        fed_bytes += len(data)
+                        last_growth = time.time()
+                        
+                        try:
+                            current_size = os.path.getsize(input_file)
+                        except OSError:
+                            current_size = fed_bytes
+                        if current_size > 0:
+                            self.follow_progress = min(1.0, fed_bytes / current_size)
+                        continue
+                    
+                    # 파일 끝에 도달: 녹화가 계속되는지 대기
+                    if time.time() - last_growth >= idle_timeout:
+                        if log_callback:
+                            log_callback(f"입력이 {idle_timeout}초 동안 변하지 않아 녹화 종료로 판단합니다. 출력을 마무리합니다.")
+                        break
+                    time.sleep(0.5)
+        except (BrokenPipeError, ValueError, OSError):
+            # FFmpeg가 먼저 종료(취소/오류)된 경우
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+
+    def verify_output_duration(self, source_file, output_file, log_callback=None, tolerance=2.0):
+        """완성된 원본과 출력 파일의 재생 시간을 비교 검증합니다."""
+        source_duration = get_video_info(source_file, fast_only=True).get('duration', 0)
+        output_duration = get_video_info(output_file, fast_only=True).get('duration', 0)
+        
+        if source_duration <= 0:
+            if log_callback:
+                log_callback("원본 재생 시간을 확인할 수 없어 길이 검증을 건너뜁니다.")
+            return True
+        
+        # 허용 오차: tolerance 초 또는 원본 길이의 1% 중 큰 값
+        allowed = max(tolerance, source_duration * 0.01)
+        difference = abs(source_duration - output_duration)
+        ok = difference <= allowed
+        
+        if log_callback:
+            status = "통과" if ok else "실패"
+            log_callback(f"재생 시간 검증 {status}: 원본 {format_duration(source_duration)} / 결과 {format_duration(output_duration)} (차이 {difference:.1f}초)")
+        return ok
+
+    def _run_ffmpeg(self, cmd, output_file, progress_callback=None, log_callback=None, feeder=None, stall_grace=0,
+                    input_path=None):
+        """
+        FFmpeg 프로세스를 실행하고 진행률을 모니터링합니다.
+        
+        진행 시간(time=)이 stall_timeout 초 동안 늘지 않으면 프로세스를 종료하고,
+        실패 시 로그 끝부분으로 원인을 분류해 self.last_failure에 기록합니다.
+        
+        Args:
+            feeder: 지정 시 stdin을 파이프로 열고 프로세스 시작 직후 별도 스레드에서 실행할 함수
+            stall_grace: 멈춤 판단 시간에 더할 여유 시간(초) (Follow 모드의 녹화 대기 시간)
+            input_path: 입력 파일 경로 (지정 시 해당 장치의 I/O 대역폭 예산에 인코딩으로 등록)
+        """
+        self.last_failure = None
+        log_tail = deque(maxlen=LOG_TAIL_LINES)
+        watchdog = None
+        process = None
+        output_existed = os.path.exists(output_file)
+
         if log_callback:
             log_callback(f"실행 명령어: {' '.join(cmd)}")
         else:
@@ -411,17 +726,42 @@ class VideoEncoder:
             # Windows에서 CMD 창 생성 방지
             creationflags = 0x08000000 if os.name == 'nt' else 0
             
+            # 배분된 CPU에서만 실행 (Linux는 taskset으로 시작 시점부터, 그 외에는 시작 직후 적용)
+            cpus = self.thread_allocation['cpus'] if self.thread_allocation else None
+            affinity_prefix = get_affinity_command_prefix(cpus)
+            
             self.process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.DEVNULL,  # 사용자 입력 요구 차단
+                affinity_prefix + cmd,
+                stdin=subprocess.PIPE if feeder else subprocess.DEVNULL,  # 사용자 입력 요구 차단
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,  # stderr를 stdout으로 통합
                 universal_newlines=True,
                 bufsize=1,
                 creationflags=creationflags
             )
+            process = self.process
+            if cpus and not affinity_prefix:
+                apply_affinity(self.process, cpus)
+            self.governor.attach(self.process)
+            if input_path:
+                get_io_arbiter().track(self.process, input_path, IO_ENCODE)
+            
+            if self.stall_timeout:
+                def on_stall(idle):
+                    message = f"⚠️ FFmpeg 진행이 {idle:.0f}초 동안 멈춰 프로세스를 종료합니다."
+                    if log_callback:
+                        log_callback(message)
+                    else:
+                        print(message)
+                watchdog = StallWatchdog(
+                    self.process, self.stall_timeout + stall_grace, self.governor, on_stall
+                ).start()
             
-            # 진행률 모니터링
+            if feeder:
+                threading.Thread(target=feeder, daemon=True).start()
+            
+            # 진행률 모니터링 (멈춘 프로세스는 감시 스레드가 종료시키므로 readline이 EOF를 반환)
+            last_seconds = -1.0
             while True:
                 line = self.process.stdout.readline()
                 if not line and self.process.poll() is not None:
@@ -431,49 +771,18 @@ class VideoEncoder:
                     continue
                 
                 clean_line = line.strip()
+                if clean_line:
+                    log_tail.append(clean_line)
                 
                 # FFmpeg의 기본 진행률 라인 감지 (frame= ... fps= ... q= ... size= ... time= ... bitrate= ... speed= ...)
                 if 'frame=' in clean_line and 'time=' in clean_line:
                     if log_callback:
                         log_callback(clean_line)
                     
-                    # 진행률 바 업데이트를 위한 시간 추출
-                    time_match = re.search(r"time=(\d{2}:\d{2}:\d{2}[.,]\d+)", clean_line)
-                    speed_match = re.search(r"speed=\s*([\d.]+)x", clean_line)
-                    
-                    if time_match:
-                        self.current_seconds = self.convert_to_seconds(time_match.group(1).replace(',', '.'))
-                        if self.total_seconds > 0:
-                            progress = min(100, int((self.current_seconds / self.total_seconds) * 100))
-                            
-                            # 속도 및 남은 시간 계산
-                            speed_str = "0.00x"
-                            remaining_str = "계산 중..."
-                            
-                            if speed_match:
-                                speed_val = float(speed_match.group(1))
-                                speed_str = f"{speed_val:.2f}x"
-                                
-                                if speed_val > 0:
-                                    remaining_seconds = (self.total_seconds - self.current_seconds) / speed_val
-                                    if remaining_seconds > 0:
-                                        m, s = divmod(int(remaining_seconds), 60)
-                                        h, m = divmod(m, 60)
-                                        if h > 0:
-                                            remaining_str = f"{h:d}:{m:02d}:{s:02d}"
-                                        else:
-                                            remaining_str = f"{m:02d}:{s:02d}"
-                                    else:
-                                        remaining_str = "00:00"
-                            
-                            if progress_callback:
-                                # 하위 호환성을 위해 progress 값과 함께 상세 정보 전달
-                                progress_data = {
-                                    'progress': progress,
-                                    'speed': speed_str,
-                                    'remaining': remaining_str
-                                }
-                                progress_callback(progress_data)
+                    self._handle_progress_line(clean_line, progress_callback)
+                    if watchdog and self.current_seconds > last_seconds:
+                        last_seconds = self.current_seconds
+                        watchdog.progress()
                 
                 # 기타 정보성 로그 (Duration, Stream 등)
                 elif "Duration:" in clean_line or "Stream #" in clean_line:
@@ -502,18 +811,109 @@ class VideoEncoder:
             if self.process.returncode == 0:
                 print(f"인코딩 완료: {output_file}")
                 return output_file
-            else:
-                error = self.process.stderr.read()
-                print(f"인코딩 실패: {error}")
-                return None
+            
+            # stderr는 stdout으로 통합되어 있으므로 보관해 둔 로그 끝부분으로 원인 분석
+            self._record_failure(
+                log_tail, self.process.returncode, output_file, output_existed,
+                stalled=bool(watchdog and watchdog.stalled), log_callback=log_callback
+            )
+            return None
                 
         except Exception as e:
             print(f"인코딩 중 오류: {e}")
+            log_tail.append(str(e))
+            self._record_failure(log_tail, None, output_file, output_existed, log_callback=log_callback)
             return None
+        finally:
+            # 완료/실패/예외 모두 감시를 멈추고 관리 대상에서 제외 (종료된 프로세스를 계속 참조하지 않도록)
+            if watchdog:
+                watchdog.stop()
+            if process is not None:
+                self.governor.detach(process)
+                get_io_arbiter().untrack(process)
+
+    def _record_failure(self, log_tail, returncode, output_file, output_existed, stalled=False, log_callback=None):
+        """실패 원인을 분류해 self.last_failure에 기록하고 로그로 알립니다."""
+        kind = classify_failure(list(log_tail), stalled=stalled, cancelled=self.cancel_requested)
+        self.last_failure = {
+            'kind': kind,
+            'label': FAILURE_LABELS[kind],
+            'returncode': returncode,
+            'tail': list(log_tail)[-5:],
+            'output_file': output_file,
+            # 이번 실행이 만든 불완전한 출력 (재시도 전에 지워야 함)
+            'partial': not output_existed and os.path.exists(output_file)
+        }
+        # 로그 끝부분은 로그 파일에만 (UI/서비스/CLI는 log_callback과 last_failure로 받음)
+        logging.getLogger('renqoder').debug(
+            "\n  ".join([f"인코딩 실패 ({self.last_failure['label']}, 종료 코드 {returncode}):"] + self.last_failure['tail']),
+            extra={'category': CATEGORY_FFMPEG}
+        )
+        if log_callback and kind != 'cancelled':
+            log_callback(f"✗ 인코딩 실패 원인: {self.last_failure['label']}")
+
+    def _handle_progress_line(self, clean_line, progress_callback):
+        """FFmpeg 진행률 라인에서 시간/속도를 추출하여 진행률 콜백을 호출합니다."""
+        # 진행률 바 업데이트를 위한 시간 추출
+        time_match = re.search(r"time=(\d{2}:\d{2}:\d{2}[.,]\d+)", clean_line)
+        speed_match = re.search(r"speed=\s*([\d.]+)x", clean_line)
+        
+        if not time_match:
+            return
+        
+        self.current_seconds = self.convert_to_seconds(time_match.group(1).replace(',', '.'))
+        
+        # 속도 및 남은 시간 계산
+        speed_str = "0.00x"
+        speed_val = 0.0
+        if speed_match:
+            speed_val = float(speed_match.group(1))
+            speed_str = f"{speed_val:.2f}x"
+        
+        if self.total_seconds > 0:
+            progress = min(100, int((self.current_seconds / self.total_seconds) * 100))
+            remaining_str = "계산 중..."
+            
+            if speed_val > 0:
+                remaining_seconds = (self.total_seconds - self.current_seconds) / speed_val
+                if remaining_seconds > 0:
+                    m, s = divmod(int(remaining_seconds), 60)
+                    h, m = divmod(m, 60)
+                    if h > 0:
+                        remaining_str = f"{h:d}:{m:02d}:{s:02d}"
+                    else:
+                        remaining_str = f"{m:02d}:{s:02d}"
+                else:
+                    remaining_str = "00:00"
+        elif self.following:
+            # Follow 모드: 현재까지 기록된 입력 중 전달된 비율 (녹화 종료 전까지 100% 미만)
+            progress = min(99, int(self.follow_progress * 100))
+            remaining_str = f"녹화 따라가는 중 ({format_duration(self.current_seconds)})"
+        else:
+            return
+        
+        if progress_callback:
+            # 하위 호환성을 위해 progress 값과 함께 상세 정보 전달
+            progress_data = {
+                'progress': progress,
+                'speed': speed_str,
+                'remaining': remaining_str
+            }
+            progress_callback(progress_data)
     
+    def pause(self):
+        """진행 중인 인코딩을 일시정지합니다 (SIGSTOP / NtSuspendProcess)."""
+        self.governor.pause()
+
+    def resume(self):
+        """일시정지된 인코딩을 재개합니다."""
+        self.governor.resume()
+
     def cancel(self):
         """진행 중인 인코딩을 취소합니다."""
+        self.cancel_requested = True
         if self.process and self.process.poll() is None:
+            self.governor.release(self.process)
             self.process.terminate()
             self.process.wait()
 
@@ -0,0 +1,248 @@
+"""
+인코더 성능 측정 모듈
+후보 인코더마다 짧은 합성 영상(lavfi testsrc2)을 실제로 인코딩해 보고 성공 여부/속도/오류를 기록합니다.
+결과는 FFmpeg 빌드와 GPU/드라이버 구성이 바뀌지 않는 한 캐시에서 재사용합니다.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from encoder import VideoEncoder
+from watchdog import classify_failure, get_codec_family, FAILURE_LABELS
+
+
+PROBE_CACHE_FILE = Path.home() / '.renqoder_encoder_probe.json'
+
+# 측정용 합성 영상 (1080p 환산 속도로 기록)
+PROBE_WIDTH = 1280
+PROBE_HEIGHT = 720
+PROBE_FRAMES = 30
+PROBE_TIMEOUT = 20          # 이 시간 안에 끝나지 않으면 그때까지 처리한 프레임으로 속도 계산
+REFERENCE_PIXELS = 1920 * 1080
+
+STATS_FRAME_PATTERN = re.compile(r"frame=\s*(\d+)")
+
+
+def _run_quiet(cmd, timeout=5) -> str:
+    """명령을 실행하고 표준 출력을 반환합니다 (실패 시 빈 문자열)."""
+    try:
+        creationflags = 0x08000000 if os.name == 'nt' else 0
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, encoding='utf-8', errors='replace',
+            timeout=timeout, creationflags=creationflags
+        )
+        return result.stdout
+    except Exception:
+        return ""
+
+
+def get_ffmpeg_fingerprint() -> str:
+    """FFmpeg 버전/빌드 설정(configuration)/라이브러리 버전 문자열"""
+    return _run_quiet(['ffmpeg', '-hide_banner', '-version']).strip()
+
+
+def get_hardware_fingerprint() -> str:
+    """CPU/GPU 모델과 그래픽 드라이버 버전 문자열"""
+    parts = [platform.system(), platform.release(), platform.machine(), platform.processor()]
+
+    if os.name == 'nt':
+        parts.append(_run_quiet(['wmic', 'path', 'win32_VideoController', 'get', 'name,driverversion']))
+    else:
+        parts.append(_run_quiet(['nvidia-smi', '--query-gpu=name,driver_version', '--format=csv,noheader']))
+        # DRM 장치의 PCI vendor/device ID (Intel/AMD)
+        for card in sorted(Path('/sys/class/drm').glob('card[0-9]')):
+            for name in ('vendor', 'device'):
+                try:
+                    parts.append((card / 'device' / name).read_text().strip())
+                except OSError:
+                    pass
+        for module in ('nvidia', 'i915', 'xe', 'amdgpu'):
+            try:
+                parts.append(f"{module}:{(Path('/sys/module') / module / 'version').read_text().strip()}")
+            except OSError:
+                pass
+
+    return "\n".join(p.strip() for p in parts if p)
+
+
+def recommend_encoder(results: Dict[str, Dict], family='hevc') -> Optional[str]:
+    """측정에 성공한 인코더 중 같은 코덱 계열에서 가장 빠른 인코더를 반환합니다."""
+    candidates = [
+        (result['fps_1080p'], encoder_type) for encoder_type, result in results.items()
+        if result.get('ok') and get_codec_family(encoder_type) == family
+    ]
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
+class EncoderProbe:
+    """
+    인코더 실측 클래스
+
+    같은 장치를 쓰는 인코더끼리는 순서대로(세션 한도/자원 경쟁으로 인한 오판 방지),
+    서로 다른 장치(NVIDIA/Intel/AMD/CPU)의 인코더는 동시에 측정합니다.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = Path(cache_file) if cache_file else PROBE_CACHE_FILE
+        self.fingerprint = None
+        self.results = {}
+
+    def get_fingerprint(self) -> str:
+        """캐시 키 (FFmpeg 빌드 + 하드웨어/드라이버 구성의 해시)"""
+        if self.fingerprint is None:
+            text = get_ffmpeg_fingerprint() + "\n--\n" + get_hardware_fingerprint()
+            self.fingerprint = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return self.fingerprint
+
+    def load_cached(self) -> Optional[Dict[str, Dict]]:
+        """현재 FFmpeg/하드웨어 구성과 일치하는 캐시가 있으면 측정 결과를 반환합니다."""
+        try:
+            data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.get('fingerprint') != self.get_fingerprint():
+            return None
+        self.results = data.get('results', {})
+        return self.results or None
+
+    def save(self):
+        try:
+            data = {'fingerprint': self.get_fingerprint(), 'created': time.time(), 'results': self.results}
+            self.cache_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        except Exception as e:
+            print(f"인코더 측정 결과 저장 실패: {e}")
+
+    def probe(self, codecs: List[Dict], force=False, progress_callback=None) -> Dict[str, Dict]:
+        """
+        인코더들을 측정합니다.
+
+        Args:
+            codecs: HardwareDetector.get_available_codecs() 결과 ('compiled'가 False인 항목은 제외)
+            force: 캐시를 무시하고 다시 측정
+            progress_callback: 인코더 하나의 측정이 끝날 때마다 호출 (인코더 ID, 결과 전달)
+
+        Returns:
+            {인코더 ID: {'ok', 'fps', 'fps_1080p', 'frames', 'seconds', 'error', 'kind'}}
+        """
+        if force or self.load_cached() is None:
+            self.results = {}
+
+        groups = {}
+        for codec in codecs:
+            if not codec.get('compiled', True) or codec['id'] in self.results:
+                continue
+            groups.setdefault(codec.get('vendor', 'CPU'), []).append(codec['id'])
+
+        if not groups:
+            return self.results
+
+        lock = threading.Lock()
+
+        def run_group(encoder_types):
+            for encoder_type in encoder_types:
+                result = self.probe_encoder(encoder_type)
+                with lock:
+                    self.results[encoder_type] = result
+                if progress_callback:
+                    progress_callback(encoder_type, result)
+
+        threads = [threading.Thread(target=run_group, args=(ids,), daemon=True) for ids in groups.values()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.save()
+        return self.results
+
+    def build_probe_command(self, encoder_type: str) -> List[str]:
+        """실제 인코딩과 같은 인코더 옵션으로 합성 영상을 인코딩하는 명령 (출력은 버림)"""
+        encoder = VideoEncoder(encoder_type)
+        return [
+            'ffmpeg', '-hide_banner', '-nostdin', '-loglevel', 'error', '-stats',
+            '-f', 'lavfi', '-i', f'testsrc2=size={PROBE_WIDTH}x{PROBE_HEIGHT}:rate=30',
+            '-frames:v', str(PROBE_FRAMES)
+        ] + encoder.build_video_args() + ['-f', 'null', '-']
+
+    def probe_encoder(self, encoder_type: str) -> Dict:
+        """인코더 하나를 측정합니다."""
+        cmd = self.build_probe_command(encoder_type)
+        creationflags = 0x08000000 if os.name == 'nt' else 0
+        timed_out = False
+
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                encoding='utf-8', errors='replace', timeout=PROBE_TIMEOUT, creationflags=creationflags
+            )
+            output = completed.stderr
+            returncode = completed.returncode
+        except subprocess.TimeoutExpired as e:
+            # 느린 인코더: 제한 시간까지 처리한 프레임으로 속도 계산
+            output = e.stderr or ""
+            if isinstance(output, bytes):
+                output = output.decode('utf-8', errors='replace')
+            returncode = None
+            timed_out = True
+        except Exception as e:
+            return {'ok': False, 'fps': 0.0, 'fps_1080p': 0.0, 'frames': 0, 'seconds': 0.0,
+                    'error': str(e), 'kind': 'unknown'}
+        elapsed = time.perf_counter() - start
+
+        frame_matches = STATS_FRAME_PATTERN.findall(output)
+        frames = int(frame_matches[-1]) if frame_matches else 0
+        if returncode == 0 and frames == 0:
+            frames = PROBE_FRAMES
+
+        ok = (returncode == 0 or timed_out) and frames > 0
+        lines = [line.strip() for line in re.split(r'[\r\n]+', output) if line.strip()]
+        errors = [line for line in lines if not line.startswith('frame=')]
+
+        # 인코더가 직접 남긴 오류(예: "[hevc_nvenc @ ...] OpenEncodeSessionEx failed")를 우선 표시
+        detail = next((line for line in errors if line.startswith(f"[{encoder_type}")), errors[-1] if errors else None)
+
+        fps = frames / elapsed if ok and elapsed > 0 else 0.0
+        kind = None if ok else classify_failure(errors)
+        return {
+            'ok': ok,
+            'fps': round(fps, 2),
+            'fps_1080p': round(fps * PROBE_WIDTH * PROBE_HEIGHT / REFERENCE_PIXELS, 2),
+            'frames': frames,
+            'seconds': round(elapsed, 2),
+            'error': None if ok else (detail or f"종료 코드 {returncode}"),
+            'kind': kind
+        }
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Encoder Probe Test ===")
+
+    from hardware_detector import HardwareDetector
+
+    detector = HardwareDetector()
+    detector.detect_gpu()
+    codecs = detector.get_available_codecs()
+
+    probe = EncoderProbe()
+    print(f"캐시 키: {probe.get_fingerprint()}")
+
+    def show(encoder_type, result):
+        if result['ok']:
+            print(f"  ✓ {encoder_type:12s} {result['fps_1080p']:8.1f} fps (1080p 환산)")
+        else:
+            print(f"  ✗ {encoder_type:12s} {FAILURE_LABELS.get(result['kind'], '')}: {result['error']}")
+
+    results = probe.probe(codecs, force=True, progress_callback=show)
+    print(f"권장 인코더: {recommend_encoder(results)}")
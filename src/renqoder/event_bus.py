@@ -0,0 +1,104 @@
+"""
+UI 이벤트 버스 모듈
+작업 스레드가 보내는 진행률/상태/로그를 모아 두었다가 UI 스레드에서 일정한 주기(기본 20Hz)로 한 번에 전달합니다.
+FFmpeg가 진행률 줄을 얼마나 자주 출력하든 UI 갱신 횟수는 프레임 주기로 제한되므로
+Tk 이벤트 큐가 넘치지 않습니다.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+# UI 전달 주기(ms) - 20Hz
+UI_FRAME_INTERVAL_MS = 50
+
+
+class EventBus:
+    """
+    주제(topic)별 최신 값만 남기는 스레드 안전 이벤트 버스
+
+    - publish(): 같은 주제의 값은 마지막 것만 전달 (예: 작업별 진행률)
+    - subscribe(): 주제마다 최소 전달 간격을 둘 수 있음 (목록 새로고침처럼 비싼 갱신)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = {}            # 주제 -> 아직 전달하지 않은 최신 값 (마지막 발행 순서)
+        self.handlers = {}          # 주제 -> [처리 함수]
+        self.intervals = {}         # 주제 -> 최소 전달 간격(초)
+        self.last_delivery = {}     # 주제 -> 마지막 전달 시각
+        self.stats = {'published': 0, 'delivered': 0, 'frames': 0}
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None], min_interval: float = 0.0):
+        """UI 스레드에서 호출될 처리 함수를 등록합니다."""
+        with self.lock:
+            self.handlers.setdefault(topic, []).append(handler)
+            self.intervals[topic] = max(self.intervals.get(topic, 0.0), min_interval)
+
+    def publish(self, topic: str, value: Any = None):
+        """값을 발행합니다 (아직 전달되지 않은 같은 주제의 이전 값은 대체됨). 어느 스레드에서나 호출 가능"""
+        with self.lock:
+            # 다시 넣어 전달 순서를 마지막 발행 순서로 유지 (완료 메시지가 이전 진행 상태에 덮이지 않도록)
+            self.latest.pop(topic, None)
+            self.latest[topic] = value
+            self.stats['published'] += 1
+
+    def dispatch(self):
+        """모인 이벤트를 처리 함수에 전달합니다 (UI 스레드에서 호출)."""
+        now = time.monotonic()
+        with self.lock:
+            ready = []
+            for topic in list(self.latest):
+                if now - self.last_delivery.get(topic, 0.0) < self.intervals.get(topic, 0.0):
+                    continue
+                ready.append((topic, self.latest.pop(topic)))
+                self.last_delivery[topic] = now
+            handlers = {topic: list(self.handlers.get(topic, [])) for topic, _ in ready}
+            self.stats['frames'] += 1
+            self.stats['delivered'] += len(ready)
+
+        for topic, value in ready:
+            for handler in handlers[topic]:
+                self._call(handler, value)
+
+    def _call(self, handler, value):
+        try:
+            handler(value)
+        except Exception as e:
+            print(f"UI 이벤트 처리 오류: {e}")
+
+    def start(self, widget, interval_ms: int = UI_FRAME_INTERVAL_MS):
+        """Tk 위젯의 after()로 주기적인 전달을 시작합니다."""
+        def tick():
+            self.dispatch()
+            widget.after(interval_ms, tick)
+
+        widget.after(interval_ms, tick)
+
+    def snapshot_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Event Bus Test ===")
+
+    bus = EventBus()
+    received = []
+    bus.subscribe('progress', lambda value: received.append(value))
+
+    def chatty_worker():
+        for i in range(10000):
+            bus.publish('progress', i)
+
+    threads = [threading.Thread(target=chatty_worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        bus.dispatch()
+        time.sleep(UI_FRAME_INTERVAL_MS / 1000)
+    bus.dispatch()
+
+    print(f"발행 {bus.stats['published']}회 -> UI 전달 {len(received)}회 (마지막 값 {received[-1]})")
@@ -0,0 +1,327 @@
+"""
+리소스 조절 모듈
+인코딩 프로세스의 CPU/I/O 우선순위, 일시정지/재개, CPU 사용률 상한을 관리합니다.
+"""
+
+import os
+import sys
+import threading
+import time
+import platform
+from typing import Dict, Optional
+
+
+# 우선순위 단계 -> (POSIX nice 값, Windows 우선순위 클래스)
+PRIORITY_LEVELS = {
+    'normal': (0, 0x00000020),        # NORMAL_PRIORITY_CLASS
+    'below_normal': (10, 0x00004000), # BELOW_NORMAL_PRIORITY_CLASS
+    'idle': (19, 0x00000040)          # IDLE_PRIORITY_CLASS
+}
+
+# I/O 단계 -> (Linux ioprio 클래스, 클래스 내 우선순위, Windows IoPriority)
+IO_LEVELS = {
+    'normal': (2, 4, 2),   # best-effort 기본 / IoPriorityNormal
+    'low': (2, 7, 1),      # best-effort 최저 / IoPriorityLow
+    'idle': (3, 0, 0)      # idle (다른 I/O가 없을 때만) / IoPriorityVeryLow
+}
+
+# ioprio_set 시스템 콜 번호 (아키텍처별)
+IOPRIO_SET_SYSCALLS = {
+    'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289,
+    'aarch64': 30, 'arm64': 30, 'armv7l': 314
+}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+
+# CPU 사용률 상한 제어 주기(초)
+CPU_CAP_PERIOD = 0.2
+
+
+def suspend_process(process):
+    """프로세스 전체를 정지합니다 (SIGSTOP / NtSuspendProcess)."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            ctypes.windll.ntdll.NtSuspendProcess(int(process._handle))
+        else:
+            import signal
+            os.kill(process.pid, signal.SIGSTOP)
+    except Exception as e:
+        print(f"프로세스 일시정지 실패: {e}")
+
+
+def resume_process(process):
+    """정지된 프로세스를 재개합니다 (SIGCONT / NtResumeProcess)."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            ctypes.windll.ntdll.NtResumeProcess(int(process._handle))
+        else:
+            import signal
+            os.kill(process.pid, signal.SIGCONT)
+    except Exception as e:
+        print(f"프로세스 재개 실패: {e}")
+
+
+class ResourceGovernor:
+    """
+    FFmpeg 프로세스의 시스템 자원 사용을 조절하는 클래스
+
+    우선순위/I/O 클래스는 프로세스의 모든 스레드에 적용되며 실행 중에도 변경할 수 있습니다.
+    CPU 상한은 프로세스를 짧은 주기로 정지/재개(SIGSTOP/SIGCONT, Windows는 NtSuspendProcess)하여
+    측정된 사용률이 전체 CPU 대비 지정한 비율을 넘지 않도록 조절합니다.
+    """
+
+    def __init__(self, priority='normal', io_priority='normal', cpu_cap=None):
+        """
+        Args:
+            priority: CPU 우선순위 ('normal', 'below_normal', 'idle')
+            io_priority: I/O 우선순위 ('normal', 'low', 'idle')
+            cpu_cap: 전체 CPU 대비 사용률 상한 (%, None이면 제한 없음)
+        """
+        self.priority = priority if priority in PRIORITY_LEVELS else 'normal'
+        self.io_priority = io_priority if io_priority in IO_LEVELS else 'normal'
+        self.cpu_cap = cpu_cap
+        self.paused = False
+        self.processes = []
+        self.lock = threading.Lock()
+        self.monitor_thread = None
+        self.cpu_count = os.cpu_count() or 1
+
+    # --- 프로세스 연결 ---
+
+    def attach(self, process):
+        """새로 시작된 프로세스에 현재 설정을 적용하고 관리 대상에 추가합니다."""
+        with self.lock:
+            self.processes.append(process)
+        self._apply_priority(process)
+        if self.paused:
+            self._suspend(process)
+        self._ensure_monitor()
+
+    def detach(self, process):
+        """종료된 프로세스를 관리 대상에서 제거합니다."""
+        with self.lock:
+            if process in self.processes:
+                self.processes.remove(process)
+
+    def release(self, process):
+        """프로세스를 종료하기 전에 관리 대상에서 빼고 정지 상태를 풉니다 (정지된 프로세스는 종료 신호를 처리하지 못함)."""
+        self.detach(process)
+        if process.poll() is None:
+            self._resume(process)
+
+    def _alive_processes(self):
+        with self.lock:
+            self.processes = [p for p in self.processes if p.poll() is None]
+            return list(self.processes)
+
+    # --- 설정 변경 (실행 중에도 즉시 반영) ---
+
+    def set_priority(self, priority=None, io_priority=None):
+        """CPU/I/O 우선순위를 바꾸고 실행 중인 프로세스에 즉시 적용합니다."""
+        if priority in PRIORITY_LEVELS:
+            self.priority = priority
+        if io_priority in IO_LEVELS:
+            self.io_priority = io_priority
+        for process in self._alive_processes():
+            self._apply_priority(process)
+
+    def set_cpu_cap(self, cpu_cap: Optional[float]):
+        """CPU 사용률 상한(%)을 설정합니다. None 또는 100 이상이면 제한을 해제합니다."""
+        self.cpu_cap = cpu_cap if cpu_cap and cpu_cap < 100 else None
+        self._ensure_monitor()
+
+    def pause(self):
+        """관리 중인 모든 프로세스를 일시정지합니다."""
+        self.paused = True
+        for process in self._alive_processes():
+            self._suspend(process)
+
+    def resume(self):
+        """일시정지된 프로세스를 재개합니다."""
+        self.paused = False
+        for process in self._alive_processes():
+            self._resume(process)
+
+    def get_status(self) -> Dict:
+        return {
+            'priority': self.priority,
+            'io_priority': self.io_priority,
+            'cpu_cap': self.cpu_cap,
+            'paused': self.paused,
+            'processes': len(self._alive_processes())
+        }
+
+    # --- 우선순위 적용 ---
+
+    def _apply_priority(self, process):
+        nice_value, priority_class = PRIORITY_LEVELS[self.priority]
+        io_class, io_data, win_io = IO_LEVELS[self.io_priority]
+        try:
+            if sys.platform == "win32":
+                self._apply_priority_windows(process, priority_class, win_io)
+            else:
+                # nice/ioprio는 스레드 단위이므로 이미 생성된 스레드 모두에 적용
+                for tid in self._thread_ids(process.pid):
+                    try:
+                        os.setpriority(os.PRIO_PROCESS, tid, nice_value)
+                    except (OSError, PermissionError):
+                        # 권한 없이 우선순위를 다시 올릴 수는 없음 (낮추는 것만 가능)
+                        pass
+                    self._ioprio_set(tid, io_class, io_data)
+        except Exception as e:
+            print(f"우선순위 적용 실패: {e}")
+
+    def _thread_ids(self, pid):
+        task_dir = f"/proc/{pid}/task"
+        try:
+            return [int(tid) for tid in os.listdir(task_dir)]
+        except OSError:
+            return [pid]
+
+    def _ioprio_set(self, tid, io_class, io_data):
+        """Linux ioprio_set 시스템 콜 (ionice와 동일)"""
+        if not sys.platform.startswith("linux"):
+            return False
+        syscall_number = IOPRIO_SET_SYSCALLS.get(platform.machine().lower())
+        if syscall_number is None:
+            return False
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            value = (io_class << IOPRIO_CLASS_SHIFT) | io_data
+            return libc.syscall(syscall_number, IOPRIO_WHO_PROCESS, tid, value) == 0
+        except Exception:
+            return False
+
+    def _apply_priority_windows(self, process, priority_class, io_priority):
+        import ctypes
+        handle = int(process._handle)
+        ctypes.windll.kernel32.SetPriorityClass(handle, priority_class)
+
+        # ProcessIoPriority (33)
+        value = ctypes.c_ulong(io_priority)
+        ctypes.windll.ntdll.NtSetInformationProcess(handle, 33, ctypes.byref(value), ctypes.sizeof(value))
+
+    # --- 일시정지/재개 ---
+
+    def _suspend(self, process):
+        suspend_process(process)
+
+    def _resume(self, process):
+        resume_process(process)
+
+    # --- CPU 사용률 상한 ---
+
+    def _cpu_seconds(self, process) -> Optional[float]:
+        """프로세스의 누적 CPU 시간(초, 모든 스레드 합계)"""
+        try:
+            if sys.platform == "win32":
+                import ctypes
+                from ctypes import wintypes
+                creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+                ok = ctypes.windll.kernel32.GetProcessTimes(
+                    int(process._handle), ctypes.byref(creation), ctypes.byref(exit_time),
+                    ctypes.byref(kernel), ctypes.byref(user)
+                )
+                if not ok:
+                    return None
+                to_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+                return (to_int(kernel) + to_int(user)) / 1e7
+
+            with open(f"/proc/{process.pid}/stat", 'r') as f:
+                # comm 필드에 공백이 있을 수 있으므로 마지막 ')' 이후부터 파싱
+                fields = f.read().rsplit(')', 1)[1].split()
+            ticks = os.sysconf('SC_CLK_TCK')
+            return (int(fields[11]) + int(fields[12])) / ticks
+        except Exception:
+            return None
+
+    def _ensure_monitor(self):
+        if self.cpu_cap is None:
+            return
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            return
+        self.monitor_thread = threading.Thread(target=self._cap_loop, daemon=True)
+        self.monitor_thread.start()
+
+    def _cap_loop(self):
+        """
+        실행 비율(duty)을 조절하는 루프: 주기마다 duty 비율만큼 실행시키고 나머지는 정지합니다.
+        측정된 사용률에 맞춰 duty를 보정하므로 멀티스레드 인코더도 상한에 수렴합니다.
+        """
+        duty = 1.0
+        last_cpu = None
+        last_time = time.time()
+
+        while self.cpu_cap is not None:
+            processes = self._alive_processes()
+            if not processes:
+                # 다음 작업이 연결될 때까지 대기 (대기열 실행 중 작업 사이 구간)
+                time.sleep(CPU_CAP_PERIOD)
+                last_cpu = None
+                continue
+
+            if self.paused:
+                time.sleep(CPU_CAP_PERIOD)
+                last_cpu = None
+                continue
+
+            run_time = CPU_CAP_PERIOD * duty
+            time.sleep(run_time)
+
+            if duty < 1.0 and self.cpu_cap is not None and not self.paused:
+                for process in processes:
+                    self._suspend(process)
+                time.sleep(CPU_CAP_PERIOD - run_time)
+                if not self.paused:
+                    for process in processes:
+                        self._resume(process)
+
+            # 사용률 측정 후 duty 보정
+            samples = [self._cpu_seconds(p) for p in processes]
+            now = time.time()
+            if any(sample is None for sample in samples):
+                # 측정 불가 환경: 단순 비율로 제한
+                duty = max(0.05, (self.cpu_cap or 100) / 100)
+                continue
+
+            cpu_total = sum(samples)
+            if last_cpu is not None and now > last_time and cpu_total >= last_cpu:
+                usage = (cpu_total - last_cpu) / (now - last_time) / self.cpu_count * 100
+                if usage > 0:
+                    duty = min(1.0, max(0.05, duty * (self.cpu_cap or 100) / usage))
+            last_cpu = cpu_total
+            last_time = now
+
+        # 제한 해제 시 정지된 상태로 남지 않도록 재개
+        if not self.paused:
+            for process in self._alive_processes():
+                self._resume(process)
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Resource Governor Test ===")
+
+    import subprocess
+
+    busy = subprocess.Popen([sys.executable, '-c', 'while True: pass'])
+    governor = ResourceGovernor(priority='idle', io_priority='idle', cpu_cap=20)
+    governor.attach(busy)
+
+    try:
+        start_cpu = governor._cpu_seconds(busy)
+        time.sleep(3)
+        used = governor._cpu_seconds(busy) - start_cpu
+        print(f"CPU 상한 20% (전체 {governor.cpu_count}코어 기준): 측정 사용률 {used / 3 / governor.cpu_count * 100:.1f}%")
+
+        governor.pause()
+        paused_cpu = governor._cpu_seconds(busy)
+        time.sleep(1)
+        print(f"일시정지 중 CPU 증가량: {governor._cpu_seconds(busy) - paused_cpu:.3f}초")
+        governor.resume()
+    finally:
+        governor.set_cpu_cap(None)
+        busy.kill()
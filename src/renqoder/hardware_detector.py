@@ -8,6 +8,44 @@ import platform
 import os
 
 
+# 감지할 코덱 맵핑 (우선순위 순)
+# 포맷: (ffmpeg_encoder_name, ui_label, type, description, vendor)
+TARGET_CODECS = [
+    # Hardware - NVIDIA
+    ('hevc_nvenc', 'HEVC (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 HEVC 인코딩', 'NVIDIA'),
+    ('h264_nvenc', 'H.264 (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 H.264 인코딩', 'NVIDIA'),
+    ('av1_nvenc', 'AV1 (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 AV1 인코딩 (RTX 40 시리즈 이상)', 'NVIDIA'),
+    
+    # Hardware - Intel QSV
+    ('hevc_qsv', 'HEVC (Intel QSV)', 'hardware', 'Intel 내장/외장 그래픽을 사용한 고속 HEVC 인코딩', 'Intel'),
+    ('h264_qsv', 'H.264 (Intel QSV)', 'hardware', 'Intel 내장/외장 그래픽을 사용한 고속 H.264 인코딩', 'Intel'),
+    ('vp9_qsv', 'VP9 (Intel QSV)', 'hardware', 'Intel 그래픽을 사용한 고속 VP9 인코딩', 'Intel'),
+    ('av1_qsv', 'AV1 (Intel QSV)', 'hardware', 'Intel Arc/14세대 이상 그래픽을 사용한 고속 AV1 인코딩', 'Intel'),
+    
+    # Hardware - AMD AMF
+    ('hevc_amf', 'HEVC (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 HEVC 인코딩', 'AMD'),
+    ('h264_amf', 'H.264 (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 H.264 인코딩', 'AMD'),
+    ('av1_amf', 'AV1 (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 AV1 인코딩 (RX 7000 시리즈 이상)', 'AMD'),
+    
+    # Software
+    ('libx265', 'HEVC (x265)', 'software', '가장 대중적인 고효율 소프트웨어 HEVC 인코더', 'CPU'),
+    ('libx264', 'H.264 (x264)', 'software', '최고의 안정성과 호환성을 가진 소프트웨어 H.264 인코더', 'CPU'),
+    ('libvpx-vp9', 'VP9 (libvpx)', 'software', 'Google의 오픈소스 고성능 비디오 코덱', 'CPU'),
+    ('libaom-av1', 'AV1 (libaom)', 'software', '차세대 표준 AV1 코덱 (느리지만 매우 높은 압축률)', 'CPU'),
+    ('libsvtav1', 'AV1 (SVT-AV1)', 'software', '인텔에서 개발한 고속 AV1 소프트웨어 인코더', 'CPU'),
+    ('libvpx', 'VP8 (libvpx)', 'software', '웹용 구형 오픈소스 코덱', 'CPU'),
+    ('mpeg4', 'MPEG-4 (Xvid)', 'software', '오래된 장치 호환성을 위한 MPEG-4 코덱', 'CPU'),
+]
+
+# GPU 제조사별 권장 인코더 (GPU 감지와 이전 실행 결과 복원이 함께 사용)
+VENDOR_ENCODERS = {
+    'NVIDIA': ('hevc_nvenc', 'NVIDIA NVENC'),
+    'Intel': ('hevc_qsv', 'Intel Quick Sync Video'),
+    'AMD': ('hevc_amf', 'AMD AMF'),
+    'CPU': ('libx265', 'CPU (libx265)'),
+}
+
+
 class HardwareDetector:
     """시스템 하드웨어를 감지하고 최적의 인코더를 제안하는 클래스"""
     
@@ -45,24 +83,15 @@ class HardwareDetector:
             
             # NVIDIA 우선 확인
             if 'nvidia' in gpu_info or 'geforce' in gpu_info or 'rtx' in gpu_info or 'gtx' in gpu_info:
-                self.gpu_vendor = "NVIDIA"
-                self.recommended_encoder = "hevc_nvenc"
-                self.encoder_name = "NVIDIA NVENC"
-                return True
+                return self._set_vendor("NVIDIA")
             
             # Intel 확인
             elif 'intel' in gpu_info:
-                self.gpu_vendor = "Intel"
-                self.recommended_encoder = "hevc_qsv"
-                self.encoder_name = "Intel Quick Sync Video"
-                return True
+                return self._set_vendor("Intel")
             
             # AMD 확인
             elif 'amd' in gpu_info or 'radeon' in gpu_info:
-                self.gpu_vendor = "AMD"
-                self.recommended_encoder = "hevc_amf"
-                self.encoder_name = "AMD AMF"
-                return True
+                return self._set_vendor("AMD")
             
             else:
                 return self._detect_gpu_fallback()
@@ -71,12 +100,24 @@ class HardwareDetector:
             print(f"GPU 감지 중 오류: {e}")
             return self._detect_gpu_fallback()
     
+    def restore(self, vendor):
+        """
+        이전 실행에서 감지한 GPU 제조사로 미리 설정합니다 (감지가 끝나기 전 화면 표시용).
+        알 수 없는 값이면 CPU 인코더를 사용합니다.
+        """
+        if vendor not in VENDOR_ENCODERS:
+            return self._detect_gpu_fallback()
+        return self._set_vendor(vendor)
+
+    def _set_vendor(self, vendor):
+        """제조사와 그에 맞는 권장 인코더를 설정합니다. GPU 인코더면 True"""
+        self.gpu_vendor = vendor
+        self.recommended_encoder, self.encoder_name = VENDOR_ENCODERS[vendor]
+        return vendor != 'CPU'
+
     def _detect_gpu_fallback(self):
         """GPU를 감지하지 못한 경우 CPU 인코더 사용"""
-        self.gpu_vendor = "CPU"
-        self.recommended_encoder = "libx265"
-        self.encoder_name = "CPU (libx265)"
-        return False
+        return self._set_vendor("CPU")
     
     def get_encoder_info(self):
         """현재 감지된 인코더 정보를 반환합니다."""
@@ -98,37 +139,18 @@ class HardwareDetector:
 
 
     
-    def get_available_codecs(self):
-        """시스템에서 사용 가능한 모든 FFmpeg 비디오 코덱 목록을 반환합니다."""
-        # 감지할 코덱 맵핑 (우선순위 순)
-        # 포맷: (ffmpeg_encoder_name, ui_label, type, description, vendor)
-        target_codecs = [
-            # Hardware - NVIDIA
-            ('hevc_nvenc', 'HEVC (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 HEVC 인코딩', 'NVIDIA'),
-            ('h264_nvenc', 'H.264 (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 H.264 인코딩', 'NVIDIA'),
-            ('av1_nvenc', 'AV1 (NVIDIA NVENC)', 'hardware', 'NVIDIA GPU를 사용한 고속 AV1 인코딩 (RTX 40 시리즈 이상)', 'NVIDIA'),
-            
-            # Hardware - Intel QSV
-            ('hevc_qsv', 'HEVC (Intel QSV)', 'hardware', 'Intel 내장/외장 그래픽을 사용한 고속 HEVC 인코딩', 'Intel'),
-            ('h264_qsv', 'H.264 (Intel QSV)', 'hardware', 'Intel 내장/외장 그래픽을 사용한 고속 H.264 인코딩', 'Intel'),
-            ('vp9_qsv', 'VP9 (Intel QSV)', 'hardware', 'Intel 그래픽을 사용한 고속 VP9 인코딩', 'Intel'),
-            ('av1_qsv', 'AV1 (Intel QSV)', 'hardware', 'Intel Arc/14세대 이상 그래픽을 사용한 고속 AV1 인코딩', 'Intel'),
-            
-            # Hardware - AMD AMF
-            ('hevc_amf', 'HEVC (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 HEVC 인코딩', 'AMD'),
-            ('h264_amf', 'H.264 (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 H.264 인코딩', 'AMD'),
-            ('av1_amf', 'AV1 (AMD AMF)', 'hardware', 'AMD GPU를 사용한 고속 AV1 인코딩 (RX 7000 시리즈 이상)', 'AMD'),
-            
-            # Software
-            ('libx265', 'HEVC (x265)', 'software', '가장 대중적인 고효율 소프트웨어 HEVC 인코더', 'CPU'),
-            ('libx264', 'H.264 (x264)', 'software', '최고의 안정성과 호환성을 가진 소프트웨어 H.264 인코더', 'CPU'),
-            ('libvpx-vp9', 'VP9 (libvpx)', 'software', 'Google의 오픈소스 고성능 비디오 코덱', 'CPU'),
-            ('libaom-av1', 'AV1 (libaom)', 'software', '차세대 표준 AV1 코덱 (느리지만 매우 높은 압축률)', 'CPU'),
-            ('libsvtav1', 'AV1 (SVT-AV1)', 'software', '인텔에서 개발한 고속 AV1 소프트웨어 인코더', 'CPU'),
-            ('libvpx', 'VP8 (libvpx)', 'software', '웹용 구형 오픈소스 코덱', 'CPU'),
-            ('mpeg4', 'MPEG-4 (Xvid)', 'software', '오래된 장치 호환성을 위한 MPEG-4 코덱', 'CPU'),
-        ]
+    def set_recommended_encoder(self, encoder_id, name=None):
+        """실측 결과 등으로 권장 인코더를 지정합니다."""
+        self.recommended_encoder = encoder_id
+        self.encoder_name = name or encoder_id
 
+    def get_available_codecs(self, probe_results=None):
+        """
+        시스템에서 사용 가능한 모든 FFmpeg 비디오 코덱 목록을 반환합니다.
+        
+        Args:
+            probe_results: EncoderProbe 측정 결과 (있으면 실제 인코딩 성공 여부로 사용 가능 여부 판단)
+        """
         found_ids = set()
         
         # 실제 시스템에 존재하는 GPU 벤더 목록 확인 (중복 벤더 대응)
@@ -174,29 +196,49 @@ class HardwareDetector:
 
         # 2. 모든 코덱 정보 구성 (지원 여부 + 하드웨어 검증 포함)
         all_info = []
-        for target_id, label, c_type, desc, vendor in target_codecs:
-            is_available = target_id in found_ids
+        for target_id, label, c_type, desc, vendor in TARGET_CODECS:
+            compiled = target_id in found_ids
+            is_available = compiled
             
             # 하드웨어 코덱의 경우, FFmpeg 목록에 있더라도 실제 하드웨어 정보와 일치해야 함
             if c_type == 'hardware':
                 if vendor not in present_vendors:
                     is_available = False
             
-            # 추천 코덱은 무조건 available로 표시 시도
-            if not is_available and target_id == self.recommended_encoder and self.gpu_vendor != "CPU":
-                is_available = True
+            # 실측 결과가 있으면 이름 매칭 대신 실제 인코딩 성공 여부를 따름
+            probe = (probe_results or {}).get(target_id)
+            if compiled and probe is not None:
+                is_available = probe['ok']
                 
             all_info.append({
                 'id': target_id,
                 'label': label,
                 'type': c_type,
                 'available': is_available,
+                'compiled': compiled,
                 'description': desc,
-                'vendor': vendor
+                'vendor': vendor,
+                'fps': probe['fps_1080p'] if probe and probe['ok'] else None,
+                'error': probe['error'] if probe and not probe['ok'] else None
             })
             
         return all_info
 
+    def get_provisional_codecs(self):
+        """
+        FFmpeg 인코더 목록을 조회하기 전에 쓸 임시 코덱 목록 (권장 인코더 + 기본 소프트웨어 인코더).
+        get_available_codecs()와 같은 형식이며, 실제 목록은 백그라운드 조회가 끝나면 교체됩니다.
+        """
+        keep = {self.recommended_encoder, 'libx265', 'libx264'}
+        return [
+            {
+                'id': target_id, 'label': label, 'type': c_type, 'available': True, 'compiled': True,
+                'description': desc, 'vendor': vendor, 'fps': None, 'error': None
+            }
+            for target_id, label, c_type, desc, vendor in TARGET_CODECS
+            if target_id in keep
+        ]
+
     def _get_fallback_codecs(self):
         """코덱 검색 실패 시 기본 목록 반환"""
         return [
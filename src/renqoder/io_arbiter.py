@@ -0,0 +1,464 @@
+"""
+디스크 I/O 중재 모듈
+폴더 탐색, ffprobe, 정밀 스캔(ffmpeg -f null), 인코딩이 같은 물리 장치를 동시에 읽을 때
+장치별 동시 접근 수와 대역폭 예산을 나눠 씁니다.
+HDD는 여러 곳을 동시에 읽으면 헤드 이동으로 전체 처리량이 크게 떨어지므로 한 번에 하나씩,
+SSD는 여러 개를 동시에 허용합니다.
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from governor import suspend_process, resume_process
+from task_executor import current_token, TaskCancelled
+
+
+# 우선순위 (작을수록 먼저)
+IO_INTERACTIVE = 'interactive'      # 사용자가 직접 요청한 분석 (파일 선택, 재분석)
+IO_ENCODE = 'encode'                # 인코딩 입력 읽기
+IO_BACKGROUND = 'background'        # 폴더 탐색, 목록 메타데이터 수집, 정밀 스캔
+
+IO_PRIORITY_ORDER = {IO_INTERACTIVE: 0, IO_ENCODE: 1, IO_BACKGROUND: 2}
+
+MB = 1024 * 1024
+
+# 장치 종류별 기본 예산 (동시 접근 수, 대역폭 바이트/초 - None이면 제한 없음)
+DEVICE_BUDGETS = {
+    'hdd': {'concurrency': 1, 'bandwidth': 80 * MB},
+    'ssd': {'concurrency': 4, 'bandwidth': None},
+    'network': {'concurrency': 2, 'bandwidth': 40 * MB},
+    'fixed': {'concurrency': 2, 'bandwidth': None},     # Windows에서 HDD/SSD를 조회하지 못한 로컬 드라이브
+    'unknown': {'concurrency': 2, 'bandwidth': None},
+}
+
+NETWORK_FILESYSTEMS = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', 'sshfs', '9p', 'afs', 'ceph'}
+
+# 대역폭 측정/조절 주기(초)
+BANDWIDTH_PERIOD = 0.5
+
+
+def _existing_path(path: str) -> str:
+    """아직 없는 경로(출력 파일 등)는 존재하는 가장 가까운 상위 폴더로 바꿉니다."""
+    current = os.path.abspath(path)
+    while not os.path.exists(current):
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return current
+
+
+def _linux_mount_source(major: int, minor: int) -> Tuple[str, str]:
+    """/proc/self/mountinfo에서 장치 번호에 해당하는 (파일 시스템, 원본) 조회"""
+    try:
+        with open('/proc/self/mountinfo', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10 or fields[2] != f"{major}:{minor}":
+                    continue
+                sep = fields.index('-')
+                return fields[sep + 1], fields[sep + 2]
+    except (OSError, ValueError):
+        pass
+    return 'unknown', f"{major}:{minor}"
+
+
+def _linux_device(path: str) -> Tuple[str, str]:
+    st = os.stat(path)
+    major, minor = os.major(st.st_dev), os.minor(st.st_dev)
+
+    if major == 0:
+        # 블록 장치가 없는 파일 시스템 (NFS/SMB/FUSE/tmpfs 등)
+        fstype, source = _linux_mount_source(major, minor)
+        kind = 'network' if fstype in NETWORK_FILESYSTEMS else 'unknown'
+        return f"{fstype}:{source}", kind
+
+    block = Path(f'/sys/dev/block/{major}:{minor}')
+    try:
+        block = block.resolve()
+        if (block / 'partition').exists():
+            # 파티션은 같은 디스크를 공유하므로 상위 디스크 단위로 묶음
+            block = block.parent
+        rotational = (block / 'queue' / 'rotational').read_text().strip()
+        return block.name, 'hdd' if rotational == '1' else 'ssd'
+    except OSError:
+        return f"{major}:{minor}", 'unknown'
+
+
+def _windows_seek_penalty(drive: str) -> Optional[bool]:
+    """
+    드라이브가 탐색 지연(seek penalty)이 있는 회전식 디스크인지 조회합니다.
+    (IOCTL_STORAGE_QUERY_PROPERTY / StorageDeviceSeekPenaltyProperty, 관리자 권한 불필요)
+
+    Returns:
+        HDD면 True, SSD면 False, 조회할 수 없으면 None
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class STORAGE_PROPERTY_QUERY(ctypes.Structure):
+        _fields_ = [('PropertyId', ctypes.c_int), ('QueryType', ctypes.c_int),
+                    ('AdditionalParameters', ctypes.c_ubyte * 1)]
+
+    class DEVICE_SEEK_PENALTY_DESCRIPTOR(ctypes.Structure):
+        _fields_ = [('Version', wintypes.DWORD), ('Size', wintypes.DWORD), ('IncursSeekPenalty', wintypes.BOOLEAN)]
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    # 접근 권한 0: 속성 조회만 하므로 볼륨을 읽기 위해 열 필요 없음
+    handle = kernel32.CreateFileW(f"\\\\.\\{drive}", 0, 0x1 | 0x2, None, 3, 0, None)  # FILE_SHARE_READ|WRITE, OPEN_EXISTING
+    if not handle or handle == wintypes.HANDLE(-1).value:
+        return None
+    try:
+        query = STORAGE_PROPERTY_QUERY(7, 0)  # StorageDeviceSeekPenaltyProperty, PropertyStandardQuery
+        descriptor = DEVICE_SEEK_PENALTY_DESCRIPTOR()
+        returned = wintypes.DWORD()
+        ok = kernel32.DeviceIoControl(
+            wintypes.HANDLE(handle), 0x2D1400,  # IOCTL_STORAGE_QUERY_PROPERTY
+            ctypes.byref(query), ctypes.sizeof(query),
+            ctypes.byref(descriptor), ctypes.sizeof(descriptor),
+            ctypes.byref(returned), None
+        )
+        if not ok or returned.value <= DEVICE_SEEK_PENALTY_DESCRIPTOR.IncursSeekPenalty.offset:
+            return None
+        return bool(descriptor.IncursSeekPenalty)
+    finally:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+
+def _windows_device(path: str) -> Tuple[str, str]:
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if drive.startswith('\\\\'):
+        return drive.lower(), 'network'
+    try:
+        import ctypes
+        if ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == 4:    # DRIVE_REMOTE
+            return drive.upper(), 'network'
+    except Exception:
+        pass
+    try:
+        seek_penalty = _windows_seek_penalty(drive)
+    except Exception:
+        seek_penalty = None
+    if seek_penalty is None:
+        return drive.upper(), 'fixed'
+    return drive.upper(), 'hdd' if seek_penalty else 'ssd'
+
+
+@lru_cache(maxsize=4096)
+def _device_for_dir(directory: str) -> Tuple[str, str]:
+    try:
+        if sys.platform == "win32":
+            return _windows_device(directory)
+        return _linux_device(_existing_path(directory))
+    except Exception:
+        return 'unknown', 'unknown'
+
+
+def get_device_key(path: str) -> Tuple[str, str]:
+    """
+    경로가 속한 물리 장치를 구합니다.
+
+    Returns:
+        (장치 키, 종류) - 종류는 'hdd' | 'ssd' | 'network' | 'fixed' | 'unknown'
+    """
+    return _device_for_dir(os.path.dirname(os.path.abspath(path)) or path)
+
+
+def is_process_stopped(process) -> bool:
+    """프로세스가 정지(SIGSTOP/작업 제어) 상태인지 확인합니다 (Linux 전용, 그 외에는 False)."""
+    try:
+        with open(f'/proc/{process.pid}/stat', encoding='ascii', errors='replace') as f:
+            # 형식: "pid (실행 파일 이름) 상태 ..." - 이름에 공백/괄호가 있을 수 있어 마지막 ')' 기준
+            return f.read().rsplit(')', 1)[1].split()[0] in ('T', 't')
+    except (OSError, IndexError):
+        return False
+
+
+def read_process_io(process) -> Optional[int]:
+    """프로세스가 지금까지 읽은 바이트 수 (조회 불가 시 None)"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class IO_COUNTERS(ctypes.Structure):
+                _fields_ = [(name, ctypes.c_ulonglong) for name in (
+                    'ReadOperationCount', 'WriteOperationCount', 'OtherOperationCount',
+                    'ReadTransferCount', 'WriteTransferCount', 'OtherTransferCount')]
+
+            counters = IO_COUNTERS()
+            if ctypes.windll.kernel32.GetProcessIoCounters(int(process._handle), ctypes.byref(counters)):
+                return counters.ReadTransferCount
+            return None
+
+        values = {}
+        with open(f'/proc/{process.pid}/io', encoding='ascii') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                values[key] = int(value)
+        # 실제 디스크 읽기(read_bytes)가 없으면 캐시 포함 읽기량(rchar) 사용
+        return values.get('read_bytes') or values.get('rchar')
+    except Exception:
+        return None
+
+
+class IOArbiter:
+    """
+    장치별 I/O 중재기
+
+    - slot(): 짧은 읽기 작업(폴더 탐색, ffprobe, 정밀 스캔)의 장치별 동시 실행 수를 제한합니다.
+      대기열은 우선순위 순이며, 사용자 요청(interactive)은 한도를 하나 넘겨서라도 바로 실행합니다.
+    - track(): 오래 실행되는 프로세스의 읽기 속도를 측정해, 장치 대역폭 예산을 넘으면
+      백그라운드 프로세스를 잠시 멈춰 인코딩/사용자 요청에 대역폭을 양보합니다.
+      slot() 안에서 등록한 프로세스가 멈춰 있는 동안(대역폭 양보, 외부 SIGSTOP)에는
+      슬롯을 다른 대기 작업에 빌려주고, 다시 실행되면 돌려받습니다.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.devices = {}
+        self.budget_overrides = {}
+        self.sequence = itertools.count()
+        self.tracked = {}
+        self.monitor_thread = None
+        self.local = threading.local()  # 스레드별로 잡고 있는 슬롯 (track()이 프로세스와 연결)
+
+    def _device(self, key: str, kind: str) -> Dict:
+        state = self.devices.get(key)
+        if state is None:
+            budget = dict(DEVICE_BUDGETS.get(kind, DEVICE_BUDGETS['unknown']))
+            budget.update(self.budget_overrides.get(key, {}))
+            state = {
+                'kind': kind,
+                'concurrency': budget['concurrency'],
+                'bandwidth': budget['bandwidth'],
+                'active': 0,
+                'waiting': [],
+                'rate': 0.0
+            }
+            self.devices[key] = state
+        return state
+
+    def set_budget(self, device: str, concurrency: Optional[int] = None, bandwidth: Optional[int] = None):
+        """장치 예산을 바꿉니다 (bandwidth: 바이트/초, 0이면 제한 없음)."""
+        with self.condition:
+            override = self.budget_overrides.setdefault(device, {})
+            if concurrency is not None:
+                override['concurrency'] = max(1, int(concurrency))
+            if bandwidth is not None:
+                override['bandwidth'] = int(bandwidth) or None
+            state = self.devices.get(device)
+            if state is not None:
+                state.update(override)
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, path: str, priority: str = IO_BACKGROUND):
+        """
+        경로가 속한 장치의 접근 슬롯을 얻어 블록 안에서 사용합니다.
+
+        Usage:
+            with get_io_arbiter().slot(filepath, IO_BACKGROUND):
+                subprocess.run(['ffprobe', ...])
+        """
+        key, kind = get_device_key(path)
+        entry = (IO_PRIORITY_ORDER.get(priority, 2), next(self.sequence))
+        # 기다리는 동안 작업이 취소되면 바로 깨어나 대기열에서 빠짐
+        token = current_token()
+        wake = self._wake_waiters
+        if token is not None:
+            token.add_callback(wake)
+        try:
+            with self.condition:
+                state = self._device(key, kind)
+                heapq.heappush(state['waiting'], entry)
+                limit = state['concurrency'] + (1 if priority == IO_INTERACTIVE else 0)
+                while state['waiting'][0] != entry or state['active'] >= limit:
+                    if token is not None and token.cancelled:
+                        state['waiting'].remove(entry)
+                        heapq.heapify(state['waiting'])
+                        self.condition.notify_all()
+                        raise TaskCancelled()
+                    self.condition.wait()
+                    limit = state['concurrency'] + (1 if priority == IO_INTERACTIVE else 0)
+                heapq.heappop(state['waiting'])
+                state['active'] += 1
+                self.condition.notify_all()
+        finally:
+            if token is not None:
+                token.remove_callback(wake)
+
+        holder = {'device': key, 'lent': False, 'released': False}
+        holders = self._holders()
+        holders.append(holder)
+        try:
+            yield key
+        finally:
+            holders.remove(holder)
+            with self.condition:
+                holder['released'] = True
+                # 빌려준 슬롯은 이미 active에서 빠져 있음
+                if not holder['lent']:
+                    state['active'] -= 1
+                self.condition.notify_all()
+
+    def _holders(self):
+        holders = getattr(self.local, 'holders', None)
+        if holders is None:
+            holders = self.local.holders = []
+        return holders
+
+    def _wake_waiters(self):
+        with self.condition:
+            self.condition.notify_all()
+
+    def track(self, process, path: str, priority: str = IO_BACKGROUND):
+        """실행 중인 프로세스를 장치 대역폭 예산에 등록합니다."""
+        key, kind = get_device_key(path)
+        # 같은 스레드가 이 장치의 슬롯을 잡고 있으면 프로세스와 연결 (멈춘 동안 슬롯 양보)
+        holder = next((h for h in reversed(self._holders()) if h['device'] == key), None)
+        with self.condition:
+            self._device(key, kind)
+            self.tracked[process] = {
+                'device': key,
+                'priority': priority,
+                'last_bytes': read_process_io(process),
+                'suspended': False,
+                'holder': holder
+            }
+            if self.monitor_thread is None or not self.monitor_thread.is_alive():
+                self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+                self.monitor_thread.start()
+
+    def untrack(self, process):
+        with self.condition:
+            entry = self.tracked.pop(process, None)
+            if entry:
+                self._set_lent(entry, False)
+        if entry and entry['suspended'] and process.poll() is None:
+            resume_process(process)
+
+    def is_throttled(self, process) -> bool:
+        """대역폭 예산 때문에 멈춰 있는 프로세스인지 확인합니다."""
+        with self.condition:
+            entry = self.tracked.get(process)
+            return bool(entry and entry['suspended'])
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """장치별 상태 (종류, 예산, 사용 중 슬롯, 대기 수, 최근 읽기 속도)"""
+        with self.condition:
+            return {
+                key: {
+                    'kind': s['kind'], 'concurrency': s['concurrency'], 'bandwidth': s['bandwidth'],
+                    'active': s['active'], 'waiting': len(s['waiting']), 'rate': s['rate']
+                }
+                for key, s in self.devices.items()
+            }
+
+    def _set_lent(self, entry, lent: bool):
+        """연결된 슬롯을 빌려주거나(active 감소) 돌려받습니다 (condition을 잡은 상태에서 호출)."""
+        holder = entry.get('holder')
+        if holder is None or holder['released'] or holder['lent'] == lent:
+            return
+        holder['lent'] = lent
+        # 돌려받을 때는 한도를 잠시 넘을 수 있음 (재개된 작업을 다시 기다리게 하지 않음)
+        self.devices[entry['device']]['active'] += -1 if lent else 1
+        self.condition.notify_all()
+
+    def _monitor_loop(self):
+        while True:
+            time.sleep(BANDWIDTH_PERIOD)
+            with self.condition:
+                if not self.tracked:
+                    self.monitor_thread = None
+                    return
+                items = list(self.tracked.items())
+
+            rates = {}
+            stopped = set()
+            for process, entry in items:
+                if process.poll() is not None:
+                    continue
+                if entry['holder'] is not None and is_process_stopped(process):
+                    stopped.add(process)
+                current = read_process_io(process)
+                if current is not None and entry['last_bytes'] is not None:
+                    rate = max(0, current - entry['last_bytes']) / BANDWIDTH_PERIOD
+                    rates[entry['device']] = rates.get(entry['device'], 0.0) + rate
+                entry['last_bytes'] = current
+
+            with self.condition:
+                for key, state in self.devices.items():
+                    state['rate'] = rates.get(key, 0.0)
+
+                for process, entry in items:
+                    if entry['priority'] != IO_BACKGROUND or process not in self.tracked:
+                        continue
+                    state = self.devices[entry['device']]
+                    budget = state['bandwidth']
+                    if not budget:
+                        continue
+                    # 예산 초과 시 멈추고, 여유가 생기면 재개 (듀티 사이클)
+                    if not entry['suspended'] and state['rate'] > budget:
+                        suspend_process(process)
+                        entry['suspended'] = True
+                    elif entry['suspended'] and state['rate'] < budget * 0.8:
+                        resume_process(process)
+                        entry['suspended'] = False
+
+                # 멈춘 프로세스가 잡고 있는 슬롯은 대기 중인 작업에 빌려줌 (HDD 슬롯이 하나뿐인 경우 등)
+                for process, entry in items:
+                    if process in self.tracked:
+                        self._set_lent(entry, entry['suspended'] or process in stopped)
+
+
+_shared_arbiter = None
+_shared_lock = threading.Lock()
+
+
+def get_io_arbiter() -> IOArbiter:
+    """프로그램 전체가 함께 쓰는 중재기"""
+    global _shared_arbiter
+    with _shared_lock:
+        if _shared_arbiter is None:
+            _shared_arbiter = IOArbiter()
+        return _shared_arbiter
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== I/O Arbiter Test ===")
+
+    for path in [os.getcwd(), str(Path.home()), '/tmp']:
+        print(f"{path}: {get_device_key(os.path.join(path, 'x'))}")
+
+    arbiter = IOArbiter()
+    arbiter.set_budget(get_device_key(__file__)[0], concurrency=1)
+    order = []
+
+    def worker(name, priority, hold):
+        with arbiter.slot(__file__, priority):
+            order.append(name)
+            time.sleep(hold)
+
+    first = threading.Thread(target=worker, args=('background-1', IO_BACKGROUND, 0.5))
+    first.start()
+    time.sleep(0.1)
+    threads = [threading.Thread(target=worker, args=(name, priority, 0.1)) for name, priority in [
+        ('background-2', IO_BACKGROUND), ('encode', IO_ENCODE), ('interactive', IO_INTERACTIVE)
+    ]]
+    for t in threads:
+        t.start()
+        time.sleep(0.02)
+    for t in [first] + threads:
+        t.join()
+    print(f"실행 순서: {order}")
+    print(arbiter.snapshot())
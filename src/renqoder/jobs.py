@@ -0,0 +1,251 @@
+"""
+인코딩 작업(Job) 모듈
+단일 파일 작업과 분할 녹화(part1, part2, ...)를 하나로 이어 붙이는 작업을 정의합니다.
+"""
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# 분할 녹화 파일명 패턴: "<이름> part1", "<이름>_pt02", "<이름>-cd1", "<이름>.seg003" 등
+# 일반적인 회차 번호("에피소드 01")와 구분하기 위해 명시적인 분할 표기만 인식하며,
+# 표기 바로 앞이 글자이면("concept2", "script2", "abcd1") 단어의 일부로 보고 제외
+MULTIPART_PATTERN = re.compile(
+    r'^(?P<base>.*?)[\s._-]*(?<![^\W\d_])(?:part|pt|cd|disc|disk|seg|segment|chunk)[\s._-]*(?P<num>\d{1,4})$',
+    re.IGNORECASE
+)
+
+# 이어 붙이기 위해 일치해야 하는 스트림 파라미터 (get_video_info 결과 기준)
+CONCAT_MATCH_FIELDS = ('codec', 'width', 'height', 'fps', 'container')
+
+
+def remove_partial_output(failure: Optional[Dict]):
+    """실패한 실행이 새로 만든 불완전한 출력 파일을 지웁니다 (VideoEncoder.last_failure 기준)."""
+    if not failure or not failure.get('partial'):
+        return
+    try:
+        os.remove(failure['output_file'])
+    except OSError:
+        pass
+
+
+def parse_multipart_name(filepath: str) -> Optional[Dict]:
+    """파일명에서 분할 표기를 찾아 {'base': 공통 이름, 'index': 파트 번호}를 반환합니다."""
+    match = MULTIPART_PATTERN.match(Path(filepath).stem)
+    if not match or not match.group('base').strip():
+        return None
+    return {
+        'base': match.group('base').rstrip(' ._-'),
+        'index': int(match.group('num'))
+    }
+
+
+def is_concat_compatible(info_a: Dict, info_b: Dict) -> bool:
+    """두 파일의 스트림 파라미터가 concat demuxer로 이어 붙일 수 있을 만큼 일치하는지 확인합니다."""
+    for field in CONCAT_MATCH_FIELDS:
+        a, b = info_a.get(field), info_b.get(field)
+        # 컨테이너 정보가 없는 이전 캐시 항목은 비교에서 제외
+        if field == 'container' and (a is None or b is None):
+            continue
+        if a != b:
+            return False
+    return True
+
+
+def find_multipart_groups(items: List[Dict]) -> List[List[Dict]]:
+    """
+    검색 결과(메타데이터 포함)에서 이어 붙일 수 있는 분할 녹화 그룹을 찾습니다.
+
+    같은 폴더/공통 이름/확장자를 가지고 파트 번호가 연속되며, 스트림 파라미터가
+    일치하는 파일들만 한 그룹으로 묶습니다. 번호가 끊기거나 파라미터가 다르면 그룹을 나눕니다.
+
+    Returns:
+        파트 순서대로 정렬된 항목 리스트의 리스트 (2개 이상인 그룹만)
+    """
+    candidates = {}
+    for item in items:
+        # 스트림 파라미터를 비교할 수 없는(미분석) 파일이나 기록 중인 파일은 제외
+        if item.get('invalid') or item.get('recording') or not item.get('metadata_loaded'):
+            continue
+        parsed = parse_multipart_name(item['path'])
+        if not parsed:
+            continue
+        key = (
+            os.path.normcase(str(Path(item['path']).parent)),
+            parsed['base'].lower(),
+            Path(item['path']).suffix.lower()
+        )
+        candidates.setdefault(key, []).append((parsed['index'], item))
+
+    groups = []
+    for parts in candidates.values():
+        parts.sort(key=lambda p: p[0])
+
+        current = [parts[0]]
+        for index, item in parts[1:]:
+            prev_index, prev_item = current[-1]
+            if index == prev_index + 1 and is_concat_compatible(prev_item, item):
+                current.append((index, item))
+            else:
+                if len(current) >= 2:
+                    groups.append([i for _, i in current])
+                current = [(index, item)]
+        if len(current) >= 2:
+            groups.append([i for _, i in current])
+
+    return groups
+
+
+def combine_video_info(infos: List[Dict]) -> Dict:
+    """여러 파트의 get_video_info 결과를 하나의 연속 영상 정보로 합칩니다."""
+    if not infos:
+        return {}
+
+    combined = dict(infos[0])
+    combined['duration'] = sum(i.get('duration', 0) for i in infos)
+    combined['size'] = sum(i.get('size', 0) for i in infos)
+    combined['audio_size'] = sum(i.get('audio_size', 0) for i in infos)
+    combined['frames'] = sum(i.get('frames', 0) for i in infos)
+    combined['invalid'] = any(i.get('invalid') for i in infos)
+    if combined['duration'] > 0 and combined['size'] > 0:
+        combined['bitrate'] = int((combined['size'] * 8) / combined['duration'])
+    return combined
+
+
+class EncodeJob:
+    """하나의 출력 파일을 만드는 인코딩 작업 (입력이 여러 개면 이어 붙여 인코딩)"""
+
+    def __init__(self, inputs, quality=23, audio_mode="copy", output_file=None, encoder_type=None, preset=None):
+        """
+        Args:
+            inputs: 입력 파일 경로 또는 순서대로 정렬된 경로 리스트
+            quality: 화질 설정값
+            audio_mode: 오디오 모드 ("copy" 또는 "aac")
+            output_file: 출력 파일 경로 (None이면 자동 생성)
+            encoder_type: 사용할 FFmpeg 인코더 (None이면 실행하는 VideoEncoder 설정 사용)
+            preset: 인코더 프리셋 (None이면 인코더별 기본 프리셋, 마감 시각 모드에서 대기열이 지정)
+        """
+        self.inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+        self.quality = quality
+        self.audio_mode = audio_mode
+        self.output_file = output_file
+        self.encoder_type = encoder_type
+        self.preset = preset
+        self.status = 'pending'
+        self.result = None
+        self.seq = 0            # 대기열 추가 순서
+        self.estimate = None    # 대기열이 계산한 예상 절감량/소요 시간
+        self.elapsed = 0.0      # 실제 인코딩 소요 시간(초)
+        self.attempts = 0       # FFmpeg 실행 횟수 (재시도/대체 포함)
+        self.failure = None     # 마지막 실패 정보 (VideoEncoder.last_failure)
+        self.active_encoder = None  # 실행 중일 때 이 작업을 인코딩하는 VideoEncoder (취소용)
+
+    @property
+    def is_concat(self):
+        return len(self.inputs) > 1
+
+    @property
+    def name(self):
+        """작업 표시 이름 (분할 녹화는 공통 이름 + 파트 수)"""
+        if self.is_concat:
+            parsed = parse_multipart_name(self.inputs[0])
+            base = parsed['base'] if parsed else Path(self.inputs[0]).stem
+            return f"{base} ({len(self.inputs)} parts)"
+        return Path(self.inputs[0]).name
+
+    def run(self, encoder, progress_callback=None, log_callback=None, overwrite=False, recovery=None):
+        """
+        주어진 VideoEncoder로 작업을 실행하고 결과 경로(실패 시 None)를 반환합니다.
+
+        Args:
+            recovery: watchdog.RecoveryPolicy (지정 시 실패 원인에 따라 대기 후 재시도하거나
+                      같은 계열의 다른 인코더로 바꿔 다시 실행)
+        """
+        if self.encoder_type:
+            encoder.encoder_type = self.encoder_type
+
+        # 작업별 프리셋은 이 작업에만 적용하고 실행 후 원래 설정으로 복원
+        previous_preset = encoder.preset
+        previous_type = encoder.encoder_type
+        encoder.preset = self.preset
+        encoder.cancel_requested = False
+        encoder.last_failure = None
+
+        self.status = 'running'
+        self.failure = None
+        self.active_encoder = encoder
+        tried = [encoder.encoder_type]
+        retries = 0
+        try:
+            while True:
+                self.attempts += 1
+                self.result = self._run_once(encoder, progress_callback, log_callback, overwrite)
+                if self.result or recovery is None:
+                    break
+
+                self.failure = encoder.last_failure
+                if not self.failure or encoder.cancel_requested:
+                    break
+                step = recovery.next_action(self.failure['kind'], retries, encoder.encoder_type, tried)
+                if step['action'] == 'give_up':
+                    break
+
+                # 이번 시도가 만든 불완전한 출력은 지워야 다시 쓸 수 있음
+                remove_partial_output(self.failure)
+
+                if step['action'] == 'retry':
+                    retries += 1
+                    if log_callback:
+                        log_callback(f"🔁 {self.failure['label']}: {step['delay']:.0f}초 후 {encoder.encoder_type}로 다시 시도합니다 ({retries}회째)")
+                    if not self._wait(encoder, step['delay']):
+                        break
+                else:
+                    if log_callback:
+                        log_callback(f"↪️ {self.failure['label']}: {encoder.encoder_type} 대신 {step['encoder_type']}로 전환합니다")
+                    encoder.encoder_type = step['encoder_type']
+                    encoder.preset = None  # 프리셋 이름은 인코더 계열마다 다름
+                    tried.append(step['encoder_type'])
+                    retries = 0
+
+            if not self.result and encoder.cancel_requested:
+                # 취소로 끊긴 출력은 지움 (다음 실행에서 완성된 출력으로 보고 건너뛰지 않도록)
+                remove_partial_output(encoder.last_failure)
+        finally:
+            self.active_encoder = None
+            encoder.preset = previous_preset
+            if encoder.encoder_type != previous_type:
+                # 대체 인코더는 이 작업에만 사용 (다음 작업은 원래 인코더부터 다시 시도)
+                if self.result:
+                    self.encoder_type = encoder.encoder_type
+                encoder.encoder_type = previous_type
+        self.status = 'done' if self.result else 'failed'
+        return self.result
+
+    def _run_once(self, encoder, progress_callback, log_callback, overwrite):
+        if self.is_concat:
+            return encoder.encode_concat(
+                self.inputs, self.quality, self.audio_mode, self.output_file,
+                progress_callback, log_callback, overwrite
+            )
+        return encoder.encode(
+            self.inputs[0], self.quality, self.audio_mode, self.output_file,
+            progress_callback, log_callback, overwrite
+        )
+
+    def cancel(self):
+        """실행 중인 작업의 FFmpeg를 중단합니다 (재시도/대체 인코더로 넘어가지 않음)."""
+        encoder = self.active_encoder
+        if encoder is not None:
+            encoder.cancel()
+
+    def _wait(self, encoder, seconds):
+        """재시도 전 대기 (취소되면 False)"""
+        deadline = time.time() + seconds
+        while time.time() < deadline:
+            if encoder.cancel_requested:
+                return False
+            time.sleep(max(0.0, min(0.5, deadline - time.time())))
+        return not encoder.cancel_requested
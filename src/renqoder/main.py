@@ -9,14 +9,12 @@ import webbrowser
 import json
 import shutil
 import threading
+import time
 import ctypes
+from collections import deque
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import send2trash
-
-import customtkinter as ctk
-from PIL import Image
 
 IS_DEV = not getattr(sys, 'frozen', False)
 
@@ -25,13 +23,84 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
+# 시작 시간 측정 기준점 (다른 모듈보다 먼저 로드)
+from startup import startup_timer, is_startup_bench
+
+import customtkinter as ctk
+from PIL import Image
+
 from hardware_detector import HardwareDetector, check_ffmpeg
-from encoder import VideoEncoder
-from taskbar import TaskbarController
+from encoder import VideoEncoder, FOLLOW_INPUT_FORMATS
 from notification import show_toast
 from __init__ import __version__
 from searcher import VideoSearcher
-from metadata_utils import format_duration
+from metadata_utils import format_duration, sniff_container
+from jobs import EncodeJob, find_multipart_groups, combine_video_info, parse_multipart_name
+from planner import SavingsPlanner
+from scheduler import BatchQueue, RANKING_MODES, AUTO_WORKERS, parse_deadline, build_devices, get_encoder_device
+from concurrency import AdaptiveConcurrency, run_adaptive
+from metadata_queue import MetadataQueue, viewport_rows
+from event_bus import EventBus
+from task_executor import TaskExecutor, current_token
+from probe_service import ProbeService
+from app_logger import (
+    AppLogger, WARNING, ERROR, CATEGORY_APP, CATEGORY_SEARCH, CATEGORY_METADATA, CATEGORY_ENCODE
+)
+from watchdog import get_codec_family
+from encoder_probe import EncoderProbe, recommend_encoder
+from io_arbiter import IO_INTERACTIVE
+from encode_service import ServiceClient, ServiceError, job_spec
+
+startup_timer.mark('imports')
+
+# 최소 크기 필터 값 (bytes)
+SIZE_FILTER_MAP = {
+    "1MB": 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+    "500MB": 500 * 1024 * 1024,
+    "1GB": 1024 * 1024 * 1024,
+    "5GB": 5 * 1024 * 1024 * 1024,
+    "10GB": 10 * 1024 * 1024 * 1024
+}
+
+# 수정일 필터 값 (최근 N일, None = 제한 없음)
+MODIFIED_FILTER_MAP = {
+    "전체": None,
+    "최근 1일": 1,
+    "최근 7일": 7,
+    "최근 30일": 30,
+    "최근 1년": 365
+}
+
+# 인코딩 우선순위 (CPU 우선순위, I/O 우선순위)
+PRIORITY_OPTION_MAP = {
+    "보통": ('normal', 'normal'),
+    "낮음": ('below_normal', 'low'),
+    "유휴 (백그라운드)": ('idle', 'idle')
+}
+
+# CPU 사용률 상한 (전체 CPU 대비 %, None = 제한 없음)
+CPU_CAP_OPTION_MAP = {
+    "제한 없음": None,
+    "75%": 75,
+    "50%": 50,
+    "25%": 25
+}
+
+# 메타데이터(ffprobe) 추출 최대 동시 실행 수 (실제 값은 처리량을 보며 자동 조절)
+METADATA_MAX_WORKERS = 8
+
+# 대기열 "동시 작업" 메뉴의 자동 조절 항목
+QUEUE_AUTO_LABEL = "자동"
+
+# 스크롤이 멈춘 뒤 메타데이터 분석 순서를 다시 매기기까지의 지연(ms)
+VIEWPORT_UPDATE_DELAY_MS = 150
+
+# 분석 진행 중 검색 결과 목록/대기열 창을 다시 그리는 최소 간격(초)
+RESULTS_REFRESH_INTERVAL = 0.5
+
+# 로그 수준 -> 로그 창 텍스트 태그
+LOG_LEVEL_TAGS = {WARNING: "log_warning", ERROR: "log_error"}
 
 # 테마 설정
 ctk.set_appearance_mode("Dark")
@@ -90,36 +159,73 @@ class MainWindow(ctk.CTk):
             myappid = 'crazylulu.renqoder.transcoder.v1'
             ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
         
-        # 하드웨어 감지
+        # 설정 파일 경로
+        self.config_file = Path.home() / '.renqoder_config.json'
+        
+        # 하드웨어 감지 (창을 먼저 띄우기 위해 이전 실행에서 감지한 GPU로 시작하고, 실제 감지는 백그라운드에서)
         self.detector = HardwareDetector()
-        self.detector.detect_gpu()
+        self.detector.restore(self.load_cached_gpu_vendor())
+        self.hardware_ready = False
+        
+        # 인코더 실측 결과 (FFmpeg 빌드/하드웨어 구성이 같으면 캐시 재사용, 없으면 UI 표시 후 백그라운드 측정)
+        self.encoder_probe = EncoderProbe()
+        self.probe_results = None
+        self.probe_running = False
         
         # 인코더 초기화
         encoder_info = self.detector.get_encoder_info()
         self.encoder = VideoEncoder(encoder_info['encoder'])
         self.accent_color = self.detector.get_accent_color()
         
-        # 검색기 초기화
-        self.searcher = VideoSearcher()
+        # 검색기 초기화 (Everything 확인/메타데이터 캐시 로드는 백그라운드에서)
+        self.searcher = VideoSearcher(defer_init=True)
+        
+        # 절감 예측기 (검색 결과 전체의 예상 절감 용량/소요 시간)
+        self.planner = SavingsPlanner()
+        self.planner_window = None
+        
+        # 배치 인코딩 대기열 (처리 속도 모델은 절감 예측기와 공유)
+        self.batch_queue = BatchQueue(
+            self.encoder, self.planner.throughput, recording_detector=self.searcher.recording_detector
+        )
+        self.queue_window = None
+        self.queue_running = False
         
         # 변수
         self.input_file = None
+        self.input_parts = None  # 분할 녹화를 이어 붙여 인코딩할 때의 파트 경로 목록
         self.output_file = None
         self.estimated_size_bytes = 0
         self.encoding_in_progress = False
+        self.pending_codec_refresh = None  # 인코딩 중에 도착한 하드웨어 감지 결과 (raw_codecs, 권장 코덱 전환 여부)
+        self.start_check_pending = False  # START 전 확인(녹화 여부 등)이 작업 스레드에서 진행 중
         self.taskbar = None
         
         # 검색 관련 상태
         self.all_search_results = []
-        self.metadata_thread_running = False
+        # 검색/메타데이터 추출 등 백그라운드 작업 (다시 시작하면 이전 작업과 그 프로세스를 즉시 취소)
+        self.tasks = TaskExecutor()
+        # 인코딩 탭 입력 파일 분석 (검색 탭과 메타데이터 캐시 공유, 작업 스레드에서 한 번만 분석)
+        self.probe_service = ProbeService(self.searcher, self.tasks)
+        self.encoder.probe_service = self.probe_service
+        self.metadata_queue = None      # 진행 중인 추출 단계의 우선순위 대기열
+        self.displayed_paths = []       # 목록에 표시된 순서대로의 경로 (필터/정렬 적용 후)
+        self.viewport_update_job = None
         self.sort_column = None
         self.sort_descending = False
         
-        # 설정 파일 경로
-        self.config_file = Path.home() / '.renqoder_config.json'
+        # 작업 스레드 -> UI 전달 (주제별 최신 값만 20Hz로 전달)
+        self.events = EventBus()
+        
+        # 로그 (전체는 교체식 파일, UI 창은 최근 로그 링 버퍼만 표시)
+        self.app_log = AppLogger()
+        self.log_rendered_sequence = 0
+        self.log_widget_entries = deque()  # 로그 창에 표시 중인 로그마다 차지한 줄 수 (여러 줄 메시지 포함)
         
         # UI 초기화
         self.init_ui()
+        self.subscribe_ui_events()
+        self.startup_encoder_type = self.encoder.encoder_type
         
         # 툴팁 인스턴스 초기화 (Treeview용 동적 툴팁)
         self.tree_tooltip = ToolTip(self.results_tree, "")
@@ -133,8 +239,19 @@ class MainWindow(ctk.CTk):
         # 설정 로드 및 적용
         self.load_settings()
         
+        # 하드웨어 감지/코덱 조회와 검색기 준비는 창이 뜬 뒤 백그라운드에서 (끝나면 UI에 반영)
+        self.events.subscribe('startup.hardware', self.on_hardware_ready)
+        self.events.subscribe('startup.searcher', lambda _: self.on_searcher_ready())
+        self.tasks.submit('startup', self.startup_hardware_worker)
+        self.tasks.submit('startup', self.startup_searcher_worker)
+        self.after(0, self.on_first_frame)
+
+        # 백그라운드 인코딩 서비스에 진행 중인 작업이 있으면 다시 연결해 진행 상황 표시
+        self.service_status = ""
+        self.events.subscribe('service.progress', self.on_service_progress)
+        self.tasks.submit('service', self.service_watch_worker)
+        
         self.log("renQoder 초기화 완료")
-        self.log(f"감지된 인코더: {encoder_info['name']}")
 
     def get_resource_path(self, relative_path):
         """리소스 파일의 실제 경로를 가져옵니다"""
@@ -279,11 +396,11 @@ class MainWindow(ctk.CTk):
         encoding_tab = self.tabview.tab("Encoding")
         encoding_tab.grid_columnconfigure(0, weight=1)
 
-        # GPU 정보
+        # GPU 정보 (백그라운드 감지가 끝나면 갱신)
         encoder_info = self.detector.get_encoder_info()
         self.gpu_info_label = ctk.CTkLabel(
             encoding_tab,
-            text=f"🎮 감지된 GPU: {encoder_info['vendor']} ({encoder_info['name']})",
+            text=f"🎮 GPU 감지 중... ({encoder_info['name']})",
             text_color=self.accent_color,
             font=ctk.CTkFont(weight="bold")
         )
@@ -378,49 +495,12 @@ class MainWindow(ctk.CTk):
         
         ctk.CTkLabel(self.codec_frame, text="비디오 코덱", font=ctk.CTkFont(weight="bold")).pack(side="left", padx=10)
         
-        # 코덱 목록 가져오기 및 가공
+        # 코덱 목록 가져오기 및 가공 (FFmpeg 인코더 목록 조회 전까지는 임시 목록)
         try:
-            raw_codecs = self.detector.get_available_codecs()
-            self.codec_data_map = {} # 유선택 항목 -> 코덱 정보
-            self.codec_list = []
-            
-            default_codec_label = None
-            recommended_id = self.detector.recommended_encoder
-            
-            current_category = None
-            for c in raw_codecs:
-                # 카테고리 헤더 결정
-                category = f"--- Hardware - {c['vendor']} ---" if c['type'] == 'hardware' else "--- Software ---"
-                
-                if category != current_category:
-                    self.codec_list.append(category)
-                    current_category = category
-                
-                # 레이블 생성 (하드웨어 ⚡ 아이콘 적용)
-                if c['type'] == 'hardware':
-                    if c['available']:
-                        label = f"⚡ {c['label']}"
-                    else:
-                        label = f"❌ {c['label']} (미지원)"
-                else:
-                    label = f"   {c['label']}" # Software는 여백 추가하여 정렬
-                
-                self.codec_list.append(label)
-                self.codec_data_map[label] = c
-                
-                # 기본값 후보 (추천 코덱)
-                if c['id'] == recommended_id and c['available']:
-                    default_codec_label = label
-            
-            # 기본값 보정
-            if not default_codec_label:
-                for label in self.codec_list:
-                    if not label.startswith("---") and self.codec_data_map[label]['available']:
-                        default_codec_label = label
-                        break
-            
-            if not default_codec_label:
-                default_codec_label = self.codec_list[0]
+            raw_codecs = self.detector.get_provisional_codecs()
+            # 대기열 작업이 실패하면 같은 계열의 사용 가능한 인코더로 대체
+            self.batch_queue.recovery.set_codecs(raw_codecs)
+            self.codec_list, self.codec_data_map, default_codec_label = self.build_codec_choices(raw_codecs)
                 
         except Exception as e:
             print(f"코덱 목록 로드 실패: {e}")
@@ -446,6 +526,14 @@ class MainWindow(ctk.CTk):
         )
         self.codec_combo.pack(side="left", padx=5)
         
+        self.probe_btn = ctk.CTkButton(
+            self.codec_frame, text="🔬 성능 측정", width=100,
+            fg_color="#444444", hover_color="#555555",
+            command=lambda: self.start_encoder_probe(force=True)
+        )
+        self.probe_btn.pack(side="left", padx=5)
+        ToolTip(self.probe_btn, "각 인코더로 짧은 테스트 영상을 실제 인코딩하여\n사용 가능 여부와 속도를 다시 측정합니다.")
+        
         # 코덱 변경 이벤트 트리거 (초기 품질 UI 동기화)
         self.after(100, self.update_quality_ui)
         
@@ -658,6 +746,42 @@ class MainWindow(ctk.CTk):
         self.progress_bar.configure(progress_color=self.accent_color)
         self.progress_bar.grid(row=1, column=0, columnspan=3, padx=10, pady=(15, 5), sticky="ew")
 
+        # 리소스 조절 (우선순위 / CPU 상한 / 일시정지) - 업무 중 백그라운드 인코딩용
+        self.governor_frame = ctk.CTkFrame(self.action_frame, fg_color="transparent")
+        self.governor_frame.grid(row=2, column=0, columnspan=3, padx=10, pady=(5, 0), sticky="ew")
+        self.governor_frame.grid_columnconfigure(4, weight=1)
+
+        ctk.CTkLabel(self.governor_frame, text="우선순위:", font=ctk.CTkFont(size=12)).grid(row=0, column=0, padx=(0, 5))
+        self.priority_var = ctk.StringVar(value="보통")
+        ctk.CTkOptionMenu(
+            self.governor_frame,
+            values=list(PRIORITY_OPTION_MAP.keys()),
+            variable=self.priority_var,
+            width=140,
+            command=self.on_governor_change
+        ).grid(row=0, column=1, padx=(0, 15))
+
+        ctk.CTkLabel(self.governor_frame, text="CPU 제한:", font=ctk.CTkFont(size=12)).grid(row=0, column=2, padx=(0, 5))
+        self.cpu_cap_var = ctk.StringVar(value="제한 없음")
+        ctk.CTkOptionMenu(
+            self.governor_frame,
+            values=list(CPU_CAP_OPTION_MAP.keys()),
+            variable=self.cpu_cap_var,
+            width=110,
+            command=self.on_governor_change
+        ).grid(row=0, column=3)
+
+        self.pause_btn = ctk.CTkButton(
+            self.governor_frame,
+            text="⏸ 일시정지",
+            width=110,
+            fg_color="#444",
+            hover_color="#555",
+            state="disabled",
+            command=self.toggle_pause
+        )
+        self.pause_btn.grid(row=0, column=5, sticky="e")
+
         # 8. 로그 (row index 조정)
         self.log_text = ctk.CTkTextbox(
             encoding_tab, 
@@ -667,6 +791,8 @@ class MainWindow(ctk.CTk):
             fg_color="#1A1A1A"
         )
         self.log_text.grid(row=6, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        self.log_text.tag_config("log_warning", foreground="#FFA500")
+        self.log_text.tag_config("log_error", foreground="#E74856")
         encoding_tab.grid_rowconfigure(6, weight=1)  # Log area expands
 
     def init_search_tab(self):
@@ -675,29 +801,15 @@ class MainWindow(ctk.CTk):
         search_tab.grid_columnconfigure(0, weight=1)
         search_tab.grid_rowconfigure(4, weight=1)  # Results area expands
 
-        # Everything 감지 정보
-        everything_status = self.searcher.get_everything_status()
+        # Everything 감지 정보 (백그라운드 확인이 끝나면 on_searcher_ready에서 갱신)
         self.everything_info_label = ctk.CTkLabel(
             search_tab,
-            text=everything_status['status_text'],
-            text_color=everything_status['color'],
+            text="Everything 확인 중...",
+            text_color="#888888",
             font=ctk.CTkFont(weight="bold")
         )
         self.everything_info_label.grid(row=0, column=0, pady=(10, 5))
-
-        # Everything 다운로드 버튼 (미설치 시에만 표시)
-        if not everything_status['installed']:
-            self.everything_download_btn = ctk.CTkButton(
-                search_tab,
-                text="Everything 다운로드",
-                width=150,
-                height=28,
-                font=ctk.CTkFont(size=12),
-                fg_color="#0071c5",
-                hover_color="#005a9e",
-                command=lambda: webbrowser.open("https://www.voidtools.com/")
-            )
-            self.everything_download_btn.grid(row=1, column=0, pady=(0, 15))
+        self.everything_download_btn = None
 
         # 검색 컨트롤 프레임
         search_control_frame = ctk.CTkFrame(search_tab)
@@ -882,7 +994,8 @@ class MainWindow(ctk.CTk):
             filter_frame,
             variable=self.container_var,
             values=["전체", "mp4", "mkv", "avi", "ts", "m2ts", "mov", "wmv", "flv", "webm"],
-            width=100
+            width=100,
+            command=lambda _: self.apply_filters()
         )
         self.container_combo.grid(row=1, column=1, padx=(0, 15), pady=(0, 15), sticky="w")
 
@@ -933,6 +1046,18 @@ class MainWindow(ctk.CTk):
         )
         self.abnormal_only_check.grid(row=1, column=8, padx=(0, 20), pady=(0, 15), sticky="w")
 
+        # 수정일 필터 (검색 백엔드에 dm: 조건으로 전달)
+        ctk.CTkLabel(filter_frame, text="수정일:").grid(row=2, column=0, padx=(20, 5), pady=(0, 15), sticky="w")
+        self.modified_var = ctk.StringVar(value="전체")
+        self.modified_combo = ctk.CTkComboBox(
+            filter_frame,
+            variable=self.modified_var,
+            values=list(MODIFIED_FILTER_MAP.keys()),
+            width=100,
+            command=lambda _: self.apply_filters()
+        )
+        self.modified_combo.grid(row=2, column=1, padx=(0, 15), pady=(0, 15), sticky="w")
+
         # 결과 프레임
         results_frame = ctk.CTkFrame(search_tab)
         results_frame.grid(row=4, column=0, padx=10, pady=(0, 10), sticky="nsew")
@@ -972,11 +1097,13 @@ class MainWindow(ctk.CTk):
             tree_container,
             columns=("name", "abnormal", "codec", "res", "fps", "size", "bitrate", "length", "ext", "path"),
             show="headings",
-            yscrollcommand=tree_scroll.set,
+            yscrollcommand=self.on_results_yscroll,
             selectmode="browse"
         )
+        self.results_scroll = tree_scroll
         self.results_tree.tag_configure("loading", foreground="#666666")
         self.results_tree.tag_configure("estimated", foreground="#FFA500") # Orange for estimated fields
+        self.results_tree.tag_configure("recording", foreground="#E74856") # Red for recording in progress
         tree_scroll.configure(command=self.results_tree.yview)
 
         # 컬럼 설정
@@ -1015,6 +1142,8 @@ class MainWindow(ctk.CTk):
         # 우클릭 메뉴 정의
         self.results_context_menu = tk.Menu(self, tearoff=0, bg="#2B2B2B", fg="white", activebackground="#0071c5")
         self.results_context_menu.add_command(label="➡️ 인코딩 탭으로 보내기", command=self.send_to_encoder)
+        self.results_context_menu.add_command(label="🔗 분할 파일 묶어서 보내기", command=self.send_parts_to_encoder)
+        self.results_context_menu.add_command(label="➕ 대기열에 추가", command=self.add_selected_to_queue)
         self.results_context_menu.add_separator()
         self.results_context_menu.add_command(label="📂 폴더 열기", command=lambda: self.context_menu_action("open_folder"))
         self.results_context_menu.add_command(label="🔗 파일 경로 복사", command=lambda: self.context_menu_action("copy_path"))
@@ -1071,7 +1200,29 @@ class MainWindow(ctk.CTk):
             hover_color="#555555",
             command=self.clear_search_cache
         )
-        self.clear_cache_btn.grid(row=0, column=1, padx=(5, 10), sticky="e")
+        self.clear_cache_btn.grid(row=0, column=3, padx=(5, 10), sticky="e")
+
+        self.queue_btn = ctk.CTkButton(
+            action_frame,
+            text="📋 대기열 (0)",
+            width=120,
+            height=40,
+            fg_color="#444444",
+            hover_color="#555555",
+            command=self.open_queue_window
+        )
+        self.queue_btn.grid(row=0, column=1, padx=5, sticky="e")
+
+        self.planner_btn = ctk.CTkButton(
+            action_frame,
+            text="📊 절감 예측",
+            width=120,
+            height=40,
+            fg_color="#444444",
+            hover_color="#555555",
+            command=self.open_planner_window
+        )
+        self.planner_btn.grid(row=0, column=2, padx=5, sticky="e")
 
         # Treeview 선택 이벤트
         self.results_tree.bind('<<TreeviewSelect>>', self.on_search_result_select)
@@ -1088,10 +1239,27 @@ class MainWindow(ctk.CTk):
         if drive_letter in self.drive_cards:
             self.drive_cards[drive_letter].configure(border_color=self.accent_color)
     
+    def get_search_filters(self):
+        """현재 필터 바 상태를 검색 백엔드용 조건(dict)으로 변환합니다."""
+        container = self.container_var.get()
+        
+        # "제한 없음"이라도 최소 1바이트 이상인 파일만 대상으로 함 (0바이트 파일 제외)
+        min_size = max(SIZE_FILTER_MAP.get(self.min_size_var.get(), 0), 1)
+        
+        modified_days = MODIFIED_FILTER_MAP.get(self.modified_var.get())
+        modified_after = time.time() - modified_days * 86400 if modified_days else None
+        
+        return {
+            'extensions': None if container == "전체" else [container],
+            'min_size': min_size,
+            'modified_after': modified_after
+        }
+
     def start_search(self):
         """검색 시작"""
         drive = self.selected_drive.get()
-        min_size_str = self.min_size_var.get()
+        filters = self.get_search_filters()
+        self.last_search_filters = filters
 
         # UI 비활성화
         self.search_btn.configure(state="disabled", text="🔍 검색 중...")
@@ -1099,49 +1267,41 @@ class MainWindow(ctk.CTk):
         self.metadata_status_label.configure(text="")
         self.metadata_progress.set(0)
         
-        # 기존 메타데이터 추출 중단
-        self.metadata_thread_running = False
+        # 이전 검색과 메타데이터 추출을 모두 취소 (실행 중인 es.exe/ffprobe/ffmpeg도 즉시 종료)
+        self.tasks.cancel('metadata')
+        generation = self.tasks.restart('search')
 
-        # 백그라운드 스레드에서 검색 실행
-        import threading
-        thread = threading.Thread(
-            target=self.search_worker,
-            args=(drive, min_size_str),
-            daemon=True
-        )
-        thread.start()
+        # 백그라운드 작업으로 검색 실행
+        self.tasks.submit('search', self.search_worker, drive, filters, generation)
 
-    def search_worker(self, drive, min_size_str):
-        """검색 작업 스레드"""
+    def search_worker(self, drive, filters, generation):
+        """검색 작업 (새 검색이 시작되면 취소되고, 결과는 현재 세대일 때만 반영)"""
+        token = current_token()
         try:
-            # 1. 파일 검색 (빠름)
-            results = self.searcher.search(drive)
+            # 1. 파일 검색 (컨테이너/최소 크기/수정일 조건은 검색 백엔드에서 먼저 적용됨)
+            results = self.searcher.search(drive, filters)
+            token.check()
             self.all_search_results = results
+            self.planner.reset(results)
             
             # 2. UI 업데이트
-            self.after(0, lambda: self.on_search_complete(results))
+            self.after(0, lambda: self.tasks.is_current('search', generation) and self.on_search_complete(results))
             
-            # 3. 메타데이터 추출 대상 필터링 (최소 크기 조건 적용)
-            size_map = {
-                "1MB": 1024 * 1024,
-                "100MB": 100 * 1024 * 1024,
-                "500MB": 500 * 1024 * 1024,
-                "1GB": 1024 * 1024 * 1024,
-                "5GB": 5 * 1024 * 1024 * 1024,
-                "10GB": 10 * 1024 * 1024 * 1024
-            }
-            # "제한 없음"이라도 최소 1바이트 이상인 파일만 대상으로 함 (0바이트 파일 제외)
-            min_size = max(size_map.get(min_size_str, 0), 1)
-            
-            # 지정된 크기 이상의 파일만 상세 정보 추출 대상으로 선정
-            extraction_targets = [item for item in results if item['size'] >= min_size]
+            # 3. 녹화 진행 중인 파일 표시 (최근 수정된 파일만 샘플링)
+            recording = self.searcher.mark_recordings(results)
+            if recording:
+                self.log(f"녹화 진행 중인 파일 {len(recording)}개 감지 - 정밀 분석 및 인코딩에서 보류됩니다.", category=CATEGORY_SEARCH)
+                self.after(0, self.apply_filters)
             
             # 4. 메타데이터 추출 시작 (느림)
-            self.start_metadata_extraction(extraction_targets)
+            # 백엔드가 이미 후보 집합만 반환하므로 결과 전체가 추출 대상임
+            token.check()
+            self.start_metadata_extraction(results)
             
         except Exception as e:
-            self.after(0, lambda: self.log(f"검색 오류: {e}"))
-            self.after(0, lambda: self.search_btn.configure(state="normal", text="🔍 검색 시작"))
+            self.log(f"검색 오류: {e}", level=ERROR, category=CATEGORY_SEARCH)
+            self.after(0, lambda: self.tasks.is_current('search', generation)
+                       and self.search_btn.configure(state="normal", text="🔍 검색 시작"))
 
     def on_search_complete(self, results):
         """기본 검색 완료 시 호출"""
@@ -1150,47 +1310,64 @@ class MainWindow(ctk.CTk):
         self.log(f"검색 완료: {len(results)}개 파일 발견")
         
     def start_metadata_extraction(self, results):
-        """메타데이터 추출 스레드 시작"""
-        self.metadata_thread_running = True
-        import threading
-        thread = threading.Thread(
-            target=self.metadata_worker,
-            args=(results,),
-            daemon=True
-        )
-        thread.start()
+        """메타데이터 추출 작업 시작 (진행 중인 이전 추출은 취소)"""
+        self.tasks.restart('metadata')
+        future = self.tasks.submit('metadata', self.metadata_worker, results)
+        # 추출이 끝나면(또는 취소되면) 분석 중 표시를 지우도록 목록 새로고침
+        future.add_done_callback(lambda _: self.events.publish('results.refresh'))
 
     def metadata_worker(self, results):
-        """메타데이터 추출 작업 스레드 (2단계 추출 방식)"""
+        """메타데이터 추출 작업 (2단계 추출 방식, 새 검색이 시작되면 취소됨)"""
         total = len(results)
+        token = current_token()
+        
+        def publish(topic, value):
+            # 이전 세대의 진행 상태가 새 추출의 표시를 덮지 않도록 세대 번호를 붙여 발행
+            self.events.publish(topic, (token.generation, value))
         
         # --- Stage 1: 빠른 헤더 분석 (Fast Scan) ---
-        self.after(0, lambda: self.metadata_status_label.configure(text=f"상세 정보 추출 중 (1단계: 빠른 스캔)... (0/{total})"))
+        publish('metadata.status', f"상세 정보 추출 중 (1단계: 빠른 스캔)... (0/{total})")
         
-        for i, item in enumerate(results):
-            if not self.metadata_thread_running:
-                return
-            
+        # ffprobe 동시 실행 수는 처리량을 보며 자동 조절 (NVMe는 여러 개, HDD/공유 폴더는 적게)
+        def fast_scan(item):
             if not item.get('metadata_loaded'):
                 # Stage 1: fast_only=True
                 metadata = self.searcher.extract_metadata(item['path'], fast_only=True)
                 item.update(metadata)
-            
-            # 주기적으로 UI 업데이트 (5개마다 혹은 마지막에)
-            if (i + 1) % 5 == 0 or (i + 1) == total:
-                self.after(0, lambda count=i+1: self.update_metadata_progress(count, total, stage=1))
+            self.on_item_metadata_updated(item)
+        
+        def on_scanned(count, item):
+            # 진행률은 UI 프레임마다 최신 값만 반영
+            publish('metadata.progress', (count, total, 1))
+        
+        controller = AdaptiveConcurrency(
+            "메타데이터", initial=1, maximum=METADATA_MAX_WORKERS,
+            log_callback=lambda message: self.log(message, category=CATEGORY_METADATA)
+        )
+        # 화면에 보이는 행/선택한 파일부터 분석 (스크롤/필터 변경 시 남은 순서 재조정)
+        queue = self.metadata_queue = MetadataQueue(results)
+        self.after(0, lambda: self.update_metadata_viewport(matched=True))
+        run_adaptive(queue, fast_scan, controller, on_done=on_scanned)
+        token.check()
         
         # --- Stage 2: 정밀 스캔 (Deep Scan for damaged files) ---
-        # 재생 시간이 0인 파일들만 골라냄
+        # 재생 시간이 0인 파일들만 골라냄 (녹화 진행 중인 파일은 완료될 때까지 보류)
         damaged_files = [item for item in results if item.get('metadata_loaded') and item.get('duration', 0) <= 0 and not item.get('invalid')]
+        deferred_files = [item for item in damaged_files if item.get('recording')]
+        damaged_files = [item for item in damaged_files if not item.get('recording')]
         
         if damaged_files:
             total_damaged = len(damaged_files)
-            self.after(0, lambda: self.metadata_status_label.configure(text=f"손상된 파일 정밀 분석 중 (2단계)... (0/{total_damaged})"))
+            publish('metadata.status', f"손상된 파일 정밀 분석 중 (2단계)... (0/{total_damaged})")
             
-            for i, item in enumerate(damaged_files):
-                if not self.metadata_thread_running:
-                    return
+            token.check()
+            queue = self.metadata_queue = MetadataQueue(damaged_files)
+            self.after(0, lambda: self.update_metadata_viewport(matched=True))
+            for i in range(total_damaged):
+                token.check()
+                item = queue.pop_next()
+                if item is None:
+                    break
                 
                 filename = Path(item['path']).name
                 
@@ -1200,20 +1377,88 @@ class MainWindow(ctk.CTk):
                     m = int((current_duration % 3600) // 60)
                     s = int(current_duration % 60)
                     time_str = f"{h:02d}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
-                    self.after(0, lambda: self.metadata_status_label.configure(
-                        text=f"정밀 분석 중 (2단계): {filename} - {time_str} ({i+1}/{total_damaged})"
-                    ))
+                    publish('metadata.status', f"정밀 분석 중 (2단계): {filename} - {time_str} ({i+1}/{total_damaged})")
                 
                 # Stage 2: fast_only=False (ffmpeg 스캔 포함) with progress callback
                 metadata = self.searcher.extract_metadata(item['path'], fast_only=False, progress_callback=progress_update)
                 item.update(metadata)
+                self.on_item_metadata_updated(item)
                 
                 # 매 파일마다 UI 업데이트
-                self.after(0, lambda count=i+1: self.update_metadata_progress(count, total_damaged, stage=2))
+                publish('metadata.progress', (i + 1, total_damaged, 2))
+        
+        token.check()
+        if self.metadata_queue is queue:
+            self.metadata_queue = None
+        
+        if deferred_files:
+            publish('metadata.status', f"상세 정보 추출 완료 ({total}개 파일, 녹화 중 {len(deferred_files)}개 보류)")
+            self.after(0, lambda: self.schedule_recording_recheck(deferred_files))
+        else:
+            publish('metadata.status', f"상세 정보 추출 완료 ({total}개 파일)")
+        self.after(0, lambda: self.tasks.is_current('metadata', token.generation) and self.metadata_progress.set(1.0))
+
+    def schedule_recording_recheck(self, items):
+        """녹화 중이라 보류된 파일을 안정화 시간이 지난 뒤 다시 확인하도록 예약합니다."""
+        delay_ms = int(self.searcher.recording_detector.stable_seconds * 1000)
+        self.after(delay_ms, lambda: self.recheck_recordings(items))
+
+    def recheck_recordings(self, items):
+        """보류된 파일의 녹화 종료 여부를 확인하고, 안정화된 파일은 다시 분석합니다."""
+        # 새 검색으로 결과 목록이 바뀐 경우 이전 항목은 무시
+        current_ids = {id(item) for item in self.all_search_results}
+        items = [item for item in items if id(item) in current_ids]
+        if not items:
+            return
+        
+        # 다른 추출 작업이 진행 중이면 다음 주기로 연기
+        if self.tasks.is_running('metadata'):
+            self.schedule_recording_recheck(items)
+            return
         
-        self.metadata_thread_running = False
-        self.after(0, lambda: self.metadata_status_label.configure(text=f"상세 정보 추출 완료 ({total}개 파일)"))
-        self.after(0, lambda: self.metadata_progress.set(1.0))
+        def worker():
+            still_recording = self.searcher.mark_recordings(items)
+            ready = [item for item in items if not item.get('recording')]
+            # 확인하는 동안 새 검색이 시작됐으면 이전 결과는 버림
+            current_token().check()
+            
+            if ready:
+                # 녹화 중 수집된 정보는 부정확하므로 1단계부터 다시 분석
+                for item in ready:
+                    item['metadata_loaded'] = False
+                self.log(f"녹화가 끝난 파일 {len(ready)}개를 다시 분석합니다.", category=CATEGORY_METADATA)
+                self.start_metadata_extraction(ready)
+            
+            self.after(0, self.apply_filters)
+            if still_recording:
+                self.after(0, lambda: self.schedule_recording_recheck(still_recording))
+        
+        # 검색 그룹 작업으로 실행 (새 검색이 시작되면 함께 취소)
+        self.tasks.submit('search', worker)
+
+    def on_item_metadata_updated(self, item):
+        """항목의 메타데이터가 갱신되면 절감 예측기와 대기열 예상치에 반영합니다 (작업 스레드에서 호출됨)"""
+        self.planner.update([item])
+        self.batch_queue.refresh(item['path'], item)
+
+    def subscribe_ui_events(self):
+        """작업 스레드가 발행하는 이벤트를 UI 갱신 함수에 연결하고 전달 주기를 시작합니다."""
+        self.app_log.add_listener(lambda: self.events.publish('log.changed'))
+        self.events.subscribe('log.changed', lambda _: self.render_log())
+        self.events.subscribe('encode.progress', self._update_progress_ui)
+        self.events.subscribe('metadata.progress',
+                              self.tasks.current_only('metadata', lambda value: self.update_metadata_progress(*value)))
+        self.events.subscribe('metadata.status',
+                              self.tasks.current_only('metadata', lambda text: self.metadata_status_label.configure(text=text)))
+        # 목록 전체를 다시 그리는 갱신은 분석이 아무리 빨라도 RESULTS_REFRESH_INTERVAL마다 한 번
+        self.events.subscribe('results.refresh', lambda _: self.refresh_results(), min_interval=RESULTS_REFRESH_INTERVAL)
+        self.events.subscribe('queue.refresh', lambda _: self.refresh_queue_window(), min_interval=RESULTS_REFRESH_INTERVAL)
+        self.events.start(self)
+
+    def refresh_results(self):
+        """현재 필터 상태에 맞춰 검색 결과 테이블과 절감 예측 창을 새로고침합니다."""
+        self.apply_filters()
+        self.refresh_planner_window()
 
     def update_metadata_progress(self, current, total, stage=1):
         """메타데이터 추출 진행률 업데이트"""
@@ -1226,7 +1471,7 @@ class MainWindow(ctk.CTk):
             self.metadata_status_label.configure(text=f"손상된 파일 정밀 분석 중 (2단계)... ({current}/{total})")
             
         # 현재 필터 상태에 맞춰 테이블 새로고침
-        self.apply_filters()
+        self.events.publish('results.refresh')
 
     def apply_filters(self):
         """필터 및 정렬 적용하여 Treeview 업데이트"""
@@ -1236,17 +1481,15 @@ class MainWindow(ctk.CTk):
         min_bitrate_str = self.min_bitrate_var.get()
         abnormal_only = self.abnormal_only_var.get()
 
-        # 크기 필터 값 변환
-        size_map = {
-            "1MB": 1024 * 1024,
-            "100MB": 100 * 1024 * 1024,
-            "500MB": 500 * 1024 * 1024,
-            "1GB": 1024 * 1024 * 1024,
-            "5GB": 5 * 1024 * 1024 * 1024,
-            "10GB": 10 * 1024 * 1024 * 1024
-        }
         # "제한 없음"이라도 최소 1바이트 이상인 파일만 표시 (0바이트 파일 제외)
-        min_size = max(size_map.get(min_size_str, 0), 1)
+        min_size = max(SIZE_FILTER_MAP.get(min_size_str, 0), 1)
+        
+        # 수정일 필터 (OS 검색 결과는 mtime 숫자를 가지므로 즉시 재적용 가능)
+        modified_days = MODIFIED_FILTER_MAP.get(self.modified_var.get())
+        modified_after = time.time() - modified_days * 86400 if modified_days else None
+        
+        # 검색 당시보다 넓은 조건은 백엔드에서 이미 제외된 파일이 있으므로 재검색 안내
+        self.check_filters_broadened()
 
         # 비트레이트 필터 값 변환 (bps)
         bitrate_map = {
@@ -1272,6 +1515,11 @@ class MainWindow(ctk.CTk):
             if item['size'] < min_size:
                 continue
             
+            # 수정일 필터
+            if modified_after and isinstance(item.get('modified'), (int, float)):
+                if item['modified'] < modified_after:
+                    continue
+            
             # 코덱 필터
             if codec_filter != "전체" and item.get('metadata_loaded'):
                 if codec_filter.lower() not in item.get('codec', '').lower():
@@ -1291,6 +1539,8 @@ class MainWindow(ctk.CTk):
 
         # 정렬 적용
         if self.sort_column:
+            metadata_running = self.tasks.is_running('metadata')
+            
             def sort_key(x):
                 if self.sort_column == "res":
                     # 해상도는 전체 픽셀 수 기준으로 정렬 (캐시된 값 우선 사용)
@@ -1303,13 +1553,15 @@ class MainWindow(ctk.CTk):
                     # 길이는 초 단위 duration으로 정렬
                     return x.get('duration', 0.0)
                 if self.sort_column == "abnormal":
-                    # 상태별 정렬 우선순위: 비정상(3) > 미분석(2) > 분석 중(1) > 정상(0)
+                    # 상태별 정렬 우선순위: 녹화 중(4) > 비정상(3) > 미분석(2) > 분석 중(1) > 정상(0)
+                    if x.get('recording'):
+                        return 4
                     if x.get('estimated_fields'):
                         return 3
                     if not x.get('metadata_loaded'):
                         return 2
                     # 기초 정보는 있으나 정밀 분석(Stage 2) 대기/진행 중인 경우
-                    if self.metadata_thread_running and x.get('duration', 0) <= 0 and not x.get('invalid'):
+                    if metadata_running and x.get('duration', 0) <= 0 and not x.get('invalid'):
                         return 1
                     return 0
                 val = x.get(self.sort_column)
@@ -1321,6 +1573,25 @@ class MainWindow(ctk.CTk):
 
         self.update_treeview(filtered)
 
+    def check_filters_broadened(self):
+        """현재 필터가 마지막 검색 조건보다 넓어졌는지 확인하고 한 번만 안내합니다."""
+        last = getattr(self, 'last_search_filters', None)
+        if not last:
+            return
+        
+        current = self.get_search_filters()
+        broadened = (
+            current['min_size'] < last['min_size']
+            or (last['extensions'] and current['extensions'] != last['extensions'])
+            or (last['modified_after'] and (not current['modified_after'] or current['modified_after'] < last['modified_after'] - 60))
+        )
+        
+        if broadened and not getattr(self, 'broadened_filter_notified', False):
+            self.broadened_filter_notified = True
+            self.log("필터 조건이 검색 당시보다 넓어졌습니다. 추가 파일을 보려면 다시 검색하세요.")
+        elif not broadened:
+            self.broadened_filter_notified = False
+
     def on_column_click(self, col):
         """Treeview 컬럼 클릭 시 정렬"""
         if self.sort_column == col:
@@ -1355,6 +1626,8 @@ class MainWindow(ctk.CTk):
 
         # 데이터 업데이트
         self.results_tree.delete(*self.results_tree.get_children())
+        self.displayed_paths = [item['path'] for item in results]
+        metadata_running = self.tasks.is_running('metadata')
         
         for item in results:
             size_mb = item['size'] / (1024 * 1024)
@@ -1365,11 +1638,13 @@ class MainWindow(ctk.CTk):
             bitrate_kbps = f"{bitrate / 1000:,.0f} kbps" if item.get('metadata_loaded') and bitrate > 0 else "-"
 
             # 상태 아이콘 결정
-            if item.get('estimated_fields'):
+            if item.get('recording'):
+                status_icon = "🔴"
+            elif item.get('estimated_fields'):
                 status_icon = "⚠️"
             elif not item.get('metadata_loaded'):
                 status_icon = "⏳"
-            elif self.metadata_thread_running and item.get('duration', 0) <= 0 and not item.get('invalid'):
+            elif metadata_running and item.get('duration', 0) <= 0 and not item.get('invalid'):
                 status_icon = "🔍"
             else:
                 status_icon = "✅"
@@ -1388,13 +1663,15 @@ class MainWindow(ctk.CTk):
             )
             # 하이라이트 태그 설정 (1단계 미완료이거나, 2단계 분석 대기 중인 경우)
             is_loading = not item.get('metadata_loaded')
-            if not is_loading and self.metadata_thread_running:
+            if not is_loading and metadata_running:
                 # 1단계는 완료되었으나 재생 시간이 '0'이고 분석이 진행 중이면 2단계 대기 상태로 간주
                 if item.get('duration', 0) <= 0 and not item.get('invalid'):
                     is_loading = True
             
             tags = ()
-            if is_loading:
+            if item.get('recording'):
+                tags = ("recording",)
+            elif is_loading:
                 tags = ("loading",)
             elif item.get('estimated_fields'):
                 tags = ("estimated",)
@@ -1405,6 +1682,39 @@ class MainWindow(ctk.CTk):
             if selected_path and item['path'] == selected_path:
                 self.results_tree.selection_set(node)
                 self.results_tree.see(node)
+        
+        self.update_metadata_viewport(matched=True)
+
+    def on_results_yscroll(self, first, last):
+        """검색 결과 스크롤 시 스크롤바를 갱신하고, 멈춘 뒤 분석 순서를 보이는 행 위주로 다시 매깁니다."""
+        self.results_scroll.set(first, last)
+        if self.metadata_queue is None:
+            return
+        if self.viewport_update_job is not None:
+            self.after_cancel(self.viewport_update_job)
+        self.viewport_update_job = self.after(VIEWPORT_UPDATE_DELAY_MS, self.update_metadata_viewport)
+
+    def update_metadata_viewport(self, matched=False):
+        """
+        메타데이터 추출 대기열에 현재 화면 상태를 알립니다.
+        
+        Args:
+            matched: True면 필터/정렬 결과(표시 순서)도 다시 반영
+        """
+        self.viewport_update_job = None
+        queue = self.metadata_queue
+        if queue is None:
+            return
+        if matched:
+            queue.set_matched(self.displayed_paths)
+        
+        first, last = self.results_tree.yview()
+        selected = []
+        for node in self.results_tree.selection():
+            values = self.results_tree.item(node)['values']
+            if len(values) > 9:
+                selected.append(values[9])
+        queue.set_viewport(viewport_rows(self.displayed_paths, first, last), selected)
 
     def update_search_results(self, results):
         """이전 방식 호환성 유지용"""
@@ -1419,7 +1729,18 @@ class MainWindow(ctk.CTk):
 
         # 해당 아이템의 태그 확인
         tags = self.results_tree.item(item_id, "tags")
-        if "estimated" in tags:
+        if "recording" in tags:
+            values = self.results_tree.item(item_id, "values")
+            if len(values) > 9:
+                target_item = next((i for i in self.all_search_results if i['path'] == values[9]), None)
+                if target_item and target_item.get('recording'):
+                    tooltip_text = "🔴 녹화 진행 중:\n" + target_item.get('recording_reason', '')
+                    if self.tree_tooltip.text != tooltip_text:
+                        self.tree_tooltip.text = tooltip_text
+                        self.tree_tooltip.hide_tooltip()
+                    self.tree_tooltip.show_tooltip(event)
+                    return
+        elif "estimated" in tags:
             # 원본 데이터 찾기 (아이템 인덱스로 추적)
             # Treeview의 모든 아이템을 순회하며 찾거나, update_treeview 시 map을 만들 수도 있지만
             # 여기서는 path를 기준으로 all_search_results에서 찾음
@@ -1524,9 +1845,10 @@ class MainWindow(ctk.CTk):
                     # 백그라운드에서 즉시 재분석 수행
                     def reanalyze():
                         # Stage 1: Fast scan
-                        metadata = self.searcher.extract_metadata(filepath, fast_only=True)
+                        metadata = self.searcher.extract_metadata(filepath, fast_only=True, io_priority=IO_INTERACTIVE)
                         target_item.update(metadata)
-                        self.after(0, self.apply_filters)
+                        self.on_item_metadata_updated(target_item)
+                        self.events.publish('results.refresh')
                         
                         # Stage 2: Deep scan if needed
                         if target_item.get('metadata_loaded') and target_item.get('duration', 0) <= 0 and not target_item.get('invalid'):
@@ -1535,18 +1857,19 @@ class MainWindow(ctk.CTk):
                                 m = int((current_duration % 3600) // 60)
                                 s = int(current_duration % 60)
                                 time_str = f"{h:02d}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
-                                self.after(0, lambda: self.metadata_status_label.configure(
-                                    text=f"재분석 중: {filename} - {time_str}"
-                                ))
+                                self.events.publish('metadata.status', (generation, f"재분석 중: {filename} - {time_str}"))
                             
-                            metadata = self.searcher.extract_metadata(filepath, fast_only=False, progress_callback=progress_update)
+                            metadata = self.searcher.extract_metadata(filepath, fast_only=False, progress_callback=progress_update,
+                                                                  io_priority=IO_INTERACTIVE)
                             target_item.update(metadata)
-                            self.after(0, lambda: self.metadata_status_label.configure(text=""))
-                            self.after(0, self.apply_filters)
-                            self.after(0, lambda: self.log(f"재분석 완료: {filename}"))
+                            self.on_item_metadata_updated(target_item)
+                            self.events.publish('metadata.status', (generation, ""))
+                            self.events.publish('results.refresh')
+                            self.log(f"재분석 완료: {filename}", category=CATEGORY_METADATA)
                     
-                    import threading
-                    threading.Thread(target=reanalyze, daemon=True).start()
+                    # 진행 상태는 현재 추출 세대의 상태 표시줄에 표시
+                    generation = self.tasks.generation('metadata')
+                    self.tasks.submit('reanalyze', reanalyze)
         elif action == "delete":
             if messagebox.askyesno("파일 삭제", f"정말로 이 파일을 휴지통으로 보내시겠습니까?\n\n{filename}"):
                 try:
@@ -1566,6 +1889,7 @@ class MainWindow(ctk.CTk):
             self.send_to_encoder_btn.configure(state="normal")
         else:
             self.send_to_encoder_btn.configure(state="disabled")
+        self.update_metadata_viewport()
 
     def send_to_encoder(self):
         """선택한 파일을 인코딩 탭으로 전송"""
@@ -1581,26 +1905,537 @@ class MainWindow(ctk.CTk):
         
         # 파일 설정
         self.input_file = file_path
+        self.input_parts = None
         self.auto_naming = True
         
         file_name = Path(file_path).name
         self.file_label.configure(text=f"📁 {file_name}")
         
-        # 비디오 정보
-        video_info = self.encoder.get_video_info(file_path)
-        duration_str = format_duration(video_info['duration'])
-        
+        # 비디오 정보 (검색 탭에서 이미 분석한 파일은 캐시에서 바로 가져옴)
         self.log(f"검색 탭에서 파일 선택됨: {file_name}")
-        self.log(f"정보: {video_info['codec'].upper()} | {video_info['width']}x{video_info['height']} | {duration_str} | {video_info['fps']:.2f}fps")
+        self.request_input_probe(on_ready=lambda infos: self.log_video_info(infos[0]))
+        self.update_ui_state()
+
+    def send_parts_to_encoder(self):
+        """선택한 파일이 속한 분할 녹화 그룹(part1, part2, ...)을 하나의 작업으로 인코딩 탭에 전송"""
+        selection = self.results_tree.selection()
+        if not selection:
+            return
+        
+        file_path = self.results_tree.item(selection[0])['values'][9]
+        group = next(
+            (g for g in find_multipart_groups(self.all_search_results) if any(i['path'] == file_path for i in g)),
+            None
+        )
+        if not group:
+            self.log("이어 붙일 수 있는 분할 파일을 찾지 못했습니다. (연속된 파트 번호와 동일한 코덱/해상도/FPS 필요)")
+            return
+        
+        self.tabview.set("Encoding")
+        
+        self.input_parts = [item['path'] for item in group]
+        self.input_file = self.input_parts[0]
+        self.auto_naming = True
+        
+        job = EncodeJob(self.input_parts)
+        self.file_label.configure(text=f"📁 {job.name}")
+        
+        combined = combine_video_info(group)
+        self.log(f"분할 파일 {len(group)}개를 하나로 인코딩합니다: {job.name}")
+        for item in group:
+            self.log(f"  - {item['name']} ({format_duration(item.get('duration', 0))})")
+        self.log(f"합산 길이: {format_duration(combined['duration'])}")
         
         self.update_ui_state()
 
     def clear_search_cache(self):
         """메타데이터 캐시 초기화"""
         self.searcher.clear_cache()
+        self.probe_service.forget()
         self.log("메타데이터 캐시가 초기화되었습니다. 다음 검색 시 모든 파일을 새로 분석합니다.")
         self.metadata_status_label.configure(text="캐시 초기화 완료")
 
+    def open_planner_window(self):
+        """검색 결과 전체의 예상 절감 용량/소요 시간 창을 엽니다."""
+        if self.planner_window and self.planner_window.winfo_exists():
+            self.planner_window.focus()
+            self.refresh_planner_window()
+            return
+
+        import tkinter.ttk as ttk
+
+        window = ctk.CTkToplevel(self)
+        window.title("절감 예측")
+        window.geometry("760x420")
+        window.grid_columnconfigure(0, weight=1)
+        window.grid_rowconfigure(2, weight=1)
+        self.planner_window = window
+
+        self.planner_group_map = {"폴더별": "folder", "코덱별": "codec", "컨테이너별": "container"}
+        self.planner_group_var = ctk.StringVar(value="폴더별")
+        group_selector = ctk.CTkSegmentedButton(
+            window,
+            values=list(self.planner_group_map.keys()),
+            variable=self.planner_group_var,
+            command=lambda _: self.refresh_planner_window()
+        )
+        group_selector.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="w")
+
+        self.planner_summary_label = ctk.CTkLabel(window, text="", font=ctk.CTkFont(size=13, weight="bold"), anchor="w")
+        self.planner_summary_label.grid(row=1, column=0, padx=15, pady=5, sticky="ew")
+
+        self.planner_tree = ttk.Treeview(
+            window,
+            columns=("key", "files", "original", "estimated", "savings", "hours"),
+            show="headings"
+        )
+        headings = {
+            "key": ("그룹", 300), "files": ("파일 수", 70), "original": ("원본", 90),
+            "estimated": ("예상 결과", 90), "savings": ("절감", 90), "hours": ("예상 시간", 90)
+        }
+        for col, (head, width) in headings.items():
+            self.planner_tree.heading(col, text=head)
+            self.planner_tree.column(col, width=width, minwidth=50)
+        self.planner_tree.grid(row=2, column=0, padx=15, pady=(5, 15), sticky="nsew")
+
+        self.refresh_planner_window()
+
+    def refresh_planner_window(self):
+        """현재 인코딩 설정(코덱/화질/오디오) 기준으로 절감 예측 창을 갱신합니다."""
+        if not self.planner_window or not self.planner_window.winfo_exists():
+            return
+
+        def fmt_size(size):
+            return f"{size / (1024 ** 3):.2f} GB"
+
+        encoder_type = self.encoder.encoder_type
+        quality = int(self.quality_slider.get())
+        audio_mode = self.audio_mode_map.get(self.audio_var.get(), "copy")
+        group_by = self.planner_group_map.get(self.planner_group_var.get(), "folder")
+
+        try:
+            totals = self.planner.totals(encoder_type, quality, audio_mode)
+            rows = self.planner.summarize(encoder_type, quality, audio_mode, group_by=group_by)
+        except Exception as e:
+            print(f"절감 예측 계산 오류: {e}")
+            return
+
+        self.planner_summary_label.configure(
+            text=f"{encoder_type.upper()} / 화질 {quality}: {totals['files']}개 파일 인코딩 시 "
+                 f"약 {fmt_size(totals['savings'])} 절감, 약 {totals['hours']:.1f}시간 소요 "
+                 f"(분석 완료 {totals['analyzed']}/{len(self.all_search_results)})"
+        )
+
+        self.planner_tree.delete(*self.planner_tree.get_children())
+        for row in rows:
+            self.planner_tree.insert("", "end", values=(
+                row['key'], row['files'], fmt_size(row['original']), fmt_size(row['estimated']),
+                fmt_size(row['savings']), f"{row['hours']:.1f}h"
+            ))
+
+    def add_selected_to_queue(self):
+        """선택한 파일을 현재 인코딩 설정(코덱/화질/오디오)으로 배치 대기열에 추가"""
+        selection = self.results_tree.selection()
+        if not selection:
+            return
+
+        file_path = self.results_tree.item(selection[0])['values'][9]
+        item = next((i for i in self.all_search_results if i['path'] == file_path), None)
+        if item and item.get('invalid'):
+            self.log(f"대기열 추가 불가: 손상되었거나 동영상이 아닌 파일입니다 - {Path(file_path).name}")
+            return
+        if any(file_path in job.inputs for job in self.batch_queue.pending()):
+            self.log(f"이미 대기열에 있는 파일입니다: {Path(file_path).name}")
+            return
+
+        quality = int(self.quality_slider.get())
+        audio_mode = self.audio_mode_map.get(self.audio_var.get(), "copy")
+        job = EncodeJob(file_path, quality, audio_mode, encoder_type=self.encoder.encoder_type)
+
+        # 이미 분석된 메타데이터가 있으면 재사용 (없으면 대기열이 직접 분석)
+        self.batch_queue.add(job, item if item and item.get('metadata_loaded') else None)
+
+        est = job.estimate
+        self.log(
+            f"대기열에 추가: {job.name} (예상 절감 {est['savings'] / (1024 ** 3):.2f}GB, "
+            f"약 {est['seconds'] / 60:.0f}분)"
+        )
+        self.refresh_queue_window()
+
+    def open_queue_window(self):
+        """배치 인코딩 대기열 창을 엽니다."""
+        if self.queue_window and self.queue_window.winfo_exists():
+            self.queue_window.focus()
+            self.refresh_queue_window()
+            return
+
+        import tkinter.ttk as ttk
+
+        window = ctk.CTkToplevel(self)
+        window.title("배치 인코딩 대기열")
+        window.geometry("820x480")
+        window.grid_columnconfigure(0, weight=1)
+        window.grid_rowconfigure(1, weight=1)
+        self.queue_window = window
+
+        top_frame = ctk.CTkFrame(window, fg_color="transparent")
+        top_frame.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        top_frame.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkLabel(top_frame, text="실행 순서:").grid(row=0, column=0, padx=(0, 10))
+        self.queue_mode_labels = {label: mode for mode, label in RANKING_MODES.items()}
+        self.queue_mode_var = ctk.StringVar(value=RANKING_MODES[self.batch_queue.mode])
+        ctk.CTkSegmentedButton(
+            top_frame,
+            values=list(RANKING_MODES.values()),
+            variable=self.queue_mode_var,
+            command=self.on_queue_mode_change
+        ).grid(row=0, column=1, sticky="w")
+
+        # 동시 작업 수 (2 이상이면 CPU 코어를 작업별로 나눠 스레드/affinity 지정, "자동"이면 처리량을 보며 조절)
+        ctk.CTkLabel(top_frame, text="동시 작업:").grid(row=0, column=2, padx=(15, 5))
+        self.queue_workers_var = ctk.StringVar(
+            value=QUEUE_AUTO_LABEL if self.queue_workers == AUTO_WORKERS else str(self.queue_workers)
+        )
+        ctk.CTkOptionMenu(
+            top_frame,
+            values=[QUEUE_AUTO_LABEL, "1", "2", "3", "4", "6", "8"],
+            variable=self.queue_workers_var,
+            width=70,
+            command=lambda value: setattr(
+                self, 'queue_workers', AUTO_WORKERS if value == QUEUE_AUTO_LABEL else int(value)
+            )
+        ).grid(row=0, column=3)
+
+        # 마감 시각 모드: 지정한 시각까지 끝나는 범위에서 가장 느린(고효율) 프리셋 선택
+        deadline_frame = ctk.CTkFrame(top_frame, fg_color="transparent")
+        deadline_frame.grid(row=1, column=0, columnspan=2, pady=(8, 0), sticky="w")
+        ctk.CTkLabel(deadline_frame, text="완료 목표 시각:").grid(row=0, column=0, padx=(0, 10))
+        self.queue_deadline_entry = ctk.CTkEntry(deadline_frame, width=80, placeholder_text="07:00")
+        self.queue_deadline_entry.grid(row=0, column=1, padx=(0, 5))
+        ctk.CTkButton(
+            deadline_frame, text="적용", width=60, fg_color="#444444", hover_color="#555555",
+            command=self.apply_queue_deadline
+        ).grid(row=0, column=2, padx=5)
+        ctk.CTkButton(
+            deadline_frame, text="해제", width=60, fg_color="#444444", hover_color="#555555",
+            command=lambda: self.apply_queue_deadline(clear=True)
+        ).grid(row=0, column=3, padx=5)
+        self.queue_plan_label = ctk.CTkLabel(deadline_frame, text="", text_color="#888888")
+        self.queue_plan_label.grid(row=0, column=4, padx=(10, 0))
+
+        # 장치 동시 사용: 서로 바꿔 써도 되는 인코더를 승인하면 GPU와 CPU에 작업을 나눠 동시에 실행
+        device_frame = ctk.CTkFrame(top_frame, fg_color="transparent")
+        device_frame.grid(row=2, column=0, columnspan=4, pady=(8, 0), sticky="w")
+        ctk.CTkLabel(device_frame, text="장치 동시 사용:").grid(row=0, column=0, padx=(0, 10))
+        family = get_codec_family(self.encoder.encoder_type)
+        candidates = [
+            info for info in self.codec_data_map.values()
+            if info.get('available') and family and get_codec_family(info['id']) == family
+        ]
+        self.queue_device_vars = {}
+        for column, info in enumerate(candidates, start=1):
+            var = ctk.BooleanVar(value=info['id'] in self.queue_device_encoders)
+            ctk.CTkCheckBox(
+                device_frame, text=f"{info['id']} ({get_encoder_device(info['id'])})", variable=var,
+                command=self.on_queue_devices_change
+            ).grid(row=0, column=column, padx=5)
+            self.queue_device_vars[info['id']] = var
+        self.queue_device_label = ctk.CTkLabel(device_frame, text="", text_color="#888888")
+        self.queue_device_label.grid(row=1, column=0, columnspan=len(candidates) + 1, sticky="w")
+
+        self.queue_tree = ttk.Treeview(
+            window,
+            columns=("order", "name", "status", "preset", "original", "savings", "time", "rate"),
+            show="headings"
+        )
+        headings = {
+            "order": ("#", 40), "name": ("작업", 240), "status": ("상태", 80), "preset": ("프리셋", 70),
+            "original": ("원본", 90), "savings": ("예상 절감", 90), "time": ("예상 시간", 80),
+            "rate": ("효율 (MB/s)", 90)
+        }
+        for col, (head, width) in headings.items():
+            self.queue_tree.heading(col, text=head)
+            self.queue_tree.column(col, width=width, minwidth=40)
+        self.queue_tree.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
+
+        button_frame = ctk.CTkFrame(window, fg_color="transparent")
+        button_frame.grid(row=2, column=0, padx=15, pady=(5, 15), sticky="ew")
+        button_frame.grid_columnconfigure(0, weight=1)
+
+        self.queue_start_btn = ctk.CTkButton(
+            button_frame, text="▶ 대기열 인코딩 시작", height=36,
+            fg_color="#0071c5", hover_color="#005a9e", command=self.start_queue
+        )
+        self.queue_start_btn.grid(row=0, column=0, padx=(0, 5), sticky="ew")
+        ctk.CTkButton(
+            button_frame, text="⏹ 현재 작업 후 중지", width=140, height=36,
+            fg_color="#444444", hover_color="#555555", command=self.stop_queue
+        ).grid(row=0, column=1, padx=5)
+        ctk.CTkButton(
+            button_frame, text="🧹 완료 항목 정리", width=140, height=36,
+            fg_color="#444444", hover_color="#555555", command=self.clear_finished_queue
+        ).grid(row=0, column=2, padx=5)
+        # 대기 작업을 백그라운드 서비스로 넘김: 창을 닫거나 프로그램이 종료되어도 인코딩 계속
+        ctk.CTkButton(
+            button_frame, text="🛰 백그라운드로 보내기", width=160, height=36,
+            fg_color="#444444", hover_color="#555555", command=self.send_queue_to_service
+        ).grid(row=0, column=3, padx=(5, 0))
+
+        self.refresh_queue_window()
+
+    def on_queue_devices_change(self):
+        """장치 동시 사용에 승인된 인코더 목록 갱신 (서로 다른 장치가 2개 이상이어야 적용)"""
+        self.queue_device_encoders = [encoder_id for encoder_id, var in self.queue_device_vars.items() if var.get()]
+        self.batch_queue.set_devices(self.queue_devices())
+        self.refresh_queue_window()
+
+    def queue_devices(self):
+        """대기열을 실행할 장치 구성 (승인된 인코더가 서로 다른 장치 2개 이상에 걸쳐 있을 때만, 아니면 None)"""
+        devices = build_devices(self.queue_device_encoders, cpu_slots=max(1, self.queue_workers))
+        return devices if len(devices) >= 2 else None
+
+    def on_queue_mode_change(self, label):
+        """대기열 정렬 방식 변경"""
+        mode = self.queue_mode_labels.get(label, 'fifo')
+        self.batch_queue.set_mode(mode)
+        self.log(f"대기열 실행 순서: {label}")
+        self.refresh_queue_window()
+
+    def apply_queue_deadline(self, clear=False):
+        """완료 목표 시각을 적용(또는 해제)하고 작업별 프리셋을 다시 계획합니다."""
+        if clear:
+            self.batch_queue.set_deadline(None)
+            self.log("대기열 마감 모드 해제: 기본 프리셋으로 인코딩합니다.")
+            self.refresh_queue_window()
+            return
+
+        try:
+            deadline = parse_deadline(self.queue_deadline_entry.get())
+        except ValueError:
+            self.log("⚠️ 완료 목표 시각은 HH:MM 형식으로 입력하세요. (예: 07:00)")
+            return
+
+        # 마감 계획이 실행 시와 같은 장치 구성의 처리 능력을 쓰도록 먼저 설정
+        self.batch_queue.set_devices(self.queue_devices())
+        plan = self.batch_queue.set_deadline(deadline)
+        deadline_text = time.strftime("%m/%d %H:%M", time.localtime(deadline))
+        if plan['feasible']:
+            self.log(f"대기열 마감 {deadline_text}: 마감 안에 끝나는 가장 고효율 프리셋으로 계획했습니다. (예상 {plan['seconds'] / 3600:.1f}시간)")
+        else:
+            self.log(f"⚠️ 대기열 마감 {deadline_text}: 가장 빠른 프리셋으로도 약 {plan['seconds'] / 3600:.1f}시간이 걸릴 것으로 예상됩니다.")
+        self.refresh_queue_window()
+
+    def refresh_queue_window(self):
+        """대기열 버튼과 대기열 창 목록을 갱신합니다."""
+        service_text = f" · 🛰 {self.service_status}" if self.service_status else ""
+        self.queue_btn.configure(text=f"📋 대기열 ({len(self.batch_queue.pending())}){service_text}")
+        if not self.queue_window or not self.queue_window.winfo_exists():
+            return
+
+        status_labels = {
+            'pending': "대기", 'running': "인코딩 중", 'done': "완료", 'failed': "실패", 'skipped': "건너뜀"
+        }
+        self.queue_start_btn.configure(state="disabled" if self.encoding_in_progress else "normal")
+
+        devices = build_devices(self.queue_device_encoders, cpu_slots=max(1, self.queue_workers))
+        report = [row for row in self.batch_queue.device_report() if row['jobs']]
+        if report:
+            self.queue_device_label.configure(text="  ".join(
+                f"{row['device']}: {row['jobs']}개, {row['fps']:.0f} fps" for row in report
+            ))
+        elif len(devices) >= 2:
+            self.queue_device_label.configure(text=" + ".join(
+                f"{device['name']} ({device['encoder_type']})" for device in devices
+            ) + " 동시 실행")
+        else:
+            self.queue_device_label.configure(text="서로 다른 장치의 인코더를 2개 이상 선택하면 동시에 사용합니다.")
+
+        plan = self.batch_queue.last_plan
+        if self.batch_queue.deadline is None or not plan:
+            self.queue_plan_label.configure(text="마감 없음 (기본 프리셋)", text_color="#888888")
+        else:
+            deadline_text = time.strftime("%m/%d %H:%M", time.localtime(self.batch_queue.deadline))
+            self.queue_plan_label.configure(
+                text=f"마감 {deadline_text}: 예상 {plan['seconds'] / 3600:.1f}시간 / 남은 {max(plan['available'], 0) / 3600:.1f}시간",
+                text_color=self.accent_color if plan['feasible'] else "#E74856"
+            )
+
+        self.queue_tree.delete(*self.queue_tree.get_children())
+        order = 0
+        for job in self.batch_queue.snapshot():
+            est = job.estimate or {}
+            if job.status == 'pending':
+                order += 1
+            self.queue_tree.insert("", "end", values=(
+                order if job.status == 'pending' else "",
+                job.name,
+                status_labels.get(job.status, job.status),
+                job.preset or "기본",
+                f"{est.get('original', 0) / (1024 ** 3):.2f} GB",
+                f"{est.get('savings', 0) / (1024 ** 3):.2f} GB",
+                format_duration(job.elapsed if job.elapsed else est.get('seconds', 0)),
+                f"{est.get('rate', 0) / (1024 * 1024):.1f}"
+            ))
+
+    def start_queue(self):
+        """대기열의 작업을 정렬 순서대로 인코딩합니다."""
+        if self.encoding_in_progress:
+            return
+        if not self.batch_queue.pending():
+            self.log("대기열에 인코딩할 작업이 없습니다.")
+            return
+
+        self.encoding_in_progress = True
+        self.queue_running = True
+        self.run_btn.configure(state="disabled", text="⏳ 대기열 인코딩 중...")
+        self.select_btn.configure(state="disabled")
+        self.edit_output_btn.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.set_pause_button_active(True)
+        self.refresh_queue_window()
+
+        threading.Thread(target=self.queue_worker, daemon=True).start()
+
+    def stop_queue(self):
+        """현재 작업이 끝나면 대기열 실행을 멈춥니다."""
+        if self.queue_running:
+            self.batch_queue.stop()
+            self.log("현재 작업이 끝나면 대기열 실행을 중지합니다.")
+
+    def clear_finished_queue(self):
+        self.batch_queue.clear_finished()
+        self.refresh_queue_window()
+
+    def send_queue_to_service(self):
+        """대기 중인 작업을 백그라운드 인코딩 서비스로 보냅니다 (서비스가 없으면 실행)."""
+        # 서비스 연결/시작을 기다리는 동안 실행 중인 로컬 대기열이 같은 작업을 가져가지 않도록 먼저 꺼냄
+        jobs = self.batch_queue.take_pending()
+        if not jobs:
+            self.log("대기열에 보낼 작업이 없습니다.")
+            return
+        self.refresh_queue_window()
+        specs = [dict(job_spec(job), encoder_type=job.encoder_type or self.encoder.encoder_type) for job in jobs]
+        self.tasks.restart('service')
+        self.tasks.submit('service', self.service_watch_worker, specs, jobs)
+
+    def service_watch_worker(self, specs=None, jobs=None):
+        """
+        (작업 스레드) specs가 있으면 서비스에 작업을 보내고, 서비스에 남은 작업이 끝날 때까지 진행 상황을 받아 표시합니다.
+        specs 없이 호출되면(시작 시) 서비스가 실행 중이고 진행 중인 작업이 있을 때만 다시 연결합니다.
+        """
+        token = current_token()
+        submitted = False
+        try:
+            client = ServiceClient.connect(auto_start=bool(specs))
+            if client is None:
+                return
+            state = client.list_jobs()
+            if specs:
+                ids = client.submit(specs)
+                submitted = True
+                self.log(f"🛰 작업 {len(ids)}개를 백그라운드 서비스로 보냈습니다. 프로그램을 닫아도 인코딩은 계속됩니다.",
+                         category=CATEGORY_ENCODE)
+            else:
+                active = [job for job in state['jobs'] if job['status'] in ('pending', 'running')]
+                if not active:
+                    return
+                self.log(f"🛰 백그라운드 서비스에서 진행 중인 작업 {len(active)}개에 다시 연결했습니다.", category=CATEGORY_ENCODE)
+
+            for event in client.watch(state['last_seq'], state['instance'], stop=lambda: token.cancelled):
+                if self.on_service_event(event):
+                    break
+        except ServiceError as e:
+            self.log(f"백그라운드 서비스 오류: {e}", level=WARNING, category=CATEGORY_ENCODE)
+        finally:
+            if specs and not submitted:
+                # 보내지 못한 작업은 로컬 대기열로 되돌림
+                self.after(0, self.on_service_failed, jobs)
+            self.events.publish('service.progress', None)
+
+    def on_service_event(self, event):
+        """(작업 스레드) 서비스 이벤트를 로그/대기열 버튼에 반영합니다. 서비스 대기열이 비면 True"""
+        kind = event['event']
+        if kind == 'job_start':
+            self.log(f"🛰 [백그라운드] 인코딩 시작: {event['name']}", category=CATEGORY_ENCODE)
+        elif kind == 'progress':
+            self.events.publish('service.progress', f"{event['name']} {event['progress']}%")
+        elif kind == 'job_end':
+            labels = {'done': "완료", 'failed': "실패", 'skipped': "건너뜀", 'cancelled': "취소", 'interrupted': "중단"}
+            level = WARNING if event['status'] in ('failed', 'interrupted') else None
+            self.log(f"🛰 [백그라운드] {labels.get(event['status'], event['status'])}: {event['name']}",
+                     level=level, category=CATEGORY_ENCODE)
+            self.events.publish('service.progress', None)
+        elif kind == 'idle':
+            summary = ", ".join(f"{status} {count}" for status, count in sorted(event.items())
+                                if status not in ('seq', 'event', 'time'))
+            self.log(f"🛰 백그라운드 대기열 완료 ({summary})", category=CATEGORY_ENCODE)
+            return True
+        return False
+
+    def on_service_failed(self, jobs):
+        """서비스로 보내지 못한 작업을 로컬 대기열에 되돌립니다."""
+        self.batch_queue.restore(jobs)
+        self.log(f"작업 {len(jobs)}개를 로컬 대기열로 되돌렸습니다.", category=CATEGORY_ENCODE)
+        self.refresh_queue_window()
+
+    def on_service_progress(self, text):
+        self.service_status = text or ""
+        self.refresh_queue_window()
+
+    def queue_worker(self):
+        try:
+            # 승인된 인코더가 서로 다른 장치에 걸쳐 있으면 장치별로 동시에 실행
+            self.batch_queue.equivalent_encoders = list(self.queue_device_encoders)
+            processed = self.batch_queue.run(
+                self.on_progress_callback,
+                self.on_log_callback,
+                job_callback=lambda job: self.events.publish('queue.refresh'),
+                workers=self.queue_workers,
+                devices=self.queue_devices()
+            )
+            self.after(0, self.queue_finished, processed)
+        except Exception as e:
+            self.after(0, self.encoding_error, str(e))
+
+    def queue_finished(self, processed):
+        self.events.dispatch()  # 남아 있는 진행률/로그를 먼저 반영 (완료 표시가 덮이지 않도록)
+        self.encoding_in_progress = False
+        self.queue_running = False
+        self.set_pause_button_active(False)
+        self.apply_pending_codec_refresh()
+
+        done = [job for job in processed if job.status == 'done']
+        failed = [job for job in processed if job.status == 'failed']
+        saved = 0
+        for job in done:
+            try:
+                saved += sum(Path(p).stat().st_size for p in job.inputs) - Path(job.result).stat().st_size
+            except OSError:
+                pass
+
+        remaining = len(self.batch_queue.pending())
+        self.log(f"✓ 대기열 실행 종료: 완료 {len(done)}개, 실패 {len(failed)}개, 남은 작업 {remaining}개 (절감 {saved / (1024 ** 3):.2f}GB)")
+        for job in failed:
+            reason = job.failure['label'] if job.failure else "알 수 없는 오류"
+            self.log(f"  ✗ {job.name}: {reason} (시도 {job.attempts}회)")
+
+        icon_path = self.get_resource_path("resources/icon.png")
+        show_toast(
+            "renQoder 대기열 완료",
+            f"{len(done)}개 작업 완료, {saved / (1024 ** 3):.2f}GB 절감",
+            icon_path=str(icon_path)
+        )
+
+        self.run_btn.configure(state="normal" if self.input_file else "disabled", text="🚀 START")
+        self.select_btn.configure(state="normal")
+        self.edit_output_btn.configure(state="normal")
+        self.progress_bar.set(1.0)
+        self.refresh_queue_window()
+
+        if self.taskbar:
+            self.taskbar.stop()
+
     def open_folder(self, file_path):
         """파일이 위치한 폴더를 시스템 탐색기로 엽니다"""
         if not file_path:
@@ -1624,6 +2459,8 @@ class MainWindow(ctk.CTk):
     def init_taskbar(self):
         """Windows 작업표시줄 진행바 연동 초기화"""
         try:
+            # comtypes를 불러오는 모듈이므로 창이 뜬 뒤에 로드
+            from taskbar import TaskbarController
             # Tkinter의 winfo_id()는 Windows에서 HWND를 반환함
             self.taskbar = TaskbarController(self.winfo_id())
             # self.log("작업표시줄 연동 완료")
@@ -1639,13 +2476,283 @@ class MainWindow(ctk.CTk):
         b = min(255, int(b * factor))
         return f'#{r:02x}{g:02x}{b:02x}'
 
-    def log(self, message):
-        """로그 출력"""
+    def log(self, message, level=None, category=CATEGORY_APP):
+        """
+        로그 출력 (어느 스레드에서나 호출 가능)
+        
+        FFmpeg 진행률 줄은 파일에만 기록되고 로그 창에는 표시되지 않습니다.
+        """
+        self.app_log.log(message, level, category)
+        if threading.current_thread() is threading.main_thread():
+            self.render_log()
+
+    def render_log(self):
+        """마지막으로 그린 이후의 로그만 로그 창에 덧붙이고, 링 버퍼에서 밀려난 줄은 창에서도 지웁니다."""
+        entries, last_sequence, _ = self.app_log.since(self.log_rendered_sequence)
+        if not entries:
+            return
+        self.log_rendered_sequence = last_sequence
+        
         self.log_text.configure(state="normal")
-        self.log_text.insert("end", f"> {message}\n")
+        # 같은 수준이 이어지는 줄은 한 번에 삽입
+        run_level, run_lines = None, []
+        for entry in entries + [None]:
+            level = entry['level'] if entry else None
+            if run_lines and level != run_level:
+                tag = LOG_LEVEL_TAGS.get(run_level)
+                self.log_text.insert("end", "".join(run_lines), tags=tag)
+                run_lines = []
+            if entry:
+                run_level = level
+                text = f"> {entry['message']}\n"
+                run_lines.append(text)
+                self.log_widget_entries.append(text.count("\n"))
+        
+        # 링 버퍼 용량(로그 개수)을 넘은 오래된 로그를 실제로 차지한 줄 수만큼 지움
+        excess_lines = 0
+        while len(self.log_widget_entries) > self.app_log.capacity():
+            excess_lines += self.log_widget_entries.popleft()
+        if excess_lines:
+            self.log_text.delete("1.0", f"{excess_lines + 1}.0")
         self.log_text.see("end")
         self.log_text.configure(state="disabled")
 
+    def build_codec_choices(self, raw_codecs):
+        """코덱 콤보박스 항목 구성 (벤더별 헤더, 실측 속도 표시) -> (항목 리스트, 항목 -> 코덱 정보, 기본 항목)"""
+        codec_list = []
+        codec_data_map = {} # 유선택 항목 -> 코덱 정보
+        default_codec_label = None
+        recommended_id = self.detector.recommended_encoder
+        
+        current_category = None
+        for c in raw_codecs:
+            # 카테고리 헤더 결정
+            category = f"--- Hardware - {c['vendor']} ---" if c['type'] == 'hardware' else "--- Software ---"
+            
+            if category != current_category:
+                codec_list.append(category)
+                current_category = category
+            
+            # 레이블 생성 (하드웨어 ⚡ 아이콘 적용)
+            if c['type'] == 'hardware':
+                if c['available']:
+                    label = f"⚡ {c['label']}"
+                else:
+                    label = f"❌ {c['label']} (미지원)"
+            else:
+                label = f"   {c['label']}" # Software는 여백 추가하여 정렬
+            
+            # 실측 속도 표시 (1080p 환산)
+            if c.get('fps'):
+                label += f" · {c['fps']:.0f}fps"
+            
+            codec_list.append(label)
+            codec_data_map[label] = c
+            
+            # 기본값 후보 (추천 코덱)
+            if c['id'] == recommended_id and c['available']:
+                default_codec_label = label
+        
+        # 기본값 보정
+        if not default_codec_label:
+            for label in codec_list:
+                if not label.startswith("---") and codec_data_map[label]['available']:
+                    default_codec_label = label
+                    break
+        
+        if not default_codec_label:
+            default_codec_label = codec_list[0]
+        
+        return codec_list, codec_data_map, default_codec_label
+
+    def apply_recommended_encoder(self, results):
+        """실측 속도가 가장 빠른 HEVC 인코더를 권장 인코더로 지정"""
+        best = recommend_encoder(results)
+        if best:
+            self.detector.set_recommended_encoder(best)
+
+    def start_encoder_probe(self, force=False):
+        """인코더 실측을 백그라운드에서 실행"""
+        if self.probe_running:
+            return
+        if self.encoding_in_progress:
+            # 측정 결과가 인코딩 부하에 영향을 받으므로 인코딩 중에는 실행하지 않음
+            self.log("인코딩 중에는 인코더 성능 측정을 할 수 없습니다.")
+            return
+        self.probe_running = True
+        self.probe_btn.configure(state="disabled", text="🔬 측정 중...")
+        self.log("🔬 인코더 성능 측정 중... (짧은 테스트 영상을 각 인코더로 인코딩)")
+        
+        def worker():
+            try:
+                codecs = self.detector.get_available_codecs()
+                results = self.encoder_probe.probe(
+                    codecs, force=force,
+                    progress_callback=lambda encoder_type, result: self.after(0, self.log_probe_result, encoder_type, result)
+                )
+                raw_codecs = self.detector.get_available_codecs(results)
+                self.after(0, self.encoder_probe_finished, results, raw_codecs)
+            except Exception as e:
+                print(f"인코더 성능 측정 실패: {e}")
+                self.after(0, self.encoder_probe_finished, None, None)
+        
+        self.tasks.submit('probe', worker)
+
+    def log_probe_result(self, encoder_type, result):
+        if result['ok']:
+            self.log(f"  ✓ {encoder_type}: {result['fps_1080p']:.0f} fps (1080p 환산)")
+        else:
+            self.log(f"  ✗ {encoder_type}: 사용 불가 - {result['error']}")
+
+    def encoder_probe_finished(self, results, raw_codecs):
+        """측정 결과로 코덱 목록/권장 인코더 갱신 (사용자가 고른 코덱이 동작하면 유지)"""
+        self.probe_running = False
+        self.probe_btn.configure(state="normal", text="🔬 성능 측정")
+        if not results or not raw_codecs:
+            return
+        
+        self.probe_results = results
+        self.apply_recommended_encoder(results)
+        previous_encoder = self.encoder.encoder_type
+        if not self.refresh_codec_choices(raw_codecs):
+            # 현재 인코더가 실제로는 동작하지 않음: 측정상 가장 빠른 인코더로 전환
+            self.log(f"⚠️ {previous_encoder} 인코더가 테스트 인코딩에 실패하여 권장 인코더로 전환했습니다.")
+        self.log(f"🔬 인코더 성능 측정 완료 (권장: {self.detector.recommended_encoder})")
+
+    def refresh_codec_choices(self, raw_codecs, prefer_default=False):
+        """
+        코덱 목록을 다시 구성합니다. 현재 코덱을 계속 쓸 수 있으면 유지하고, 사용 불가이거나
+        prefer_default이면 권장 코덱으로 전환합니다. 현재 코덱을 유지했으면 True를 반환합니다.
+        """
+        self.batch_queue.recovery.set_codecs(raw_codecs)
+        self.codec_list, self.codec_data_map, default_label = self.build_codec_choices(raw_codecs)
+        self.codec_combo.configure(values=self.codec_list)
+        
+        current = next(
+            (label for label, info in self.codec_data_map.items()
+             if info['id'] == self.encoder.encoder_type and info['available']),
+            None
+        )
+        kept = current is not None
+        if current is None or prefer_default:
+            current = default_label
+            info = self.codec_data_map.get(current)
+            if info and info['id'] != self.encoder.encoder_type:
+                self.encoder.encoder_type = info['id']
+                self.update_quality_ui()
+                self.update_ui_state()
+        self.codec_var.set(current)
+        self.previous_codec_label = current
+        return kept
+
+    def apply_pending_codec_refresh(self):
+        """인코딩 중에 도착해 미뤄 둔 하드웨어 감지 결과를 코덱 목록에 반영합니다."""
+        if self.pending_codec_refresh is None:
+            return
+        raw_codecs, untouched = self.pending_codec_refresh
+        self.pending_codec_refresh = None
+        # 인코딩하는 동안 사용자가 코덱을 바꿨으면 그 선택을 유지
+        untouched = untouched and self.encoder.encoder_type == self.startup_encoder_type
+        self.refresh_codec_choices(raw_codecs, prefer_default=untouched)
+
+    def startup_hardware_worker(self):
+        """GPU 감지 -> 인코더 실측 캐시 확인 -> FFmpeg 인코더 목록 조회 (창 표시 후 작업 스레드에서)"""
+        # UI가 읽는 self.detector는 건드리지 않고 별도 인스턴스로 감지해 결과만 UI 스레드로 전달
+        detector = HardwareDetector()
+        detector.detect_gpu()
+        probe_results = self.encoder_probe.load_cached()
+        raw_codecs = detector.get_available_codecs(probe_results)
+        self.events.publish('startup.hardware', (detector.gpu_vendor, probe_results, raw_codecs))
+
+    def startup_searcher_worker(self):
+        """Everything 확인과 메타데이터 캐시 로드 (창 표시 후 작업 스레드에서)"""
+        self.searcher.warm_up()
+        self.events.publish('startup.searcher')
+
+    def on_hardware_ready(self, value):
+        """백그라운드 하드웨어 감지 결과를 GPU 표시/포인트 컬러/코덱 목록에 반영"""
+        vendor, probe_results, raw_codecs = value
+        untouched = self.encoder.encoder_type == self.startup_encoder_type
+        self.hardware_ready = True
+        self.detector.restore(vendor)
+        self.probe_results = probe_results
+        if probe_results:
+            self.apply_recommended_encoder(probe_results)
+        
+        encoder_info = self.detector.get_encoder_info()
+        self.apply_accent_color(self.detector.get_accent_color())
+        self.gpu_info_label.configure(text=f"🎮 감지된 GPU: {encoder_info['vendor']} ({encoder_info['name']})")
+        if raw_codecs:
+            if self.encoding_in_progress:
+                # 감지 전에 시작한 인코딩이 쓰는 인코더는 바꾸지 않고, 끝난 뒤 반영
+                self.pending_codec_refresh = (raw_codecs, untouched)
+            else:
+                # 사용자가 아직 코덱을 바꾸지 않았으면 실제 감지 결과의 권장 코덱으로 전환
+                self.refresh_codec_choices(raw_codecs, prefer_default=untouched)
+        self.log(f"감지된 인코더: {encoder_info['name']}")
+        
+        if not probe_results and not is_startup_bench():
+            # 첫 실행 또는 FFmpeg/드라이버 변경: 백그라운드에서 측정
+            self.after(1500, self.start_encoder_probe)
+        startup_timer.mark('hardware_ready')
+        self.check_startup_finished()
+
+    def on_searcher_ready(self):
+        """Everything 설치 여부 표시 (미설치 시 다운로드 버튼 표시)"""
+        everything_status = self.searcher.get_everything_status()
+        self.everything_info_label.configure(
+            text=everything_status['status_text'], text_color=everything_status['color']
+        )
+        if not everything_status['installed'] and self.everything_download_btn is None:
+            self.everything_download_btn = ctk.CTkButton(
+                self.tabview.tab("Search"),
+                text="Everything 다운로드",
+                width=150,
+                height=28,
+                font=ctk.CTkFont(size=12),
+                fg_color="#0071c5",
+                hover_color="#005a9e",
+                command=lambda: webbrowser.open("https://www.voidtools.com/")
+            )
+            self.everything_download_btn.grid(row=1, column=0, pady=(0, 15))
+        startup_timer.mark('cache_ready')
+        self.check_startup_finished()
+
+    def on_first_frame(self):
+        """창이 처음 그려진 시점 기록"""
+        self.update_idletasks()
+        startup_timer.mark('first_frame')
+        self.check_startup_finished()
+
+    def check_startup_finished(self):
+        """첫 화면과 백그라운드 준비가 모두 끝나면 단계별 소요 시간 기록 (벤치마크 모드면 결과 출력 후 종료)"""
+        if not all(startup_timer.has(name) for name in ('first_frame', 'hardware_ready', 'cache_ready')):
+            return
+        self.log(f"시작 소요 시간: {startup_timer.summary()}")
+        if is_startup_bench():
+            startup_timer.dump()
+            self.tasks.shutdown(timeout=1.0)
+            self.after(0, self.destroy)
+
+    def apply_accent_color(self, color):
+        """감지된 GPU의 포인트 컬러를 주요 위젯에 다시 적용"""
+        if color == self.accent_color:
+            return
+        self.accent_color = color
+        hover_color = self.adjust_color_brightness(color, 1.2)
+        self.tabview.configure(segmented_button_selected_color=color)
+        self.gpu_info_label.configure(text_color=color)
+        self.run_btn.configure(fg_color=color, hover_color=hover_color)
+        self.search_btn.configure(fg_color=color, hover_color=hover_color)
+        self.progress_bar.configure(progress_color=color)
+        
+        import tkinter.ttk as ttk
+        style = ttk.Style()
+        style.map('Treeview', background=[('selected', color)])
+        style.map('Treeview.Heading',
+                 background=[('active', color)],
+                 foreground=[('active', 'black')])
+
     def on_codec_change(self, choice):
         """코덱 변경 시 처리"""
         # 헤더 항목 선택 시 무시
@@ -1765,11 +2872,22 @@ class MainWindow(ctk.CTk):
         audio_display_mode = self.audio_var.get()
         audio_mode = self.audio_mode_map.get(audio_display_mode, "copy")
         
+        # 분석 결과는 기억된 것만 사용 (슬라이더/오디오 변경 시 ffprobe를 다시 실행하지 않음)
+        infos = [self.probe_service.peek(path) for path in (self.input_parts or [self.input_file])]
+        if any(info is None for info in infos):
+            self.show_input_probe_pending()
+            if not self.tasks.is_running('input_probe'):
+                self.request_input_probe()
+            return
+        
         if not self.output_file or self.auto_naming:
+            parsed = parse_multipart_name(self.input_file) if self.input_parts else None
             self.output_file = self.encoder.generate_output_filename(
                 self.input_file,
                 quality,
-                audio_mode
+                audio_mode,
+                stem=parsed['base'] if parsed else None,
+                audio_info=infos[0].get('audio_info')
             )
         
         self.output_filename_entry.configure(state="normal")
@@ -1781,7 +2899,7 @@ class MainWindow(ctk.CTk):
         self.update_drive_space_label()
         
         # 예상 용량 계산 및 표시
-        self.update_estimated_size(quality, audio_mode)
+        self.update_estimated_size(quality, audio_mode, infos)
         
         # 버튼 활성화
         if not self.encoding_in_progress:
@@ -1834,12 +2952,27 @@ class MainWindow(ctk.CTk):
         except:
             self.drive_space_label.configure(text="")
             
-    def update_estimated_size(self, quality, audio_mode):
+    def show_input_probe_pending(self):
+        """입력 파일 분석이 끝날 때까지 출력 파일명/예상 용량 대신 분석 중 표시 (인코딩 시작 비활성화)"""
+        self.output_filename_entry.configure(state="normal")
+        self.output_filename_entry.delete(0, "end")
+        self.output_filename_entry.insert(0, "파일 정보 분석 중...")
+        self.output_filename_entry.configure(state="readonly")
+        self.estimated_size_label.configure(text="📊 예상 결과 용량: 파일 정보 분석 중...", text_color="#888888")
+        if not self.encoding_in_progress:
+            self.run_btn.configure(state="disabled")
+            self.edit_output_btn.configure(state="disabled")
+
+    def update_estimated_size(self, quality, audio_mode, infos):
+        """infos: 입력 파일(분할 녹화면 파트별) 분석 결과"""
         if not self.input_file:
             return
             
         try:
-            video_info = self.encoder.get_video_info(self.input_file)
+            if self.input_parts:
+                video_info = combine_video_info(infos)
+            else:
+                video_info = infos[0]
             orig_size = video_info.get('size', 0)
             
             est_data = self.encoder.estimate_output_size(video_info, quality, audio_mode)
@@ -1880,21 +3013,39 @@ class MainWindow(ctk.CTk):
         
         if file_path:
             self.input_file = file_path
+            self.input_parts = None
             self.last_directory = str(Path(file_path).parent)
             self.auto_naming = True
             
             file_name = Path(file_path).name
             self.file_label.configure(text=f"📁 {file_name}")
             
-            # 비디오 정보
-            video_info = self.encoder.get_video_info(file_path)
-            duration_str = format_duration(video_info['duration'])
-            
+            # 비디오 정보 (네트워크 파일이어도 UI가 멈추지 않도록 작업 스레드에서 분석)
             self.log(f"파일 선택됨: {file_name}")
-            self.log(f"정보: {video_info['codec'].upper()} | {video_info['width']}x{video_info['height']} | {duration_str} | {video_info['fps']:.2f}fps")
-            
+            self.request_input_probe(on_ready=lambda infos: self.log_video_info(infos[0]))
             self.update_ui_state()
 
+    def log_video_info(self, video_info):
+        duration_str = format_duration(video_info['duration'])
+        self.log(f"정보: {video_info['codec'].upper()} | {video_info['width']}x{video_info['height']} | {duration_str} | {video_info['fps']:.2f}fps")
+
+    def request_input_probe(self, on_ready=None):
+        """
+        입력 파일(분할 녹화면 모든 파트)을 작업 스레드에서 분석합니다.
+        끝나면 UI 스레드에서 on_ready(정보 리스트)를 호출하고 화면을 갱신합니다 (그 사이 다른 파일을 고르면 버림).
+        """
+        input_file = self.input_file
+        paths = list(self.input_parts or [input_file])
+        
+        def deliver(infos):
+            if self.input_file != input_file:
+                return
+            if on_ready:
+                on_ready(infos)
+            self.update_ui_state()
+        
+        self.probe_service.request(paths, lambda infos: self.after(0, deliver, infos))
+
     def edit_output_filename(self):
         if not self.input_file:
             return
@@ -1959,10 +3110,51 @@ class MainWindow(ctk.CTk):
 
 
     def start_encoding(self):
-        if not self.input_file or self.encoding_in_progress:
+        if not self.input_file or self.encoding_in_progress or self.start_check_pending:
             return
+        # 녹화 여부/컨테이너/출력 파일 확인은 디스크를 읽으므로 작업 스레드에서 (NAS에서도 창이 멈추지 않도록)
+        self.start_check_pending = True
+        self.tasks.submit('start_check', self.start_check_worker, self.input_file, self.output_file)
+
+    def start_check_worker(self, input_file, output_file):
+        """(작업 스레드) 인코딩 시작 전 확인: 녹화 진행 여부, 컨테이너 형식, 출력 파일 존재"""
+        try:
+            recording_state = self.searcher.recording_detector.check(input_file)
+            container = None
+            if recording_state['in_progress']:
+                try:
+                    container = sniff_container(input_file)
+                except OSError:
+                    pass
+            output_exists = Path(output_file).exists()
+        except Exception as e:
+            self.log(f"인코딩 시작 전 확인 실패: {e}", level=WARNING)
+            self.after(0, lambda: setattr(self, 'start_check_pending', False))
+            return
+        self.after(0, self.confirm_start_encoding, input_file, output_file, recording_state, container, output_exists)
+
+    def confirm_start_encoding(self, input_file, output_file, recording_state, container, output_exists):
+        """확인 결과로 필요한 질문을 한 뒤 인코딩을 시작합니다."""
+        self.start_check_pending = False
+        # 확인하는 동안 다른 파일을 골랐거나 인코딩이 시작되었으면 무시
+        if input_file != self.input_file or output_file != self.output_file or self.encoding_in_progress:
+            return
+
+        # 녹화가 아직 진행 중인 파일은 재생 시간이 확정되지 않아 결과물이 잘릴 수 있음
+        follow = False
+        if recording_state['in_progress']:
+            if container in FOLLOW_INPUT_FORMATS:
+                # 스트리밍 가능한 컨테이너는 녹화를 따라가며 실시간 인코딩 가능
+                if not messagebox.askyesno("녹화 진행 중", f"아직 기록 중인 파일로 보입니다:\n{recording_state['reason']}\n\n녹화를 따라가며 인코딩하시겠습니까? (Follow 모드)\n녹화가 {self.follow_idle_seconds}초 동안 멈추면 자동으로 마무리됩니다."):
+                    self.log("인코딩 보류: 녹화 진행 중인 파일")
+                    return
+                follow = True
+                self.log("Follow 모드로 인코딩합니다.")
+            elif not messagebox.askyesno("녹화 진행 중", f"아직 기록 중인 파일로 보입니다:\n{recording_state['reason']}\n\n그래도 인코딩하시겠습니까?"):
+                self.log("인코딩 보류: 녹화 진행 중인 파일")
+                return
             
-        if Path(self.output_file).exists():
+        if output_exists:
             if not messagebox.askyesno("파일 중복", f"이미 파일이 존재합니다:\n{Path(self.output_file).name}\n\n파일을 덮어쓰시겠습니까?\n(기존 파일은 휴지통으로 안전하게 이동됩니다)"):
                 self.log("인코딩 취소: 파일이 이미 존재함")
                 return
@@ -1977,6 +3169,7 @@ class MainWindow(ctk.CTk):
         self.select_btn.configure(state="disabled")
         self.edit_output_btn.configure(state="disabled")
         self.progress_bar.set(0)
+        self.set_pause_button_active(True)
         
         quality = int(self.quality_slider.get())
         audio_mode = self.audio_mode_map.get(self.audio_var.get(), "copy")
@@ -1984,40 +3177,85 @@ class MainWindow(ctk.CTk):
         # 인코딩 스레드 시작
         thread = threading.Thread(
             target=self.encoding_worker,
-            args=(quality, audio_mode, overwrite),
+            args=(quality, audio_mode, overwrite, follow),
             daemon=True
         )
         thread.start()
 
-    def encoding_worker(self, quality, audio_mode, overwrite):
+    def encoding_worker(self, quality, audio_mode, overwrite, follow=False):
         try:
             # 덮어쓰기인 경우 기존 파일을 휴지통으로 이동
             if overwrite and Path(self.output_file).exists():
                 try:
+                    import send2trash
                     send2trash.send2trash(self.output_file)
                     self.log(f"기존 파일을 휴지통으로 이동했습니다: {Path(self.output_file).name}")
                 except Exception as e:
                     self.log(f"휴지통 이동 실패 (영구 삭제될 수 있음): {e}")
 
-            result = self.encoder.encode(
-                self.input_file,
-                quality,
-                audio_mode,
-                self.output_file,
-                self.on_progress_callback,
-                self.on_log_callback,
-                overwrite
-            )
+            self.encoder.cancel_requested = False
+            if self.input_parts:
+                result = self.encoder.encode_concat(
+                    self.input_parts,
+                    quality,
+                    audio_mode,
+                    self.output_file,
+                    self.on_progress_callback,
+                    self.on_log_callback,
+                    overwrite
+                )
+            else:
+                result = self.encoder.encode(
+                    self.input_file,
+                    quality,
+                    audio_mode,
+                    self.output_file,
+                    self.on_progress_callback,
+                    self.on_log_callback,
+                    overwrite,
+                    follow=follow,
+                    idle_timeout=self.follow_idle_seconds
+                )
             
             if result:
                 self.after(0, self.encoding_finished, result)
             else:
-                self.after(0, self.encoding_error, "인코딩 실패")
+                failure = self.encoder.last_failure
+                reason = f"인코딩 실패 ({failure['label']})" if failure else "인코딩 실패"
+                self.after(0, self.encoding_error, reason)
         except Exception as e:
             self.after(0, self.encoding_error, str(e))
 
+    def on_governor_change(self, _=None):
+        """우선순위/CPU 제한 변경 (실행 중인 인코딩에도 즉시 적용)"""
+        priority, io_priority = PRIORITY_OPTION_MAP.get(self.priority_var.get(), ('normal', 'normal'))
+        cpu_cap = CPU_CAP_OPTION_MAP.get(self.cpu_cap_var.get())
+        self.encoder.governor.set_priority(priority, io_priority)
+        self.encoder.governor.set_cpu_cap(cpu_cap)
+        self.log(f"리소스 설정: 우선순위 {self.priority_var.get()}, CPU 제한 {self.cpu_cap_var.get()}")
+
+    def toggle_pause(self):
+        """인코딩 일시정지/재개"""
+        if self.encoder.governor.paused:
+            self.encoder.resume()
+            self.pause_btn.configure(text="⏸ 일시정지")
+            self.log("인코딩 재개")
+        else:
+            self.encoder.pause()
+            self.pause_btn.configure(text="▶ 재개")
+            self.log("인코딩 일시정지")
+            if self.taskbar:
+                self.taskbar.set_paused()
+
+    def set_pause_button_active(self, active):
+        """인코딩 시작/종료 시 일시정지 버튼 상태 갱신 (종료 시 일시정지 상태 해제)"""
+        if not active and self.encoder.governor.paused:
+            self.encoder.resume()
+        self.pause_btn.configure(state="normal" if active else "disabled", text="⏸ 일시정지")
+
     def on_progress_callback(self, data):
-        self.after(0, lambda: self._update_progress_ui(data))
+        # FFmpeg 진행률 줄마다 호출되므로 최신 값만 남겨 UI 프레임마다 반영
+        self.events.publish('encode.progress', data)
 
     def _update_progress_ui(self, data):
         if isinstance(data, dict):
@@ -2040,14 +3278,18 @@ class MainWindow(ctk.CTk):
                 self.taskbar.set_value(data)
 
     def on_log_callback(self, message):
-        self.after(0, lambda: self.log(message))
+        self.log(message, category=CATEGORY_ENCODE)
 
     def encoding_finished(self, output_file):
+        self.events.dispatch()  # 남아 있는 진행률/로그를 먼저 반영 (완료 표시가 덮이지 않도록)
         self.encoding_in_progress = False
+        self.set_pause_button_active(False)
+        self.apply_pending_codec_refresh()
         self.run_btn.configure(state="normal", text="🚀 START")
         self.log(f"✓ 인코딩 완료: {Path(output_file).name}")
         
-        input_size = Path(self.input_file).stat().st_size / (1024**3)
+        input_paths = self.input_parts or [self.input_file]
+        input_size = sum(Path(p).stat().st_size for p in input_paths) / (1024**3)
         output_size = Path(output_file).stat().st_size / (1024**3)
         reduction = ((input_size - output_size) / input_size) * 100 if input_size > 0 else 0
         
@@ -2085,7 +3327,11 @@ class MainWindow(ctk.CTk):
         self.log(f"알림 테스트를 실행했습니다. {icon_path}")
 
     def encoding_error(self, message):
+        self.events.dispatch()  # 남아 있는 진행률/로그를 먼저 반영 (완료 표시가 덮이지 않도록)
         self.encoding_in_progress = False
+        self.queue_running = False
+        self.set_pause_button_active(False)
+        self.apply_pending_codec_refresh()
         self.log(f"✗ 오류 발생: {message}")
         messagebox.showerror("오류", f"인코딩 중 오류가 발생했습니다:\n{message}")
         
@@ -2097,14 +3343,44 @@ class MainWindow(ctk.CTk):
         if self.taskbar:
             self.taskbar.set_error()
 
+    def load_cached_gpu_vendor(self):
+        """이전 실행에서 감지한 GPU 제조사 (설정 파일에 없으면 None)"""
+        try:
+            if self.config_file.exists():
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('detected_gpu')
+        except Exception as e:
+            print(f"설정 로드 중 오류: {e}")
+        return None
+
     def load_settings(self):
         """설정 로드"""
         self.last_directory = str(Path.home())
+        self.follow_idle_seconds = 30
+        self.queue_workers = 1
+        self.queue_device_encoders = []
         try:
             if self.config_file.exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                     self.last_directory = config.get('last_directory', self.last_directory)
+                    self.follow_idle_seconds = config.get('follow_idle_seconds', self.follow_idle_seconds)
+                    self.batch_queue.set_mode(config.get('queue_ranking_mode', self.batch_queue.mode))
+                    self.queue_workers = config.get('queue_parallel_jobs', self.queue_workers)
+                    self.queue_device_encoders = config.get('queue_device_encoders', self.queue_device_encoders)
+                    self.encoder.stall_timeout = config.get('stall_timeout_seconds', self.encoder.stall_timeout)
+                    
+                    # 리소스 조절 설정 복원
+                    if config.get('encode_priority') in PRIORITY_OPTION_MAP:
+                        self.priority_var.set(config['encode_priority'])
+                    if config.get('encode_cpu_cap') in CPU_CAP_OPTION_MAP:
+                        self.cpu_cap_var.set(config['encode_cpu_cap'])
+                    priority, io_priority = PRIORITY_OPTION_MAP[self.priority_var.get()]
+                    self.encoder.governor.set_priority(priority, io_priority)
+                    self.encoder.governor.set_cpu_cap(CPU_CAP_OPTION_MAP[self.cpu_cap_var.get()])
+                    self.searcher.recording_detector.stable_seconds = config.get(
+                        'recording_stable_seconds', self.searcher.recording_detector.stable_seconds
+                    )
                     
                     # 윈도우 위치/크기 복원 (CustomTkinter는 geometry 문자열 사용)
                     geom = config.get('window_geometry_ctk')
@@ -2123,15 +3399,34 @@ class MainWindow(ctk.CTk):
             
             config['last_directory'] = self.last_directory
             config['window_geometry_ctk'] = self.geometry()
+            config['recording_stable_seconds'] = self.searcher.recording_detector.stable_seconds
+            config['follow_idle_seconds'] = self.follow_idle_seconds
+            config['queue_ranking_mode'] = self.batch_queue.mode
+            config['queue_parallel_jobs'] = self.queue_workers
+            config['queue_device_encoders'] = self.queue_device_encoders
+            config['stall_timeout_seconds'] = self.encoder.stall_timeout
+            config['encode_priority'] = self.priority_var.get()
+            config['encode_cpu_cap'] = self.cpu_cap_var.get()
+            if self.hardware_ready:
+                # 다음 실행 시 감지가 끝나기 전까지 쓸 GPU 정보
+                config['detected_gpu'] = self.detector.gpu_vendor
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"설정 저장 중 오류: {e}")
         
+        # 남은 검색/메타데이터 추출 작업과 그 ffprobe/ffmpeg 프로세스 정리
+        self.tasks.shutdown(timeout=1.0)
         self.destroy()
 
 def main():
+    # 배포판(exe)에서 백그라운드 인코딩 서비스로 실행된 경우 (encode_service.start_service_process)
+    if '--service' in sys.argv[1:]:
+        from encode_service import main as service_main
+        service_main(['serve'])
+        return
+
     # FFmpeg 확인
     if not check_ffmpeg():
         if messagebox.askyesno(
@@ -0,0 +1,129 @@
+"""
+메타데이터 추출 우선순위 대기열
+검색 결과 목록에서 사용자가 지금 보고 있는 항목부터 분석합니다.
+선택한 파일 > 화면에 보이는 행(과 그 주변) > 현재 필터/정렬에 맞는 행(표시 순서) > 나머지(검색 순서)
+순으로 꺼내며, 스크롤/필터/정렬이 바뀌면 남은 항목의 순위를 다시 매깁니다.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+PRIORITY_SELECTED = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_MATCHED = 2
+PRIORITY_BACKGROUND = 3
+
+# 보이는 영역 위아래로 함께 앞당길 행 수 (스크롤 직후 빈 행이 보이지 않도록 미리 분석)
+VIEWPORT_MARGIN = 20
+
+
+class MetadataQueue:
+    """
+    메타데이터 추출 대상 우선순위 큐
+
+    항목마다 현재 순위 키(등급, 순번)를 두고 힙에는 (키, 경로)를 넣습니다. 순위가 바뀐 항목은
+    새 키로 다시 넣고, 꺼낼 때 현재 키와 다른 오래된 항목은 버립니다 (스크롤마다 전체를 다시 정렬하지 않음).
+    """
+
+    def __init__(self, items: List[Dict]):
+        self.lock = threading.Lock()
+        self.pending = {item['path']: item for item in items}
+        self.search_order = {item['path']: index for index, item in enumerate(items)}
+        self.matched_rank = {}
+        self.visible = set()
+        self.selected = set()
+        self.keys = {}
+        self.heap = []
+        self.sequence = itertools.count()
+        self._rebuild()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.pending)
+
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def _key(self, path):
+        rank = self.matched_rank.get(path)
+        if path in self.selected:
+            return (PRIORITY_SELECTED, 0)
+        if path in self.visible:
+            return (PRIORITY_VISIBLE, rank if rank is not None else self.search_order[path])
+        if rank is not None:
+            return (PRIORITY_MATCHED, rank)
+        return (PRIORITY_BACKGROUND, self.search_order[path])
+
+    def _push(self, path):
+        key = self._key(path)
+        if self.keys.get(path) != key:
+            self.keys[path] = key
+            heapq.heappush(self.heap, (key, next(self.sequence), path))
+
+    def _rebuild(self):
+        self.keys = {path: self._key(path) for path in self.pending}
+        self.heap = [(key, next(self.sequence), path) for path, key in self.keys.items()]
+        heapq.heapify(self.heap)
+
+    def pop_next(self) -> Optional[Dict]:
+        """가장 우선순위가 높은 항목을 꺼냅니다 (남은 항목이 없으면 None)."""
+        with self.lock:
+            while self.heap:
+                key, _, path = heapq.heappop(self.heap)
+                if path in self.pending and self.keys.get(path) == key:
+                    self.keys.pop(path, None)
+                    return self.pending.pop(path)
+            return None
+
+    def set_matched(self, ordered_paths: Iterable[str]):
+        """현재 필터를 통과한 행의 경로를 표시 순서대로 지정합니다 (필터/정렬 변경 시)."""
+        with self.lock:
+            self.matched_rank = {path: rank for rank, path in enumerate(ordered_paths)}
+            self._rebuild()
+
+    def set_viewport(self, visible_paths: Iterable[str], selected_paths: Iterable[str] = ()):
+        """화면에 보이는 행과 선택된 행을 지정합니다 (스크롤/선택 변경 시)."""
+        with self.lock:
+            visible = set(visible_paths)
+            selected = set(selected_paths)
+            changed = (visible ^ self.visible) | (selected ^ self.selected)
+            self.visible = visible
+            self.selected = selected
+            for path in changed:
+                if path in self.pending:
+                    self._push(path)
+
+
+def viewport_rows(ordered_paths: List[str], first: float, last: float, margin: int = VIEWPORT_MARGIN) -> List[str]:
+    """
+    스크롤 위치(Treeview.yview()의 시작/끝 비율)로 화면에 보이는 행의 경로를 구합니다.
+
+    Args:
+        ordered_paths: 목록에 표시된 순서대로의 경로
+        margin: 위아래로 함께 포함할 행 수
+    """
+    count = len(ordered_paths)
+    if count == 0:
+        return []
+    start = max(0, int(first * count) - margin)
+    end = min(count, int(last * count + 0.999) + margin)
+    return ordered_paths[start:end]
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Metadata Queue Test ===")
+
+    items = [{'path': f'/videos/{i:03d}.mp4'} for i in range(100)]
+    queue = MetadataQueue(items)
+    print(f"초기: {[queue.pop_next()['path'] for _ in range(3)]}")
+
+    # 정렬을 바꾸고(역순) 중간쯤으로 스크롤, 한 파일 선택
+    display = [item['path'] for item in reversed(items)]
+    queue.set_matched(display)
+    queue.set_viewport(viewport_rows(display, 0.5, 0.6, margin=0), ['/videos/010.mp4'])
+    print(f"스크롤 후: {[queue.pop_next()['path'] for _ in range(5)]}")
+    print(f"남은 항목: {len(queue)}")
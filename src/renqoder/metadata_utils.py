@@ -10,6 +10,9 @@ import json
 import time as time_module
 from typing import Dict, Optional, Callable
 
+from io_arbiter import get_io_arbiter, IO_BACKGROUND
+from task_executor import current_token, run_process
+
 def check_everything_available() -> bool:
     """es.exe(Everything CLI)가 사용 가능한지 확인합니다."""
     try:
@@ -49,6 +52,76 @@ def get_file_size_via_everything(filepath: str) -> int:
         pass
     return 0
 
+# 컨테이너 판별을 위해 읽어들일 파일 앞부분 크기
+SNIFF_SIZE = 8192
+
+# ISO-BMFF(MP4/MOV/3GP) 파일의 첫 박스로 올 수 있는 타입
+ISO_BMFF_BOXES = {b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot', b'uuid'}
+
+def _has_sync_pattern(header: bytes, packet_size: int, sync_offset: int = 0, packets: int = 3) -> bool:
+    """MPEG-TS 계열 sync byte(0x47)가 일정 간격으로 반복되는지 확인합니다."""
+    # 파일 앞부분이 잘린 경우(부분 다운로드 등)를 고려하여 첫 패킷 범위 안에서 시작 위치 탐색
+    for start in range(packet_size):
+        positions = [start + sync_offset + packet_size * i for i in range(packets)]
+        if positions[-1] >= len(header):
+            return False
+        if all(header[pos] == 0x47 for pos in positions):
+            return True
+    return False
+
+def sniff_container(filepath: str) -> Optional[str]:
+    """
+    파일 앞부분(수 KB)의 매직 바이트로 컨테이너 형식을 판별합니다.
+    ffprobe를 실행하기 전에 동영상이 아닌 파일을 값싸게 걸러내기 위해 사용합니다.
+    
+    Returns:
+        'mp4', '3gp', 'mkv', 'webm', 'mpegts', 'm2ts', 'avi', 'asf', 'flv', 'mpeg-ps' 중 하나,
+        동영상 컨테이너로 인식되지 않으면 None
+    
+    Raises:
+        OSError: 파일을 읽을 수 없는 경우 (잠김, 권한 없음 등 - 판별 불가)
+    """
+    with open(filepath, 'rb') as f:
+        header = f.read(SNIFF_SIZE)
+    
+    # 빈 파일 또는 0으로 채워진 파일 (미리 할당만 된 녹화 파일 등)
+    if len(header) < 12 or not header.strip(b'\x00'):
+        return None
+    
+    # ISO-BMFF (MP4/MOV/M4V/3GP)
+    if header[4:8] in ISO_BMFF_BOXES:
+        if header[4:8] == b'ftyp' and header[8:11] in (b'3gp', b'3g2'):
+            return '3gp'
+        return 'mp4'
+    
+    # Matroska / WebM (EBML 헤더)
+    if header[:4] == b'\x1a\x45\xdf\xa3':
+        return 'webm' if b'webm' in header[:64] else 'mkv'
+    
+    # AVI (RIFF....AVI )
+    if header[:4] == b'RIFF' and header[8:12] in (b'AVI ', b'AVIX'):
+        return 'avi'
+    
+    # ASF / WMV (ASF Header Object GUID)
+    if header[:8] == b'\x30\x26\xb2\x75\x8e\x66\xcf\x11':
+        return 'asf'
+    
+    # FLV
+    if header[:3] == b'FLV':
+        return 'flv'
+    
+    # MPEG Program Stream / VOB (pack start code)
+    if header[:4] == b'\x00\x00\x01\xba':
+        return 'mpeg-ps'
+    
+    # MPEG-TS (188 bytes) / M2TS (192 bytes, 4바이트 타임스탬프 + TS 패킷)
+    if _has_sync_pattern(header, 188):
+        return 'mpegts'
+    if _has_sync_pattern(header, 192, sync_offset=4):
+        return 'm2ts'
+    
+    return None
+
 def format_duration(seconds: float) -> str:
     """재생 시간을 'XX분 XX초' 형식 문자열로 변환합니다."""
     if seconds <= 0:
@@ -57,7 +130,7 @@ def format_duration(seconds: float) -> str:
     secs = int(seconds % 60)
     return f"{mins}분 {secs}초"
 
-def get_audio_info(filepath: str) -> str:
+def get_audio_info(filepath: str, io_priority: str = IO_BACKGROUND) -> str:
     """
     ffprobe JSON 포맷을 사용하여 오디오 상세 정보(코덱 + 비트레이트)를 가져옵니다.
     기존 encoder.py의 로직을 기반으로 합니다.
@@ -75,52 +148,53 @@ def get_audio_info(filepath: str) -> str:
         # Windows에서 CMD 창 생성 방지
         creationflags = 0x08000000 if os.name == 'nt' else 0
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, creationflags=creationflags)
+        with get_io_arbiter().slot(filepath, io_priority):
+            result = run_process(cmd, text=True, timeout=10, creationflags=creationflags)
         if result.returncode == 0:
             data = json.loads(result.stdout)
             streams = data.get('streams', [])
             if not streams:
                 return 'None'
             
-            a_stream = streams[0]
-            codec = a_stream.get('codec_name', 'UNKNOWN').upper()
-            bitrate_raw = a_stream.get('bit_rate', '')
-            
-            # 코덱 이름 정리
-            codec_map = {
-                'AAC': 'AAC',
-                'AC3': 'AC3',
-                'EAC3': 'EAC3',
-                'DTS': 'DTS',
-                'TRUEHD': 'TrueHD',
-                'FLAC': 'FLAC',
-                'OPUS': 'Opus',
-                'PCM': 'PCM'
-            }
-            
-            display_codec = codec
-            for key, val in codec_map.items():
-                if key in codec:
-                    display_codec = val
-                    break
-            
-            # 비트레이트 정보 추가 (미디어 표준인 1000 단위를 사용)
-            if bitrate_raw and str(bitrate_raw).isdigit():
-                kbps = round(int(bitrate_raw) / 1000)
-                return f"{display_codec}{kbps}k"
-            
-            return display_codec
+            return describe_audio_stream(streams[0])
     except Exception as e:
         print(f"오디오 정보 가져오기 실패: {e}")
     
     return 'Unknown'
 
-def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Optional[Callable[[float], None]] = None) -> Dict:
-    """
-    ffprobe 및 ffmpeg를 사용하여 비디오 상세 정보(Stage 1 & 2)를 가져옵니다.
-    정확한 FPS 추출 및 손상된 파일 정밀 분석을 포함합니다.
-    """
-    info = {
+def describe_audio_stream(a_stream: Dict) -> str:
+    """ffprobe 오디오 스트림 정보를 출력 파일명에 쓰는 '코덱+비트레이트' 문자열로 바꿉니다 (예: AAC192k)."""
+    codec = a_stream.get('codec_name', 'UNKNOWN').upper()
+    bitrate_raw = a_stream.get('bit_rate', '')
+    
+    # 코덱 이름 정리
+    codec_map = {
+        'AAC': 'AAC',
+        'AC3': 'AC3',
+        'EAC3': 'EAC3',
+        'DTS': 'DTS',
+        'TRUEHD': 'TrueHD',
+        'FLAC': 'FLAC',
+        'OPUS': 'Opus',
+        'PCM': 'PCM'
+    }
+    
+    display_codec = codec
+    for key, val in codec_map.items():
+        if key in codec:
+            display_codec = val
+            break
+    
+    # 비트레이트 정보 추가 (미디어 표준인 1000 단위를 사용)
+    if bitrate_raw and str(bitrate_raw).isdigit():
+        kbps = round(int(bitrate_raw) / 1000)
+        return f"{display_codec}{kbps}k"
+    
+    return display_codec
+
+def empty_video_info() -> Dict:
+    """분석 전 기본값 (get_video_info와 async_api.probe 공통)"""
+    return {
         'codec': 'unknown',
         'width': 0,
         'height': 0,
@@ -134,30 +208,157 @@ def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Op
         'size': 0,
         'metadata_loaded': False,
         'invalid': False,
+        'container': None,
+        'audio_info': 'None',
         'estimated_fields': {}
     }
 
+
+def probe_command(filepath: str):
+    """Stage 1 분석용 ffprobe 명령어"""
+    return ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', filepath]
+
+
+def apply_probe_data(info: Dict, data: Dict, file_size: int = 0):
+    """
+    ffprobe JSON 결과(Stage 1)를 info에 채웁니다.
+
+    Args:
+        file_size: 미리 확인한 파일 크기 (0이면 ffprobe의 format.size 사용)
+
+    Returns:
+        (비디오 스트림 또는 None, 재생 시간(초), 컨테이너 비트레이트)
+    """
+    # Format 정보 파싱
+    format_data = data.get('format', {})
+    duration_raw = float(format_data.get('duration', 0))
+    if file_size <= 0:
+        file_size = int(format_data.get('size', 0))
+    info['size'] = file_size
+    bitrate_raw = int(format_data.get('bit_rate', 0))
+
+    # Stream 정보 파싱
+    streams = data.get('streams', [])
+    vstream = None
+    total_audio_size = 0
+
+    for s in streams:
+        ctype = s.get('codec_type')
+        if ctype == 'video' and vstream is None:
+            vstream = s
+        elif ctype == 'audio':
+            # 오디오 사이즈 정보 추출
+            s_size = int(s.get('size', 0))
+            if s_size <= 0:
+                s_bitrate = int(s.get('bit_rate', 0))
+                s_duration = float(s.get('duration', duration_raw))
+                if s_bitrate > 0 and s_duration > 0:
+                    s_size = int((s_bitrate * s_duration) / 8)
+            total_audio_size += s_size
+
+    info['audio_size'] = total_audio_size
+
+    # 첫 번째 오디오 트랙 요약 (출력 파일명용 - 같은 ffprobe 결과를 쓰므로 오디오만 따로 분석하지 않음)
+    first_audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    if first_audio is not None:
+        info['audio_info'] = describe_audio_stream(first_audio)
+
+    if vstream:
+        info['codec'] = vstream.get('codec_name', 'unknown')
+        info['width'] = int(vstream.get('width', 0))
+        info['height'] = int(vstream.get('height', 0))
+        info['pixels'] = info['width'] * info['height']
+        info['resolution'] = f"{info['width']}x{info['height']}"
+        info['frames'] = int(vstream.get('nb_frames', 0))
+
+        # FPS 정확도 확보 (r_frame_rate)
+        fps_raw = vstream.get('r_frame_rate', '0/0')
+        if '/' in fps_raw:
+            num, den = map(float, fps_raw.split('/'))
+            if den > 0:
+                info['fps'] = round(num / den, 2)
+
+        # Duration Fallback
+        if duration_raw <= 0:
+            try:
+                duration_raw = float(vstream.get('duration', 0))
+            except (ValueError, TypeError):
+                pass
+
+        # 보정: 재생 시간이 프레임 수에 비해 너무 짧은 경우 (corrupted timestamps)
+        if duration_raw > 0 and info['fps'] > 0 and info['frames'] > 0:
+            frame_based_duration = info['frames'] / info['fps']
+            # 10배 이상 차이 나면 프레임 기반 정보가 더 정확할 가능성이 높음
+            if frame_based_duration / duration_raw > 10:
+                duration_raw = frame_based_duration
+                info['estimated_fields']['duration'] = "파일 헤더의 재생 시간이 실제 데이터에 비해 너무 짧아 프레임 수 기반으로 계산되었습니다."
+
+    return vstream, duration_raw, bitrate_raw
+
+
+def finish_video_info(info: Dict, vstream: Optional[Dict], duration_raw: float, bitrate_raw: int):
+    """확정된 재생 시간으로 프레임 수/비트레이트를 보정하고 분석 완료로 표시합니다."""
+    info['metadata_loaded'] = True
+    if not vstream:
+        # 비디오 스트림이 없는 경우
+        info['invalid'] = True
+        return
+
+    info['duration'] = duration_raw
+    info['duration_str'] = format_duration(duration_raw)
+
+    # 보정: frames 계산 (반대 케이스: duration은 있는데 frames가 없는 경우)
+    if info['frames'] <= 0 and info['duration'] > 0 and info['fps'] > 0:
+        info['frames'] = int(info['duration'] * info['fps'])
+
+    # 비트레이트 결정 (계산된 평균 비트레이트 우선 - 가장 정확함)
+    # 비트레이트 표시 및 필터링 시에는 미디어 표준인 1000 단위를 사용 (1024 아님)
+    if duration_raw > 0 and info['size'] > 0:
+        info['bitrate'] = int((info['size'] * 8) / duration_raw)
+        # 재생 시간이 추정된 것이라면 비트레이트 역시 결과적으로 추정된 값임
+        if 'duration' in info['estimated_fields']:
+            info['estimated_fields']['bitrate'] = "추정된 재생 시간을 기반으로 계산된 평균 비트레이트입니다."
+    else:
+        bitrate = bitrate_raw
+        if bitrate <= 0:
+            bitrate = int(vstream.get('bit_rate', 0))
+        info['bitrate'] = bitrate
+
+
+def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Optional[Callable[[float], None]] = None,
+                   io_priority: str = IO_BACKGROUND) -> Dict:
+    """
+    ffprobe 및 ffmpeg를 사용하여 비디오 상세 정보(Stage 1 & 2)를 가져옵니다.
+    정확한 FPS 추출 및 손상된 파일 정밀 분석을 포함합니다.
+    ffprobe/정밀 스캔은 io_priority 우선순위로 파일이 있는 장치의 I/O 슬롯을 얻어 실행합니다.
+    """
+    info = empty_video_info()
+
+    # 0. 매직 바이트 검사 (ffprobe 실행 전 비디오가 아닌 파일 조기 제외)
+    try:
+        info['container'] = sniff_container(filepath)
+        if info['container'] is None:
+            info['invalid'] = True
+            info['metadata_loaded'] = True
+            return info
+    except OSError:
+        # 읽을 수 없는 경우(공유 위반 등)에는 판단을 ffprobe에 맡김
+        pass
+
     try:
         creationflags = 0x08000000 if os.name == 'nt' else 0
         
         # 1. ffprobe JSON 상세 분석 (Stage 1)
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            filepath
-        ]
+        cmd = probe_command(filepath)
         
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True, 
-            encoding='utf-8',
-            creationflags=creationflags,
-            timeout=10
-        )
+        with get_io_arbiter().slot(filepath, io_priority):
+            result = run_process(
+                cmd, 
+                text=True, 
+                encoding='utf-8',
+                creationflags=creationflags,
+                timeout=10
+            )
         
         if result.returncode != 0:
             info['invalid'] = True
@@ -166,10 +367,6 @@ def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Op
 
         data = json.loads(result.stdout)
         
-        # Format 정보 파싱
-        format_data = data.get('format', {})
-        duration_raw = float(format_data.get('duration', 0))
-        
         # 파일 크기 확인 우선순위: 1. Everything, 2. OS System, 3. ffprobe
         file_size = 0
         if check_everything_available():
@@ -181,63 +378,10 @@ def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Op
             except:
                 pass
         
-        if file_size <= 0:
-            file_size = int(format_data.get('size', 0))
-            
-        info['size'] = file_size
-        bitrate_raw = int(format_data.get('bit_rate', 0))
-
-        # Stream 정보 파싱
+        vstream, duration_raw, bitrate_raw = apply_probe_data(info, data, file_size)
         streams = data.get('streams', [])
-        vstream = None
-        total_audio_size = 0
-        
-        for s in streams:
-            ctype = s.get('codec_type')
-            if ctype == 'video' and vstream is None:
-                vstream = s
-            elif ctype == 'audio':
-                # 오디오 사이즈 정보 추출
-                s_size = int(s.get('size', 0))
-                if s_size <= 0:
-                    s_bitrate = int(s.get('bit_rate', 0))
-                    s_duration = float(s.get('duration', duration_raw))
-                    if s_bitrate > 0 and s_duration > 0:
-                        s_size = int((s_bitrate * s_duration) / 8)
-                total_audio_size += s_size
-        
-        info['audio_size'] = total_audio_size
         
         if vstream:
-            info['codec'] = vstream.get('codec_name', 'unknown')
-            info['width'] = int(vstream.get('width', 0))
-            info['height'] = int(vstream.get('height', 0))
-            info['pixels'] = info['width'] * info['height']
-            info['resolution'] = f"{info['width']}x{info['height']}"
-            info['frames'] = int(vstream.get('nb_frames', 0))
-            
-            # FPS 정확도 확보 (r_frame_rate)
-            fps_raw = vstream.get('r_frame_rate', '0/0')
-            if '/' in fps_raw:
-                num, den = map(float, fps_raw.split('/'))
-                if den > 0:
-                    info['fps'] = round(num / den, 2)
-            
-            # Duration Fallback
-            if duration_raw <= 0:
-                try:
-                    duration_raw = float(vstream.get('duration', 0))
-                except (ValueError, TypeError):
-                    pass
-            
-            # 보정: 재생 시간이 프레임 수에 비해 너무 짧은 경우 (corrupted timestamps)
-            if duration_raw > 0 and info['fps'] > 0 and info['frames'] > 0:
-                frame_based_duration = info['frames'] / info['fps']
-                # 10배 이상 차이 나면 프레임 기반 정보가 더 정확할 가능성이 높음
-                if frame_based_duration / duration_raw > 10:
-                    duration_raw = frame_based_duration
-                    info['estimated_fields']['duration'] = "파일 헤더의 재생 시간이 실제 데이터에 비해 너무 짧아 프레임 수 기반으로 계산되었습니다."
-            
             # 2. ffmpeg 정밀 분석 (Stage 2)
             # 재생 시간이 0이거나, 파일 크기에 비해 너무 짧은 경우 (suspicious)
             is_suspicious = False
@@ -265,71 +409,64 @@ def get_video_info(filepath: str, fast_only: bool = False, progress_callback: Op
                         ffmpeg_cmd.extend(['-map', '0:a', '-c', 'copy'])
                     ffmpeg_cmd.extend(['-f', 'null', '-'])
                     
-                    process = subprocess.Popen(
-                        ffmpeg_cmd,
-                        stderr=subprocess.PIPE,
-                        stdout=subprocess.DEVNULL,
-                        text=True,
-                        encoding='utf-8',
-                        creationflags=creationflags,
-                        bufsize=1
-                    )
-                    
-                    last_output_time = time_module.time()
-                    inactivity_timeout = 60
-                    final_dur = 0.0
-                    
-                    while True:
-                        line = process.stderr.readline()
-                        if line:
+                    # 파일 전체를 읽는 작업이므로 장치 슬롯을 잡고, 대역폭 예산에도 등록
+                    arbiter = get_io_arbiter()
+                    with arbiter.slot(filepath, io_priority):
+                        process = subprocess.Popen(
+                            ffmpeg_cmd,
+                            stderr=subprocess.PIPE,
+                            stdout=subprocess.DEVNULL,
+                            text=True,
+                            encoding='utf-8',
+                            creationflags=creationflags,
+                            bufsize=1
+                        )
+                        arbiter.track(process, filepath, io_priority)
+                        # 작업이 취소되면(새 검색 시작 등) 스캔 프로세스를 바로 종료
+                        token = current_token()
+                        if token is not None:
+                            token.add_process(process)
+                        try:
                             last_output_time = time_module.time()
-                            time_match = re.search(r'time=\s*(\d+):(\d+):(\d+\.?\d*)', line)
-                            if time_match:
-                                h, m, s_val = map(float, time_match.groups())
-                                current_dur = h * 3600 + m * 60 + s_val
-                                if current_dur > final_dur:
-                                    final_dur = current_dur
-                                    if progress_callback:
-                                        progress_callback(final_dur)
-                        else:
-                            if process.poll() is not None:
-                                break
-                            if time_module.time() - last_output_time > inactivity_timeout:
-                                process.terminate()
-                                process.wait(timeout=5)
-                                break
-                            time_module.sleep(0.1)
-                    
+                            inactivity_timeout = 60
+                            final_dur = 0.0
+
+                            while True:
+                                line = process.stderr.readline()
+                                if line:
+                                    last_output_time = time_module.time()
+                                    time_match = re.search(r'time=\s*(\d+):(\d+):(\d+\.?\d*)', line)
+                                    if time_match:
+                                        h, m, s_val = map(float, time_match.groups())
+                                        current_dur = h * 3600 + m * 60 + s_val
+                                        if current_dur > final_dur:
+                                            final_dur = current_dur
+                                            if progress_callback:
+                                                progress_callback(final_dur)
+                                else:
+                                    if process.poll() is not None:
+                                        break
+                                    if arbiter.is_throttled(process):
+                                        # 대역폭 양보로 멈춘 시간은 응답 없음으로 보지 않음
+                                        last_output_time = time_module.time()
+                                    if time_module.time() - last_output_time > inactivity_timeout:
+                                        process.terminate()
+                                        process.wait(timeout=5)
+                                        break
+                                    time_module.sleep(0.1)
+                        finally:
+                            arbiter.untrack(process)
+                            if token is not None:
+                                token.remove_process(process)
+                                # 중간에 끊긴 스캔 결과를 재생 시간으로 쓰지 않음
+                                token.check()
+
                     duration_raw = final_dur
                     info['estimated_fields']['duration'] = "파일 헤더에 정보가 없어 FFmpeg 정밀 스캔을 통해 실제 재생 시간을 확인했습니다."
                 except Exception as e:
                     print(f"정밀 분석 오류: {e}")
             
-            info['duration'] = duration_raw
-            info['duration_str'] = format_duration(duration_raw)
-            
-            # 보정: frames 계산 (반대 케이스: duration은 있는데 frames가 없는 경우)
-            if info['frames'] <= 0 and info['duration'] > 0 and info['fps'] > 0:
-                info['frames'] = int(info['duration'] * info['fps'])
-            
-            # 비트레이트 결정 (계산된 평균 비트레이트 우선 - 가장 정확함)
-            # 비트레이트 표시 및 필터링 시에는 미디어 표준인 1000 단위를 사용 (1024 아님)
-            if duration_raw > 0 and info['size'] > 0:
-                info['bitrate'] = int((info['size'] * 8) / duration_raw)
-                # 재생 시간이 추정된 것이라면 비트레이트 역시 결과적으로 추정된 값임
-                if 'duration' in info['estimated_fields']:
-                    info['estimated_fields']['bitrate'] = "추정된 재생 시간을 기반으로 계산된 평균 비트레이트입니다."
-            else:
-                bitrate = bitrate_raw
-                if bitrate <= 0:
-                    bitrate = int(vstream.get('bit_rate', 0))
-                info['bitrate'] = bitrate
-            
-            info['metadata_loaded'] = True
-        else:
-            # 비디오 스트림이 없는 경우
-            info['invalid'] = True
-            info['metadata_loaded'] = True
+        finish_video_info(info, vstream, duration_raw, bitrate_raw)
 
     except Exception as e:
         print(f"메타데이터 추출 오류 ({filepath}): {e}")
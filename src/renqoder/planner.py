@@ -0,0 +1,337 @@
+"""
+라이브러리 절감 예측 모듈
+검색 결과 전체에 대해 예상 절감 용량과 인코딩 소요 시간을 NumPy로 일괄 계산합니다.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from startup import lazy_import
+
+from encoder import (
+    ESTIMATE_BASE_BPP, ESTIMATE_BASE_QUALITY, ESTIMATE_HALVING_STEP, ESTIMATE_DEFAULT_VIDEO,
+    AAC_BITRATE, FALLBACK_AUDIO_BITRATE, DEFAULT_PRESETS, get_preset_family, get_preset_speed_factor
+)
+
+# NumPy는 첫 계산 시점에 로드 (프로그램 시작 시간 단축)
+np = lazy_import('numpy')
+
+
+# 처리 속도 환산 기준 해상도 (1080p)
+REFERENCE_PIXELS = 1920 * 1080
+
+# 1080p 기준 인코더별 기본 처리 속도 (fps) - 실제 인코딩 측정값이 들어오면 보정됨
+DEFAULT_THROUGHPUT_FPS = {
+    # Hardware (코덱 무관, 제조사별)
+    'nvenc': 180.0,
+    'qsv': 120.0,
+    'amf': 150.0,
+
+    # Software (build_command의 기본 프리셋 기준)
+    'libx264': 60.0,
+    'libx265': 10.0,
+    'libvpx-vp9': 8.0,
+    'libvpx': 30.0,
+    'libaom-av1': 2.0,
+    'libsvtav1': 25.0,
+    'mpeg4': 250.0
+}
+
+# 알 수 없는 인코더의 기본 처리 속도
+FALLBACK_THROUGHPUT_FPS = 30.0
+
+# 플래너가 유지하는 수치 컬럼
+PLANNER_FIELDS = ('duration', 'width', 'height', 'fps', 'size', 'audio_size', 'bit_rate')
+
+# 그룹화 기준별 항목 -> 키 추출 함수
+GROUP_KEYS = {
+    'folder': lambda item: os.path.dirname(item['path']),
+    'codec': lambda item: (item.get('codec') or 'unknown').lower(),
+    'container': lambda item: item.get('container') or item.get('extension', '').lstrip('.') or 'unknown'
+}
+
+
+class ThroughputModel:
+    """
+    인코더/프리셋별 처리 속도(1080p 환산 fps) 모델. 실제 인코딩 측정값으로 보정됩니다.
+
+    측정값은 (인코더, 프리셋) 단위로 보관하며, 측정되지 않은 프리셋은 같은 인코더의
+    다른 프리셋 측정값을 프리셋 간 상대 속도(encoder.PRESET_LADDERS)로 환산하여 추정합니다.
+    """
+
+    def __init__(self, smoothing=0.3):
+        """
+        Args:
+            smoothing: 새 측정값 반영 비율 (지수 이동 평균 계수)
+        """
+        self.smoothing = smoothing
+        self.measured = {}
+        self.lock = threading.Lock()
+
+    def _default_fps(self, encoder_type):
+        """측정값이 없을 때 사용하는 기본 프리셋의 처리 속도"""
+        etype = encoder_type.lower()
+        if etype in DEFAULT_THROUGHPUT_FPS:
+            return DEFAULT_THROUGHPUT_FPS[etype]
+        for family in ('nvenc', 'qsv', 'amf'):
+            if family in etype:
+                return DEFAULT_THROUGHPUT_FPS[family]
+        return FALLBACK_THROUGHPUT_FPS
+
+    def _key(self, encoder_type, preset):
+        """측정값 키 (프리셋 None은 인코더의 기본 프리셋과 같은 키로 취급)"""
+        if preset is None:
+            preset = DEFAULT_PRESETS.get(get_preset_family(encoder_type))
+        return (encoder_type, None if preset is None else str(preset))
+
+    def fps_1080p(self, encoder_type: str, preset=None) -> float:
+        """인코더(프리셋)의 1080p 환산 처리 속도(fps)를 반환합니다."""
+        factor = get_preset_speed_factor(encoder_type, preset)
+        with self.lock:
+            key = self._key(encoder_type, preset)
+            if key in self.measured:
+                return self.measured[key]
+
+            # 같은 인코더의 다른 프리셋 측정값을 기본 프리셋 기준으로 환산해 평균
+            baselines = [
+                fps / get_preset_speed_factor(encoder_type, measured_preset)
+                for (measured_type, measured_preset), fps in self.measured.items()
+                if measured_type == encoder_type
+            ]
+        if baselines:
+            return sum(baselines) / len(baselines) * factor
+        return self._default_fps(encoder_type) * factor
+
+    def observe(self, encoder_type: str, fps: float, pixels: int, preset=None):
+        """
+        실제 인코딩에서 측정한 처리 속도를 반영합니다.
+
+        Args:
+            fps: 측정된 인코딩 속도 (초당 프레임)
+            pixels: 프레임 당 픽셀 수 (width * height)
+            preset: 측정 시 사용한 프리셋 (None이면 기본 프리셋)
+        """
+        if fps <= 0 or pixels <= 0:
+            return
+
+        equivalent = fps * pixels / REFERENCE_PIXELS
+        key = self._key(encoder_type, preset)
+        with self.lock:
+            previous = self.measured.get(key)
+            if previous is None:
+                self.measured[key] = equivalent
+            else:
+                self.measured[key] = previous + self.smoothing * (equivalent - previous)
+
+    def estimate_seconds(self, encoder_type: str, frames, pixels, preset=None):
+        """프레임 수와 프레임 당 픽셀 수로 예상 인코딩 시간(초)을 계산합니다 (스칼라/배열 모두 지원)."""
+        return frames * (pixels / REFERENCE_PIXELS) / self.fps_1080p(encoder_type, preset)
+
+
+class SavingsPlanner:
+    """
+    검색 결과 전체의 예상 절감 용량/소요 시간 계산기
+
+    항목별 메타데이터를 열(column) 배열로 보관하여 VideoEncoder.estimate_output_size와
+    동일한 모델을 수천 개 파일에 대해 한 번에 계산합니다. 1단계 메타데이터가 도착할 때마다
+    update()로 해당 행만 갱신하므로 분석 도중에도 결과가 점진적으로 채워집니다.
+    """
+
+    def __init__(self, throughput_model: Optional[ThroughputModel] = None):
+        self.throughput = throughput_model or ThroughputModel()
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, items: Optional[List[Dict]] = None):
+        """모든 행을 비우고, 주어진 항목이 있으면 다시 채웁니다."""
+        with self.lock:
+            self.count = 0
+            self.row_index = {}
+            self.group_values = {name: [] for name in GROUP_KEYS}
+            # 배열은 첫 행이 들어올 때 할당 (NumPy 로드도 그때)
+            self.valid = None
+            self.columns = None
+
+        if items:
+            self.update(items)
+
+    def _ensure_capacity(self, required):
+        """필요 시 배열 용량을 두 배씩 늘립니다."""
+        if self.valid is None:
+            self.valid = np.zeros(0, dtype=bool)
+            self.columns = {name: np.zeros(0) for name in PLANNER_FIELDS}
+        capacity = len(self.valid)
+        if required <= capacity:
+            return
+
+        new_capacity = max(required, capacity * 2, 256)
+        self.valid = np.concatenate([self.valid, np.zeros(new_capacity - capacity, dtype=bool)])
+        for name in PLANNER_FIELDS:
+            self.columns[name] = np.concatenate([self.columns[name], np.zeros(new_capacity - capacity)])
+
+    def update(self, items: List[Dict]):
+        """항목(검색 결과 + 메타데이터)을 추가하거나 해당 행을 갱신합니다."""
+        with self.lock:
+            for item in items:
+                row = self.row_index.get(item['path'])
+                if row is None:
+                    row = self.count
+                    self._ensure_capacity(row + 1)
+                    self.row_index[item['path']] = row
+                    self.count += 1
+                    for name in GROUP_KEYS:
+                        self.group_values[name].append('')
+
+                # 분석이 끝난 정상 동영상만 계산 대상 (녹화 중인 파일은 보류)
+                self.valid[row] = bool(
+                    item.get('metadata_loaded') and not item.get('invalid') and not item.get('recording')
+                    and item.get('duration', 0) > 0
+                )
+                for name in PLANNER_FIELDS:
+                    value = item.get(name) or 0
+                    if not isinstance(value, (int, float)):
+                        value = 0
+                    # 해상도/프레임레이트가 없으면 estimate_output_size와 같은 기본값 사용
+                    self.columns[name][row] = value or ESTIMATE_DEFAULT_VIDEO.get(name, 0)
+                for name, key_func in GROUP_KEYS.items():
+                    self.group_values[name][row] = key_func(item)
+
+    def estimate(self, encoder_type: str, quality: int, audio_mode: str) -> Dict:
+        """
+        모든 행에 대해 예상 출력 크기/절감량/인코딩 시간을 일괄 계산합니다.
+
+        Returns:
+            {'estimated', 'savings', 'seconds', 'worth', 'size', 'valid'} 배열 딕셔너리
+            (worth: 인코딩 시 용량이 줄어드는 파일 여부)
+        """
+        with self.lock:
+            n = self.count
+            self._ensure_capacity(n)
+            c = {name: self.columns[name][:n].copy() for name in PLANNER_FIELDS}
+            valid = self.valid[:n].copy()
+
+        duration = c['duration']
+
+        # 1. 비디오 크기 (estimate_output_size와 동일한 bpp 모델)
+        bpp = ESTIMATE_BASE_BPP * (0.5 ** ((quality - ESTIMATE_BASE_QUALITY) / ESTIMATE_HALVING_STEP))
+        pixels = c['width'] * c['height']
+        v_size = pixels * c['fps'] * bpp * duration / 8
+
+        # 2. 오디오 크기
+        if audio_mode == 'aac':
+            a_size = AAC_BITRATE * duration / 8
+        else:
+            fallback_bitrate = np.where(c['bit_rate'] > 0, c['bit_rate'] * 0.1, FALLBACK_AUDIO_BITRATE)
+            a_size = np.where(c['audio_size'] > 0, c['audio_size'], fallback_bitrate * duration / 8)
+
+        estimated = np.where(valid, v_size + a_size, 0.0)
+        savings = np.where(valid, c['size'] - estimated, 0.0)
+        worth = valid & (savings > 0)
+
+        # 3. 인코딩 시간 (용량이 줄어드는 파일만 인코딩한다고 가정)
+        frames = duration * c['fps']
+        seconds = np.where(worth, self.throughput.estimate_seconds(encoder_type, frames, pixels), 0.0)
+
+        return {
+            'estimated': estimated,
+            'savings': np.where(worth, savings, 0.0),
+            'seconds': seconds,
+            'worth': worth,
+            'size': np.where(valid, c['size'], 0.0),
+            'valid': valid
+        }
+
+    def summarize(self, encoder_type: str, quality: int, audio_mode: str, group_by: str = 'folder') -> List[Dict]:
+        """
+        그룹(폴더/코덱/컨테이너)별 예상 절감 용량과 소요 시간을 계산합니다.
+
+        Returns:
+            절감 용량 내림차순으로 정렬된
+            [{'key', 'files', 'original', 'estimated', 'savings', 'hours'}, ...]
+        """
+        result = self.estimate(encoder_type, quality, audio_mode)
+        with self.lock:
+            keys = np.array(self.group_values[group_by][:len(result['valid'])], dtype=object)
+
+        mask = result['valid']
+        if not mask.any():
+            return []
+
+        unique_keys, inverse = np.unique(keys[mask].astype(str), return_inverse=True)
+
+        def group_sum(values):
+            return np.bincount(inverse, weights=values[mask], minlength=len(unique_keys))
+
+        files = group_sum(result['worth'].astype(float))
+        original = group_sum(np.where(result['worth'], result['size'], 0.0))
+        estimated = group_sum(np.where(result['worth'], result['estimated'], 0.0))
+        savings = group_sum(result['savings'])
+        hours = group_sum(result['seconds']) / 3600
+
+        order = np.argsort(-savings)
+        return [
+            {
+                'key': str(unique_keys[i]),
+                'files': int(files[i]),
+                'original': int(original[i]),
+                'estimated': int(estimated[i]),
+                'savings': int(savings[i]),
+                'hours': float(hours[i])
+            }
+            for i in order
+        ]
+
+    def totals(self, encoder_type: str, quality: int, audio_mode: str) -> Dict:
+        """전체 예상 절감 용량과 소요 시간을 계산합니다."""
+        result = self.estimate(encoder_type, quality, audio_mode)
+        return {
+            'analyzed': int(result['valid'].sum()),
+            'files': int(result['worth'].sum()),
+            'original': int(result['size'][result['worth']].sum()),
+            'estimated': int(result['estimated'][result['worth']].sum()),
+            'savings': int(result['savings'].sum()),
+            'hours': float(result['seconds'].sum() / 3600)
+        }
+
+    def compare(self, scenarios: List[Dict]) -> List[Dict]:
+        """
+        여러 인코더/화질 조합의 전체 결과를 비교합니다.
+
+        Args:
+            scenarios: [{'encoder_type', 'quality', 'audio_mode'}, ...]
+        """
+        return [dict(scenario, **self.totals(**scenario)) for scenario in scenarios]
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Savings Planner Test ===")
+
+    import time
+
+    rng = np.random.default_rng(0)
+    items = []
+    for i in range(20000):
+        duration = float(rng.uniform(60, 7200))
+        bitrate = float(rng.choice([6e6, 20e6, 50e6, 200e6]))
+        items.append({
+            'path': os.path.join(f'/videos/folder{i % 50}', f'clip{i}.mkv'),
+            'metadata_loaded': True,
+            'codec': str(rng.choice(['h264', 'hevc'])),
+            'container': 'mkv',
+            'width': 1920, 'height': 1080, 'fps': 60.0,
+            'duration': duration,
+            'size': int(bitrate * duration / 8),
+            'audio_size': int(160000 * duration / 8)
+        })
+
+    planner = SavingsPlanner()
+    start = time.perf_counter()
+    planner.update(items)
+    rows = planner.summarize('hevc_nvenc', 23, 'copy', group_by='folder')
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(items)}개 파일 계산: {elapsed * 1000:.1f}ms")
+    for row in rows[:5]:
+        print(f"{row['key']}: {row['savings'] / 1e12:.2f}TB 절감, {row['hours']:.1f}시간")
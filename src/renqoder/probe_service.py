@@ -0,0 +1,195 @@
+"""
+입력 파일 분석 서비스
+인코딩 탭에서 고른 파일의 비디오+오디오 정보를 ffprobe 한 번으로 분석하고, (경로, 크기, 수정 시각)별로
+기억해 두었다가 다시 씁니다. 검색 탭과 같은 메타데이터 캐시(VideoSearcher)를 공유하므로 검색 탭에서
+이미 분석한 파일은 ffprobe를 실행하지 않습니다.
+UI 스레드에서는 peek()로 기억된 결과만 읽고(디스크 접근 없음), 분석은 request()로 작업 스레드에서 합니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from io_arbiter import IO_INTERACTIVE
+from metadata_utils import get_video_info, get_audio_info
+from task_executor import TaskCancelled, current_token
+
+
+# 기억해 둘 파일 수 (오래 쓰지 않은 것부터 버림)
+PROBE_MEMO_SIZE = 256
+
+
+def probe_key(path: str):
+    """분석 결과를 구분하는 키 (경로, 크기, 수정 시각) - 파일이 바뀌면 키도 바뀜"""
+    stat = os.stat(path)
+    return (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime)
+
+
+class ProbeService:
+    """
+    입력 파일 분석 결과 저장소
+
+    - probe(): 작업 스레드에서 호출 (파일이 바뀌지 않았으면 기억된 결과, 같은 파일을 동시에 요청하면 한 번만 분석)
+    - peek(): UI 스레드에서 호출 (마지막 분석 결과만 반환, stat도 하지 않음)
+    - request(): 여러 파일을 작업 스레드에서 분석하고 callback(결과 리스트) 호출
+    """
+
+    def __init__(self, searcher=None, executor=None, max_entries: int = PROBE_MEMO_SIZE):
+        """
+        Args:
+            searcher: 메타데이터 캐시를 공유할 VideoSearcher (None이면 이 서비스 안에서만 기억)
+            executor: request()를 실행할 TaskExecutor (None이면 스레드를 직접 만듦)
+        """
+        self.searcher = searcher
+        self.executor = executor
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.memo = OrderedDict()   # 경로 -> (키, 정보)
+        self.inflight = {}          # 키 -> 분석 중인 Future
+        self.stats = {'hits': 0, 'probes': 0, 'shared': 0}
+
+    def peek(self, path: str) -> Optional[Dict]:
+        """마지막으로 분석한 결과 (없으면 None). 디스크에 접근하지 않으므로 UI 스레드에서 호출 가능"""
+        with self.lock:
+            entry = self.memo.get(path)
+            return entry[1] if entry else None
+
+    def probe(self, path: str, io_priority: str = IO_INTERACTIVE) -> Dict:
+        """파일 정보를 반환합니다 (파일이 바뀌지 않았으면 기억된 결과). 작업 스레드에서 호출"""
+        try:
+            key = probe_key(path)
+        except OSError:
+            # 파일에 접근할 수 없으면 매번 다시 분석 (결과는 peek()용으로만 남김)
+            info = self._probe(path, io_priority)
+            with self.lock:
+                self.memo[path] = (None, info)
+            return info
+
+        while True:
+            with self.lock:
+                entry = self.memo.get(path)
+                if entry and entry[0] == key:
+                    self.memo.move_to_end(path)
+                    self.stats['hits'] += 1
+                    return entry[1]
+                future = self.inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = self.inflight[key] = Future()
+                else:
+                    self.stats['shared'] += 1
+
+            if not owner:
+                try:
+                    return future.result()
+                except TaskCancelled:
+                    # 먼저 분석하던 작업이 취소된 것이면 직접 다시 분석
+                    token = current_token()
+                    if token is not None:
+                        token.check()
+                    continue
+
+            try:
+                info = self._probe(path, io_priority)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self.lock:
+                    self.inflight.pop(key, None)
+
+            with self.lock:
+                self.memo[path] = (key, info)
+                self.memo.move_to_end(path)
+                while len(self.memo) > self.max_entries:
+                    self.memo.popitem(last=False)
+            future.set_result(info)
+            return info
+
+    def _probe(self, path: str, io_priority: str) -> Dict:
+        with self.lock:
+            self.stats['probes'] += 1
+        if self.searcher is not None:
+            info = self.searcher.extract_metadata(path, io_priority=io_priority)
+        else:
+            info = get_video_info(path, io_priority=io_priority)
+
+        # 오디오 요약이 없던 이전 버전 캐시 항목은 오디오만 한 번 더 확인해 채워 둠
+        if 'audio_info' not in info and not info.get('invalid'):
+            info['audio_info'] = get_audio_info(path, io_priority=io_priority)
+        return info
+
+    def request(self, paths: List[str], callback: Callable[[List[Dict]], None], group: str = 'input_probe') -> Future:
+        """
+        paths를 작업 스레드에서 분석하고 callback(정보 리스트)를 호출합니다 (callback도 작업 스레드에서 호출됨).
+
+        executor가 있으면 group의 이전 요청을 취소하고 새 요청으로 대체합니다.
+        """
+        def worker():
+            infos = [self.probe(path) for path in paths]
+            callback(infos)
+            return infos
+
+        if self.executor is not None:
+            self.executor.restart(group)
+            return self.executor.submit(group, worker)
+
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(worker())
+            except Exception as e:
+                print(f"파일 분석 오류: {e}")
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def forget(self, path: Optional[str] = None):
+        """기억된 결과를 지웁니다 (path가 None이면 전체, 캐시 초기화 시)."""
+        with self.lock:
+            if path is None:
+                self.memo.clear()
+            else:
+                self.memo.pop(path, None)
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Probe Service Test ===")
+
+    import tempfile
+    import time
+
+    calls = []
+
+    class FakeSearcher:
+        def extract_metadata(self, path, io_priority=None):
+            calls.append(path)
+            time.sleep(0.2)
+            return {'duration': 60.0, 'audio_info': 'AAC192k', 'size': os.path.getsize(path)}
+
+    service = ProbeService(FakeSearcher())
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
+        f.write(b'\0' * 1024)
+        path = f.name
+
+    # 같은 파일을 동시에 4번 요청해도 분석은 한 번
+    threads = [threading.Thread(target=service.probe, args=(path,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    start = time.perf_counter()
+    service.probe(path)
+    print(f"분석 {len(calls)}회, 기억된 결과 {(time.perf_counter() - start) * 1000:.2f}ms, 통계 {service.stats}")
+
+    # 파일이 바뀌면 다시 분석
+    with open(path, 'ab') as f:
+        f.write(b'\0')
+    service.probe(path)
+    print(f"파일 변경 후 분석 {len(calls)}회, peek: {service.peek(path)}")
+    os.unlink(path)
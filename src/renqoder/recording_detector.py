@@ -0,0 +1,122 @@
+"""
+녹화 진행 중 파일 감지 모듈
+OBS 등 녹화 프로그램이 아직 기록 중인 파일을 마지막 수정 시각과 파일 잠금 상태로 판별합니다.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List
+
+
+class RecordingDetector:
+    """기록 중인(계속 커지는) 파일을 감지하는 클래스"""
+
+    # Windows 공유 위반 오류 코드
+    ERROR_SHARING_VIOLATION = 32
+    ERROR_LOCK_VIOLATION = 33
+
+    def __init__(self, stable_seconds=60):
+        """
+        Args:
+            stable_seconds: 마지막 수정 이후 이 시간(초)이 지나야 녹화가 끝난 것으로 간주
+        """
+        self.stable_seconds = stable_seconds
+
+    def is_locked(self, filepath: str) -> bool:
+        """다른 프로세스가 쓰기 목적으로 파일을 잡고 있는지 확인합니다."""
+        if sys.platform == "win32":
+            return self._is_locked_windows(filepath)
+        return self._is_locked_posix(filepath)
+
+    def _is_locked_windows(self, filepath):
+        """쓰기 공유를 허용하지 않고 열어 공유 위반 여부를 확인합니다."""
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            GENERIC_READ = 0x80000000
+            FILE_SHARE_READ = 0x00000001
+            OPEN_EXISTING = 3
+            INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            kernel32.CreateFileW.restype = wintypes.HANDLE
+
+            # 녹화 프로그램이 쓰기 핸들을 열어둔 상태라면 FILE_SHARE_WRITE 없이 열 때 공유 위반이 발생함
+            handle = kernel32.CreateFileW(
+                str(filepath), GENERIC_READ, FILE_SHARE_READ, None, OPEN_EXISTING, 0, None
+            )
+            if handle == INVALID_HANDLE_VALUE:
+                error = ctypes.get_last_error()
+                return error in (self.ERROR_SHARING_VIOLATION, self.ERROR_LOCK_VIOLATION)
+
+            kernel32.CloseHandle(handle)
+            return False
+        except Exception:
+            return False
+
+    def _is_locked_posix(self, filepath):
+        """advisory lock(flock)을 다른 프로세스가 잡고 있는지 확인합니다."""
+        try:
+            import fcntl
+
+            with open(filepath, 'rb') as f:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return True
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return False
+        except Exception:
+            return False
+
+    def check_many(self, filepaths: List[str]) -> Dict[str, Dict]:
+        """
+        여러 파일의 녹화 진행 여부를 판별합니다 (stat과 잠금 검사만 하므로 기다리지 않음).
+
+        최근 stable_seconds 이내에 수정된 파일은 잠금 여부와 관계없이 녹화 중(안정화 대기)으로 보므로,
+        크기 변화를 샘플링해도 판정이 달라지지 않습니다. 잠금 검사는 이유 표시를 위해서만 사용합니다.
+
+        Returns:
+            {경로: {'in_progress': bool, 'reason': str, 'stable_for': float}}
+        """
+        now = time.time()
+        results = {}
+
+        for path in filepaths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            stable_for = max(now - stat.st_mtime, 0.0)
+            if stable_for >= self.stable_seconds:
+                results[path] = {'in_progress': False, 'reason': '', 'stable_for': stable_for}
+            elif self.is_locked(path):
+                results[path] = {'in_progress': True, 'reason': '다른 프로세스가 파일을 기록 중입니다.', 'stable_for': 0.0}
+            else:
+                results[path] = {
+                    'in_progress': True,
+                    'reason': f'최근 수정된 파일입니다. 안정화 대기 중 ({int(stable_for)}/{int(self.stable_seconds)}초)',
+                    'stable_for': stable_for
+                }
+
+        return results
+
+    def check(self, filepath: str) -> Dict:
+        """단일 파일의 녹화 진행 여부를 판별합니다."""
+        return self.check_many([filepath]).get(
+            filepath, {'in_progress': False, 'reason': '', 'stable_for': 0.0}
+        )
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Recording Detector Test ===")
+
+    if len(sys.argv) > 1:
+        detector = RecordingDetector()
+        for path, state in detector.check_many(sys.argv[1:]).items():
+            status = "녹화 중" if state['in_progress'] else "안정"
+            print(f"{path}: {status} {state['reason']}")
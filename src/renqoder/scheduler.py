@@ -0,0 +1,843 @@
+"""
+배치 인코딩 대기열 모듈
+여러 인코딩 작업을 순서 정책(FIFO / 큰 파일 우선 / 절감 효율 우선)에 따라 차례로 실행합니다.
+"""
+
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jobs import EncodeJob, combine_video_info, parse_multipart_name
+from planner import ThroughputModel
+from encoder import get_preset_ladder, get_preset_family
+from cpu_topology import ThreadPlanner
+from metadata_utils import format_duration
+from watchdog import RecoveryPolicy
+from concurrency import AdaptiveConcurrency
+
+
+# 대기열 정렬 방식 -> 표시 이름
+RANKING_MODES = {
+    'fifo': "추가 순서 (FIFO)",
+    'largest': "큰 파일 우선",
+    'savings_rate': "절감 효율 우선"
+}
+
+
+# 하드웨어 인코더 계열 -> 장치 (같은 장치의 인코더는 하나의 인코딩 엔진을 공유)
+DEVICE_KEYWORDS = {
+    'nvenc': 'NVIDIA',
+    'qsv': 'Intel',
+    'amf': 'AMD'
+}
+
+# 장치 모드에서 작업을 미룰 수 있을 때 다시 확인하는 간격(초)
+DEFER_POLL_SECONDS = 1.0
+
+# 입력의 녹화 진행 여부 판정을 재사용하는 시간(초) - 작업자가 폴링할 때마다 모든 입력을 다시 확인하지 않도록
+RECORDING_RECHECK_SECONDS = 2.0
+
+# run(workers=AUTO_WORKERS): 동시 작업 수를 실측 처리량(초당 인코딩된 영상 길이)으로 자동 조절
+AUTO_WORKERS = 0
+ADAPTIVE_MAX_WORKERS = 4
+ADAPTIVE_WINDOW = 60.0          # 조절 판단 구간(초) - 인코딩은 시작 직후 속도가 불안정하므로 길게
+ADAPTIVE_SAMPLE_SECONDS = 5.0   # 진행량 보고 주기(초)
+
+# 장치 과부하로 볼 수 있는 실패 (동시 작업을 줄일 근거)
+OVERLOAD_FAILURES = {'stalled', 'session_limit', 'device'}
+
+
+def get_encoder_device(encoder_type: str) -> str:
+    """인코더가 사용하는 장치 이름 (하드웨어 인코더는 GPU 벤더, 나머지는 'CPU')"""
+    for keyword, device in DEVICE_KEYWORDS.items():
+        if keyword in encoder_type:
+            return device
+    return 'CPU'
+
+
+def build_devices(encoder_types: List[str], cpu_slots=1, gpu_slots=1) -> List[Dict]:
+    """
+    사용자가 동등하다고 승인한 인코더 목록으로 장치 목록을 만듭니다.
+
+    Args:
+        encoder_types: 서로 바꿔 써도 되는 인코더 목록 (예: ['hevc_nvenc', 'libx265'])
+        cpu_slots: CPU 풀에서 동시에 실행할 작업 수
+        gpu_slots: GPU 장치마다 동시에 실행할 작업 수
+
+    Returns:
+        [{'name': 장치 이름, 'encoder_type': 인코더, 'slots': 동시 작업 수}, ...]
+        (장치마다 목록에서 먼저 나온 인코더 하나만 사용)
+    """
+    devices = []
+    seen = set()
+    for encoder_type in encoder_types:
+        name = get_encoder_device(encoder_type)
+        if name in seen:
+            continue
+        seen.add(name)
+        slots = cpu_slots if name == 'CPU' else gpu_slots
+        devices.append({'name': name, 'encoder_type': encoder_type, 'slots': max(1, slots)})
+    return devices
+
+
+def parse_deadline(text: str, now: Optional[datetime] = None) -> float:
+    """
+    "07:00" 형식의 시각을 다음에 돌아오는 해당 시각의 타임스탬프로 변환합니다.
+    (이미 지난 시각이면 다음 날로 간주)
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    now = now or datetime.now()
+    clock = datetime.strptime(text.strip(), "%H:%M")
+    deadline = now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline.timestamp()
+
+
+class BatchQueue:
+    """
+    인코딩 작업 대기열
+
+    savings_rate 모드에서는 '예상 절감 용량 / 예상 인코딩 시간'(초당 절감 바이트)이 큰 작업부터
+    실행합니다. 밤사이처럼 시간이 제한된 경우 같은 시간에 가장 많은 공간을 확보할 수 있습니다.
+    메타데이터가 갱신되거나 실제 인코딩 속도가 측정되면 남은 작업을 다시 정렬합니다.
+    """
+
+    def __init__(self, encoder, throughput_model: Optional[ThroughputModel] = None,
+                 mode='fifo', recording_detector=None):
+        """
+        Args:
+            encoder: 작업을 실행하고 예상 용량을 계산할 VideoEncoder
+            throughput_model: 인코더 처리 속도 모델 (절감 예측기와 공유 가능)
+            mode: 정렬 방식 (RANKING_MODES의 키)
+            recording_detector: 녹화 중인 입력을 건너뛰기 위한 RecordingDetector (선택)
+        """
+        self.encoder = encoder
+        self.throughput = throughput_model or ThroughputModel()
+        self.mode = mode if mode in RANKING_MODES else 'fifo'
+        self.recording_detector = recording_detector
+        self.jobs = []
+        self.next_seq = 0
+        self.stopped = False
+        self.running = {}  # 실행 중인 작업 -> 시작 시각
+        self.running_shares = {}  # 실행 중인 작업 -> 받은 처리 자원 비율 (같은 장치를 나눠 쓰면 1 미만)
+        self.workers = 1
+        self.devices = None  # 설정된 장치 구성 (build_devices() 결과, 마감 계획의 동시 처리 능력 계산용)
+        self.thread_planner = None
+        self.claim_lock = threading.Lock()
+        self.deadline = None  # 마감 시각 (타임스탬프, None이면 기본 프리셋 사용)
+        self.last_plan = None
+        self.recovery = RecoveryPolicy()  # 실패 시 재시도/대체 인코더 정책 (사용 가능한 코덱 목록은 UI가 설정)
+        self.equivalent_encoders = []  # 장치 모드에서 서로 바꿔 쓸 수 있는 인코더 (사용자 승인)
+        self.worker_slots = {}  # 장치 모드 작업자 -> {'device', 'encoder_type', 'encoder', 'job', 'started', 'expected'}
+        self.device_stats = {}  # 장치 이름 -> 처리량 통계
+        self.concurrency = None  # 자동 조절 모드의 AdaptiveConcurrency
+        self.job_progress_callback = None  # 작업별 진행률 (job, 진행 정보) - 설정하면 모든 작업자가 호출
+        self.lock = threading.Lock()
+        self.recording_lock = threading.Lock()
+        self.recording_checked = {}  # 입력 경로 -> (확인 시각, 녹화 진행 중 여부)
+
+    def add(self, job: EncodeJob, video_info: Optional[Dict] = None) -> EncodeJob:
+        """
+        작업을 대기열에 추가합니다.
+
+        Args:
+            video_info: 입력의 메타데이터 (검색 결과 항목 등). 분할 작업이면 파트별 리스트도 가능.
+                        None이면 ffprobe로 직접 분석합니다.
+        """
+        if job.output_file is None:
+            parsed = parse_multipart_name(job.inputs[0]) if job.is_concat else None
+            job.output_file = self.encoder.generate_output_filename(
+                job.inputs[0], job.quality, job.audio_mode, stem=parsed['base'] if parsed else None
+            )
+
+        self.estimate(job, video_info)
+        with self.lock:
+            job.seq = self.next_seq
+            self.next_seq += 1
+            self.jobs.append(job)
+            self._rerank()
+        if self.deadline is not None:
+            self.plan_presets()
+        return job
+
+    def remove(self, job: EncodeJob):
+        """아직 실행되지 않은 작업을 대기열에서 제거합니다."""
+        with self.lock:
+            if job in self.jobs and job.status != 'running':
+                self.jobs.remove(job)
+
+    def take_pending(self) -> List[EncodeJob]:
+        """
+        대기 작업을 모두 꺼내 대기열에서 제거합니다 (다른 곳에 넘길 때 사용).
+        작업을 고르는 중인 작업자가 없을 때 꺼내므로, 실행 중인 대기열이 같은 작업을 함께 실행하지 않습니다.
+        """
+        with self.claim_lock, self.lock:
+            taken = [job for job in self.jobs if job.status == 'pending']
+            self.jobs = [job for job in self.jobs if job.status != 'pending']
+        return taken
+
+    def restore(self, jobs: List[EncodeJob]):
+        """take_pending()으로 꺼낸 작업을 원래 순번대로 대기열에 되돌립니다."""
+        with self.lock:
+            self.jobs.extend(job for job in jobs if job not in self.jobs)
+            self._rerank()
+
+    def clear_finished(self):
+        """완료/실패/건너뛴 작업을 목록에서 제거합니다."""
+        with self.lock:
+            self.jobs = [job for job in self.jobs if job.status in ('pending', 'running')]
+
+    def set_mode(self, mode):
+        """정렬 방식을 바꾸고 남은 작업을 다시 정렬합니다."""
+        if mode not in RANKING_MODES:
+            return
+        with self.lock:
+            self.mode = mode
+            self._rerank()
+
+    def estimate(self, job: EncodeJob, video_info=None):
+        """작업의 예상 출력 크기/절감량/인코딩 시간을 계산하여 job.estimate에 저장합니다."""
+        try:
+            if video_info is None:
+                infos = [self.encoder.get_video_info(path) for path in job.inputs]
+            elif isinstance(video_info, list):
+                infos = video_info
+            else:
+                infos = [video_info]
+            info = combine_video_info(infos) if len(infos) > 1 else infos[0]
+
+            est = self.encoder.estimate_output_size(info, job.quality, job.audio_mode)
+            original = info.get('size', 0)
+            savings = max(original - est['total'], 0) if est['total'] > 0 else 0
+
+            fps = info.get('fps', 0)
+            frames = info.get('frames') or info.get('duration', 0) * fps
+            pixels = info.get('width', 0) * info.get('height', 0)
+
+            job.estimate = {
+                'original': original,
+                'estimated': est['total'],
+                'savings': savings,
+                'frames': frames,
+                'pixels': pixels
+            }
+        except Exception as e:
+            print(f"작업 예상치 계산 오류: {e}")
+            job.estimate = {'original': 0, 'estimated': 0, 'savings': 0, 'frames': 0, 'pixels': 0}
+
+        self._update_rate(job)
+
+    def _job_seconds(self, job, preset):
+        """작업을 주어진 프리셋으로 인코딩할 때의 예상 시간(초)"""
+        est = job.estimate
+        if not est or est['pixels'] <= 0:
+            return 0
+        encoder_type = job.encoder_type or self.encoder.encoder_type
+        return self.throughput.estimate_seconds(encoder_type, est['frames'], est['pixels'], preset)
+
+    def _update_rate(self, job):
+        """처리 속도 모델로 예상 시간과 초당 절감량을 다시 계산합니다."""
+        est = job.estimate
+        seconds = self._job_seconds(job, job.preset)
+        est['seconds'] = seconds
+        est['rate'] = est['savings'] / seconds if seconds > 0 else 0
+
+    def refresh(self, path: str, video_info: Dict):
+        """파일의 메타데이터가 갱신되었을 때 해당 파일을 입력으로 하는 대기 작업의 예상치를 갱신합니다."""
+        with self.lock:
+            targets = [job for job in self.jobs if job.status == 'pending' and not job.is_concat and job.inputs[0] == path]
+        if not targets:
+            return
+
+        for job in targets:
+            self.estimate(job, video_info)
+        with self.lock:
+            self._rerank()
+
+    def _rank_key(self, job):
+        est = job.estimate or {}
+        if self.mode == 'largest':
+            return (-est.get('original', 0), job.seq)
+        if self.mode == 'savings_rate':
+            return (-est.get('rate', 0), job.seq)
+        return (job.seq,)
+
+    def _rerank(self):
+        """대기 중인 작업만 정렬 방식에 맞게 재정렬합니다 (완료/실행 중 작업은 앞에 유지)."""
+        started = [job for job in self.jobs if job.status != 'pending']
+        pending = sorted((job for job in self.jobs if job.status == 'pending'), key=self._rank_key)
+        self.jobs = started + pending
+
+    def pending(self) -> List[EncodeJob]:
+        """실행 순서대로 정렬된 대기 작업 목록"""
+        with self.lock:
+            return [job for job in self.jobs if job.status == 'pending']
+
+    def snapshot(self) -> List[EncodeJob]:
+        """표시용 전체 작업 목록 (완료 → 실행 중 → 대기 순)"""
+        with self.lock:
+            return list(self.jobs)
+
+    def _recording_inputs(self, jobs: List[EncodeJob]) -> set:
+        """
+        작업 입력 중 아직 녹화가 진행 중인 경로의 집합을 반환합니다.
+        확인할 경로를 모아 check_many를 한 번만 호출하고, 판정은 RECORDING_RECHECK_SECONDS 동안 재사용합니다.
+        """
+        if not self.recording_detector:
+            return set()
+        now = time.time()
+        paths = {path for job in jobs for path in job.inputs}
+        with self.recording_lock:
+            stale = [path for path in paths
+                     if now - self.recording_checked.get(path, (0.0, False))[0] >= RECORDING_RECHECK_SECONDS]
+        states = self.recording_detector.check_many(stale) if stale else {}
+        with self.recording_lock:
+            for path in stale:
+                self.recording_checked[path] = (now, states.get(path, {}).get('in_progress', False))
+            # 대기열에서 빠진 입력의 판정은 버림
+            self.recording_checked = {path: entry for path, entry in self.recording_checked.items() if path in paths}
+            return {path for path, (_, in_progress) in self.recording_checked.items() if in_progress}
+
+    def _ready_jobs(self, encoder_type=None, recording=None) -> List[EncodeJob]:
+        """
+        지금 실행할 수 있는 대기 작업 (입력이 녹화 중이거나 해당 인코더로 실행할 수 없는 작업 제외)
+
+        Args:
+            recording: 미리 확인한 녹화 중인 입력 경로 (None이면 여기서 확인)
+        """
+        jobs = self.pending()
+        if recording is None:
+            recording = self._recording_inputs(jobs)
+        ready = []
+        for job in jobs:
+            if encoder_type is not None and not self.can_run(job, encoder_type):
+                continue
+            if any(path in recording for path in job.inputs):
+                continue
+            ready.append(job)
+        return ready
+
+    def next_job(self, worker=None, recording=None) -> Optional[EncodeJob]:
+        """
+        다음에 실행할 작업을 반환합니다. 입력이 아직 녹화 중인 작업은 건너뜁니다.
+
+        Args:
+            worker: 장치 모드의 작업자 키. 지정하면 정렬 순서대로 작업마다 가장 먼저 끝낼 수 있는
+                    작업자를 가상으로 배정해 보고, 이 작업자에게 배정된 첫 작업을 반환합니다.
+                    (더 빠른 장치가 곧 비어서 먼저 끝낼 수 있는 작업은 느린 장치가 가져가지 않음)
+            recording: 미리 확인한 녹화 중인 입력 경로 (None이면 여기서 확인)
+        """
+        if worker is None:
+            ready = self._ready_jobs(recording=recording)
+            return ready[0] if ready else None
+
+        now = time.time()
+        free_at = {key: self._worker_free_at(key, now) for key in self.worker_slots}
+        for job in self._ready_jobs(self.worker_slots[worker]['encoder_type'], recording):
+            candidates = [key for key in free_at if self.can_run(job, self.worker_slots[key]['encoder_type'])]
+            # 끝나는 시각이 같으면 지금 요청한 작업자에게 배정
+            best = min(candidates, key=lambda key: (
+                free_at[key] + self._device_seconds(job, self.worker_slots[key]['encoder_type']), key != worker
+            ))
+            if best == worker:
+                return job
+            free_at[best] += self._device_seconds(job, self.worker_slots[best]['encoder_type'])
+        return None
+
+    def _worker_free_at(self, worker, now: float) -> float:
+        """작업자가 현재 작업을 마칠 것으로 예상되는 시각 (진행률이 있으면 실제 속도로 추정)"""
+        slot = self.worker_slots[worker]
+        if slot['job'] is None:
+            return now
+        elapsed = now - slot['started']
+        encoder = slot['encoder']
+        done = encoder.current_seconds / encoder.total_seconds if encoder.total_seconds > 0 else 0
+        if 0.05 < done < 1:
+            return now + elapsed * (1 - done) / done
+        return max(now, slot['started'] + slot['expected'])
+
+    def can_run(self, job: EncodeJob, encoder_type: str) -> bool:
+        """작업을 주어진 인코더로 실행할 수 있는지 (원래 인코더이거나 둘 다 승인된 동등 인코더)"""
+        target = job.encoder_type or self.encoder.encoder_type
+        if target == encoder_type:
+            return True
+        return target in self.equivalent_encoders and encoder_type in self.equivalent_encoders
+
+    def _device_seconds(self, job: EncodeJob, encoder_type: str) -> float:
+        """작업을 주어진 인코더로 실행할 때의 예상 시간 (계열이 다르면 프리셋은 기본값)"""
+        est = job.estimate
+        if not est or est['pixels'] <= 0:
+            return 0
+        current = job.encoder_type or self.encoder.encoder_type
+        preset = job.preset if get_preset_family(current) == get_preset_family(encoder_type) else None
+        return self.throughput.estimate_seconds(encoder_type, est['frames'], est['pixels'], preset)
+
+    def observe(self, job: EncodeJob, elapsed: float, share: float = 1.0):
+        """
+        완료된 작업의 실제 처리 속도를 모델에 반영하고 남은 작업을 다시 정렬합니다.
+
+        Args:
+            share: 작업이 받은 처리 자원 비율. 코어를 나눠 받은 작업의 속도를 장치 전체를 쓸 때의
+                   속도로 환산해 저장합니다 (모델은 항상 작업 하나가 장치를 모두 쓰는 기준).
+        """
+        est = job.estimate or {}
+        if elapsed <= 0 or not est.get('frames'):
+            return
+
+        encoder_type = job.encoder_type or self.encoder.encoder_type
+        self.throughput.observe(encoder_type, est['frames'] / elapsed / max(share, 0.01), est['pixels'], job.preset)
+
+        with self.lock:
+            for pending_job in self.jobs:
+                if pending_job.status == 'pending':
+                    self._update_rate(pending_job)
+            self._rerank()
+
+    def set_devices(self, devices: Optional[List[Dict]]):
+        """
+        실행할 장치 구성을 설정합니다 (run() 전에 마감 계획이 같은 처리 능력을 쓰도록 UI가 호출).
+
+        Args:
+            devices: build_devices() 결과. None이면 장치 하나(CPU 또는 GPU 인코더)로 실행
+        """
+        self.devices = devices or None
+        if self.deadline is not None:
+            return self.plan_presets()
+        return None
+
+    def set_deadline(self, deadline: Optional[float]):
+        """마감 시각(타임스탬프)을 설정합니다. None이면 마감 모드를 끄고 기본 프리셋으로 되돌립니다."""
+        self.deadline = deadline
+        if deadline is not None:
+            return self.plan_presets()
+
+        with self.lock:
+            for job in self.jobs:
+                if job.status == 'pending':
+                    job.preset = None
+                    self._update_rate(job)
+            self._rerank()
+        self.last_plan = None
+        return None
+
+    def plan_presets(self, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        마감 시각까지 모든 대기 작업이 끝나도록 작업별 프리셋을 정합니다.
+
+        모든 작업을 가장 느린(압축 효율이 높은) 프리셋에서 시작하여, 예상 총 시간이 남은 시간을
+        넘는 동안 한 단계 올렸을 때 가장 많은 시간이 줄어드는 작업부터 빠른 프리셋으로 올립니다.
+        처리 속도 모델이 실측값으로 갱신될 때마다 다시 호출하면 남은 작업의 계획이 조정됩니다.
+
+        Returns:
+            {'feasible': 마감 준수 가능 여부, 'seconds': 예상 총 시간, 'available': 남은 시간}
+            (마감 모드가 꺼져 있으면 None)
+        """
+        if self.deadline is None:
+            return None
+
+        now = now or time.time()
+        available = self.deadline - now
+
+        # 같은 장치의 동시 작업들은 자원을 나눠 쓰므로 (작업당 속도도 그만큼 줄어듦)
+        # 동시 작업 수가 아니라 설정된 장치 수만큼 시간 여유가 늘어남
+        available *= len(self.devices) if self.devices else 1
+        # 진행 중인 작업은 받은 자원 비율만큼 진행된 것으로 보고 남은 예상 시간만큼 줄어듦
+        for job, started in list(self.running.items()):
+            if job.estimate:
+                done = (now - started) * self.running_shares.get(job, 1.0)
+                available -= max(job.estimate.get('seconds', 0) - done, 0)
+
+        with self.lock:
+            jobs = [job for job in self.jobs if job.status == 'pending']
+            levels = {}
+            ladders = {}
+            heap = []
+            total = 0.0
+
+            for index, job in enumerate(jobs):
+                ladder = [preset for preset, _ in get_preset_ladder(job.encoder_type or self.encoder.encoder_type)]
+                if not ladder:
+                    total += self._job_seconds(job, job.preset)
+                    continue
+                ladders[index] = ladder
+                levels[index] = 0
+                seconds = self._job_seconds(job, ladder[0])
+                total += seconds
+                if len(ladder) > 1:
+                    gain = seconds - self._job_seconds(job, ladder[1])
+                    heapq.heappush(heap, (-gain, job.seq, index))
+
+            while total > available and heap:
+                neg_gain, _, index = heapq.heappop(heap)
+                total += neg_gain
+                levels[index] += 1
+                ladder = ladders[index]
+                level = levels[index]
+                if level + 1 < len(ladder):
+                    job = jobs[index]
+                    gain = self._job_seconds(job, ladder[level]) - self._job_seconds(job, ladder[level + 1])
+                    heapq.heappush(heap, (-gain, job.seq, index))
+
+            for index, level in levels.items():
+                jobs[index].preset = ladders[index][level]
+            for job in jobs:
+                self._update_rate(job)
+            self._rerank()
+
+        self.last_plan = {'feasible': total <= available, 'seconds': total, 'available': available}
+        return self.last_plan
+
+    def stop(self):
+        """현재 작업이 끝나면 대기열 실행을 멈춥니다."""
+        self.stopped = True
+
+    def cancel_running(self):
+        """실행 중인 모든 작업의 FFmpeg를 중단합니다 (작업자별 인코더 포함)."""
+        for job in list(self.running):
+            job.cancel()
+
+    def run(self, progress_callback=None, log_callback=None, job_callback=None, workers=1, devices=None):
+        """
+        대기열이 빌 때까지(또는 stop() 호출 시까지) 작업을 순서대로 실행합니다.
+
+        Args:
+            job_callback: 작업 시작/종료 시 호출되는 함수 (EncodeJob 전달)
+            workers: 동시에 실행할 작업 수. 2 이상이면 CPU 토폴로지에 따라 작업마다 코어를 나눠
+                     스레드 옵션과 CPU affinity를 지정합니다. AUTO_WORKERS면 처리량을 보며 자동 조절합니다.
+            devices: build_devices() 결과. 지정하면 GPU와 CPU 풀을 별도 장치로 동시에 사용하며
+                     (workers 대신 장치별 slots 사용), 작업은 가장 먼저 끝낼 수 있는 장치로 보냅니다.
+
+        Returns:
+            이번 실행에서 처리한 작업 리스트
+        """
+        self.stopped = False
+        processed = []
+        self.devices = devices or None
+
+        if devices:
+            return self._run_devices(devices, processed, progress_callback, log_callback, job_callback)
+
+        if workers == AUTO_WORKERS:
+            return self._run_adaptive(processed, progress_callback, log_callback, job_callback)
+
+        self.workers = max(1, workers)
+        if self.workers == 1:
+            self._worker_loop(self.encoder, None, processed, progress_callback, log_callback, job_callback)
+            return processed
+
+        if self.thread_planner is None:
+            self.thread_planner = ThreadPlanner()
+        allocations = self.thread_planner.allocate(self.workers)
+
+        threads = []
+        for index, allocation in enumerate(allocations):
+            # 작업자마다 별도의 VideoEncoder (프로세스/진행률 상태가 분리되어야 함)
+            encoder = type(self.encoder)(self.encoder.encoder_type)
+            encoder.thread_allocation = allocation
+            encoder.governor = self.encoder.governor  # 일시정지/우선순위는 모든 작업자에 공통 적용
+            encoder.stall_timeout = self.encoder.stall_timeout
+            encoder.probe_service = getattr(self.encoder, 'probe_service', None)
+            if log_callback:
+                log_callback(f"대기열 작업자 {index + 1}: CPU {allocation['cpus']} (NUMA 노드 {allocation['node']})")
+
+            # 진행률 표시는 첫 번째 작업자 기준
+            worker_progress = progress_callback if index == 0 else None
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(encoder, allocation, processed, worker_progress, log_callback, job_callback),
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+        self.workers = 1
+        return processed
+
+    def _run_adaptive(self, processed, progress_callback, log_callback, job_callback):
+        """
+        동시 작업 수를 1개부터 시작해 전체 처리량이 늘어나는 동안 하나씩 늘립니다.
+
+        작업 수가 계속 바뀌므로 코어를 고정 배분하지 않고 FFmpeg 기본 스레드 설정을 사용합니다.
+        """
+        maximum = min(ADAPTIVE_MAX_WORKERS, max(1, len(self.pending())))
+        self.concurrency = AdaptiveConcurrency(
+            "인코딩", initial=1, maximum=maximum, window=ADAPTIVE_WINDOW, min_samples=1, log_callback=log_callback
+        )
+        self.workers = 1
+
+        encoders = []
+        threads = []
+        for index in range(maximum):
+            encoder = type(self.encoder)(self.encoder.encoder_type)
+            encoder.governor = self.encoder.governor
+            encoder.stall_timeout = self.encoder.stall_timeout
+            encoder.probe_service = getattr(self.encoder, 'probe_service', None)
+            encoders.append(encoder)
+            worker_progress = progress_callback if index == 0 else None
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(encoder, None, processed, worker_progress, log_callback, job_callback, None, self.concurrency),
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        # 작업자들의 진행 시간(인코딩된 영상 길이) 증가량을 처리량으로 보고
+        last = [0.0] * len(encoders)
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(ADAPTIVE_SAMPLE_SECONDS)
+            work = 0.0
+            for index, encoder in enumerate(encoders):
+                current = encoder.current_seconds
+                work += current - last[index] if current >= last[index] else current
+                last[index] = current
+            self.concurrency.add_work(work)
+            self.workers = self.concurrency.limit
+
+        for thread in threads:
+            thread.join()
+        if log_callback:
+            log_callback(f"대기열 자동 조절 종료: 마지막 동시 작업 수 {self.concurrency.limit}개")
+        self.workers = 1
+        return processed
+
+    def _run_devices(self, devices, processed, progress_callback, log_callback, job_callback):
+        """장치(GPU 벤더별 인코딩 엔진 + CPU 풀)마다 작업자를 두고 동시에 실행합니다."""
+        self.workers = sum(device['slots'] for device in devices)
+        self.worker_slots = {}
+        self.device_stats = {
+            device['name']: {'encoder_type': device['encoder_type'], 'jobs': 0, 'failed': 0, 'frames': 0, 'seconds': 0.0}
+            for device in devices
+        }
+
+        threads = []
+        for device in devices:
+            allocations = [None] * device['slots']
+            if device['name'] == 'CPU' and device['slots'] > 1:
+                # CPU 풀 안에서 여러 작업이면 코어를 나눠 배분 (GPU 작업의 디코딩은 OS 스케줄러에 맡김)
+                if self.thread_planner is None:
+                    self.thread_planner = ThreadPlanner()
+                allocations = self.thread_planner.allocate(device['slots'])
+
+            for slot, allocation in enumerate(allocations):
+                key = f"{device['name']}#{slot + 1}"
+                encoder = type(self.encoder)(device['encoder_type'])
+                encoder.thread_allocation = allocation
+                self.worker_slots[key] = {
+                    'device': device['name'], 'encoder_type': device['encoder_type'], 'encoder': encoder,
+                    'job': None, 'started': 0.0, 'expected': 0.0
+                }
+                encoder.governor = self.encoder.governor
+                encoder.stall_timeout = self.encoder.stall_timeout
+                encoder.probe_service = getattr(self.encoder, 'probe_service', None)
+                if log_callback:
+                    cpu_text = f", CPU {allocation['cpus']}" if encoder.thread_allocation else ""
+                    log_callback(f"대기열 작업자 {key}: {device['encoder_type']}{cpu_text}")
+
+                worker_progress = progress_callback if not threads else None
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(encoder, encoder.thread_allocation, processed, worker_progress, log_callback, job_callback, key),
+                    daemon=True
+                )
+                threads.append(thread)
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if log_callback:
+            for row in self.device_report():
+                log_callback(
+                    f"장치 {row['device']} ({row['encoder_type']}): 작업 {row['jobs']}개 (실패 {row['failed']}개), "
+                    f"{format_duration(row['seconds'])} 동안 평균 {row['fps']:.1f} fps"
+                )
+        self.worker_slots = {}
+        self.workers = 1
+        return processed
+
+    def device_report(self) -> List[Dict]:
+        """장치별 처리량 [{'device', 'encoder_type', 'jobs', 'failed', 'frames', 'seconds', 'fps'}]"""
+        with self.lock:
+            rows = [dict(stats, device=name) for name, stats in self.device_stats.items()]
+        for row in rows:
+            row['fps'] = row['frames'] / row['seconds'] if row['seconds'] > 0 else 0.0
+        return rows
+
+    def _record_device(self, worker, job: EncodeJob):
+        device = self.worker_slots[worker]['device']
+        with self.lock:
+            stats = self.device_stats[device]
+            if job.status == 'done':
+                stats['jobs'] += 1
+                stats['frames'] += (job.estimate or {}).get('frames', 0)
+                stats['seconds'] += job.elapsed
+            else:
+                stats['failed'] += 1
+
+    def _job_progress(self, job: EncodeJob, progress_callback):
+        """작업자의 진행률 콜백에 작업별 진행률 콜백(job_progress_callback)을 덧붙입니다."""
+        if self.job_progress_callback is None:
+            return progress_callback
+
+        def report(data):
+            if progress_callback:
+                progress_callback(data)
+            self.job_progress_callback(job, data)
+
+        return report
+
+    def _claim_next(self, log_callback=None, worker=None) -> Optional[EncodeJob]:
+        """다음 작업을 꺼내 실행 중 상태로 표시합니다 (작업자 간 중복 실행 방지)."""
+        # 녹화 여부 확인(stat/잠금 검사)은 다른 작업자를 막지 않도록 claim_lock 밖에서
+        recording = self._recording_inputs(self.pending())
+        with self.claim_lock:
+            # 마감 모드: 지금까지 측정된 실제 속도로 남은 작업의 프리셋을 다시 계획
+            if self.deadline is not None:
+                plan = self.plan_presets()
+                if not plan['feasible'] and log_callback:
+                    log_callback(
+                        f"⚠️ 가장 빠른 프리셋으로도 마감 시각을 넘길 것으로 예상됩니다 "
+                        f"(예상 {plan['seconds'] / 3600:.1f}시간 / 남은 시간 {max(plan['available'], 0) / 3600:.1f}시간)"
+                    )
+
+            job = self.next_job(worker, recording)
+            if job is None:
+                return None
+
+            if worker is not None:
+                slot = self.worker_slots[worker]
+                target = job.encoder_type or self.encoder.encoder_type
+                if target != slot['encoder_type']:
+                    # 승인된 동등 인코더로 바꿔 이 장치에서 실행 (계열이 다르면 프리셋은 기본값)
+                    if get_preset_family(target) != get_preset_family(slot['encoder_type']):
+                        job.preset = None
+                    job.encoder_type = slot['encoder_type']
+                    if log_callback:
+                        log_callback(f"대기열: {job.name} 작업을 {target} 대신 {slot['encoder_type']}({slot['device']})로 실행합니다.")
+                else:
+                    job.encoder_type = target
+                self._update_rate(job)
+                slot.update(job=job, started=time.time(), expected=(job.estimate or {}).get('seconds', 0))
+
+            with self.lock:
+                job.status = 'running'
+            self.running[job] = time.time()
+            return job
+
+    def _worker_loop(self, encoder, allocation, processed, progress_callback, log_callback, job_callback, worker=None,
+                     controller=None):
+        while not self.stopped:
+            # 자동 조절 모드: 허용된 동시 작업 수 안에서만 새 작업 시작
+            if controller is not None and not controller.acquire(timeout=DEFER_POLL_SECONDS):
+                if not self._ready_jobs():
+                    break
+                continue
+
+            job = self._claim_next(log_callback, worker)
+            if job is None:
+                if controller is not None:
+                    controller.release(work=0)
+                # 장치 모드: 더 빠른 장치가 맡을 작업만 남았으면 상황이 바뀔 때까지 대기
+                if worker is not None and self._ready_jobs(self.worker_slots[worker]['encoder_type']):
+                    time.sleep(DEFER_POLL_SECONDS)
+                    continue
+                break
+
+            overloaded = False
+            try:
+                if Path(job.output_file).exists():
+                    job.status = 'skipped'
+                    if log_callback:
+                        log_callback(f"대기열: 이미 출력 파일이 있어 건너뜁니다 - {Path(job.output_file).name}")
+                else:
+                    overloaded = self._execute(job, encoder, worker, progress_callback, log_callback, job_callback)
+            finally:
+                # 건너뛴 작업/예외를 포함해 작업이 끝나면 항상 작업자를 비움 (_worker_free_at이 바쁜 것으로 보지 않도록)
+                self.running.pop(job, None)
+                self.running_shares.pop(job, None)
+                if worker is not None:
+                    self.worker_slots[worker]['job'] = None
+                if controller is not None:
+                    controller.release(work=0, ok=not overloaded)
+
+            processed.append(job)
+            if job_callback:
+                job_callback(job)
+
+    def _share(self, encoder, worker) -> float:
+        """작업자가 받은 처리 자원 비율 (배분된 CPU 수, 또는 같은 장치를 나눠 쓰는 작업자 수 기준)"""
+        allocation = encoder.thread_allocation
+        if allocation and self.thread_planner is not None:
+            total = self.thread_planner.topology['logical']
+            return min(allocation['threads'] / total, 1.0) if total > 0 else 1.0
+        if worker is not None:
+            device = self.worker_slots[worker]['device']
+            return 1.0 / sum(1 for slot in self.worker_slots.values() if slot['device'] == device)
+        # 자동 조절 모드: 현재 허용된 동시 작업 수만큼 나눠 씀
+        return 1.0 / max(1, self.workers)
+
+    def _execute(self, job: EncodeJob, encoder, worker, progress_callback, log_callback, job_callback) -> bool:
+        """작업 하나를 인코딩하고 결과를 속도 모델/장치 통계에 반영합니다. 과부하로 실패했으면 True."""
+        if log_callback:
+            est = job.estimate or {}
+            preset_text = f", 프리셋 {job.preset}" if job.preset else ""
+            log_callback(
+                f"대기열 작업 시작: {job.name} "
+                f"(예상 절감 {est.get('savings', 0) / (1024 ** 3):.2f}GB, 약 {est.get('seconds', 0) / 60:.0f}분{preset_text})"
+            )
+        if job_callback:
+            job_callback(job)
+
+        share = self._share(encoder, worker)
+        self.running_shares[job] = share
+        start = time.time()
+        encoder.current_seconds = 0
+        job.run(encoder, self._job_progress(job, progress_callback), log_callback, recovery=self.recovery)
+        job.elapsed = time.time() - start
+
+        if job.status == 'done':
+            self.observe(job, job.elapsed, share)
+        if worker is not None:
+            self._record_device(worker, job)
+        return job.status == 'failed' and (job.failure or {}).get('kind') in OVERLOAD_FAILURES
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Batch Queue Test ===")
+
+    class DummyEncoder:
+        encoder_type = 'hevc_nvenc'
+
+        def generate_output_filename(self, input_file, quality, audio_mode, stem=None):
+            return os.path.join('/nonexistent', f"{stem or Path(input_file).stem}_out.mp4")
+
+        def estimate_output_size(self, info, quality, audio_mode):
+            total = info['width'] * info['height'] * info['fps'] * 0.12 * info['duration'] / 8
+            return {'video': total, 'audio': 0, 'total': total}
+
+    queue = BatchQueue(DummyEncoder(), mode='savings_rate')
+    for name, mbps, duration in [('small', 6, 3600), ('capture', 200, 1800), ('medium', 20, 7200)]:
+        queue.add(EncodeJob(f'/videos/{name}.mp4'), {
+            'width': 1920, 'height': 1080, 'fps': 60.0, 'duration': duration,
+            'size': int(mbps * 1e6 * duration / 8)
+        })
+
+    for mode in RANKING_MODES:
+        queue.set_mode(mode)
+        print(f"{RANKING_MODES[mode]}: {[job.name for job in queue.pending()]}")
+
+    for hours in (1, 2, 4, 12):
+        plan = queue.set_deadline(time.time() + hours * 3600)
+        presets = [(job.name, job.preset) for job in queue.pending()]
+        print(f"마감 {hours}시간: 예상 {plan['seconds'] / 3600:.2f}시간, 가능={plan['feasible']} {presets}")
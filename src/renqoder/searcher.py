@@ -8,9 +8,14 @@ import os
 import shutil
 import hashlib
 import json
+import threading
+import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from metadata_utils import get_video_info
+from io_arbiter import get_io_arbiter, IO_BACKGROUND
+from recording_detector import RecordingDetector
+from task_executor import current_token, run_process
 
 
 class VideoSearcher:
@@ -22,11 +27,39 @@ class VideoSearcher:
         '.webm', '.m4v', '.ts', '.m2ts', '.vob', '.3gp'
     }
     
-    def __init__(self):
-        self.everything_available = self.check_everything_available()
+    def __init__(self, defer_init: bool = False):
+        """
+        Args:
+            defer_init: Skip the Everything check and cache load here so the window can appear first;
+                        call warm_up() from a background thread. Anything that needs them runs
+                        warm_up() itself (or waits for the one in progress).
+        """
         self.cache_file = Path.home() / '.renqoder_metadata_cache.json'
-        self.metadata_cache = self.load_cache()
-    
+        self.metadata_cache = {}
+        self.cache_lock = threading.Lock()  # extract_metadata() may run on several worker threads
+        self.warm_up_lock = threading.Lock()
+        self.ready = threading.Event()
+        self._everything_available = False
+        self.recording_detector = RecordingDetector()
+        if not defer_init:
+            self.warm_up()
+
+    def warm_up(self):
+        """Check for Everything and load the metadata cache (only the first call does the work)"""
+        if self.ready.is_set():
+            return
+        with self.warm_up_lock:
+            if self.ready.is_set():
+                return
+            self._everything_available = self.check_everything_available()
+            self.metadata_cache = self.load_cache()
+            self.ready.set()
+
+    @property
+    def everything_available(self) -> bool:
+        self.warm_up()
+        return self._everything_available
+
     def load_cache(self) -> Dict:
         """Load metadata cache from file"""
         if self.cache_file.exists():
@@ -38,13 +71,16 @@ class VideoSearcher:
 
     def save_cache(self):
         """Save metadata cache to file"""
+        self.warm_up()
         try:
-            self.cache_file.write_text(json.dumps(self.metadata_cache), encoding='utf-8')
+            with self.cache_lock:
+                self.cache_file.write_text(json.dumps(self.metadata_cache), encoding='utf-8')
         except Exception:
             pass
 
     def clear_cache(self):
         """Delete cache file and clear in-memory metadata"""
+        self.warm_up()
         self.metadata_cache = {}
         if self.cache_file.exists():
             try:
@@ -54,6 +90,7 @@ class VideoSearcher:
 
     def clear_cache_item(self, filepath: str) -> bool:
         """특정 파일의 캐시 정보만 삭제"""
+        self.warm_up()
         cache_key = self._get_cache_key(filepath)
         if cache_key in self.metadata_cache:
             del self.metadata_cache[cache_key]
@@ -184,31 +221,81 @@ class VideoSearcher:
         
         return drives_info
     
-    def search(self, drive: str) -> List[Dict]:
+    def normalize_filters(self, filters: Optional[Dict] = None) -> Dict:
+        """
+        Normalize search predicates that are pushed down to the backends
+
+        Args:
+            filters: Optional dict with keys
+                - extensions: iterable of extensions ('mp4', '.mkv', ...), None for all videos
+                - min_size: minimum file size in bytes
+                - modified_after: epoch seconds, only files modified at/after this time
+
+        Returns:
+            Dict with 'extensions' (set), 'min_size' (int), 'modified_after' (float or None)
+        """
+        filters = filters or {}
+        
+        extensions = filters.get('extensions')
+        if extensions:
+            # 알 수 없는 확장자는 제외 (동영상 확장자 집합 안에서만 좁힘)
+            extensions = {('.' + str(e).lstrip('.')).lower() for e in extensions} & self.VIDEO_EXTENSIONS
+        else:
+            extensions = set(self.VIDEO_EXTENSIONS)
+        
+        modified_after = filters.get('modified_after')
+        
+        return {
+            'extensions': extensions,
+            'min_size': max(int(filters.get('min_size') or 0), 0),
+            'modified_after': float(modified_after) if modified_after else None
+        }
+
+    def build_everything_query(self, filters: Optional[Dict] = None) -> List[str]:
+        """
+        Compile search predicates into Everything search terms (ext:, size:, dm:)
+        
+        Everything ANDs space separated terms, so each term is passed as its own argument.
         """
-        Search for all video files in a drive
+        f = self.normalize_filters(filters)
+        
+        terms = ['ext:' + ';'.join(sorted(e.lstrip('.') for e in f['extensions']))]
+        
+        if f['min_size'] > 0:
+            terms.append(f"size:>={f['min_size']}")
+        
+        if f['modified_after']:
+            # Everything은 ISO 8601 날짜(YYYY-MM-DD)를 로케일과 무관하게 인식함
+            date_str = time.strftime('%Y-%m-%d', time.localtime(f['modified_after']))
+            terms.append(f'dm:>={date_str}')
+        
+        return terms
+
+    def search(self, drive: str, filters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Search for video files in a drive
         
         Args:
             drive: Drive path (e.g., 'C:\\')
+            filters: Optional predicates pushed down to the backend (see normalize_filters)
         
         Returns:
             List of dicts with keys: name, path, size, extension, modified
         """
         if self.everything_available:
-            return self.search_everything(drive)
+            return self.search_everything(drive, filters)
         else:
-            return self.search_os(drive)
+            return self.search_os(drive, filters)
     
-    def search_everything(self, drive: str) -> List[Dict]:
+    def search_everything(self, drive: str, filters: Optional[Dict] = None) -> List[Dict]:
         """Search using Everything (es.exe)"""
+        if not self.normalize_filters(filters)['extensions']:
+            return []
+        
         try:
             # Build Everything command with options
             creationflags = 0x08000000 if os.name == 'nt' else 0
             
-            # All video extensions
-            ext_list = ';'.join(e.lstrip('.') for e in self.VIDEO_EXTENSIONS)
-            ext_query = f'ext:{ext_list}'
-            
             # Build command with -path option for drive filtering
             cmd = ['es.exe']
             
@@ -216,8 +303,8 @@ class VideoSearcher:
             if drive:
                 cmd.extend(['-path', drive])
             
-            # Add search query
-            cmd.append(ext_query)
+            # Add search query (container, min-size, modified-date predicates)
+            cmd.extend(self.build_everything_query(filters))
             
             # Add column options for output (no CSV export, use stdout)
             cmd.extend([
@@ -225,15 +312,15 @@ class VideoSearcher:
                 '-dm'
             ])
             
-            result = subprocess.run(
+            # Killed immediately if the search task is cancelled (a new search was started)
+            result = run_process(
                 cmd,
-                check=True,
                 timeout=30,
                 creationflags=creationflags,
-                capture_output=True,
                 text=True,
                 encoding='utf-8'
             )
+            result.check_returncode()
             
             # Parse stdout output
             results = []
@@ -274,42 +361,101 @@ class VideoSearcher:
             return results
         
         except subprocess.CalledProcessError:
-            return self.search_os(drive)
+            return self.search_os(drive, filters)
         except Exception:
-            return self.search_os(drive)
+            return self.search_os(drive, filters)
     
-    def search_os(self, drive: str) -> List[Dict]:
-        """Fallback search using os.walk"""
+    def search_os(self, drive: str, filters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Fallback search using an os.scandir crawler
+        
+        Candidates are rejected as early as possible: the extension is checked from the
+        directory entry name first, and only matching files are stat'ed for size/mtime
+        (on Windows DirEntry.stat() is served from the directory listing itself).
+        Each directory listing takes a background slot on its device from the shared
+        I/O arbiter, so crawling yields to interactive probes and encodes on the same disk.
+        """
+        f = self.normalize_filters(filters)
+        extensions = f['extensions']
+        min_size = f['min_size']
+        modified_after = f['modified_after']
+        
         results = []
+        if not extensions:
+            return results
+        
+        arbiter = get_io_arbiter()
+        token = current_token()
         try:
-            for root, dirs, files in os.walk(drive):
-                for file in files:
-                    try:
-                        path = Path(root) / file
-                        ext = path.suffix.lower()
-                        
-                        if ext not in self.VIDEO_EXTENSIONS:
-                            continue
-                        
-                        stat = path.stat()
-                        results.append({
-                            'name': path.name,
-                            'path': str(path),
-                            'size': stat.st_size,
-                            'extension': ext,
-                            'modified': stat.st_mtime,
-                            'metadata_loaded': False
-                        })
-                    except (PermissionError, OSError):
-                        continue
+            pending_dirs = [drive]
+            while pending_dirs:
+                if token is not None:
+                    token.check()
+                current_dir = pending_dirs.pop()
+                try:
+                    with arbiter.slot(current_dir, IO_BACKGROUND):
+                        with os.scandir(current_dir) as entries:
+                            for entry in entries:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        pending_dirs.append(entry.path)
+                                        continue
+                                
+                                    # 1. 확장자 검사 (stat 없이 이름만으로 거부)
+                                    ext = os.path.splitext(entry.name)[1].lower()
+                                    if ext not in extensions:
+                                        continue
+                                
+                                    # 2. 크기/수정일 검사
+                                    stat = entry.stat()
+                                    if stat.st_size < min_size:
+                                        continue
+                                    if modified_after and stat.st_mtime < modified_after:
+                                        continue
+                                
+                                    results.append({
+                                        'name': entry.name,
+                                        'path': entry.path,
+                                        'size': stat.st_size,
+                                        'extension': ext,
+                                        'modified': stat.st_mtime,
+                                        'metadata_loaded': False
+                                    })
+                                except (PermissionError, OSError):
+                                    continue
+                except (PermissionError, OSError):
+                    continue
         except Exception as e:
             print(f"OS search error: {e}")
         
         return results
 
-    def extract_metadata(self, filepath: str, fast_only=False, progress_callback=None) -> Dict:
+    def mark_recordings(self, results: List[Dict]) -> List[Dict]:
+        """
+        Mark results that are still being written by a recorder
+        
+        Sets 'recording' / 'recording_reason' on each item and returns the items in progress.
+        """
+        states = self.recording_detector.check_many([item['path'] for item in results])
+        
+        recording = []
+        for item in results:
+            state = states.get(item['path'])
+            if state and state['in_progress']:
+                item['recording'] = True
+                item['recording_reason'] = state['reason']
+                recording.append(item)
+            else:
+                item['recording'] = False
+                item.pop('recording_reason', None)
+        
+        return recording
+
+    def extract_metadata(self, filepath: str, fast_only=False, progress_callback=None,
+                         io_priority=IO_BACKGROUND) -> Dict:
         """Extract detailed metadata using ffprobe, with persistent caching"""
         # 1. Check cache first
+        self.warm_up()
         cache_key = self._get_cache_key(filepath)
         if cache_key and cache_key in self.metadata_cache:
             cached_data = self.metadata_cache[cache_key]
@@ -325,11 +471,13 @@ class VideoSearcher:
             # 캐시를 무시하고 아래에서 ffprobe + ffmpeg 정밀 스캔을 수행하도록 함
 
         # 2. Extract using unified metadata utility
-        metadata = get_video_info(filepath, fast_only=fast_only, progress_callback=progress_callback)
+        metadata = get_video_info(filepath, fast_only=fast_only, progress_callback=progress_callback,
+                                  io_priority=io_priority)
             
         # 3. Store in cache and save
         if cache_key:
-            self.metadata_cache[cache_key] = metadata
+            with self.cache_lock:
+                self.metadata_cache[cache_key] = metadata
             self.save_cache()
             
         return metadata
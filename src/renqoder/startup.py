@@ -0,0 +1,113 @@
+"""
+시작 시간 측정 및 지연 로딩 모듈
+창이 뜨기 전까지 걸리는 시간을 단계별로 기록하고, 무거운 모듈은 처음 사용할 때 불러옵니다.
+main.py보다 먼저 import되어야 모듈 로드 시간까지 측정됩니다.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import types
+from typing import Dict
+
+
+# 이 모듈이 처음 로드된 시각 (시작 시간 측정 기준점)
+STARTED = time.perf_counter()
+
+# 설정되면 첫 화면 표시와 백그라운드 준비가 끝난 뒤 측정 결과(JSON)를 출력하고 종료 (scripts/bench_startup.py)
+BENCH_ENV = 'RENQODER_STARTUP_BENCH'
+
+
+class StartupTimer:
+    """
+    시작 단계별 경과 시간 기록기
+
+    Usage:
+        startup_timer.mark('imports')       # 기준점으로부터 경과 시간 기록 (처음 한 번만)
+        startup_timer.report()              # {'imports': 0.21, 'first_frame': 0.48, ...}
+    """
+
+    def __init__(self, started: float = STARTED):
+        self.started = started
+        self.lock = threading.Lock()
+        self.marks = {}
+
+    def mark(self, name: str) -> float:
+        with self.lock:
+            if name not in self.marks:
+                self.marks[name] = time.perf_counter() - self.started
+            return self.marks[name]
+
+    def has(self, name: str) -> bool:
+        with self.lock:
+            return name in self.marks
+
+    def report(self) -> Dict[str, float]:
+        with self.lock:
+            return dict(sorted(self.marks.items(), key=lambda item: item[1]))
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds:.2f}초" for name, seconds in self.report().items())
+
+    def dump(self):
+        """측정 결과를 한 줄 JSON으로 출력합니다 (벤치마크 스크립트가 읽음)."""
+        print(json.dumps({'startup': self.report()}), flush=True)
+
+
+startup_timer = StartupTimer()
+
+
+def is_startup_bench() -> bool:
+    return bool(os.environ.get(BENCH_ENV))
+
+
+# 지연 모듈의 첫 로드를 한 스레드씩 실행 (같은 스레드에서 다시 들어올 수 있도록 RLock)
+_lazy_import_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """
+    처음 속성에 접근할 때 실제 모듈을 불러오는 대리 모듈
+    importlib.util.LazyLoader는 Python 3.12 전까지 여러 스레드가 동시에 처음 접근하면
+    일부 스레드가 아직 채워지지 않은 모듈을 보게 되므로(AttributeError) 잠금으로 보호합니다.
+    """
+
+    def __getattr__(self, attr):
+        with _lazy_import_lock:
+            module = importlib.import_module(self.__name__)
+            # 이후 접근은 __getattr__을 거치지 않도록 실제 모듈의 속성을 복사
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str):
+    """
+    모듈을 처음 속성에 접근할 때 실제로 불러오는 지연 모듈을 반환합니다.
+    (이미 로드되었거나 찾을 수 없는 모듈은 일반 import와 같이 동작, 여러 스레드에서 사용 가능)
+
+    Usage:
+        np = lazy_import('numpy')   # 여기서는 로드하지 않음
+        np.zeros(3)                 # 이 시점에 로드
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        return importlib.import_module(name)
+    return _LazyModule(name)
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Startup Timer Test ===")
+
+    startup_timer.mark('start')
+    json_module = lazy_import('json')
+    decimal = lazy_import('decimal')
+    startup_timer.mark('lazy_import')
+    print(f"decimal 지연 모듈: {type(decimal).__name__}")
+    print(f"첫 사용: {decimal.Decimal('1.5') + 1}")
+    startup_timer.mark('first_use')
+    print(startup_timer.summary())
@@ -0,0 +1,321 @@
+"""
+작업 실행기 모듈
+검색/메타데이터 추출처럼 새 요청이 오면 이전 작업을 버려야 하는 백그라운드 작업을 관리합니다.
+- 작업마다 취소 토큰: 취소하면 그 작업이 실행 중인 ffprobe/ffmpeg 프로세스를 즉시 종료
+- 그룹별 세대(generation) 번호: 다시 시작하면 세대가 바뀌어 이전 세대의 결과는 버려짐
+- 제출한 작업은 Future로 완료/예외를 확인
+"""
+
+import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class TaskCancelled(BaseException):
+    """
+    작업이 취소되었음을 알리는 예외
+
+    asyncio.CancelledError처럼 BaseException을 상속하므로 `except Exception`으로 오류를
+    기록하고 기본값으로 넘어가는 코드에 걸리지 않고 작업 밖까지 전달됩니다.
+    """
+
+
+class CancellationToken:
+    """작업 하나의 취소 상태와 그 작업이 실행 중인 프로세스"""
+
+    def __init__(self, group: str = '', generation: int = 0):
+        self.group = group
+        self.generation = generation
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.processes = set()
+        self.callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def cancel(self):
+        """취소하고 실행 중인 프로세스를 종료합니다 (여러 번 호출해도 됨)."""
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            processes = list(self.processes)
+            callbacks = list(self.callbacks)
+        for process in processes:
+            _kill(process)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"취소 처리 오류: {e}")
+
+    def check(self):
+        """취소되었으면 TaskCancelled를 발생시킵니다."""
+        if self.event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """timeout초 동안 기다립니다 (취소되면 즉시 True 반환, time.sleep 대신 사용)."""
+        return self.event.wait(timeout)
+
+    def add_process(self, process):
+        """프로세스를 등록합니다 (이미 취소된 상태면 바로 종료)."""
+        with self.lock:
+            if not self.event.is_set():
+                self.processes.add(process)
+                return
+        _kill(process)
+
+    def remove_process(self, process):
+        with self.lock:
+            self.processes.discard(process)
+
+    def add_callback(self, callback: Callable[[], None]):
+        """취소될 때 호출할 함수를 등록합니다 (이미 취소된 상태면 바로 호출)."""
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+
+
+def _kill(process):
+    try:
+        if process.poll() is None:
+            process.kill()
+    except Exception as e:
+        print(f"프로세스 종료 실패: {e}")
+
+
+_local = threading.local()
+
+
+def current_token() -> Optional[CancellationToken]:
+    """현재 스레드에서 실행 중인 작업의 취소 토큰 (작업 밖이면 None)"""
+    return getattr(_local, 'token', None)
+
+
+@contextmanager
+def bind_token(token: Optional[CancellationToken]):
+    """
+    블록 안에서 current_token()이 token을 반환하도록 합니다 (작업이 만든 보조 스레드에서 사용).
+
+    Usage:
+        token = current_token()
+        def worker():
+            with bind_token(token):
+                probe(path)
+    """
+    previous = getattr(_local, 'token', None)
+    _local.token = token
+    try:
+        yield token
+    finally:
+        _local.token = previous
+
+
+@contextmanager
+def cancellable_process(process):
+    """블록 안에서 현재 작업이 취소되면 process를 종료합니다."""
+    token = current_token()
+    if token is None:
+        yield process
+        return
+    token.add_process(process)
+    try:
+        yield process
+    finally:
+        token.remove_process(process)
+
+
+def run_process(cmd: List[str], timeout: Optional[float] = None, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(cmd, capture_output=True, ...)과 같지만 현재 작업이 취소되면 프로세스를 바로 종료하고
+    TaskCancelled를 발생시킵니다.
+    """
+    token = current_token()
+    if token is not None:
+        token.check()
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+    with cancellable_process(process):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+    if token is not None:
+        token.check()
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+class TaskExecutor:
+    """
+    그룹별 백그라운드 작업 실행기
+
+    Usage:
+        executor = TaskExecutor()
+        generation = executor.restart('search')      # 이전 검색 작업 취소 + 새 세대
+        future = executor.submit('search', search_worker, drive)
+        ...
+        if executor.is_current('search', generation):
+            show(results)                             # 그 사이 새 검색이 시작됐으면 버림
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generations = {}   # 그룹 -> 현재 세대
+        self.running = {}       # 그룹 -> {Future: CancellationToken}
+
+    def generation(self, group: str) -> int:
+        with self.lock:
+            return self.generations.get(group, 0)
+
+    def is_current(self, group: str, generation: int) -> bool:
+        """generation이 아직 그룹의 현재 세대인지 확인합니다 (오래된 결과 거르기)."""
+        with self.lock:
+            return self.generations.get(group, 0) == generation
+
+    def is_running(self, group: str) -> bool:
+        """그룹에 끝나지 않은 현재 세대 작업이 있는지 확인합니다."""
+        with self.lock:
+            current = self.generations.get(group, 0)
+            return any(token.generation == current for token in self.running.get(group, {}).values())
+
+    def current_only(self, group: str, handler: Callable) -> Callable:
+        """
+        (세대, 값)으로 발행된 이벤트 중 그룹의 현재 세대 값만 handler에 넘기는 함수를 만듭니다.
+
+        Usage:
+            events.subscribe('metadata.status', executor.current_only('metadata', label_update))
+        """
+        def deliver(value):
+            generation, payload = value
+            if self.is_current(group, generation):
+                handler(payload)
+
+        return deliver
+
+    def cancel(self, group: str) -> int:
+        """그룹의 모든 작업을 취소하고 세대를 바꿉니다. 새 세대 번호를 반환합니다."""
+        with self.lock:
+            generation = self.generations.get(group, 0) + 1
+            self.generations[group] = generation
+            tokens = list(self.running.get(group, {}).values())
+        for token in tokens:
+            token.cancel()
+        return generation
+
+    restart = cancel
+
+    def submit(self, group: str, func: Callable, *args, **kwargs) -> Future:
+        """
+        func(*args, **kwargs)를 새 스레드에서 그룹의 현재 세대 작업으로 실행합니다.
+
+        작업 안에서는 current_token()으로 취소 토큰을 얻을 수 있고, 반환된 Future에는
+        token/generation 속성이 붙습니다. 취소된 작업의 Future는 cancelled() 상태로 끝나며,
+        Future.cancel()을 호출해도 작업이 취소됩니다.
+        """
+        future = Future()
+        with self.lock:
+            generation = self.generations.get(group, 0)
+            token = CancellationToken(group, generation)
+            self.running.setdefault(group, {})[future] = token
+        future.token = token
+        future.generation = generation
+        # 끝날 때까지 PENDING 상태로 두어야 Future.cancel()로도 취소할 수 있음
+        future.add_done_callback(lambda f: f.cancelled() and token.cancel())
+
+        def run():
+            result, error = None, None
+            try:
+                with bind_token(token):
+                    token.check()
+                    result = func(*args, **kwargs)
+            except TaskCancelled:
+                token.cancel()
+            except Exception as e:
+                print(f"작업 오류 ({group}): {e}")
+                error = e
+
+            # 완료 콜백이 is_running()을 확인할 때 이미 끝난 것으로 보이도록 먼저 목록에서 제거
+            with self.lock:
+                self.running.get(group, {}).pop(future, None)
+            if token.cancelled:
+                future.cancel()
+            elif future.done():
+                pass
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=run, name=f"{group}-{generation}", daemon=True).start()
+        return future
+
+    def wait(self, group: str, timeout: Optional[float] = None) -> bool:
+        """그룹의 작업이 모두 끝날 때까지 기다립니다 (timeout 안에 끝나면 True)."""
+        with self.lock:
+            futures = list(self.running.get(group, {}))
+        for future in futures:
+            try:
+                future.exception(timeout)
+            except FutureTimeoutError:
+                return False
+            except BaseException:
+                pass
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """모든 그룹의 작업을 취소하고 끝나기를 기다립니다 (프로그램 종료 시)."""
+        with self.lock:
+            groups = list(self.running)
+        for group in groups:
+            self.cancel(group)
+        for group in groups:
+            self.wait(group, timeout)
+
+    def snapshot(self) -> Dict[str, int]:
+        """그룹별 실행 중인 작업 수"""
+        with self.lock:
+            return {group: len(futures) for group, futures in self.running.items() if futures}
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Task Executor Test ===")
+
+    import sys
+    import time
+
+    executor = TaskExecutor()
+
+    def slow_probe(label):
+        # 10초 걸리는 외부 프로세스 (취소 시 즉시 종료되어야 함)
+        result = run_process([sys.executable, '-c', 'import time; time.sleep(10)'])
+        return label, result.returncode
+
+    executor.restart('search')
+    first = executor.submit('search', slow_probe, 'first')
+    time.sleep(0.5)
+
+    start = time.perf_counter()
+    generation = executor.restart('search')
+    second = executor.submit('search', lambda: 'second')
+    executor.wait('search', timeout=5)
+    print(f"이전 작업 취소: {first.cancelled()} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    print(f"새 작업 결과: {second.result()} (현재 세대: {executor.is_current('search', generation)}, "
+          f"이전 세대: {executor.is_current('search', first.generation)})")
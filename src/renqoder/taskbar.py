@@ -52,6 +52,13 @@ class TaskbarController:
             self.tbl.SetProgressValue(self.hwnd, 100, 100)
         except: pass
 
+    def set_paused(self):
+        """일시정지 상태 표시 (노란색)"""
+        if not self.tbl: return
+        try:
+            self.tbl.SetProgressState(self.hwnd, self.TBPF_PAUSED)
+        except: pass
+
     def reset(self):
         """진행 표시 제거"""
         if not self.tbl: return
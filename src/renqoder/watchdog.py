@@ -0,0 +1,265 @@
+"""
+인코딩 감시(Watchdog) 모듈
+진행이 멈춘 FFmpeg 프로세스를 감지해 종료하고, 로그 끝부분으로 실패 원인을 분류하여
+재시도 또는 다른 인코더로의 대체(fallback) 여부를 결정합니다.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+# 진행 시간(time=)이 이 시간(초) 동안 늘지 않으면 멈춘 것으로 판단
+STALL_TIMEOUT = 120
+
+# 실패 유형 -> 로그 패턴 (위에서부터 먼저 일치하는 유형 사용)
+FAILURE_PATTERNS = [
+    ('session_limit', re.compile(
+        r"openencodesessionex failed|incompatible client key|nv_enc_err_out_of_memory|"
+        r"too many (?:concurrent )?sessions|session limit", re.IGNORECASE)),
+    ('device', re.compile(
+        r"device lost|device removed|device creation failed|failed to create .*device|"
+        r"no capable devices found|cannot load (?:nvcuda|nvencodeapi|libcuda)|cuda_error|cuinit|"
+        r"driver does not support|minimum required nvidia driver|mfx_err|dxgi_error|amf.*fail|"
+        r"failed to initiali[sz]e (?:vaapi|qsv|the encoder)", re.IGNORECASE)),
+    ('output', re.compile(
+        r"no space left on device|disk full|read-only file system|permission denied|"
+        r"already exists\. exiting", re.IGNORECASE)),
+    ('input', re.compile(
+        r"invalid data found when processing input|no such file or directory|moov atom not found|"
+        r"could not find codec parameters", re.IGNORECASE)),
+    ('unsupported', re.compile(
+        r"unknown encoder|encoder not found|not supported|unrecognized option|option .* not found|"
+        r"error setting option|incorrect parameters|error while opening encoder", re.IGNORECASE)),
+]
+
+FAILURE_LABELS = {
+    'stalled': "진행 멈춤 (응답 없음)",
+    'session_limit': "하드웨어 인코더 세션 한도 초과",
+    'device': "GPU/드라이버 오류",
+    'output': "출력 파일 쓰기 실패",
+    'input': "입력 파일 오류",
+    'unsupported': "인코더/옵션 미지원",
+    'cancelled': "사용자 취소",
+    'unknown': "알 수 없는 오류"
+}
+
+# 같은 인코더로 다시 시도할 만한 실패 (일시적인 원인)
+RETRYABLE_FAILURES = {'stalled', 'session_limit', 'device', 'unknown'}
+
+# 다른 인코더로 바꿔 시도할 만한 실패 (인코더 자체의 문제)
+FALLBACK_FAILURES = {'stalled', 'session_limit', 'device', 'unsupported', 'unknown'}
+
+# 같은 코덱 계열로만 대체 (HEVC가 실패했다고 VP8로 바꾸지 않음)
+CODEC_FAMILIES = {
+    'hevc': ('hevc_', 'libx265'),
+    'h264': ('h264_', 'libx264'),
+    'av1': ('av1_', 'libsvtav1', 'libaom-av1'),
+    'vp9': ('vp9_', 'libvpx-vp9')
+}
+
+
+def classify_failure(log_tail: List[str], stalled=False, cancelled=False) -> str:
+    """FFmpeg 로그 끝부분으로 실패 유형(FAILURE_LABELS의 키)을 판단합니다."""
+    if cancelled:
+        return 'cancelled'
+    if stalled:
+        return 'stalled'
+    text = "\n".join(log_tail)
+    for kind, pattern in FAILURE_PATTERNS:
+        if pattern.search(text):
+            return kind
+    return 'unknown'
+
+
+def get_codec_family(encoder_type: str) -> Optional[str]:
+    for family, prefixes in CODEC_FAMILIES.items():
+        if any(encoder_type.startswith(prefix) for prefix in prefixes):
+            return family
+    return None
+
+
+def build_fallback_chain(codecs: List[Dict], encoder_type: str) -> List[str]:
+    """
+    실패한 인코더를 대신할 인코더 목록을 우선순위 순으로 만듭니다.
+
+    Args:
+        codecs: HardwareDetector.get_available_codecs() 결과 (하드웨어 -> 소프트웨어 순)
+        encoder_type: 실패한 인코더
+
+    Returns:
+        같은 코덱 계열의 사용 가능한 인코더 ID 리스트 (실패한 인코더 제외)
+    """
+    family = get_codec_family(encoder_type)
+    if family is None:
+        return []
+    return [
+        c['id'] for c in codecs
+        if c.get('available') and c['id'] != encoder_type and get_codec_family(c['id']) == family
+    ]
+
+
+class StallWatchdog:
+    """
+    FFmpeg 진행 감시 스레드
+
+    progress()가 timeout 초 동안 호출되지 않으면 프로세스를 강제 종료합니다.
+    리소스 조절기가 일시정지한 시간은 멈춤으로 보지 않으며, CPU 상한이 걸려 있으면
+    그만큼 느려지는 것을 감안해 제한 시간을 늘립니다.
+    """
+
+    def __init__(self, process, timeout=STALL_TIMEOUT, governor=None, on_stall=None, poll_interval=1.0):
+        """
+        Args:
+            process: 감시할 subprocess.Popen 객체
+            timeout: 진행 없이 허용할 시간(초)
+            governor: 일시정지/CPU 상한 상태를 확인할 ResourceGovernor (선택)
+            on_stall: 멈춤 감지 시 호출할 함수 (정체 시간(초) 전달)
+        """
+        self.process = process
+        self.timeout = timeout
+        self.governor = governor
+        self.on_stall = on_stall
+        self.poll_interval = poll_interval
+        self.stalled = False
+        self.last_progress = time.time()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.last_progress = time.time()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def progress(self):
+        """진행 시간이 늘었을 때 호출합니다."""
+        self.last_progress = time.time()
+
+    def _effective_timeout(self):
+        cap = getattr(self.governor, 'cpu_cap', None)
+        if cap:
+            return self.timeout * max(1.0, 100.0 / cap)
+        return self.timeout
+
+    def _loop(self):
+        while not self.stop_event.wait(self.poll_interval):
+            if self.process.poll() is not None:
+                return
+
+            now = time.time()
+            if self.governor is not None and self.governor.paused:
+                # 일시정지된 시간은 정체 시간에서 제외
+                self.last_progress = now
+                continue
+
+            idle = now - self.last_progress
+            if idle < self._effective_timeout():
+                continue
+
+            self.stalled = True
+            if self.on_stall:
+                self.on_stall(idle)
+            try:
+                if self.governor is not None:
+                    self.governor.release(self.process)
+                self.process.kill()
+            except Exception as e:
+                print(f"멈춘 프로세스 종료 실패: {e}")
+            return
+
+
+class RecoveryPolicy:
+    """
+    실패한 인코딩을 어떻게 이어갈지 결정하는 정책
+
+    일시적인 실패는 같은 인코더로 대기 시간을 늘려 가며 재시도하고, 재시도 횟수를 넘기거나
+    인코더 자체의 문제로 보이면 사용 가능한 같은 계열의 다른 인코더로 바꿉니다.
+    """
+
+    def __init__(self, codecs: Optional[List[Dict]] = None, max_retries=1, backoff=10.0, backoff_factor=3.0):
+        """
+        Args:
+            codecs: HardwareDetector.get_available_codecs() 결과 (없으면 재시도만 수행)
+            max_retries: 인코더마다 허용할 재시도 횟수
+            backoff: 첫 재시도 전 대기 시간(초)
+            backoff_factor: 재시도마다 대기 시간에 곱할 배수
+        """
+        self.codecs = codecs or []
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+
+    def set_codecs(self, codecs: List[Dict]):
+        self.codecs = list(codecs or [])
+
+    def next_action(self, failure: str, retries: int, encoder_type: str, tried: List[str]) -> Dict:
+        """
+        다음에 할 일을 결정합니다.
+
+        Args:
+            failure: classify_failure() 결과
+            retries: 현재 인코더로 이미 재시도한 횟수
+            encoder_type: 방금 실패한 인코더
+            tried: 이 작업에서 이미 사용한 인코더 목록
+
+        Returns:
+            {'action': 'retry' | 'fallback' | 'give_up', 'delay': 대기 시간(초), 'encoder_type': 사용할 인코더}
+        """
+        if failure in RETRYABLE_FAILURES and retries < self.max_retries:
+            delay = self.backoff * (self.backoff_factor ** retries)
+            return {'action': 'retry', 'delay': delay, 'encoder_type': encoder_type}
+
+        if failure in FALLBACK_FAILURES:
+            for candidate in build_fallback_chain(self.codecs, encoder_type):
+                if candidate not in tried:
+                    return {'action': 'fallback', 'delay': 0.0, 'encoder_type': candidate}
+
+        return {'action': 'give_up', 'delay': 0.0, 'encoder_type': encoder_type}
+
+
+if __name__ == "__main__":
+    # 테스트 코드
+    print("=== Watchdog Test ===")
+
+    samples = [
+        ["[hevc_nvenc @ 0x1] OpenEncodeSessionEx failed: out of memory (10): (no details)"],
+        ["[h264_qsv @ 0x2] Error initializing an internal MFX session: MFX_ERR_UNSUPPORTED (-3)"],
+        ["out.mp4: No space left on device"],
+        ["input.mp4: Invalid data found when processing input"],
+        ["Unknown encoder 'av1_amf'"],
+        ["Conversion failed!"],
+    ]
+    for tail in samples:
+        print(f"{classify_failure(tail):>14}: {tail[0]}")
+
+    codecs = [
+        {'id': 'hevc_nvenc', 'available': True}, {'id': 'hevc_qsv', 'available': False},
+        {'id': 'hevc_amf', 'available': True}, {'id': 'libx265', 'available': True},
+        {'id': 'libx264', 'available': True}
+    ]
+    policy = RecoveryPolicy(codecs, max_retries=1, backoff=1.0)
+    tried = ['hevc_nvenc']
+    encoder_type, retries = 'hevc_nvenc', 0
+    while True:
+        step = policy.next_action('session_limit', retries, encoder_type, tried)
+        print(f"{encoder_type} 실패 -> {step}")
+        if step['action'] == 'give_up':
+            break
+        if step['action'] == 'retry':
+            retries += 1
+        else:
+            encoder_type, retries = step['encoder_type'], 0
+            tried.append(encoder_type)
+
+    import subprocess
+    import sys
+    sleeper = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    watchdog = StallWatchdog(sleeper, timeout=2, on_stall=lambda idle: print(f"멈춤 감지: {idle:.1f}초"), poll_interval=0.2)
+    watchdog.start()
+    sleeper.wait()
+    print(f"종료 코드: {sleeper.returncode}, stalled={watchdog.stalled}")
@@ -0,0 +1,152 @@
+"""
+테스트용 FFmpeg/ffprobe 대역(stub) 실행 파일
+실제 FFmpeg 없이 진행률 출력, 표준 입력(Follow 모드) 읽기, 출력 파일 생성을 흉내 냅니다.
+환경 변수로 동작을 바꿀 수 있습니다.
+  STUB_FFMPEG_DELAY    진행률 한 줄마다 기다릴 시간(초)
+  STUB_FFMPEG_FAIL     1이면 출력 일부만 쓰고 실패 (종료 코드 1)
+  STUB_FFPROBE_DELAY   ffprobe 응답 시간(초)
+  STUB_FFPROBE_STATE   지정 시 이 폴더에 동시 실행 수를 기록 (concurrency.log)
+  STUB_NO_AUDIO        1이면 오디오 스트림 없음
+  STUB_OUTPUT_DURATION 지정 시 .mp4 파일(인코딩 결과)의 재생 시간을 이 값(초)으로 응답
+  STUB_AFFINITY        1이면 ffmpeg 대역이 시작 시점의 CPU affinity를 '<출력 파일>.affinity'에 기록
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src' / 'renqoder'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+FFMPEG_STUB = r'''
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+if '-version' in args:
+    print("ffmpeg version 6.0-stub")
+    sys.exit(0)
+if '-encoders' in args:
+    print(" V....D libx265              libx265 H.265 / HEVC")
+    print(" V....D libx264              libx264 H.264 / AVC")
+    sys.exit(0)
+
+output = args[-1]
+if os.environ.get('STUB_AFFINITY') == '1' and hasattr(os, 'sched_getaffinity'):
+    with open(output + '.affinity', 'w') as f:
+        f.write(','.join(str(cpu) for cpu in sorted(os.sched_getaffinity(0))))
+if os.path.exists(output) and '-y' not in args:
+    sys.stderr.write(f"File '{output}' already exists. Exiting.\n")
+    sys.exit(1)
+
+
+def progress(seconds):
+    sys.stderr.write(f"frame={seconds * 30} fps=30 q=28.0 size=1024kB time=00:{seconds // 60:02d}:{seconds % 60:02d}.00 bitrate=1000.0kbits/s speed=1.0x\n")
+    sys.stderr.flush()
+
+
+PACKET = b'\x47' + bytes(187)
+with open(output, 'wb') as out:
+    if 'pipe:0' in args:
+        # Follow 모드: 표준 입력이 닫힐 때까지 받은 데이터를 그대로 기록
+        received = 0
+        while True:
+            chunk = sys.stdin.buffer.read1(65536)
+            if not chunk:
+                break
+            out.write(chunk)
+            received += 1
+            progress(received)
+    else:
+        out.write(PACKET * 8)
+        out.flush()
+        delay = float(os.environ.get('STUB_FFMPEG_DELAY', '0.05'))
+        for seconds in (20, 40, 60):
+            time.sleep(delay)
+            progress(seconds)
+            if os.environ.get('STUB_FFMPEG_FAIL') == '1':
+                sys.stderr.write("Error while encoding: Invalid data found when processing input\n")
+                sys.exit(1)
+        out.write(PACKET * 8)
+'''
+
+FFPROBE_STUB = r'''
+import json
+import os
+import sys
+import time
+
+path = sys.argv[-1]
+if not os.path.exists(path):
+    sys.stderr.write(f"{path}: No such file or directory\n")
+    sys.exit(1)
+
+state = os.environ.get('STUB_FFPROBE_STATE')
+marker = None
+if state:
+    marker = os.path.join(state, f"{os.getpid()}.run")
+    open(marker, 'w').close()
+    active = sum(1 for name in os.listdir(state) if name.endswith('.run'))
+    with open(os.path.join(state, 'concurrency.log'), 'a') as log:
+        log.write(f"{active}\n")
+try:
+    time.sleep(float(os.environ.get('STUB_FFPROBE_DELAY', '0')))
+finally:
+    if marker:
+        os.remove(marker)
+
+streams = [{'codec_type': 'video', 'codec_name': 'h264', 'width': 1920, 'height': 1080,
+            'r_frame_rate': '30/1', 'nb_frames': '1800'}]
+if os.environ.get('STUB_NO_AUDIO') != '1':
+    streams.append({'codec_type': 'audio', 'codec_name': 'aac', 'bit_rate': '192000'})
+duration = '60.0'
+if path.endswith('.mp4') and os.environ.get('STUB_OUTPUT_DURATION'):
+    duration = os.environ['STUB_OUTPUT_DURATION']
+print(json.dumps({
+    'format': {'duration': duration, 'size': str(os.path.getsize(path)), 'bit_rate': '8000000'},
+    'streams': streams
+}))
+'''
+
+# MPEG-TS 패킷 (매직 바이트 검사를 통과하는 최소 형식)
+TS_PACKET = b'\x47' + bytes(187)
+
+
+def ts_chunk(packets=64):
+    """동기 바이트만 있는 MPEG-TS 조각"""
+    return TS_PACKET * packets
+
+
+def install_stub_tools(directory):
+    """directory 아래에 ffmpeg/ffprobe 대역을 만들고 실행 파일 폴더 경로를 반환합니다."""
+    bin_dir = Path(directory) / 'bin'
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name, source in (('ffmpeg', FFMPEG_STUB), ('ffprobe', FFPROBE_STUB)):
+        path = bin_dir / name
+        path.write_text(f"#!{sys.executable}\n{source}", encoding='utf-8')
+        path.chmod(0o755)
+    return bin_dir
+
+
+@unittest.skipIf(os.name == 'nt', "대역 실행 파일은 shebang을 사용하므로 POSIX 전용")
+class StubToolsTestCase(unittest.TestCase):
+    """임시 폴더와 PATH 앞에 놓인 FFmpeg/ffprobe 대역을 준비하는 테스트 기반 클래스"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        bin_dir = install_stub_tools(self.tmp)
+        env = mock.patch.dict(os.environ, {'PATH': f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"})
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def make_input(self, name='input.ts', packets=64):
+        path = self.tmp / name
+        path.write_bytes(ts_chunk(packets))
+        return str(path)
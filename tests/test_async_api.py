@@ -0,0 +1,131 @@
+"""
+asyncio API 테스트: FFmpeg/ffprobe 대역으로 동시 분석 제한, 취소/실패 시 출력 정리,
+ProgressStream의 오래된 항목 버리기, batch의 예기치 않은 오류 처리를 확인합니다.
+"""
+
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+import async_api
+from async_api import EncodeFailed, ProgressStream, batch, encode, probe
+from encoder import VideoEncoder
+from jobs import EncodeJob
+
+
+class AsyncApiTest(StubToolsTestCase):
+
+    def env(self, **values):
+        patcher = mock.patch.dict(os.environ, values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_probe_concurrency_is_limited(self):
+        state = self.tmp / 'probe-state'
+        state.mkdir()
+        self.env(STUB_FFPROBE_STATE=str(state), STUB_FFPROBE_DELAY='0.2')
+        video = self.make_input()
+
+        async def main():
+            limit = asyncio.Semaphore(3)
+            return await asyncio.gather(*(probe(video, limit) for _ in range(12)))
+
+        infos = asyncio.run(main())
+
+        self.assertEqual(len(infos), 12)
+        self.assertTrue(all(info['duration'] == 60.0 and not info['invalid'] for info in infos))
+        counts = [int(line) for line in (state / 'concurrency.log').read_text().split()]
+        self.assertEqual(len(counts), 12)
+        self.assertLessEqual(max(counts), 3)
+
+    def test_output_name_without_audio_does_not_block(self):
+        self.env(STUB_NO_AUDIO='1')
+        video = self.make_input('clip.ts')
+
+        # 동기 ffprobe로 오디오를 다시 분석하면 이벤트 루프가 멈춤
+        with mock.patch.object(VideoEncoder, 'get_audio_info', side_effect=AssertionError("blocking ffprobe")):
+            output = asyncio.run(encode(video, encoder_type='libx264'))
+
+        self.assertTrue(output.endswith('_None.mp4'))
+        self.assertTrue(os.path.exists(output))
+
+    def test_cancel_removes_partial_output(self):
+        self.env(STUB_FFMPEG_DELAY='2')
+        video = self.make_input()
+        output = str(self.tmp / 'out.mp4')
+
+        async def main():
+            task = asyncio.create_task(encode(video, output, encoder_type='libx264'))
+            while not os.path.exists(output):
+                await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(main())
+        self.assertFalse(os.path.exists(output))
+
+    def test_failed_overwrite_removes_truncated_output(self):
+        self.env(STUB_FFMPEG_FAIL='1')
+        video = self.make_input()
+        output = self.tmp / 'out.mp4'
+
+        # 덮어쓰지 않으면 FFmpeg가 기존 출력을 건드리지 않으므로 그대로 둠
+        output.write_bytes(b'previous')
+        with self.assertRaises(EncodeFailed):
+            asyncio.run(encode(video, str(output), encoder_type='libx264'))
+        self.assertEqual(output.read_bytes(), b'previous')
+
+        # 덮어쓰다 실패하면 잘린 출력이 남지 않음
+        with self.assertRaises(EncodeFailed):
+            asyncio.run(encode(video, str(output), encoder_type='libx264', overwrite=True))
+        self.assertFalse(output.exists())
+
+    def test_progress_stream_drops_oldest(self):
+        async def main():
+            stream = ProgressStream(maxsize=3)
+            for value in range(10):
+                stream.put({'progress': value})
+            stream.close()
+            stream.put({'progress': 99})  # 닫힌 뒤에는 무시
+            return [item['progress'] async for item in stream]
+
+        self.assertEqual(asyncio.run(main()), [7, 8, 9])
+
+    def test_batch_cancels_siblings_on_unexpected_error(self):
+        self.env(STUB_FFMPEG_DELAY='2')
+        slow = self.make_input('slow.ts')
+        slow_output = str(self.tmp / 'slow_out.mp4')
+        parts = [self.make_input(f'rec_part{index}.ts') for index in (1, 2)]
+
+        async def main():
+            jobs = [EncodeJob(slow, output_file=slow_output), EncodeJob(parts, output_file=str(self.tmp / 'rec.mp4'))]
+            try:
+                await batch(jobs, workers=2, encoder_type='libx264')
+            except OSError:
+                # asyncio.run이 남은 태스크를 정리하기 전, 예외를 받은 시점의 상태
+                return [job.status for job in jobs], os.path.exists(slow_output)
+
+        original_run_encode = async_api._run_encode
+
+        async def run_encode(encoder, inputs, *args, **kwargs):
+            if len(inputs) > 1:
+                # 다른 작업의 FFmpeg가 출력을 쓰기 시작한 뒤 분할 목록 파일을 만들지 못한 상황
+                while not os.path.exists(slow_output):
+                    await asyncio.sleep(0.05)
+                raise OSError("disk full")
+            return await original_run_encode(encoder, inputs, *args, **kwargs)
+
+        with mock.patch.object(async_api, '_run_encode', run_encode):
+            statuses, slow_output_left = asyncio.run(main())
+
+        # 예외를 전달하기 전에 다른 작업의 FFmpeg를 종료하고 불완전한 출력을 지움
+        self.assertEqual(statuses[0], 'failed')
+        self.assertFalse(slow_output_left)
+
+
+if __name__ == "__main__":
+    unittest.main()
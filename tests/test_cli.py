@@ -0,0 +1,83 @@
+"""
+명령줄 일괄 인코딩(cli.py) 테스트
+필터로 제외한 파일을 log 이벤트로 알리는지, SIGTERM을 받으면 작업자별 FFmpeg까지 모두 중단하고
+불완전한 출력을 지운 뒤 종료 코드 130으로 끝나는지 확인합니다.
+"""
+
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import unittest
+
+from stub_tools import StubToolsTestCase
+
+import cli
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CliTest(StubToolsTestCase):
+
+    def test_filtered_files_are_reported(self):
+        video = self.make_input('clip.ts')
+        note = self.tmp / 'notes.txt'
+        note.write_text("not a video")
+        stream = io.StringIO()
+
+        code = cli.run([video, str(note), '--ext', 'ts', '--encoder', 'libx264', '--include-recording',
+                        '--dry-run'], stream=stream)
+
+        self.assertEqual(code, cli.EXIT_OK)
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        skipped = [event for event in events if event['event'] == 'log' and event.get('path') == str(note)]
+        self.assertEqual(len(skipped), 1)
+        self.assertIn("제외", skipped[0]['message'])
+        self.assertEqual([event['inputs'] for event in events if event['event'] == 'queued'], [[video]])
+
+    def test_sigterm_cancels_every_worker(self):
+        inputs = [self.make_input(f'clip{index}.ts') for index in range(2)]
+        env = dict(os.environ, HOME=str(self.tmp), STUB_FFMPEG_DELAY='3')
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT_DIR, 'run_cli.py'), *inputs, '--encoder', 'libx264',
+             '--workers', '2', '--include-recording'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True
+        )
+        events = []
+        started = 0
+        for line in process.stdout:
+            events.append(json.loads(line))
+            if events[-1]['event'] == 'job_start':
+                started += 1
+                if started == 2:
+                    break
+        time.sleep(0.5)  # 두 작업의 FFmpeg가 출력 파일을 쓰기 시작할 때까지
+        process.send_signal(signal.SIGTERM)
+        events.extend(json.loads(line) for line in process.stdout)
+        code = process.wait(timeout=10)
+
+        self.assertEqual(code, cli.EXIT_INTERRUPTED)
+        self.assertTrue(events[-1]['interrupted'])
+        outputs = [event['output'] for event in events if event['event'] == 'queued']
+        self.assertEqual(len(outputs), 2)
+        # 끊긴 출력은 남지 않음 (다음 실행에서 완성된 출력으로 보고 건너뛰지 않도록)
+        for output in outputs:
+            self.assertFalse(os.path.exists(output), output)
+        # 대역 FFmpeg가 고아 프로세스로 남지 않음
+        stub = str(self.tmp / 'bin' / 'ffmpeg')
+        leftovers = []
+        for pid in filter(str.isdigit, os.listdir('/proc')):
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    if stub.encode() in f.read():
+                        leftovers.append(pid)
+            except OSError:
+                pass
+        self.assertEqual(leftovers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+분할 녹화 이어 붙이기(encode_concat) 테스트: 파트 분석에 probe_service 결과를 재사용하는지 확인합니다.
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+from encoder import VideoEncoder
+
+
+class FakeProbeService:
+    """UI가 이미 분석해 둔 결과를 돌려주는 ProbeService 대역"""
+
+    def __init__(self):
+        self.paths = []
+
+    def probe(self, path):
+        self.paths.append(path)
+        return {'duration': 30.0, 'frames': 900, 'size': os.path.getsize(path), 'audio_info': 'AAC192k',
+                'width': 1920, 'height': 1080, 'fps': 30.0}
+
+
+class ConcatTest(StubToolsTestCase):
+
+    def test_parts_use_probe_service(self):
+        parts = [self.make_input(f'show_part{index}.ts') for index in (1, 2)]
+        state = self.tmp / 'probe-state'
+        state.mkdir()
+        encoder = VideoEncoder('libx264')
+        encoder.probe_service = FakeProbeService()
+
+        with mock.patch.dict(os.environ, {'STUB_FFPROBE_STATE': str(state)}):
+            result = encoder.encode_concat(parts)
+
+        self.assertEqual(encoder.probe_service.paths, parts)
+        # 파트 분석과 출력 이름의 오디오 표시 모두 ffprobe를 다시 실행하지 않음
+        self.assertFalse((state / 'concurrency.log').exists())
+        self.assertEqual(os.path.basename(result), 'show_x264_CQ23_AAC192k.mp4')
+        self.assertEqual(encoder.total_seconds, 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
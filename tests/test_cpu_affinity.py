@@ -0,0 +1,55 @@
+"""
+CPU affinity 적용 테스트: 배분된 CPU가 FFmpeg 시작 시점부터 적용되는지 확인합니다.
+"""
+
+import os
+import threading
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+from cpu_topology import get_affinity_command_prefix
+from encoder import VideoEncoder
+
+
+@unittest.skipUnless(hasattr(os, 'sched_getaffinity'), "Linux 전용")
+class AffinityTest(StubToolsTestCase):
+
+    def test_prefix(self):
+        self.assertEqual(get_affinity_command_prefix(None), [])
+        with mock.patch('shutil.which', return_value='/usr/bin/taskset'):
+            self.assertEqual(get_affinity_command_prefix([3, 1, 1]), ['/usr/bin/taskset', '-c', '1,3'])
+        with mock.patch('shutil.which', return_value=None):
+            self.assertEqual(get_affinity_command_prefix([0]), [])
+
+    def test_encodes_from_worker_threads_start_on_assigned_cpu(self):
+        cpu = min(os.sched_getaffinity(0))
+        results = []
+
+        def worker(index):
+            output_file = self.tmp / f"out{index}.mp4"
+            encoder = VideoEncoder('libx264')
+            encoder.thread_allocation = {'cpus': [cpu], 'threads': 1, 'node': None, 'node_count': 1}
+            output = encoder.encode(self.make_input(f"in{index}.ts"), output_file=str(output_file))
+            affinity_file = self.tmp / f"out{index}.mp4.affinity"
+            results.append((output, affinity_file.read_text() if affinity_file.exists() else None))
+
+        os.environ['STUB_AFFINITY'] = '1'  # setUp의 patch.dict가 테스트 후 복원
+
+        # 스케줄러처럼 여러 작업자 스레드에서 동시에 시작
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        self.assertEqual(len(results), 4)
+        for output, affinity in results:
+            self.assertIsNotNone(output)
+            if get_affinity_command_prefix([cpu]):
+                self.assertEqual(affinity, str(cpu))
+
+
+if __name__ == "__main__":
+    unittest.main()
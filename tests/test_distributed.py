@@ -0,0 +1,86 @@
+"""
+분산 인코딩 테스트: 같은 프로세스에서 코디네이터(HTTP)와 작업자를 실행하고 FFmpeg 대역으로 인코딩합니다.
+출력 이름을 작업자가 정하는지, 인코딩 중에 임대가 재배정되면 결과를 최종 출력으로 옮기지 않는지 확인합니다.
+"""
+
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+from distributed import Coordinator, CoordinatorClient, RemoteWorker, is_loopback
+
+
+class DistributedTest(StubToolsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        env = mock.patch.dict(os.environ, {'HOME': str(self.tmp), 'STUB_FFMPEG_DELAY': '0.3'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.coordinator = Coordinator(token='secret')
+        server = self.coordinator.start('127.0.0.1', 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(self.coordinator.stopped.set)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.client = CoordinatorClient(f"http://127.0.0.1:{server.server_address[1]}", 'secret')
+        # 생존 신호는 임대 시간의 1/3마다 (기본 10초) - 인코딩 중에는 보내지 않음
+        self.worker = RemoteWorker(self.client, 'worker-a', 'libx264', poll_interval=0.1)
+
+    def outputs(self):
+        return sorted(path.name for path in self.tmp.iterdir() if path.suffix == '.mp4')
+
+    def test_worker_names_output(self):
+        video = self.make_input('clip.ts')
+        [job_id] = self.client.submit([{'inputs': [video], 'quality': 23}])
+        self.assertIsNone(self.client.jobs()[0]['output_file'])
+
+        self.assertEqual(self.worker.run(max_jobs=1), 1)
+
+        job = self.client.jobs()[0]
+        self.assertEqual((job['id'], job['status']), (job_id, 'done'))
+        self.assertEqual(self.outputs(), [os.path.basename(self.worker.output_name(job, [video]))])
+
+        # 출력이 이미 있으면 작업자가 건너뜀
+        self.client.submit([{'inputs': [video], 'quality': 23}])
+        self.worker.run(max_jobs=1)
+        self.assertEqual(self.client.jobs()[1]['status'], 'skipped')
+
+    def test_reassigned_lease_discards_result(self):
+        video = self.make_input('clip.ts')
+        [job_id] = self.client.submit([{'inputs': [video], 'quality': 23}])
+
+        def reassign():
+            # 인코딩 중에 임대가 만료되어 다른 작업자에게 넘어간 상황
+            while self.coordinator.jobs[job_id]['status'] != 'leased':
+                time.sleep(0.01)
+            time.sleep(0.2)
+            with self.coordinator.lock:
+                self.coordinator.jobs[job_id]['expires'] = 0
+            self.coordinator.reap()
+            self.assertIsNotNone(self.coordinator.lease('worker-b'))
+
+        thief = threading.Thread(target=reassign)
+        thief.start()
+        self.worker.run(max_jobs=1)
+        thief.join()
+
+        job = self.client.jobs()[0]
+        self.assertEqual((job['status'], job['worker']), ('leased', 'worker-b'))
+        # 이전 임대의 결과는 최종 출력으로 옮기지 않고 임시 파일도 지움
+        self.assertEqual(self.outputs(), [])
+
+    def test_requires_token_off_loopback(self):
+        self.assertTrue(is_loopback('127.0.0.1'))
+        self.assertTrue(is_loopback('localhost'))
+        self.assertFalse(is_loopback('0.0.0.0'))
+        with self.assertRaises(ValueError):
+            Coordinator().start('0.0.0.0', 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+인코딩 실패 처리 테스트: 실패하거나 진행률 처리 중 예외가 나도 FFmpeg 프로세스를 리소스 조절기와
+I/O 대역폭 예산에서 빼는지, 실패 원인과 로그 끝부분을 표준 출력에 찍지 않고 log_callback으로만 알리는지 확인합니다.
+"""
+
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+from encoder import VideoEncoder
+from io_arbiter import get_io_arbiter
+
+
+class EncoderFailureTest(StubToolsTestCase):
+
+    def assert_released(self, encoder):
+        self.assertEqual(encoder.governor.processes, [])
+        self.assertNotIn(encoder.process, get_io_arbiter().tracked)
+
+    def test_failed_encode_reports_through_callback(self):
+        os.environ['STUB_FFMPEG_FAIL'] = '1'  # setUp의 patch.dict가 테스트 후 복원
+        encoder = VideoEncoder('libx264')
+        logs = []
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout):
+            result = encoder.encode(self.make_input(), output_file=str(self.tmp / 'out.mp4'), log_callback=logs.append)
+
+        self.assertIsNone(result)
+        self.assert_released(encoder)
+        self.assertIn(f"✗ 인코딩 실패 원인: {encoder.last_failure['label']}", logs)
+        self.assertNotIn("인코딩 실패 (", stdout.getvalue())
+
+    def test_exception_releases_process(self):
+        encoder = VideoEncoder('libx264')
+
+        with mock.patch.object(encoder, '_handle_progress_line', side_effect=RuntimeError("boom")):
+            result = encoder.encode(self.make_input(), output_file=str(self.tmp / 'out.mp4'), log_callback=lambda _: None)
+
+        self.assertIsNone(result)
+        self.assertIn("boom", encoder.last_failure['tail'])
+        # 예외로 빠져나와도 종료된 프로세스를 CPU 상한 감시가 계속 참조하지 않음
+        self.assert_released(encoder)
+
+
+if __name__ == "__main__":
+    unittest.main()
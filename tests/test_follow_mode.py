@@ -0,0 +1,126 @@
+"""
+Follow 모드(녹화 중인 TS 파일 따라가며 인코딩) 테스트
+작성 중인 파일에 TS 조각을 이어 쓰고, 쓰기가 멈춘 뒤 idle_timeout이 지나면 인코딩이 끝나는지 확인합니다.
+대역 ffprobe로 재생 시간 검증 실패도 확인하고, 실제 FFmpeg가 있으면 lavfi로 만든 TS로 길이를 비교합니다.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from stub_tools import StubToolsTestCase, ts_chunk
+
+from encoder import VideoEncoder
+from metadata_utils import get_video_info
+
+# 대역을 PATH 앞에 두기 전에 찾은 실제 FFmpeg (없으면 lavfi 테스트 건너뜀)
+REAL_FFMPEG = shutil.which('ffmpeg')
+REAL_FFPROBE = shutil.which('ffprobe')
+
+
+def append_slowly(source: bytes, target: str, slices=5, interval=0.2):
+    """녹화 프로그램처럼 source를 TS 패킷 경계로 나눠 interval초마다 target에 덧붙입니다."""
+    packets = len(source) // 188
+    step = max(1, packets // slices) * 188
+    for offset in range(0, len(source), step):
+        time.sleep(interval)
+        with open(target, 'ab') as f:
+            f.write(source[offset:offset + step])
+
+
+class FollowModeTest(StubToolsTestCase):
+
+    def test_follow_finishes_after_idle_timeout(self):
+        input_file = self.make_input('recording.ts')
+        output_file = str(self.tmp / 'recording_out.mp4')
+        finished_writing = []
+
+        def recorder():
+            # 녹화 프로그램처럼 0.2초마다 조각을 덧붙임
+            for _ in range(5):
+                time.sleep(0.2)
+                with open(input_file, 'ab') as f:
+                    f.write(ts_chunk())
+            finished_writing.append(time.time())
+
+        writer = threading.Thread(target=recorder)
+        writer.start()
+
+        progress = []
+        encoder = VideoEncoder('libx265')
+        result = encoder.encode(input_file, output_file=output_file, follow=True, idle_timeout=1,
+                                progress_callback=progress.append)
+        ended = time.time()
+        writer.join()
+
+        self.assertEqual(result, output_file)
+        # 마지막 쓰기 후 idle_timeout 이상 기다렸다가 마무리
+        self.assertGreaterEqual(ended - finished_writing[0], 1.0)
+        # 녹화 중에 쓰인 조각까지 모두 전달됨
+        self.assertEqual(os.path.getsize(output_file), os.path.getsize(input_file))
+        self.assertTrue(progress)
+        self.assertTrue(all(data['progress'] < 100 for data in progress))
+        self.assertFalse(encoder.following)
+
+    def test_follow_rejects_non_streaming_input(self):
+        input_file = self.tmp / 'clip.mp4'
+        input_file.write_bytes(b'\x00\x00\x00\x18ftypisom' + bytes(64))
+        logs = []
+
+        result = VideoEncoder('libx265').encode(str(input_file), output_file=str(self.tmp / 'out.mp4'),
+                                                follow=True, idle_timeout=1, log_callback=logs.append)
+
+        self.assertIsNone(result)
+        self.assertTrue(any('MPEG-TS/MKV' in line for line in logs))
+
+    def test_duration_mismatch_fails_and_removes_output(self):
+        input_file = self.make_input('recording.ts')
+        output_file = str(self.tmp / 'recording_out.mp4')
+        logs = []
+        # 결과만 원본(60초)보다 짧게 응답 - 녹화가 잘린 경우
+        os.environ['STUB_OUTPUT_DURATION'] = '30.0'
+        self.addCleanup(os.environ.pop, 'STUB_OUTPUT_DURATION', None)
+
+        encoder = VideoEncoder('libx265')
+        result = encoder.encode(input_file, output_file=output_file, follow=True, idle_timeout=0.5,
+                                log_callback=logs.append)
+
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(output_file))
+        self.assertEqual(encoder.last_failure['kind'], 'output')
+        self.assertTrue(any('재생 시간 검증 실패' in line for line in logs))
+
+
+@unittest.skipUnless(REAL_FFMPEG and REAL_FFPROBE and os.name != 'nt', "실제 FFmpeg/ffprobe 필요")
+class RealFollowModeTest(unittest.TestCase):
+
+    def test_follow_matches_source_duration(self):
+        encoders = subprocess.run([REAL_FFMPEG, '-hide_banner', '-encoders'], capture_output=True, text=True).stdout
+        if ' libx264 ' not in encoders:
+            self.skipTest("libx264 없음")
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / 'source.ts'
+            subprocess.run([REAL_FFMPEG, '-v', 'error', '-f', 'lavfi', '-i', 'testsrc=duration=6:size=320x240:rate=30',
+                            '-c:v', 'mpeg2video', '-f', 'mpegts', str(source)], check=True)
+            recording = Path(tmp) / 'recording.ts'
+            data = source.read_bytes()
+            recording.write_bytes(data[:188 * 64])
+            writer = threading.Thread(target=append_slowly, args=(data[188 * 64:], str(recording)))
+            writer.start()
+
+            output_file = str(Path(tmp) / 'recording_out.mp4')
+            result = VideoEncoder('libx264').encode(str(recording), output_file=output_file, follow=True,
+                                                    idle_timeout=1.5)
+            writer.join()
+
+            self.assertEqual(result, output_file)
+            self.assertAlmostEqual(get_video_info(output_file, fast_only=True)['duration'], 6.0, delta=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+I/O 중재기 테스트: 슬롯을 잡은 프로세스가 멈추면(SIGSTOP) 다른 작업에 슬롯을 빌려주는지 확인합니다.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import stub_tools  # noqa: F401  (src/renqoder를 import 경로에 추가)
+
+from io_arbiter import IOArbiter, IO_BACKGROUND, get_device_key, is_process_stopped
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "Linux 전용 (/proc, SIGSTOP)")
+class SlotLendingTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, 'video.ts')
+        self.arbiter = IOArbiter()
+        # HDD처럼 슬롯 하나, 대역폭 제한 없음
+        self.arbiter.set_budget(get_device_key(self.path)[0], concurrency=1, bandwidth=0)
+
+    def test_stopped_scan_lends_its_slot(self):
+        acquired = threading.Event()
+        scan_started = threading.Event()
+        finish_scan = threading.Event()
+        scan = {}
+
+        def deep_scan():
+            with self.arbiter.slot(self.path, IO_BACKGROUND):
+                process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+                scan['process'] = process
+                self.arbiter.track(process, self.path, IO_BACKGROUND)
+                scan_started.set()
+                finish_scan.wait(20)
+                process.kill()
+                process.wait()
+                self.arbiter.untrack(process)
+
+        def probe():
+            with self.arbiter.slot(self.path, IO_BACKGROUND):
+                acquired.set()
+
+        scanner = threading.Thread(target=deep_scan)
+        scanner.start()
+        self.assertTrue(scan_started.wait(10))
+        prober = threading.Thread(target=probe)
+        prober.start()
+
+        # 실행 중인 스캔이 슬롯을 잡고 있으면 기다림
+        self.assertFalse(acquired.wait(1.0))
+
+        os.kill(scan['process'].pid, signal.SIGSTOP)
+        try:
+            self.assertTrue(acquired.wait(5), "멈춘 스캔이 슬롯을 계속 잡고 있음")
+            self.assertTrue(is_process_stopped(scan['process']))
+        finally:
+            os.kill(scan['process'].pid, signal.SIGCONT)
+            finish_scan.set()
+            scanner.join(10)
+            prober.join(10)
+
+        state = self.arbiter.snapshot()[get_device_key(self.path)[0]]
+        self.assertEqual(state['active'], 0)
+        self.assertEqual(state['waiting'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
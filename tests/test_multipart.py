@@ -0,0 +1,36 @@
+"""
+분할 녹화 파일명 인식 테스트 (jobs.parse_multipart_name)
+"""
+
+import unittest
+
+import stub_tools  # noqa: F401  (src/renqoder를 import 경로에 추가)
+
+from jobs import parse_multipart_name
+
+
+class MultipartNameTest(unittest.TestCase):
+
+    def test_explicit_markers(self):
+        cases = {
+            'Game Night part1.ts': ('Game Night', 1),
+            'Game Night_pt02.mkv': ('Game Night', 2),
+            'movie-cd1.avi': ('movie', 1),
+            'stream.seg003.ts': ('stream', 3),
+            'capture segment 12.mp4': ('capture', 12),
+            'backup_disc2.mkv': ('backup', 2),
+            '녹화 Part 3.ts': ('녹화', 3),
+        }
+        for name, (base, index) in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(parse_multipart_name(name), {'base': base, 'index': index})
+
+    def test_words_ending_with_marker_letters(self):
+        for name in ('concept2.mp4', 'attempt1.mp4', 'script2.mkv', 'abcd1.mp4', 'Moviepart1.ts',
+                     'checkpoint3.ts', 'Episode 01.mp4', 'part1.mp4', 'Final Cut Pro.mov'):
+            with self.subTest(name=name):
+                self.assertIsNone(parse_multipart_name(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
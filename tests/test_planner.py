@@ -0,0 +1,46 @@
+"""
+절감 예측 테스트: SavingsPlanner(NumPy 일괄 계산)와 VideoEncoder.estimate_output_size(파일 하나)의 결과 일치
+"""
+
+import unittest
+
+import stub_tools  # noqa: F401  (src/renqoder를 import 경로에 추가)
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    numpy = None
+
+from encoder import VideoEncoder
+
+
+@unittest.skipIf(numpy is None, "NumPy가 설치되어 있지 않음")
+class PlannerConsistencyTest(unittest.TestCase):
+
+    def estimate_both(self, item, quality=23, audio_mode='copy'):
+        from planner import SavingsPlanner
+
+        planner = SavingsPlanner()
+        planner.update([item])
+        vectorized = planner.estimate('libx265', quality, audio_mode)['estimated'][0]
+        scalar = VideoEncoder('libx265').estimate_output_size(item, quality, audio_mode)['total']
+        return vectorized, scalar
+
+    def test_full_metadata(self):
+        item = {'path': '/videos/a.mp4', 'metadata_loaded': True, 'duration': 600.0, 'width': 1280,
+                'height': 720, 'fps': 60.0, 'size': 2_000_000_000, 'audio_size': 9_000_000}
+        vectorized, scalar = self.estimate_both(item, quality=28)
+        self.assertAlmostEqual(vectorized, scalar, delta=1)
+
+    def test_missing_resolution_and_fps_use_same_defaults(self):
+        for missing in ({}, {'width': 0, 'height': 0, 'fps': 0.0}):
+            item = {'path': '/videos/b.ts', 'metadata_loaded': True, 'duration': 120.0,
+                    'size': 500_000_000, 'bit_rate': 4_000_000, **missing}
+            with self.subTest(missing=missing):
+                vectorized, scalar = self.estimate_both(item, audio_mode='aac')
+                self.assertGreater(scalar, 0)
+                self.assertAlmostEqual(vectorized, scalar, delta=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+녹화 진행 중 파일 감지 테스트: 판정에 샘플링 대기가 없는지 확인합니다.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import stub_tools  # noqa: F401  (src/renqoder를 import 경로에 추가)
+
+from recording_detector import RecordingDetector
+
+
+class RecordingDetectorTest(unittest.TestCase):
+
+    def test_check_many_does_not_wait(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recent = Path(tmp) / 'recent.ts'
+            old = Path(tmp) / 'old.ts'
+            for path in (recent, old):
+                path.write_bytes(b'\x47' * 188)
+            os.utime(old, (time.time() - 120, time.time() - 120))
+
+            started = time.perf_counter()
+            states = RecordingDetector(stable_seconds=60).check_many([str(recent), str(old), str(Path(tmp) / 'gone.ts')])
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(states[str(recent)]['in_progress'])
+        self.assertIn("안정화 대기", states[str(recent)]['reason'])
+        self.assertFalse(states[str(old)]['in_progress'])
+        self.assertNotIn(str(Path(tmp) / 'gone.ts'), states)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+배치 대기열 테스트: 장치 모드에서 건너뛴 작업이 작업자를 계속 점유하지 않는지,
+실행 중에 꺼낸 대기 작업을 대기열이 다시 실행하지 않는지, 녹화 여부를 한 번에 확인하는지,
+마감 계획이 동시 작업 수만큼 처리 능력을 부풀리지 않는지 확인합니다.
+"""
+
+import os
+import time
+import unittest
+from unittest import mock
+
+from stub_tools import StubToolsTestCase
+
+from cpu_topology import ThreadPlanner
+from encoder import VideoEncoder
+from jobs import EncodeJob
+from recording_detector import RecordingDetector
+from scheduler import BatchQueue, build_devices
+
+VIDEO_INFO = {'width': 1920, 'height': 1080, 'fps': 30.0, 'duration': 60.0, 'size': 100_000_000,
+              'metadata_loaded': True}
+
+
+class DeviceModeTest(StubToolsTestCase):
+
+    def test_skipped_jobs_release_worker_slot(self):
+        queue = BatchQueue(VideoEncoder('libx264'))
+        for index in range(6):
+            job = EncodeJob(self.make_input(f"clip{index}.ts"), output_file=str(self.tmp / f"clip{index}_out.mp4"))
+            if index % 2 == 0:
+                # 이미 출력이 있는 작업 (건너뜀)
+                (self.tmp / f"clip{index}_out.mp4").write_bytes(b'done')
+            queue.add(job, dict(VIDEO_INFO))
+
+        held_after_finish = []
+
+        def on_job(job):
+            if job.status in ('skipped', 'done', 'failed'):
+                now = time.time()
+                for key, slot in queue.worker_slots.items():
+                    if slot['job'] is job:
+                        held_after_finish.append((job.name, key, queue._worker_free_at(key, now) - now))
+
+        processed = queue.run(job_callback=on_job, devices=build_devices(['hevc_nvenc', 'libx264']))
+
+        self.assertEqual(held_after_finish, [])
+        self.assertEqual(sorted(job.status for job in processed), ['done'] * 3 + ['skipped'] * 3)
+        report = {row['device']: row for row in queue.device_report()}
+        # 건너뛴 작업은 장치 실패로 세지 않음
+        self.assertEqual(sum(row['failed'] for row in report.values()), 0)
+        self.assertEqual(sum(row['jobs'] for row in report.values()), 3)
+
+
+class TakePendingTest(StubToolsTestCase):
+
+    def test_taken_jobs_are_not_run_locally(self):
+        queue = BatchQueue(VideoEncoder('libx264'))
+        jobs = []
+        for index in range(3):
+            job = EncodeJob(self.make_input(f"clip{index}.ts"), output_file=str(self.tmp / f"clip{index}_out.mp4"))
+            jobs.append(queue.add(job, dict(VIDEO_INFO)))
+
+        taken = []
+
+        def on_job(job):
+            # 첫 작업이 시작되면 나머지를 서비스로 보내듯 꺼냄
+            if job.status == 'running' and not taken:
+                taken.extend(queue.take_pending())
+
+        with mock.patch.dict(os.environ, {'STUB_FFMPEG_DELAY': '0.2'}):
+            processed = queue.run(job_callback=on_job)
+
+        self.assertEqual(processed, jobs[:1])
+        self.assertEqual(taken, jobs[1:])
+        self.assertTrue(all(job.status == 'pending' for job in taken))
+        self.assertFalse(any(os.path.exists(job.output_file) for job in taken))
+        self.assertEqual(queue.pending(), [])
+
+        # 보내지 못하면 원래 순서대로 되돌림
+        queue.restore(list(reversed(taken)))
+        self.assertEqual(queue.pending(), jobs[1:])
+
+
+class CountingDetector(RecordingDetector):
+    """check_many 호출마다 확인한 경로 목록을 기록하는 RecordingDetector"""
+
+    def __init__(self):
+        super().__init__(stable_seconds=60)
+        self.calls = []
+
+    def check_many(self, filepaths):
+        self.calls.append(sorted(filepaths))
+        return super().check_many(filepaths)
+
+
+class RecordingCheckTest(StubToolsTestCase):
+
+    def test_recording_inputs_are_checked_together(self):
+        detector = CountingDetector()
+        queue = BatchQueue(VideoEncoder('libx264'), recording_detector=detector)
+        paths = []
+        for index in range(5):
+            # 방금 쓴 파일 (녹화 중으로 판정)
+            paths.append(self.make_input(f"live{index}.ts"))
+            queue.add(EncodeJob(paths[-1], output_file=str(self.tmp / f"live{index}_out.mp4")), dict(VIDEO_INFO))
+        finished = self.make_input("finished.ts")
+        os.utime(finished, (time.time() - 600, time.time() - 600))
+        paths.append(finished)
+        queue.add(EncodeJob(finished, output_file=str(self.tmp / "finished_out.mp4")), dict(VIDEO_INFO))
+
+        processed = queue.run()
+
+        self.assertEqual([job.inputs[0] for job in processed], [finished])
+        # 작업마다 따로 확인하지 않고 모든 대기 작업의 입력을 한 번에 확인, 판정은 잠시 재사용
+        self.assertEqual(detector.calls[0], sorted(paths))
+        self.assertEqual(len(detector.calls), 1)
+
+
+class DeadlinePlanTest(StubToolsTestCase):
+
+    def test_capacity_follows_devices_not_workers(self):
+        queue = BatchQueue(VideoEncoder('libx264'))
+        queue.add(EncodeJob(self.make_input("clip.ts"), output_file=str(self.tmp / "clip_out.mp4")), dict(VIDEO_INFO))
+        now = time.time()
+        queue.deadline = now + 3600
+
+        self.assertAlmostEqual(queue.plan_presets(now)['available'], 3600)
+        # 실행 중 작업자 수(run()이 바꾸는 값)는 계획에 영향 없음 - 작업들이 코어를 나눠 씀
+        queue.workers = 4
+        self.assertAlmostEqual(queue.plan_presets(now)['available'], 3600)
+        # 서로 독립된 장치는 처리 능력이 더해짐 (run() 전에 UI가 설정)
+        queue.set_devices(build_devices(['hevc_nvenc', 'libx264']))
+        self.assertAlmostEqual(queue.plan_presets(now)['available'], 7200)
+
+    def test_observed_speed_is_scaled_to_whole_device(self):
+        queue = BatchQueue(VideoEncoder('libx264'))
+        job = queue.add(EncodeJob(self.make_input("clip.ts"), output_file=str(self.tmp / "clip_out.mp4")),
+                        dict(VIDEO_INFO))
+        queue.thread_planner = ThreadPlanner({'logical': 4, 'cores': [[0], [1], [2], [3]], 'nodes': {0: [0, 1, 2, 3]}})
+        encoder = VideoEncoder('libx264')
+        encoder.thread_allocation = queue.thread_planner.allocate(2)[0]
+
+        share = queue._share(encoder, None)
+        queue.observe(job, 10.0, share)
+
+        # 코어 절반으로 180 fps였으면 장치 전체로는 360 fps
+        self.assertEqual(share, 0.5)
+        self.assertAlmostEqual(queue.throughput.fps_1080p('libx264'), 1800 / 10.0 / 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+지연 import 테스트: 여러 스레드가 동시에 처음 접근해도 모듈이 온전히 로드되는지 확인합니다.
+"""
+
+import importlib.util
+import subprocess
+import sys
+import unittest
+
+from stub_tools import SRC_DIR
+
+RACE_SCRIPT = r'''
+import sys
+import threading
+sys.path.insert(0, sys.argv[1])
+from startup import lazy_import
+
+module = lazy_import(sys.argv[2])
+barrier = threading.Barrier(16)
+errors = []
+
+def touch():
+    barrier.wait()
+    try:
+        getattr(module, sys.argv[3])
+    except Exception as e:
+        errors.append(repr(e))
+
+threads = [threading.Thread(target=touch) for _ in range(16)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+print(len(errors))
+'''
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def run_race(self, module, attribute):
+        # 이미 로드된 모듈로는 경쟁 상태를 재현할 수 없으므로 새 인터프리터에서 실행
+        result = subprocess.run([sys.executable, '-c', RACE_SCRIPT, str(SRC_DIR), module, attribute],
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return int(result.stdout.strip())
+
+    @unittest.skipIf(importlib.util.find_spec('numpy') is None, "NumPy가 설치되어 있지 않음")
+    def test_concurrent_first_access_numpy(self):
+        for _ in range(3):
+            self.assertEqual(self.run_race('numpy', 'zeros'), 0)
+
+    def test_concurrent_first_access_stdlib(self):
+        self.assertEqual(self.run_race('decimal', 'Decimal'), 0)
+
+    def test_missing_module_raises_immediately(self):
+        from startup import lazy_import
+        with self.assertRaises(ImportError):
+            lazy_import('renqoder_no_such_module')
+
+
+if __name__ == "__main__":
+    unittest.main()